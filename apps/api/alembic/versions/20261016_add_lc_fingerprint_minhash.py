@@ -0,0 +1,57 @@
+"""Add MinHash signatures and LSH band keys for LC duplicate detection.
+
+Revision ID: 20261016_add_lc_fingerprint_minhash
+Revises: 20260716_add_proofline_outcomes
+Create Date: 2026-10-16
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261016_add_lc_fingerprint_minhash"
+down_revision = "20260716_add_proofline_outcomes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    # lc_fingerprints comes from the legacy migrations tree; skip if absent.
+    if "lc_fingerprints" not in inspector.get_table_names():
+        return
+
+    columns = {column["name"] for column in inspector.get_columns("lc_fingerprints")}
+    if "minhash_signature" not in columns:
+        op.add_column(
+            "lc_fingerprints",
+            sa.Column("minhash_signature", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        )
+
+    if "lc_fingerprint_bands" not in inspector.get_table_names():
+        op.create_table(
+            "lc_fingerprint_bands",
+            sa.Column(
+                "fingerprint_id",
+                postgresql.UUID(as_uuid=True),
+                sa.ForeignKey("lc_fingerprints.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("band_key", sa.String(40), primary_key=True),
+        )
+        op.create_index("idx_lc_fingerprint_bands_key", "lc_fingerprint_bands", ["band_key"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "lc_fingerprint_bands" in inspector.get_table_names():
+        op.drop_index("idx_lc_fingerprint_bands_key", table_name="lc_fingerprint_bands")
+        op.drop_table("lc_fingerprint_bands")
+    if "lc_fingerprints" in inspector.get_table_names():
+        columns = {column["name"] for column in inspector.get_columns("lc_fingerprints")}
+        if "minhash_signature" in columns:
+            op.drop_column("lc_fingerprints", "minhash_signature")
@@ -0,0 +1,53 @@
+"""Add tenant-scoped document extraction records.
+
+Revision ID: 20261017_add_document_extraction_records
+Revises: 20261016_add_lc_fingerprint_minhash
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261017_add_document_extraction_records"
+down_revision = "20261016_add_lc_fingerprint_minhash"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "document_extraction_records",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("company_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("companies.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("content_sha256", sa.String(64), nullable=False),
+        sa.Column("document_type", sa.String(64), nullable=False),
+        sa.Column("extractor_version", sa.String(32), nullable=False),
+        sa.Column("model", sa.String(128), nullable=False),
+        sa.Column("prompt_version", sa.String(64), nullable=False),
+        sa.Column("payload", postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_used_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.UniqueConstraint(
+            "company_id",
+            "content_sha256",
+            "document_type",
+            "extractor_version",
+            "model",
+            "prompt_version",
+            name="uq_document_extraction_record_key",
+        ),
+    )
+    op.create_index(
+        "ix_document_extraction_records_company_used",
+        "document_extraction_records",
+        ["company_id", "last_used_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_extraction_records_company_used", table_name="document_extraction_records")
+    op.drop_table("document_extraction_records")
@@ -0,0 +1,69 @@
+"""Add daily analytics rollups.
+
+Revision ID: 20261018_add_analytics_daily_rollups
+Revises: 20261017_add_document_extraction_records
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision = "20261018_add_analytics_daily_rollups"
+down_revision = "20261017_add_document_extraction_records"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "analytics_daily_rollups",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("company_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("companies.id", ondelete="CASCADE"), nullable=True),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("jobs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("processing_jobs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("processing_seconds", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("discrepancy_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_analytics_daily_rollups_day", "analytics_daily_rollups", ["day"])
+    op.create_index("ix_analytics_daily_rollups_user_day", "analytics_daily_rollups", ["user_id", "day"])
+    op.create_index("ix_analytics_daily_rollups_company_day", "analytics_daily_rollups", ["company_id", "day"])
+
+    # Seed from history; scripts/backfill_analytics_rollups.py repeats this in chunks.
+    op.execute(
+        """
+        INSERT INTO analytics_daily_rollups
+            (day, user_id, company_id, status, jobs, processing_jobs, processing_seconds, discrepancy_count)
+        SELECT
+            date(vs.created_at),
+            vs.user_id,
+            vs.company_id,
+            vs.status,
+            count(*),
+            sum(CASE WHEN vs.processing_started_at IS NOT NULL AND vs.processing_completed_at IS NOT NULL THEN 1 ELSE 0 END),
+            coalesce(sum(
+                CASE WHEN vs.processing_started_at IS NOT NULL AND vs.processing_completed_at IS NOT NULL
+                THEN extract(epoch FROM vs.processing_completed_at - vs.processing_started_at) ELSE 0 END
+            ), 0),
+            coalesce(sum(d.discrepancies), 0)
+        FROM validation_sessions vs
+        LEFT JOIN (
+            SELECT validation_session_id, count(*) AS discrepancies
+            FROM discrepancies
+            GROUP BY validation_session_id
+        ) d ON d.validation_session_id = vs.id
+        GROUP BY date(vs.created_at), vs.user_id, vs.company_id, vs.status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_analytics_daily_rollups_company_day", table_name="analytics_daily_rollups")
+    op.drop_index("ix_analytics_daily_rollups_user_day", table_name="analytics_daily_rollups")
+    op.drop_index("ix_analytics_daily_rollups_day", table_name="analytics_daily_rollups")
+    op.drop_table("analytics_daily_rollups")
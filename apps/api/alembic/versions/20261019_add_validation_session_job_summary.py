@@ -0,0 +1,47 @@
+"""Add job list summary columns to validation_sessions.
+
+Revision ID: 20261019_add_validation_session_job_summary
+Revises: 20261018_add_analytics_daily_rollups
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_add_validation_session_job_summary"
+down_revision = "20261018_add_analytics_daily_rollups"
+branch_labels = None
+depends_on = None
+
+
+_COLUMNS = (
+    ("summary_lc_number", sa.String(128)),
+    ("summary_supplier_name", sa.String(255)),
+    ("summary_invoice_amount", sa.String(64)),
+    ("summary_invoice_currency", sa.String(16)),
+    ("summary_document_count", sa.Integer()),
+    ("summary_discrepancy_count", sa.Integer()),
+    ("summary_document_status", sa.JSON()),
+    ("summary_top_issue", sa.JSON()),
+    ("summary_verdict", sa.String(32)),
+    ("summary_updated_at", sa.DateTime(timezone=True)),
+)
+
+
+def upgrade() -> None:
+    for name, column_type in _COLUMNS:
+        op.add_column("validation_sessions", sa.Column(name, column_type, nullable=True))
+    op.create_index(
+        "ix_validation_sessions_user_created_id",
+        "validation_sessions",
+        ["user_id", "created_at", "id"],
+    )
+    # Existing rows are summarised by scripts/backfill_job_summaries.py (the
+    # blobs need Python to parse), run once by an operator after this.
+
+
+def downgrade() -> None:
+    op.drop_index("ix_validation_sessions_user_created_id", table_name="validation_sessions")
+    for name, _ in reversed(_COLUMNS):
+        op.drop_column("validation_sessions", name)
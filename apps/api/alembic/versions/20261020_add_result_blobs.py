@@ -0,0 +1,47 @@
+"""Add result_blobs for compressed session payloads.
+
+Revision ID: 20261020_add_result_blobs
+Revises: 20261019_add_validation_session_job_summary
+Create Date: 2026-10-20
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261020_add_result_blobs"
+down_revision = "20261019_add_validation_session_job_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "result_blobs",
+        sa.Column("sha256", sa.String(64), primary_key=True),
+        sa.Column("codec", sa.String(16), nullable=False),
+        sa.Column("raw_size", sa.Integer(), nullable=False),
+        sa.Column("stored_size", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    )
+    # Already compressed; skip TOAST's own pglz pass on the bytea.
+    op.execute("ALTER TABLE result_blobs ALTER COLUMN data SET STORAGE EXTERNAL")
+    # Existing inline payloads are moved by scripts/offload_result_blobs.py.
+
+
+def downgrade() -> None:
+    # gzip cannot be undone in SQL: inline the payloads with
+    # scripts/offload_result_blobs.py --inline --apply first.
+    offloaded = op.get_bind().execute(
+        sa.text(
+            "SELECT count(*) FROM validation_sessions"
+            " WHERE (validation_results::jsonb ? '_blob') OR (extracted_data::jsonb ? '_blob')"
+        )
+    ).scalar()
+    if offloaded:
+        raise RuntimeError(
+            f"{offloaded} validation session(s) still point at result_blobs; "
+            "run scripts/offload_result_blobs.py --inline --apply before downgrading"
+        )
+    op.drop_table("result_blobs")
@@ -0,0 +1,26 @@
+"""Add results_version to validation_sessions.
+
+Revision ID: 20261021_add_validation_session_results_version
+Revises: 20261020_add_result_blobs
+Create Date: 2026-10-21
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261021_add_validation_session_results_version"
+down_revision = "20261020_add_result_blobs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "validation_sessions",
+        sa.Column("results_version", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("validation_sessions", "results_version")
@@ -0,0 +1,147 @@
+"""
+Building blocks shared by the two-tier caches in ``app.cache``.
+
+Each cache module keeps its own key format, value encoding and settings, and
+composes:
+
+- ``ExpiringLRU``: in-process LRU with per-entry expiry, bounded by entry
+  count and optionally by the byte size of the stored values.
+- ``RedisTier``: binary Redis accessor that stops retrying once Redis is
+  found to be unconfigured or unreachable.
+- ``CacheCounters``: thread-safe hit/miss counters for ``get_stats``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class CacheCounters:
+    """Named counters; ``snapshot`` returns a copy for ``get_stats``."""
+
+    def __init__(self, *names: str) -> None:
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {name: 0 for name in names}
+
+    def bump(self, name: str, delta: int = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + delta
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+
+class ExpiringLRU(Generic[V]):
+    """LRU with per-entry expiry.
+
+    Limits are callables so settings changes apply without a restart; a limit
+    of 0 disables the tier. With ``max_bytes`` set, values must be ``bytes``
+    and both bounds apply.
+    """
+
+    def __init__(
+        self,
+        max_entries: Callable[[], int],
+        *,
+        max_bytes: Optional[Callable[[], int]] = None,
+        on_evict: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self._entries: "OrderedDict[str, Tuple[float, V]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._on_evict = on_evict
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _size(self, value: Any) -> int:
+        return len(value) if self._max_bytes is not None else 0
+
+    def get(self, key: str) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: V, ttl_seconds: int) -> None:
+        max_entries = max(0, int(self._max_entries() or 0))
+        max_bytes = max(0, int(self._max_bytes() or 0)) if self._max_bytes is not None else None
+        if not max_entries or max_bytes == 0 or (max_bytes is not None and self._size(value) > max_bytes):
+            return
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (time.time() + ttl_seconds, value)
+            self._bytes += self._size(value)
+            while self._entries and (
+                len(self._entries) > max_entries or (max_bytes is not None and self._bytes > max_bytes)
+            ):
+                self._drop(next(iter(self._entries)))
+                if self._on_evict is not None:
+                    self._on_evict()
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= self._size(entry[1])
+
+    def drop_prefix(self, prefix: str) -> int:
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefix)]
+            for key in stale:
+                self._drop(key)
+            return len(stale)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            return count
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+class RedisTier:
+    """Binary Redis client for one cache, remembering when Redis is unavailable."""
+
+    def __init__(self, label: str) -> None:
+        self.label = label
+        # Track Redis availability to avoid repeated connection attempts
+        self.available: Optional[bool] = None
+
+    async def client(self) -> Any:
+        if self.available is False:
+            return None
+        try:
+            from app.utils.redis_cache import get_redis_binary
+
+            client = await get_redis_binary()
+        except Exception as e:
+            self.available = False
+            logger.warning(f"{self.label}: Redis unavailable ({e}), using in-memory cache")
+            return None
+        if client:
+            self.available = True
+            return client
+        self.available = False
+        logger.info(f"{self.label}: Redis not configured, using in-memory cache")
+        return None
@@ -0,0 +1,238 @@
+"""
+Content-addressed cache for AI-first extraction results.
+
+Re-validations (session refresh, re-papering) re-run field extraction on
+documents whose text has not changed. Entries are keyed by
+
+    {prompt_version}:{document_type}:{model}:{sha256(normalised text)}
+
+so an unchanged document set is served without any LLM round-trip, while a
+new model, a different document type or a prompt change misses.
+
+- ``prompt_version`` combines ``EXTRACTION_PROMPT_VERSION`` (bump to retire
+  every entry) with a fingerprint of the prompt templates, so editing a
+  prompt invalidates its entries without a manual bump.
+  ``invalidate_prompt_version`` drops a version from both tiers.
+- Memory tier: LRU bounded by ``EXTRACTION_CACHE_MEMORY_MAX_ENTRIES`` with
+  per-entry expiry. Values are stored zlib-compressed, so every hit
+  decodes to a fresh dict that callers may mutate.
+- Redis tier: the same blobs with ``EXTRACTION_CACHE_TTL_SECONDS``; Redis
+  hits are promoted into memory.
+- ``get_or_compute`` shares one model call between concurrent callers for
+  the same key in this process.
+
+When Redis is not configured the memory tier works on its own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import re
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.cache._tiers import CacheCounters, ExpiringLRU, RedisTier
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_CACHE_TTL_SECONDS = 14 * 24 * 60 * 60  # 14 days (default; see settings)
+EXTRACTION_CACHE_PREFIX = "ai:extract:v1:"  # Prefix for Redis keys
+
+# Value format marker: 0x01 = zlib-compressed UTF-8 JSON.
+_FORMAT_ZLIB_JSON = b"\x01"
+_SCAN_COUNT = 500
+_WHITESPACE_RE = re.compile(r"\s+")
+
+_redis_tier = RedisTier("Extraction cache")
+_stats = CacheCounters("memory_hits", "redis_hits", "misses", "sets", "evictions", "singleflight_joins", "invalidated")
+
+# In-process singleflight: cache key -> task computing it.
+_inflight: Dict[str, "asyncio.Task[Tuple[Dict[str, Any], bool]]"] = {}
+
+
+def enabled() -> bool:
+    return bool(getattr(settings, "EXTRACTION_CACHE_ENABLED", True))
+
+
+def _ttl_seconds() -> int:
+    ttl = getattr(settings, "EXTRACTION_CACHE_TTL_SECONDS", EXTRACTION_CACHE_TTL_SECONDS)
+    return max(1, int(ttl or EXTRACTION_CACHE_TTL_SECONDS))
+
+
+_memory_cache: "ExpiringLRU[bytes]" = ExpiringLRU(
+    lambda: getattr(settings, "EXTRACTION_CACHE_MEMORY_MAX_ENTRIES", 2048),
+    on_evict=lambda: _stats.bump("evictions"),
+)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so OCR line-wrapping differences hash the same."""
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+def prompt_version(*prompt_parts: str) -> str:
+    """Cache version for a prompt: the configured version plus a template fingerprint."""
+    digest = hashlib.sha256("\x00".join(prompt_parts).encode("utf-8")).hexdigest()[:12]
+    configured = str(getattr(settings, "EXTRACTION_PROMPT_VERSION", "1") or "1")
+    return f"{configured}-{digest}"
+
+
+def build_key(text: str, document_type: str, version: str, model: str) -> str:
+    """Cache key for one document's extraction under a prompt version and model."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{version}:{document_type or 'unknown'}:{model or 'unknown'}:{digest}"
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    return _FORMAT_ZLIB_JSON + zlib.compress(raw, 6)
+
+
+def _decode(blob: Any) -> Optional[Dict[str, Any]]:
+    if not blob:
+        return None
+    try:
+        if blob[:1] == _FORMAT_ZLIB_JSON:
+            payload = json.loads(zlib.decompress(blob[1:]).decode("utf-8"))
+        else:
+            payload = json.loads(blob)
+    except Exception as exc:
+        logger.warning("Extraction cache: undecodable entry dropped (%s)", exc)
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+async def _get_redis():
+    """Get binary Redis client, caching availability status."""
+    return await _redis_tier.client()
+
+
+async def get(cache_key: str) -> Optional[Dict[str, Any]]:
+    """Return the cached extraction payload, checking memory then Redis."""
+    blob = _memory_cache.get(cache_key)
+    if blob is not None:
+        _stats.bump("memory_hits")
+        return _decode(blob)
+
+    redis = await _get_redis()
+    if redis:
+        try:
+            blob = await redis.get(f"{EXTRACTION_CACHE_PREFIX}{cache_key}")
+        except Exception as e:
+            logger.warning(f"Redis extraction cache get failed: {e}")
+            blob = None
+        if blob:
+            _stats.bump("redis_hits")
+            _memory_cache.put(cache_key, bytes(blob), _ttl_seconds())
+            return _decode(blob)
+
+    _stats.bump("misses")
+    return None
+
+
+async def set(cache_key: str, payload: Dict[str, Any]) -> None:
+    """Store an extraction payload in Redis (when available) and the memory LRU."""
+    blob = _encode(payload)
+    ttl = _ttl_seconds()
+    redis = await _get_redis()
+    if redis:
+        try:
+            await redis.setex(f"{EXTRACTION_CACHE_PREFIX}{cache_key}", ttl, blob)
+        except Exception as e:
+            logger.warning(f"Redis extraction cache set failed: {e}")
+    _memory_cache.put(cache_key, blob, ttl)
+    _stats.bump("sets")
+
+
+async def _fill(
+    cache_key: str,
+    compute: Callable[[], Awaitable[Dict[str, Any]]],
+    should_cache: Optional[Callable[[Dict[str, Any]], bool]],
+) -> Tuple[Dict[str, Any], bool]:
+    payload = await compute()
+    if should_cache is None or should_cache(payload):
+        await set(cache_key, payload)
+    return payload, False
+
+
+async def get_or_compute(
+    cache_key: str,
+    compute: Callable[[], Awaitable[Dict[str, Any]]],
+    *,
+    should_cache: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Return ``(payload, cache_hit)``, running ``compute`` at most once per key.
+
+    Callers joining an in-flight computation get their own copy of the
+    payload. ``should_cache`` filters which results are stored (e.g. skip
+    failed extractions).
+    """
+    payload = await get(cache_key)
+    if payload is not None:
+        return payload, True
+
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(cache_key)
+    if task is not None and task.get_loop() is loop and not task.done():
+        _stats.bump("singleflight_joins")
+        payload, _ = await asyncio.shield(task)
+        return copy.deepcopy(payload), True
+
+    task = loop.create_task(_fill(cache_key, compute, should_cache))
+    _inflight[cache_key] = task
+
+    def _forget(done: "asyncio.Task[Tuple[Dict[str, Any], bool]]", key: str = cache_key) -> None:
+        if _inflight.get(key) is done:
+            _inflight.pop(key, None)
+
+    task.add_done_callback(_forget)
+    payload, hit = await asyncio.shield(task)
+    # The task's payload is shared with joiners; everyone mutates a copy.
+    return copy.deepcopy(payload), hit
+
+
+async def invalidate_prompt_version(version: Optional[str] = None) -> int:
+    """Drop every entry of a prompt version (all entries when ``None``).
+
+    Returns the number of entries removed across both tiers.
+    """
+    prefix = f"{version}:" if version else ""
+    removed = _memory_cache.drop_prefix(prefix)
+
+    redis = await _get_redis()
+    if redis:
+        try:
+            batch = []
+            async for key in redis.scan_iter(match=f"{EXTRACTION_CACHE_PREFIX}{prefix}*", count=_SCAN_COUNT):
+                batch.append(key)
+                if len(batch) >= _SCAN_COUNT:
+                    removed += int(await redis.delete(*batch) or 0)
+                    batch = []
+            if batch:
+                removed += int(await redis.delete(*batch) or 0)
+        except Exception as e:
+            logger.warning(f"Redis extraction cache invalidation failed: {e}")
+
+    _stats.bump("invalidated", removed)
+    logger.info("Extraction cache invalidated: version=%s removed=%d", version or "*", removed)
+    return removed
+
+
+async def get_stats() -> Dict[str, Any]:
+    """Get cache statistics for monitoring."""
+    stats: Dict[str, Any] = _stats.snapshot()
+    stats.update(
+        {
+            "enabled": enabled(),
+            "memory_entries": len(_memory_cache),
+            "inflight": len(_inflight),
+            "redis_available": (await _get_redis()) is not None,
+        }
+    )
+    return stats
@@ -1,143 +1,312 @@
 """
-OCR result cache with Redis persistence and in-memory fallback.
+Tiered OCR result cache: bounded in-memory LRU in front of Redis.
 
-Uses Redis when available for persistence across server restarts.
-Falls back to in-memory cache when Redis is not configured.
+Entries are keyed by content hash. ``build_page_key`` hashes a single
+provider payload (one rendered page, or the whole file for single-payload
+providers), so a re-uploaded document with one changed page only misses on
+that page.
+
+- Memory tier: LRU bounded by ``OCR_CACHE_MEMORY_MAX_BYTES`` and
+  ``OCR_CACHE_MEMORY_MAX_ENTRIES``; sizes are the compressed value bytes.
+- Redis tier: zlib-compressed JSON stored as binary with
+  ``OCR_CACHE_TTL_SECONDS``. Redis hits are promoted into memory.
+- ``get_or_compute`` is a singleflight: concurrent callers in one process
+  share a single computation, and a short-lived Redis lock makes other
+  processes wait for the value instead of calling the provider again.
+
+When Redis is not configured the memory tier works on its own.
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
-import time
-from typing import Any, Dict, Optional, Tuple
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from uuid import uuid4
+
+from app.cache._tiers import CacheCounters, ExpiringLRU, RedisTier
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
-OCR_CACHE_TTL_SECONDS = 3 * 24 * 60 * 60  # 72 hours
-OCR_CACHE_PREFIX = "ocr:v1:"  # Prefix for Redis keys
+OCR_CACHE_TTL_SECONDS = 3 * 24 * 60 * 60  # 72 hours (default; see settings)
+OCR_CACHE_PREFIX = "ocr:v2:"  # Prefix for Redis value keys
+OCR_CACHE_LOCK_PREFIX = "ocr:lock:v2:"  # Prefix for singleflight lock keys
+
+# Value format marker: 0x01 = zlib-compressed UTF-8 JSON.
+_FORMAT_ZLIB_JSON = b"\x01"
+_STATS_SCAN_COUNT = 500
+_STATS_SCAN_LIMIT = 100_000
+_LOCK_POLL_INITIAL_SEC = 0.05
+_LOCK_POLL_MAX_SEC = 0.5
 
-# In-memory fallback cache
-_memory_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
-_lock = asyncio.Lock()
+# Compare-and-delete so a slow owner never releases a lock taken over by
+# another process after expiry.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
 
-# Track Redis availability to avoid repeated connection attempts
-_redis_available: Optional[bool] = None
+_redis_tier = RedisTier("OCR cache")
+_stats = CacheCounters("memory_hits", "redis_hits", "misses", "sets", "evictions", "singleflight_joins", "lock_waits")
 
+# In-process singleflight: cache key -> task computing it.
+_inflight: Dict[str, "asyncio.Task[Tuple[Dict[str, Any], bool]]"] = {}
 
-async def _get_redis():
-    """Get Redis client, caching availability status."""
-    global _redis_available
-    
-    # If we know Redis is unavailable, don't try again
-    if _redis_available is False:
+
+def _ttl_seconds() -> int:
+    return max(1, int(getattr(settings, "OCR_CACHE_TTL_SECONDS", OCR_CACHE_TTL_SECONDS) or OCR_CACHE_TTL_SECONDS))
+
+
+def _lock_ttl_seconds() -> int:
+    timeout = int(getattr(settings, "OCR_TIMEOUT_SEC", 120) or 120)
+    return max(timeout + 5, int(getattr(settings, "OCR_CACHE_LOCK_TTL_SEC", 150) or 150))
+
+
+# Sizes are the compressed value bytes.
+_memory_cache: "ExpiringLRU[bytes]" = ExpiringLRU(
+    lambda: getattr(settings, "OCR_CACHE_MEMORY_MAX_ENTRIES", 4096),
+    max_bytes=lambda: getattr(settings, "OCR_CACHE_MEMORY_MAX_BYTES", 64 * 1024 * 1024),
+    on_evict=lambda: _stats.bump("evictions"),
+)
+
+
+def build_page_key(provider: str, content: bytes, content_type: Optional[str] = None) -> str:
+    """Cache key for one provider payload (a rendered page or a whole file)."""
+    digest = hashlib.sha256(content or b"").hexdigest()
+    mime = str(content_type or "").strip().lower() or "unknown"
+    return f"{str(provider or '').strip().lower()}:{mime}:{digest}"
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    level = int(getattr(settings, "OCR_CACHE_COMPRESSION_LEVEL", 6) or 6)
+    return _FORMAT_ZLIB_JSON + zlib.compress(raw, max(1, min(9, level)))
+
+
+def _decode(blob: Any) -> Optional[Dict[str, Any]]:
+    if not blob:
         return None
-    
+    if isinstance(blob, str):
+        blob = blob.encode("latin-1")
     try:
-        from app.utils.redis_cache import get_redis
-        client = await get_redis()
-        if client:
-            _redis_available = True
-            return client
+        if blob[:1] == _FORMAT_ZLIB_JSON:
+            payload = json.loads(zlib.decompress(blob[1:]).decode("utf-8"))
         else:
-            _redis_available = False
-            logger.info("OCR cache: Redis not configured, using in-memory cache")
-            return None
-    except Exception as e:
-        _redis_available = False
-        logger.warning(f"OCR cache: Redis unavailable ({e}), using in-memory cache")
+            payload = json.loads(blob)
+    except Exception as exc:
+        logger.warning("OCR cache: undecodable entry dropped (%s)", exc)
         return None
+    return payload if isinstance(payload, dict) else None
 
 
-async def get(document_hash: str) -> Optional[Dict[str, Any]]:
-    """
-    Return cached OCR result if available.
-    
-    Tries Redis first, falls back to in-memory cache.
-    """
-    redis = await _get_redis()
-    
+async def _get_redis():
+    """Get binary Redis client, caching availability status."""
+    return await _redis_tier.client()
+
+
+async def _get_blob(cache_key: str, redis: Any = None) -> Optional[bytes]:
+    blob = _memory_cache.get(cache_key)
+    if blob is not None:
+        _stats.bump("memory_hits")
+        logger.debug(f"OCR cache HIT (memory): {cache_key[-16:]}...")
+        return blob
+
+    redis = redis if redis is not None else await _get_redis()
     if redis:
         try:
-            key = f"{OCR_CACHE_PREFIX}{document_hash}"
-            cached = await redis.get(key)
-            if cached:
-                payload = json.loads(cached)
-                logger.debug(f"OCR cache HIT (Redis): {document_hash[:16]}...")
-                return payload
-            logger.debug(f"OCR cache MISS (Redis): {document_hash[:16]}...")
-            return None
+            blob = await redis.get(f"{OCR_CACHE_PREFIX}{cache_key}")
         except Exception as e:
             logger.warning(f"Redis OCR cache get failed: {e}")
-            # Fall through to memory cache
-    
-    # In-memory fallback
-    now = time.time()
-    async with _lock:
-        entry = _memory_cache.get(document_hash)
-        if not entry:
-            return None
+            blob = None
+        if blob:
+            _stats.bump("redis_hits")
+            _memory_cache.put(cache_key, bytes(blob), _ttl_seconds())
+            logger.debug(f"OCR cache HIT (Redis): {cache_key[-16:]}...")
+            return bytes(blob)
+    return None
+
 
-        ts, payload = entry
-        if now - ts > OCR_CACHE_TTL_SECONDS:
-            _memory_cache.pop(document_hash, None)
-            return None
+async def get(document_hash: str) -> Optional[Dict[str, Any]]:
+    """
+    Return cached OCR result if available.
 
-        logger.debug(f"OCR cache HIT (memory): {document_hash[:16]}...")
-        return payload.copy()
+    Checks the in-memory LRU first, then Redis (promoting hits into memory).
+    """
+    payload = _decode(await _get_blob(document_hash))
+    if payload is None:
+        _stats.bump("misses")
+    return payload
 
 
 async def set(document_hash: str, payload: Dict[str, Any]) -> None:
     """
     Store OCR result in cache.
-    
-    Stores in Redis (persistent) and in-memory (fast fallback).
+
+    Writes the compressed value to Redis (persistent) and the memory LRU.
     """
+    blob = _encode(payload)
+    ttl = _ttl_seconds()
     redis = await _get_redis()
-    
+
     if redis:
         try:
-            key = f"{OCR_CACHE_PREFIX}{document_hash}"
-            # Store as JSON with TTL
-            await redis.setex(
-                key,
-                OCR_CACHE_TTL_SECONDS,
-                json.dumps(payload)
-            )
-            logger.debug(f"OCR cache SET (Redis): {document_hash[:16]}... TTL={OCR_CACHE_TTL_SECONDS}s")
+            await redis.setex(f"{OCR_CACHE_PREFIX}{document_hash}", ttl, blob)
+            logger.debug(f"OCR cache SET (Redis): {document_hash[-16:]}... TTL={ttl}s bytes={len(blob)}")
         except Exception as e:
             logger.warning(f"Redis OCR cache set failed: {e}")
-            # Fall through to memory cache
-    
-    # Also store in memory for fast access (double-write)
-    async with _lock:
-        _memory_cache[document_hash] = (time.time(), payload.copy())
+
+    _memory_cache.put(document_hash, blob, ttl)
+    _stats.bump("sets")
+
+
+async def _acquire_or_wait(redis: Any, cache_key: str) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """Take the cross-process lock, or wait for the holder's value.
+
+    Returns ``(token, None)`` when this caller owns the computation,
+    ``(None, payload)`` when another process produced the value, and
+    ``(None, None)`` when Redis failed or the wait timed out (compute
+    without the lock).
+    """
+    loop = asyncio.get_running_loop()
+    lock_key = f"{OCR_CACHE_LOCK_PREFIX}{cache_key}"
+    token = uuid4().hex
+    lock_ttl = _lock_ttl_seconds()
+    deadline = loop.time() + lock_ttl
+    delay = _LOCK_POLL_INITIAL_SEC
+    waited = False
+
+    while True:
+        try:
+            blob = await redis.get(f"{OCR_CACHE_PREFIX}{cache_key}")
+            if blob:
+                _memory_cache.put(cache_key, bytes(blob), _ttl_seconds())
+                _stats.bump("redis_hits")
+                return None, _decode(blob)
+            if await redis.set(lock_key, token, nx=True, ex=lock_ttl):
+                # The previous holder may have written and released between
+                # the read above and the lock acquisition.
+                blob = await redis.get(f"{OCR_CACHE_PREFIX}{cache_key}")
+                if blob:
+                    await _release_lock(redis, cache_key, token)
+                    _memory_cache.put(cache_key, bytes(blob), _ttl_seconds())
+                    _stats.bump("redis_hits")
+                    return None, _decode(blob)
+                return token, None
+        except Exception as e:
+            logger.warning(f"Redis OCR cache lock failed: {e}")
+            return None, None
+
+        if not waited:
+            waited = True
+            _stats.bump("lock_waits")
+        if loop.time() >= deadline:
+            logger.warning(f"OCR cache lock wait timed out: {cache_key[-16:]}...")
+            return None, None
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _LOCK_POLL_MAX_SEC)
+
+
+async def _release_lock(redis: Any, cache_key: str, token: str) -> None:
+    try:
+        await redis.eval(_RELEASE_LOCK_SCRIPT, 1, f"{OCR_CACHE_LOCK_PREFIX}{cache_key}", token)
+    except Exception as e:
+        logger.warning(f"Redis OCR cache lock release failed: {e}")
+
+
+async def _fill(
+    cache_key: str,
+    compute: Callable[[], Awaitable[Dict[str, Any]]],
+    should_cache: Optional[Callable[[Dict[str, Any]], bool]],
+) -> Tuple[Dict[str, Any], bool]:
+    redis = await _get_redis()
+    token: Optional[str] = None
+    if redis:
+        token, payload = await _acquire_or_wait(redis, cache_key)
+        if payload is not None:
+            return payload, True
+    try:
+        payload = await compute()
+        if should_cache is None or should_cache(payload):
+            await set(cache_key, payload)
+        return payload, False
+    finally:
+        if token:
+            await _release_lock(redis, cache_key, token)
+
+
+async def get_or_compute(
+    cache_key: str,
+    compute: Callable[[], Awaitable[Dict[str, Any]]],
+    *,
+    should_cache: Optional[Callable[[Dict[str, Any]], bool]] = None,
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Return ``(payload, cache_hit)``, running ``compute`` at most once per key.
+
+    Concurrent callers for the same key share one computation; the
+    computation is shielded, so a caller timing out does not cancel it for
+    the others. ``should_cache`` filters which results are stored (e.g. skip
+    provider errors).
+    """
+    payload = await get(cache_key)
+    if payload is not None:
+        return payload, True
+
+    loop = asyncio.get_running_loop()
+    task = _inflight.get(cache_key)
+    if task is not None and task.get_loop() is loop and not task.done():
+        _stats.bump("singleflight_joins")
+        payload, _ = await asyncio.shield(task)
+        return payload, True
+
+    task = loop.create_task(_fill(cache_key, compute, should_cache))
+    _inflight[cache_key] = task
+
+    def _forget(done: "asyncio.Task[Tuple[Dict[str, Any], bool]]", key: str = cache_key) -> None:
+        if _inflight.get(key) is done:
+            _inflight.pop(key, None)
+
+    task.add_done_callback(_forget)
+    return await asyncio.shield(task)
 
 
 async def get_stats() -> Dict[str, Any]:
     """Get cache statistics for monitoring."""
     redis = await _get_redis()
-    
-    stats = {
-        "memory_entries": len(_memory_cache),
-        "redis_available": redis is not None,
-    }
-    
+
+    stats: Dict[str, Any] = _stats.snapshot()
+    stats.update(
+        {
+            "memory_entries": len(_memory_cache),
+            "memory_bytes": _memory_cache.size_bytes,
+            "memory_max_bytes": int(getattr(settings, "OCR_CACHE_MEMORY_MAX_BYTES", 0) or 0),
+            "inflight": len(_inflight),
+            "redis_available": redis is not None,
+        }
+    )
+
     if redis:
         try:
-            # Count OCR keys in Redis
-            keys = await redis.keys(f"{OCR_CACHE_PREFIX}*")
-            stats["redis_entries"] = len(keys)
+            # SCAN, not KEYS: count incrementally without blocking Redis.
+            count = 0
+            async for _ in redis.scan_iter(match=f"{OCR_CACHE_PREFIX}*", count=_STATS_SCAN_COUNT):
+                count += 1
+                if count >= _STATS_SCAN_LIMIT:
+                    stats["redis_entries_truncated"] = True
+                    break
+            stats["redis_entries"] = count
         except Exception:
             stats["redis_entries"] = "unknown"
-    
+
     return stats
 
 
 async def clear_memory_cache() -> int:
     """Clear in-memory cache (useful for testing)."""
-    async with _lock:
-        count = len(_memory_cache)
-        _memory_cache.clear()
-        return count
+    return _memory_cache.clear()
@@ -0,0 +1,171 @@
+"""
+Pre-rendered public results envelopes for ``GET /api/results/{job_id}``.
+
+The results page polls this endpoint, and every call used to load the
+session with its documents and discrepancies, re-normalise the structured
+result and rebuild the envelope. A rendering is now stored once per
+
+    {job_id}:{results_version}
+
+as gzip-compressed JSON with a strong ETag (SHA-256 of the JSON bytes).
+``ValidationSession.results_version`` is bumped on every rewrite of
+``validation_results`` (app/models/result_blob.py), so an entry never goes
+stale and nothing has to invalidate it; old versions simply age out.
+
+- Memory tier: LRU bounded by ``RESULTS_CACHE_MEMORY_MAX_ENTRIES``.
+- Redis tier: the same bytes with ``RESULTS_CACHE_TTL_SECONDS``, shared by
+  every instance; Redis hits are promoted into memory.
+
+Bump ``RESULTS_CACHE_PREFIX`` when the envelope format changes.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.cache._tiers import CacheCounters, ExpiringLRU, RedisTier
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+RESULTS_CACHE_TTL_SECONDS = 24 * 60 * 60  # 1 day (default; see settings)
+RESULTS_CACHE_PREFIX = "results:envelope:v1:"  # Prefix for Redis keys
+
+# Value format marker: 0x01 = 64-char hex digest, then gzip-compressed JSON.
+_FORMAT_GZIP_JSON = b"\x01"
+_DIGEST_LENGTH = 64
+
+_redis_tier = RedisTier("Results cache")
+_stats = CacheCounters("memory_hits", "redis_hits", "misses", "sets", "evictions")
+
+
+def enabled() -> bool:
+    return bool(getattr(settings, "RESULTS_CACHE_ENABLED", True))
+
+
+def _ttl_seconds() -> int:
+    ttl = getattr(settings, "RESULTS_CACHE_TTL_SECONDS", RESULTS_CACHE_TTL_SECONDS)
+    return max(1, int(ttl or RESULTS_CACHE_TTL_SECONDS))
+
+
+@dataclass(frozen=True)
+class RenderedResults:
+    """One serialised envelope: strong ETags plus the gzip-compressed JSON body."""
+
+    digest: str
+    gzip_body: bytes
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+    @property
+    def gzip_etag(self) -> str:
+        # Strong validators differ per representation (RFC 9110 8.8.3).
+        return f'"{self.digest}-gzip"'
+
+    def json_body(self) -> bytes:
+        return gzip.decompress(self.gzip_body)
+
+
+def render(envelope: Dict[str, Any]) -> RenderedResults:
+    """Serialise an envelope exactly as FastAPI's JSONResponse would."""
+    raw = json.dumps(
+        jsonable_encoder(envelope),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    # mtime=0 keeps the bytes identical wherever the envelope is rendered.
+    return RenderedResults(hashlib.sha256(raw).hexdigest(), gzip.compress(raw, compresslevel=6, mtime=0))
+
+
+def cache_key(job_id: Any, version: Any) -> str:
+    return f"{job_id}:{int(version or 0)}"
+
+
+_memory_cache: "ExpiringLRU[RenderedResults]" = ExpiringLRU(
+    lambda: getattr(settings, "RESULTS_CACHE_MEMORY_MAX_ENTRIES", 512),
+    on_evict=lambda: _stats.bump("evictions"),
+)
+
+
+def _encode(rendered: RenderedResults) -> bytes:
+    return _FORMAT_GZIP_JSON + rendered.digest.encode("ascii") + rendered.gzip_body
+
+
+def _decode(blob: Any) -> Optional[RenderedResults]:
+    blob = bytes(blob or b"")
+    if blob[:1] != _FORMAT_GZIP_JSON or len(blob) <= 1 + _DIGEST_LENGTH:
+        if blob:
+            logger.warning("Results cache: undecodable entry ignored")
+        return None
+    return RenderedResults(blob[1 : 1 + _DIGEST_LENGTH].decode("ascii"), blob[1 + _DIGEST_LENGTH :])
+
+
+async def _get_redis():
+    """Get binary Redis client, caching availability status."""
+    return await _redis_tier.client()
+
+
+async def get(job_id: Any, version: Any) -> Optional[RenderedResults]:
+    """Return the rendered envelope of a result version, checking memory then Redis."""
+    if not enabled():
+        return None
+    key = cache_key(job_id, version)
+    rendered = _memory_cache.get(key)
+    if rendered is not None:
+        _stats.bump("memory_hits")
+        return rendered
+
+    redis = await _get_redis()
+    if redis:
+        try:
+            rendered = _decode(await redis.get(f"{RESULTS_CACHE_PREFIX}{key}"))
+        except Exception as e:
+            logger.warning(f"Redis results cache get failed: {e}")
+            rendered = None
+        if rendered is not None:
+            _stats.bump("redis_hits")
+            _memory_cache.put(key, rendered, _ttl_seconds())
+            return rendered
+
+    _stats.bump("misses")
+    return None
+
+
+async def put(job_id: Any, version: Any, rendered: RenderedResults) -> None:
+    """Store a rendered envelope in Redis (when available) and the memory LRU."""
+    if not enabled():
+        return
+    key = cache_key(job_id, version)
+    ttl = _ttl_seconds()
+    redis = await _get_redis()
+    if redis:
+        try:
+            await redis.setex(f"{RESULTS_CACHE_PREFIX}{key}", ttl, _encode(rendered))
+        except Exception as e:
+            logger.warning(f"Redis results cache set failed: {e}")
+    _memory_cache.put(key, rendered, ttl)
+    _stats.bump("sets")
+
+
+async def get_stats() -> Dict[str, Any]:
+    """Get cache statistics for monitoring."""
+    stats: Dict[str, Any] = _stats.snapshot()
+    stats.update(
+        {
+            "enabled": enabled(),
+            "memory_entries": len(_memory_cache),
+            "redis_available": (await _get_redis()) is not None,
+        }
+    )
+    return stats
@@ -0,0 +1,208 @@
+"""
+Shared (Redis) tier for active rulesets, with pub/sub invalidation.
+
+Each API worker keeps its own in-process ruleset and compiled-plan cache
+(``DBRulesAdapter``). This module lets workers share one copy of the
+ruleset payload instead of cold-loading it from Postgres separately, and
+tells every worker when a ruleset changes:
+
+- Payloads are zlib-compressed JSON under
+  ``rules:ruleset:v1:{domain}:{jurisdiction}:{doc}:g{global}.{scope}``.
+  The two generation counters are bumped on invalidation, so a slow loader
+  that read the old ruleset writes under a generation nobody reads any
+  more; nothing has to be deleted and stale writes cannot win.
+- ``invalidate`` bumps the generations and publishes on
+  ``RULESET_INVALIDATION_CHANNEL``; ``listen_for_invalidations`` runs in
+  every worker and drops the matching in-process entries.
+
+Without Redis, ``load`` simply calls the loader and invalidation stays
+process-local.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from uuid import uuid4
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+RULESET_CACHE_PREFIX = "rules:ruleset:v1:"
+RULESET_GENERATION_PREFIX = "rules:gen:v1:"
+RULESET_INVALIDATION_CHANNEL = "rules:invalidate:v1"
+_GLOBAL_SCOPE = "*"
+_FORMAT_ZLIB_JSON = b"\x01"
+_LISTENER_RETRY_MAX_SEC = 30.0
+
+# Identifies this process in invalidation messages so it can skip its own.
+INSTANCE_ID = uuid4().hex
+
+
+def _ttl_seconds() -> int:
+    return max(1, int(getattr(settings, "RULESET_REDIS_CACHE_TTL_SEC", 3600) or 3600))
+
+
+def _enabled() -> bool:
+    return bool(getattr(settings, "RULESET_REDIS_CACHE_ENABLED", True))
+
+
+async def _get_redis():
+    if not _enabled():
+        return None
+    try:
+        from app.utils.redis_cache import get_redis_binary
+
+        return await get_redis_binary()
+    except Exception as exc:  # noqa: BLE001 - Redis is optional for rules
+        logger.debug("Ruleset cache: Redis unavailable (%s)", exc)
+        return None
+
+
+def _scope(domain: Optional[str], jurisdiction: Optional[str]) -> str:
+    return f"{domain or ''}:{jurisdiction or 'global'}"
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    return _FORMAT_ZLIB_JSON + zlib.compress(raw, 6)
+
+
+def _decode(blob: Any) -> Optional[Dict[str, Any]]:
+    if not blob:
+        return None
+    try:
+        if blob[:1] == _FORMAT_ZLIB_JSON:
+            payload = json.loads(zlib.decompress(blob[1:]).decode("utf-8"))
+        else:
+            payload = json.loads(blob)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Ruleset cache: undecodable entry dropped (%s)", exc)
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+async def _generations(redis: Any, scope: str) -> Tuple[int, int]:
+    values = await redis.mget(
+        f"{RULESET_GENERATION_PREFIX}{_GLOBAL_SCOPE}",
+        f"{RULESET_GENERATION_PREFIX}{scope}",
+    )
+    return tuple(int(value or 0) for value in values)  # type: ignore[return-value]
+
+
+def _payload_key(scope: str, document_type: Optional[str], generations: Tuple[int, int]) -> str:
+    return f"{RULESET_CACHE_PREFIX}{scope}:{document_type or '*'}:g{generations[0]}.{generations[1]}"
+
+
+async def load(
+    domain: str,
+    jurisdiction: str,
+    document_type: Optional[str],
+    loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """Return ``(ruleset_payload, shared_hit)``, calling ``loader`` on a miss.
+
+    Loaded payloads are published to Redis for the other workers; ``None``
+    (no active ruleset) is not cached.
+    """
+    redis = await _get_redis()
+    if redis is None:
+        return await loader(), False
+
+    scope = _scope(domain, jurisdiction)
+    try:
+        generations = await _generations(redis, scope)
+        key = _payload_key(scope, document_type, generations)
+        payload = _decode(await redis.get(key))
+        if payload is not None:
+            return payload, True
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Ruleset cache read failed for %s: %s", scope, exc)
+        return await loader(), False
+
+    payload = await loader()
+    if payload is not None:
+        try:
+            await redis.setex(key, _ttl_seconds(), _encode(payload))
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Ruleset cache write failed for %s: %s", scope, exc)
+    return payload, False
+
+
+async def invalidate(domain: Optional[str] = None, jurisdiction: Optional[str] = None) -> bool:
+    """Retire shared entries for a domain/jurisdiction (or all) and notify workers.
+
+    Returns False when Redis is not available (only the local cache was cleared).
+    """
+    redis = await _get_redis()
+    if redis is None:
+        return False
+    scope = _scope(domain, jurisdiction) if domain and jurisdiction else _GLOBAL_SCOPE
+    message = json.dumps(
+        {
+            "domain": domain if scope != _GLOBAL_SCOPE else None,
+            "jurisdiction": jurisdiction if scope != _GLOBAL_SCOPE else None,
+            "origin": INSTANCE_ID,
+        }
+    )
+    try:
+        await redis.incr(f"{RULESET_GENERATION_PREFIX}{scope}")
+        await redis.publish(RULESET_INVALIDATION_CHANNEL, message)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Ruleset cache invalidation failed for %s: %s", scope, exc)
+        return False
+    logger.info("Published ruleset invalidation", extra={"scope": scope})
+    return True
+
+
+def _parse_message(data: Any) -> Optional[Dict[str, Any]]:
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8", errors="replace")
+    try:
+        message = json.loads(data)
+    except (TypeError, ValueError):
+        return None
+    return message if isinstance(message, dict) else None
+
+
+async def listen_for_invalidations(on_invalidate: Callable[[Optional[str], Optional[str]], None]) -> None:
+    """Call ``on_invalidate(domain, jurisdiction)`` for invalidations from other workers.
+
+    Runs until cancelled and reconnects with backoff when Redis drops.
+    ``(None, None)`` means "everything".
+    """
+    delay = 1.0
+    while True:
+        redis = await _get_redis()
+        if redis is None:
+            logger.info("Ruleset invalidation listener disabled (Redis not configured)")
+            return
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(RULESET_INVALIDATION_CHANNEL)
+            delay = 1.0
+            async for raw in pubsub.listen():
+                if not isinstance(raw, dict) or raw.get("type") != "message":
+                    continue
+                message = _parse_message(raw.get("data"))
+                if not message or message.get("origin") == INSTANCE_ID:
+                    continue
+                try:
+                    on_invalidate(message.get("domain"), message.get("jurisdiction"))
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Ruleset invalidation handler failed: %s", exc)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Ruleset invalidation listener lost Redis (%s); retrying in %.0fs", exc, delay)
+        finally:
+            try:
+                await pubsub.close()
+            except Exception:  # noqa: BLE001
+                pass
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, _LISTENER_RETRY_MAX_SEC)
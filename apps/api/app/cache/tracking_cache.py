@@ -0,0 +1,157 @@
+"""
+Carrier / AIS provider response cache for container and vessel tracking.
+
+Every tracking lookup used to hit the upstream provider, and the alert
+sweeper looks up the same references every 15 minutes. Provider JSON is
+now kept per
+
+    {provider}:{reference}
+
+for a provider-specific TTL (``PROVIDER_TTL_SECONDS``, overridable through
+``TRACKING_PROVIDER_CACHE_TTL_SECONDS``), so free-tier quotas (Track & Trace
+100/month, Datalastic 50/day) are not burned on repeat lookups. Concurrent
+lookups of the same key share one upstream call.
+
+- Memory tier: LRU bounded by ``TRACKING_CACHE_MEMORY_MAX_ENTRIES``.
+- Redis tier: the same JSON with the provider TTL, shared by every instance.
+
+Empty responses (``None``) are never cached.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.cache._tiers import CacheCounters, ExpiringLRU, RedisTier
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+TRACKING_CACHE_PREFIX = "tracking:provider:v1:"  # Prefix for Redis keys
+
+# Seconds a provider response stays fresh. AIS positions move, carrier
+# milestones change a few times a day, and Track & Trace is quota-bound.
+PROVIDER_TTL_SECONDS: Dict[str, int] = {
+    "tracktrace": 6 * 60 * 60,
+    "searates": 30 * 60,
+    "portcast": 30 * 60,
+    "datalastic": 15 * 60,
+    "marinetraffic": 15 * 60,
+}
+DEFAULT_TTL_SECONDS = 15 * 60
+
+_redis_tier = RedisTier("Tracking cache")
+_stats = CacheCounters("memory_hits", "redis_hits", "misses", "shared", "sets")
+
+# In-flight upstream calls keyed by cache key (single-flight).
+_inflight: Dict[str, "asyncio.Future[Optional[Dict[str, Any]]]"] = {}
+
+
+def ttl_for(provider: str) -> int:
+    overrides = getattr(settings, "TRACKING_PROVIDER_CACHE_TTL_SECONDS", None) or {}
+    ttl = overrides.get(provider, PROVIDER_TTL_SECONDS.get(provider, DEFAULT_TTL_SECONDS))
+    return max(0, int(ttl or 0))
+
+
+def cache_key(provider: str, reference: str) -> str:
+    return f"{provider}:{reference.strip().upper()}"
+
+
+_memory_cache: "ExpiringLRU[Dict[str, Any]]" = ExpiringLRU(
+    lambda: getattr(settings, "TRACKING_CACHE_MEMORY_MAX_ENTRIES", 2048)
+)
+
+
+async def _get_redis():
+    """Get binary Redis client, caching availability status."""
+    return await _redis_tier.client()
+
+
+async def _lookup(key: str, ttl: int) -> Optional[Dict[str, Any]]:
+    value = _memory_cache.get(key)
+    if value is not None:
+        _stats.bump("memory_hits")
+        return value
+
+    redis = await _get_redis()
+    if redis:
+        try:
+            cached = await redis.get(f"{TRACKING_CACHE_PREFIX}{key}")
+            value = json.loads(cached) if cached else None
+        except Exception as e:
+            logger.warning(f"Redis tracking cache get failed: {e}")
+            value = None
+        if isinstance(value, dict):
+            _stats.bump("redis_hits")
+            _memory_cache.put(key, value, ttl)
+            return value
+    return None
+
+
+async def _store(key: str, value: Dict[str, Any], ttl: int) -> None:
+    redis = await _get_redis()
+    if redis:
+        try:
+            await redis.setex(f"{TRACKING_CACHE_PREFIX}{key}", ttl, json.dumps(value, default=str).encode("utf-8"))
+        except Exception as e:
+            logger.warning(f"Redis tracking cache set failed: {e}")
+    _memory_cache.put(key, value, ttl)
+    _stats.bump("sets")
+
+
+async def fetch(
+    provider: str,
+    reference: str,
+    loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]],
+) -> Optional[Dict[str, Any]]:
+    """Return the cached response for ``reference`` or load it from the provider once."""
+    ttl = ttl_for(provider)
+    if not ttl:
+        return await loader()
+    key = cache_key(provider, reference)
+
+    cached = await _lookup(key, ttl)
+    if cached is not None:
+        return cached
+
+    pending = _inflight.get(key)
+    if pending is not None and not pending.done():
+        _stats.bump("shared")
+        return await asyncio.shield(pending)
+
+    _stats.bump("misses")
+    future: "asyncio.Future[Optional[Dict[str, Any]]]" = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = await loader()
+        if isinstance(value, dict) and value:
+            await _store(key, value, ttl)
+        future.set_result(value)
+        return value
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        # Waiters re-raise it; mark it retrieved so an unshared failure is not logged twice.
+        future.exception()
+        raise
+    finally:
+        if _inflight.get(key) is future:
+            _inflight.pop(key, None)
+
+
+async def get_stats() -> Dict[str, Any]:
+    """Get cache statistics for monitoring."""
+    stats: Dict[str, Any] = _stats.snapshot()
+    stats.update(
+        {
+            "memory_entries": len(_memory_cache),
+            "inflight": len(_inflight),
+            "redis_available": (await _get_redis()) is not None,
+        }
+    )
+    return stats
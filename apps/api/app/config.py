@@ -60,7 +60,13 @@ class Settings(BaseSettings):
     OCR_MIN_TEXT_CHARS_FOR_SKIP: int = 1200  # Hard skip OCR when native text is already rich enough
     OCR_NATIVE_TEXT_SOFT_SKIP_CHARS: int = 250  # For file-native PDFs, skip OCR when native text is already usable support text
     OCR_MAX_CONCURRENCY: int = 4  # Max parallel OCR operations (for 10-12 doc batches)
+    OCR_PROVIDER_MAX_CONCURRENCY: int = 8  # Max in-flight page calls per OCR provider (per-page plans run concurrently)
     EXTRACTION_LLM_CONCURRENCY: int = 4  # Max parallel vision LLM extraction calls
+    CPU_POOL_ENABLED: bool = True  # Run PDF parsing/rasterisation/image normalisation in a process pool off the event loop
+    CPU_POOL_MAX_WORKERS: int = 2  # Worker processes per API process
+    CPU_POOL_MAX_QUEUE: int = 16  # Tasks admitted beyond the worker count before callers wait
+    CPU_POOL_TASK_TIMEOUT_SEC: int = 90  # Per-task timeout for CPU pool work
+    CPU_POOL_START_METHOD: str = "forkserver"  # multiprocessing start method (falls back to spawn)
     OCR_RUNTIME_DIAGNOSTICS_ENABLED: bool = True  # Track bounded OCR runtime diagnostics
     OCR_DIAGNOSTICS_MAX_ERRORS: int = 10  # Max recent OCR errors exposed by diagnostics endpoint
     OCR_HEALTH_ENDPOINT_ENABLED: bool = True  # Enable internal OCR health endpoint
@@ -68,6 +74,12 @@ class Settings(BaseSettings):
     OCR_NORMALIZATION_SHIM_ENABLED: bool = True  # Normalize PDFs/images before OCR provider calls
     OCR_NORMALIZATION_DPI: int = 300  # Deterministic render DPI for OCR normalization
     OCR_NORMALIZATION_IMAGE_FORMAT: str = "TIFF"  # Provider-friendly normalized output for PDFs
+    OCR_CACHE_ENABLED: bool = True  # Cache OCR provider results per page (memory LRU + Redis)
+    OCR_CACHE_TTL_SECONDS: int = 3 * 24 * 60 * 60  # 72 hours
+    OCR_CACHE_MEMORY_MAX_BYTES: int = 64 * 1024 * 1024  # Compressed bytes held by the in-process LRU tier
+    OCR_CACHE_MEMORY_MAX_ENTRIES: int = 4096  # Entry cap for the in-process LRU tier
+    OCR_CACHE_COMPRESSION_LEVEL: int = 6  # zlib level for cached OCR payloads
+    OCR_CACHE_LOCK_TTL_SEC: int = 150  # Singleflight lock lifetime; keep above OCR_TIMEOUT_SEC
     OCR_STAGE_SCORER_ENABLED: bool = True  # Score competing OCR/native stages before selecting text
     OCR_STAGE_WEIGHT_TEXT_LEN: float = 0.30
     OCR_STAGE_WEIGHT_ALNUM_RATIO: float = 0.20
@@ -142,9 +154,44 @@ class Settings(BaseSettings):
     RULHUB_API_URL: str = "https://api.rulhub.com"
     RULHUB_API_KEY: str = ""  # rlh_... (server-side only, from env)
 
+    # Local sanctions screening
+    SANCTIONS_INDEX_DIR: str = "/tmp/lcopilot_sanctions_index"  # Persisted (memory-mapped) list indexes
+
+    # Request audit trail (AuditMiddleware)
+    AUDIT_WRITER_ENABLED: bool = True  # Buffer audit events and bulk-insert them off the request path
+    AUDIT_BUFFER_MAX_EVENTS: int = 10000  # In-memory events before new ones spill straight to disk
+    AUDIT_FLUSH_BATCH_SIZE: int = 500  # Max rows per bulk insert
+    AUDIT_FLUSH_INTERVAL_MS: int = 1000  # Max time an event waits in the buffer
+    AUDIT_SPILL_PATH: str = "/tmp/lcopilot_audit_spill.jsonl"  # Durable overflow / DB-outage log, replayed on recovery
+
+    # Rate limiting (app/utils/rate_limiter.py)
+    RATE_LIMIT_OVERRIDES: Dict[str, str] = {}  # Per-policy "limit/window_seconds", e.g. {"bank:upload": "20/60"}
+    RATE_LIMIT_LOCAL_FASTPATH_FRACTION: float = 0.1  # Share of the last seen Redis headroom admitted locally; 0 disables
+    RATE_LIMIT_LOCAL_SYNC_MS: int = 250  # Max age of that headroom before Redis is consulted again
+    RATE_LIMIT_LOCAL_SHARDS: int = 64  # Lock shards for the in-process windows
+
+    # Document object storage (app/services/object_storage.py)
+    DOCUMENT_STORAGE_BACKEND: str = "s3"  # "s3" (S3 / S3_ENDPOINT_URL) or "local" (filesystem, tests and dev)
+    DOCUMENT_STORAGE_LOCAL_ROOT: str = "/tmp/lcopilot_documents"  # Root directory of the "local" backend
+    DOCUMENT_STORAGE_MAX_CONCURRENCY: int = 8  # Storage calls in flight per process; the rest queue
+    DOCUMENT_STORAGE_MULTIPART_THRESHOLD_MB: int = 8  # Uploads from this size stream as multipart (min 5)
+
+    # Session payload storage (app/models/result_blob.py)
+    RESULT_BLOB_MIN_BYTES: int = 16384  # JSON size at which validation_results / extracted_data move to gzip blobs; 0 keeps them inline
+    RESULTS_CACHE_ENABLED: bool = True  # Serve GET /api/results/{job_id} from pre-rendered envelopes
+    RESULTS_CACHE_TTL_SECONDS: int = 24 * 60 * 60  # Entries are per result version, so this only bounds memory/Redis use
+    RESULTS_CACHE_MEMORY_MAX_ENTRIES: int = 512  # Entry cap for the in-process LRU tier
+    TRACKING_PROVIDER_CACHE_TTL_SECONDS: Dict[str, int] = {}  # Per-provider overrides, e.g. {"datalastic": 600}; 0 disables
+    TRACKING_CACHE_MEMORY_MAX_ENTRIES: int = 2048  # Entry cap for the in-process provider response LRU
+    TRACKING_ALERT_BATCH_SIZE: int = 500  # Alerts loaded per sweeper batch (one commit per batch)
+    TRACKING_ALERT_FETCH_CONCURRENCY: int = 8  # Distinct references tracked in parallel by the sweeper
+    TRACKING_ALERT_SEND_CONCURRENCY: int = 8  # Alert notifications sent in parallel by the sweeper
+
     # Rules System (DB-backed fallback when USE_RULHUB_API=False)
     USE_JSON_RULES: bool = True  # Enable JSON ruleset validation system
     RULESET_CACHE_TTL_MINUTES: int = 10  # Cache TTL for rulesets
+    RULESET_REDIS_CACHE_ENABLED: bool = True  # Share loaded rulesets across workers via Redis + pub/sub invalidation
+    RULESET_REDIS_CACHE_TTL_SEC: int = 3600  # TTL of shared ruleset payloads (invalidation retires them earlier)
     RULES_STORAGE_BUCKET: str = "rules"
 
     # Stripe configuration
@@ -168,6 +215,9 @@ class Settings(BaseSettings):
     # LCopilot routes. EIN is opt-in and never falls back to mocked verification.
     PROOFLINE_ENABLED: bool = True
     PROOFLINE_EIN_ENABLED: bool = False
+    # Calls allowed in flight per Proofline source module (per process) unless
+    # the adapter sets its own max_concurrency.
+    PROOFLINE_ADAPTER_MAX_CONCURRENCY: int = 4
     EIN_API_URL: str = ""
     EIN_API_KEY: str = ""
     EIN_VERIFY_PATH: str = "/v1/presentations/verify"
@@ -218,6 +268,12 @@ class Settings(BaseSettings):
     VALIDATION_AI_PASS_TIMEOUT_SECONDS: int = 60
     # Hard timeout for the Opus veto pass (seconds).
     VALIDATION_VETO_TIMEOUT_SECONDS: int = 90
+    # Start L2 alongside a slow L1 call instead of waiting for it to finish.
+    # L1 counts as slow once it passes this percentile of its recent latencies
+    # (needs VALIDATION_AI_SPECULATIVE_MIN_SAMPLES calls before it kicks in).
+    VALIDATION_AI_SPECULATIVE_ESCALATION_ENABLED: bool = False
+    VALIDATION_AI_SPECULATIVE_PERCENTILE: float = 90.0
+    VALIDATION_AI_SPECULATIVE_MIN_SAMPLES: int = 20
     # Legacy parallel engine — CrossDocValidator in
     # app.services.validation.crossdoc_validator. It runs UCP600 Art 28
     # (insurance), port/amount/goods checks on its own, WITHOUT consulting
@@ -249,6 +305,11 @@ class Settings(BaseSettings):
     AI_MAX_OUTPUT_TOKENS_TRANSLATE: int = 600  # Translation max tokens
     AI_MAX_OUTPUT_TOKENS_CHAT: int = 400  # Chat max tokens
     AI_TIMEOUT_MS: int = 15000  # LLM API timeout
+    LLM_HTTP2_ENABLED: bool = True  # HTTP/2 for pooled LLM clients (needs the h2 package)
+    LLM_HTTP_MAX_CONNECTIONS: int = 20  # Connection cap per pooled LLM client
+    LLM_HTTP_MAX_KEEPALIVE: int = 10  # Idle keep-alive connections kept per pooled LLM client
+    LLM_HTTP_KEEPALIVE_EXPIRY_SEC: float = 60  # Idle connection lifetime
+    LLM_PROVIDER_MAX_CONCURRENCY: int = 8  # Concurrent in-flight requests per LLM provider
     # Extraction-specific routing: keep separate from validation AI router layers.
     EXTRACTION_AI_ENABLED: bool = True
     EXTRACTION_PRIMARY_PROVIDER: str = "openrouter"
@@ -257,6 +318,14 @@ class Settings(BaseSettings):
     EXTRACTION_FALLBACK_MODEL: Optional[str] = None
     EXTRACTION_TIMEOUT_MS: int = 30000
     EXTRACTION_MAX_TOKENS: int = 2000
+    EXTRACTION_CACHE_ENABLED: bool = True  # Reuse AI extraction results for unchanged document text
+    EXTRACTION_CACHE_TTL_SECONDS: int = 14 * 24 * 60 * 60  # 14 days
+    EXTRACTION_CACHE_MEMORY_MAX_ENTRIES: int = 2048  # Entry cap for the in-process LRU tier
+    EXTRACTION_PROMPT_VERSION: str = "1"  # Bump to retire every cached extraction result
+    EXTRACTION_STORE_ENABLED: bool = True  # Reuse per-document extraction by file SHA-256 within a company
+    EXTRACTION_STORE_RETENTION_DAYS: int = 90  # Stored extractions older than this are ignored and pruned
+    EXTRACTION_STORE_MAX_RECORDS_PER_COMPANY: int = 5000  # Least recently used records beyond this are pruned
+    EXTRACTION_PATTERN_STATS_ENABLED: bool = False  # Record calls/hits/time per registered extraction regex (also on with DEBUG)
     AI_SEMANTIC_ENABLED: bool = True  # Enable semantic rule operator
     AI_SEMANTIC_MODEL: str = "gpt-4o-mini"
     AI_SEMANTIC_LOW_COST_MODEL: str = "gpt-4o-mini"
@@ -17,6 +17,13 @@ class AdapterResult:
 
 
 class ProoflineAdapter(Protocol):
+    """Source module contract.
+
+    Adapters may also declare ``input_keys`` (the context keys ``run`` reads,
+    so a check is only re-run when those change) and ``max_concurrency``
+    (calls allowed in flight per process). Both are optional.
+    """
+
     module: str
     version: str
 
@@ -51,6 +51,10 @@ def _finding(policy: Mapping[str, Any], *, observed: str, correction: str) -> di
 class BuyerRequirementsAdapter:
     module = "buyer_requirements"
     version = "proofline-buyer-policy-1"
+    input_keys = (
+        "buyer_requirements", "origin_country", "destination_country", "parties",
+        "product", "commodity", "hs_code", "documents", "ein_verification_results",
+    )
 
     async def run(self, context: Mapping[str, Any]) -> AdapterResult:
         policies = [item for item in (context.get("buyer_requirements") or []) if isinstance(item, Mapping) and _applies(item, context)]
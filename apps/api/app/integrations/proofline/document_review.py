@@ -12,6 +12,7 @@ from .base import AdapterResult
 class DocumentReviewAdapter:
     module = "document_review"
     version = "icc.lcopilot.crossdoc"
+    input_keys = ("lc", "invoice", "bill_of_lading", "documents_presence", "document_records")
 
     async def run(self, context: Mapping[str, Any]) -> AdapterResult:
         documents = [
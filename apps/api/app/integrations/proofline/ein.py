@@ -59,6 +59,7 @@ def _safe_result(row: Mapping[str, Any]) -> dict[str, Any]:
 class EINVerificationAdapter:
     module = "ein"
     version = "ein-api-v1"
+    input_keys = ("ein_presentations", "trade_case_id")
 
     def __init__(self, client: EINClient | None = None) -> None:
         self.client = client or get_ein_client()
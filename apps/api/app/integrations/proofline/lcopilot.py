@@ -44,6 +44,7 @@ def _finding(issue: Mapping[str, Any]) -> dict[str, Any]:
 class LCopilotAdapter:
     module = "lcopilot"
     version = "lcopilot-shared-services-1"
+    input_keys = ("source_lcopilot_result", "source_lcopilot_session_id", "document_records")
 
     async def run(self, context: Mapping[str, Any]) -> AdapterResult:
         source = context.get("source_lcopilot_result")
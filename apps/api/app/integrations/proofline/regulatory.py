@@ -48,11 +48,13 @@ class _ScopeAdapter:
 
 class CBAMAdapter(_ScopeAdapter):
     module = "cbam"
+    input_keys = ("cbam_answers",)
     verdict = staticmethod(cbam_scope_verdict)
 
 
 class EUDRAdapter(_ScopeAdapter):
     module = "eudr"
+    input_keys = ("eudr_answers",)
     verdict = staticmethod(eudr_scope_verdict)
 
 
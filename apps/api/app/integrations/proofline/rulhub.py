@@ -16,6 +16,11 @@ from .base import AdapterResult
 class RulHubRequirementsAdapter:
     module = "rulhub"
     version = "rulhub-api-v1"
+    input_keys = (
+        "product", "commodity", "origin_country", "destination_country", "payment_arrangement",
+        "transport_mode", "transaction_type", "shipment_date", "documents",
+        "buyer_requirements_present", "cbam_requested", "eudr_requested",
+    )
 
     def __init__(self, client: RulHubClient | None = None, *, retry_delay: float = 0.2) -> None:
         self.client = client or get_rulhub_client()
@@ -12,6 +12,7 @@ from .base import AdapterResult
 class SanctionsAdapter:
     module = "sanctions"
     version = "rulhub-sanctions-1"
+    input_keys = ("parties",)
 
     async def run(self, context: Mapping[str, Any]) -> AdapterResult:
         findings: list[dict[str, Any]] = []
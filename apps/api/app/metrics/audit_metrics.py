@@ -0,0 +1,45 @@
+"""
+Prometheus metrics for the buffered audit log writer.
+"""
+
+try:
+    from prometheus_client import Counter, Histogram, Gauge
+except ImportError:  # pragma: no cover
+    class _MockMetric:
+        def __init__(self, *args, **kwargs):
+            pass
+        def labels(self, **kwargs):
+            return self
+        def inc(self, value=1):
+            pass
+        def dec(self, value=1):
+            pass
+        def observe(self, value):
+            pass
+        def set(self, value):
+            pass
+
+    Counter = Histogram = Gauge = _MockMetric
+
+
+audit_buffer_depth = Gauge(
+    "audit_buffer_depth",
+    "Audit events waiting in the in-process buffer",
+)
+
+audit_events_total = Counter(
+    "audit_events_total",
+    "Audit event outcomes (written, spilled, replayed, quarantined, lost)",
+    ["outcome"],
+)
+
+audit_flush_seconds = Histogram(
+    "audit_flush_seconds",
+    "Wall time of one audit bulk insert",
+)
+
+audit_flush_batch_size = Histogram(
+    "audit_flush_batch_size",
+    "Audit rows per bulk insert",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500),
+)
@@ -0,0 +1,53 @@
+"""
+Prometheus metrics for the CPU-bound process pool.
+"""
+
+try:
+    from prometheus_client import Counter, Histogram, Gauge
+except ImportError:  # pragma: no cover
+    class _MockMetric:
+        def __init__(self, *args, **kwargs):
+            pass
+        def labels(self, **kwargs):
+            return self
+        def inc(self, value=1):
+            pass
+        def dec(self, value=1):
+            pass
+        def observe(self, value):
+            pass
+        def set(self, value):
+            pass
+
+    Counter = Histogram = Gauge = _MockMetric
+
+
+cpu_pool_waiting = Gauge(
+    "cpu_pool_waiting_tasks",
+    "Tasks waiting for admission to the CPU pool (queue depth beyond the size limit)",
+    ["task"],
+)
+
+cpu_pool_inflight = Gauge(
+    "cpu_pool_inflight_tasks",
+    "Tasks submitted to the CPU pool and not yet finished",
+    ["task"],
+)
+
+cpu_pool_tasks_total = Counter(
+    "cpu_pool_tasks_total",
+    "CPU pool task outcomes",
+    ["task", "outcome"],
+)
+
+cpu_pool_task_seconds = Histogram(
+    "cpu_pool_task_seconds",
+    "Wall time of CPU pool tasks, including time queued in the executor",
+    ["task"],
+)
+
+cpu_pool_wait_seconds = Histogram(
+    "cpu_pool_wait_seconds",
+    "Time spent waiting for CPU pool admission",
+    ["task"],
+)
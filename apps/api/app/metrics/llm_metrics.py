@@ -0,0 +1,47 @@
+"""
+Prometheus metrics for shared LLM provider clients.
+"""
+
+try:
+    from prometheus_client import Counter, Histogram, Gauge
+except ImportError:  # pragma: no cover
+    class _MockMetric:
+        def __init__(self, *args, **kwargs):
+            pass
+        def labels(self, **kwargs):
+            return self
+        def inc(self, value=1):
+            pass
+        def dec(self, value=1):
+            pass
+        def observe(self, value):
+            pass
+        def set(self, value):
+            pass
+
+    Counter = Histogram = Gauge = _MockMetric
+
+
+llm_inflight_requests = Gauge(
+    "llm_inflight_requests",
+    "LLM requests currently holding a provider concurrency slot",
+    ["provider"],
+)
+
+llm_waiting_requests = Gauge(
+    "llm_waiting_requests",
+    "LLM requests waiting for a provider concurrency slot",
+    ["provider"],
+)
+
+llm_slot_wait_seconds = Histogram(
+    "llm_slot_wait_seconds",
+    "Time spent waiting for a provider concurrency slot",
+    ["provider"],
+)
+
+llm_clients_created_total = Counter(
+    "llm_clients_created_total",
+    "Pooled LLM SDK clients created (should stay flat after warm-up)",
+    ["provider"],
+)
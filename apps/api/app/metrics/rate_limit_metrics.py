@@ -0,0 +1,28 @@
+"""
+Prometheus metrics for the shared rate limiter engine.
+"""
+
+try:
+    from prometheus_client import Counter
+except ImportError:  # pragma: no cover
+    class _MockMetric:
+        def __init__(self, *args, **kwargs):
+            pass
+        def labels(self, **kwargs):
+            return self
+        def inc(self, value=1):
+            pass
+
+    Counter = _MockMetric
+
+
+rate_limit_decisions_total = Counter(
+    "rate_limit_decisions_total",
+    "Rate limit decisions by policy, outcome (allowed, limited) and source (fastpath, redis, local)",
+    ["policy", "outcome", "source"],
+)
+
+rate_limit_redis_errors_total = Counter(
+    "rate_limit_redis_errors_total",
+    "Redis failures that sent the rate limiter to its in-process window",
+)
@@ -2,19 +2,22 @@
 Audit middleware for automatic request correlation and logging.
 """
 
+import logging
+import os
 import time
 import uuid
-from typing import Callable, Optional
+from typing import Any, Callable, Dict, Optional
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response as StarletteResponse
-from sqlalchemy.orm import Session
 
-from ..database import get_db
 from app.models import AuditAction, AuditResult
 from ..services.audit_service import AuditService
-from ..auth import get_current_user_from_token
+from ..services.audit_writer import SUBJECT_KEY, get_audit_writer, writer_enabled
+from ..auth import verify_token
+
+logger = logging.getLogger(__name__)
 
 
 class AuditMiddleware(BaseHTTPMiddleware):
@@ -22,6 +25,8 @@ class AuditMiddleware(BaseHTTPMiddleware):
     Middleware for automatic audit logging and request correlation.
 
     Automatically logs all requests with correlation IDs and basic request info.
+    The response path only builds the audit row; ``AuditLogWriter`` buffers
+    it and bulk-inserts it off the request.
     """
 
     def __init__(self, app, excluded_paths: Optional[list] = None):
@@ -61,7 +66,7 @@ class AuditMiddleware(BaseHTTPMiddleware):
         # Add correlation ID to response headers
         response.headers["X-Correlation-ID"] = correlation_id
 
-        # Log the request asynchronously (in background)
+        # Hand the audit event to the buffered writer
         await self.log_request(
             request=request,
             response=response,
@@ -101,79 +106,95 @@ class AuditMiddleware(BaseHTTPMiddleware):
         user_agent: Optional[str],
         duration_ms: int
     ):
-        """Log the request to audit trail."""
+        """Queue the request's audit event; the DB write happens off-request."""
         try:
-            # Get database session
-            db: Session = next(get_db())
-
-            # Initialize audit service
-            audit_service = AuditService(db)
-
-            # Try to get current user from Authorization header
-            user = None
-            auth_header = request.headers.get("Authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                try:
-                    token = auth_header[7:]  # Remove "Bearer " prefix
-                    user = await get_current_user_from_token(token, db)
-                except Exception:
-                    # Token might be invalid, that's okay
-                    pass
-
-            # Determine action based on endpoint and method
-            action = self.determine_action(request)
-
-            # Determine result based on status code
-            result = self.determine_result(response.status_code)
-
-            # Extract resource information from URL
-            resource_type, resource_id, lc_number = self.extract_resource_info(request)
-
-            # Prepare request data (sanitized)
-            # Filter sensitive headers before logging
-            sanitized_headers = self._sanitize_headers(dict(request.headers))
-            
-            request_data = {
-                "path": str(request.url.path),
-                "query_params": dict(request.query_params),
-                "headers": sanitized_headers
-            }
-
-            # Get session ID from cookies or headers
-            session_id = request.cookies.get("session_id") or request.headers.get("X-Session-ID")
-
-            # Log the audit event
-            audit_service.log_action(
-                action=action,
-                user=user,
+            event = self.build_audit_event(
+                request=request,
+                response=response,
                 correlation_id=correlation_id,
-                session_id=session_id,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                lc_number=lc_number,
-                result=result,
-                ip_address=client_ip,
+                client_ip=client_ip,
                 user_agent=user_agent,
-                endpoint=str(request.url.path),
-                http_method=request.method,
-                status_code=response.status_code,
-                duration_ms=duration_ms,
-                request_data=request_data,
-                metadata={
-                    "query_params": dict(request.query_params),
-                    "path_params": getattr(request, 'path_params', {}),
-                    "content_type": request.headers.get("content-type"),
-                    "content_length": request.headers.get("content-length"),
-                    "referer": request.headers.get("referer"),
-                    "response_size": len(response.body) if hasattr(response, 'body') else None
-                }
+                duration_ms=duration_ms
             )
-
-            db.close()
+            writer = get_audit_writer()
+            writer.submit(event)
+            if writer_enabled() and not os.environ.get("AWS_LAMBDA_FUNCTION_NAME"):
+                writer.ensure_started()
+            else:
+                # No long-lived loop to flush from later (or buffering disabled).
+                await writer.drain()
 
         except Exception as e:
             # Don't let audit logging break the request
-            print(f"Audit logging error: {e}")
+            logger.warning("Audit logging error: %s", e)
+
+    def build_audit_event(
+        self,
+        request: Request,
+        response: Response,
+        correlation_id: str,
+        client_ip: str,
+        user_agent: Optional[str],
+        duration_ms: int
+    ) -> Dict[str, Any]:
+        """Build ``AuditLog`` column values for a request without DB access."""
+        # Token subject only; the writer resolves it to a user per batch
+        subject = None
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            payload = verify_token(auth_header[7:])  # Remove "Bearer " prefix
+            if payload:
+                subject = payload.get("sub")
+
+        # Determine action based on endpoint and method
+        action = self.determine_action(request)
+
+        # Determine result based on status code
+        result = self.determine_result(response.status_code)
+
+        # Extract resource information from URL
+        resource_type, resource_id, lc_number = self.extract_resource_info(request)
+
+        # Prepare request data (sanitized)
+        # Filter sensitive headers before logging
+        sanitized_headers = self._sanitize_headers(dict(request.headers))
+
+        request_data = {
+            "path": str(request.url.path),
+            "query_params": dict(request.query_params),
+            "headers": sanitized_headers
+        }
+
+        # Get session ID from cookies or headers
+        session_id = request.cookies.get("session_id") or request.headers.get("X-Session-ID")
+
+        event = AuditService.audit_log_values(
+            action=action,
+            correlation_id=correlation_id,
+            session_id=session_id,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            lc_number=lc_number,
+            result=result,
+            ip_address=client_ip,
+            user_agent=user_agent,
+            endpoint=str(request.url.path),
+            http_method=request.method,
+            status_code=response.status_code,
+            duration_ms=duration_ms,
+            request_data=request_data,
+            metadata={
+                "query_params": dict(request.query_params),
+                "path_params": dict(getattr(request, 'path_params', {}) or {}),
+                "content_type": request.headers.get("content-type"),
+                "content_length": request.headers.get("content-length"),
+                "referer": request.headers.get("referer"),
+                "response_size": len(response.body) if hasattr(response, 'body') else None
+            }
+        )
+        event["id"] = uuid.uuid4()
+        event[SUBJECT_KEY] = subject
+        return event
 
     def determine_action(self, request: Request) -> str:
         """Determine audit action based on request."""
@@ -3,39 +3,8 @@
 from functools import wraps
 from typing import Callable
 from fastapi import HTTPException, status
-from collections import defaultdict, deque
-import time
-import asyncio
-from redis.exceptions import RedisError
 
-from app.config import settings
-from app.utils.redis_cache import get_redis
-
-
-# In-memory rate limiters for bank operations
-_bank_rate_limiters = {
-    "upload": defaultdict(lambda: deque()),  # File uploads: 10 per minute
-    "export": defaultdict(lambda: deque()),  # Exports: 20 per minute
-    "api": defaultdict(lambda: deque()),     # General API: 60 per minute
-}
-
-_rate_limit_locks: dict[tuple[str, str], asyncio.Lock] = {}
-
-
-async def _check_rate_limit(limiter_key: str, user_id: str, limit: int, window_seconds: int) -> bool:
-    """Check if user is within rate limit."""
-    bucket = _bank_rate_limiters[limiter_key][user_id]
-    now = time.monotonic()
-    
-    # Remove old entries outside window
-    while bucket and (now - bucket[0]) > window_seconds:
-        bucket.popleft()
-    
-    if len(bucket) >= limit:
-        return False
-    
-    bucket.append(now)
-    return True
+from app.utils.rate_limiter import get_rate_limiter, rate_limit_policy
 
 
 def bank_rate_limit(
@@ -45,13 +14,19 @@ def bank_rate_limit(
     error_message: str = "Rate limit exceeded. Please try again later."
 ):
     """Decorator for bank endpoint rate limiting.
-    
+
+    Hits are counted per user in the shared ``bank:<limiter_type>`` policy
+    (see :mod:`app.utils.rate_limiter`), so ``RATE_LIMIT_OVERRIDES`` can
+    retune a limiter type for every endpoint that uses it.
+
     Args:
         limiter_type: Type of limiter ("upload", "export", "api")
         limit: Maximum requests per window
         window_seconds: Time window in seconds
         error_message: Custom error message
     """
+    policy = rate_limit_policy(f"bank:{limiter_type}", limit, window_seconds)
+
     def decorator(func: Callable):
         @wraps(func)
         async def wrapper(*args, **kwargs):
@@ -61,66 +36,23 @@ def bank_rate_limit(
                 if hasattr(arg, 'id') and hasattr(arg, 'role'):
                     current_user = arg
                     break
-            
+
             if not current_user:
                 current_user = kwargs.get('current_user')
-            
+
             if not current_user:
                 # If no user found, skip rate limiting (shouldn't happen with auth)
                 return await func(*args, **kwargs)
-            
-            user_id = str(current_user.id)
-
-            redis_client = None
-            try:
-                redis_client = await get_redis()
-            except RuntimeError:
-                if not settings.USE_STUBS:
-                    raise
-                redis_client = None
-            except RedisError:
-                if not settings.USE_STUBS:
-                    raise
-                redis_client = None
-
-            if redis_client:
-                redis_key = f"rate:bank:{limiter_type}:{user_id}"
-                try:
-                    count = await redis_client.incr(redis_key)
-                    ttl = await redis_client.ttl(redis_key)
-                    if count == 1 or ttl is None or ttl < 0:
-                        await redis_client.expire(redis_key, window_seconds)
-                        ttl = window_seconds
-                except RedisError:
-                    redis_client = None
-                else:
-                    if ttl is None or ttl < 0:
-                        ttl = window_seconds
-                    if count > limit:
-                        retry_after = max(int(ttl), 1)
-                        raise HTTPException(
-                            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                            detail=error_message,
-                            headers={"Retry-After": str(retry_after)},
-                        )
-                    return await func(*args, **kwargs)
 
-            # Fallback to in-memory limiter when Redis is unavailable
-            lock_key = (limiter_type, user_id)
-            lock = _rate_limit_locks.setdefault(lock_key, asyncio.Lock())
-            async with lock:
-                allowed = await _check_rate_limit(limiter_type, user_id, limit, window_seconds)
-
-            if not allowed:
-                retry_after = window_seconds
+            decision = await get_rate_limiter().hit(policy, str(current_user.id))
+            if not decision.allowed:
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                     detail=error_message,
-                    headers={"Retry-After": str(retry_after)},
+                    headers={"Retry-After": str(decision.retry_after)},
                 )
 
             return await func(*args, **kwargs)
-        
+
         return wrapper
     return decorator
-
@@ -1,25 +1,24 @@
-"""Lightweight in-memory rate limiting middleware for FastAPI."""
+"""Baseline request rate limiting middleware for FastAPI."""
 
 from __future__ import annotations
 
-import asyncio
-import time
-from collections import defaultdict, deque
-from typing import Deque, Dict, Iterable, Optional, Tuple
+from typing import Iterable, Optional, Tuple
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette import status
 
+from app.utils.rate_limiter import RateLimitPolicy, get_rate_limiter, rate_limit_policy
+
 
 class RateLimiterMiddleware(BaseHTTPMiddleware):
-    """Simple IP-based rate limiter to provide baseline abuse protection.
+    """Tenant/user/IP sliding-window limiter for baseline abuse protection.
 
-    The middleware uses an in-memory sliding window counter and is designed to
-    offer protection in single-instance deployments (e.g. stub/dev environments
-    or low-volume production tiers). For horizontally scaled environments,
-    replace this with a Redis-backed shared limiter.
+    Windows are shared across instances through the Redis-backed engine in
+    :mod:`app.utils.rate_limiter` and fall back to per-process windows when
+    Redis is unavailable. The limits are the ``api:authenticated`` and
+    ``api:anonymous`` policies, so ``RATE_LIMIT_OVERRIDES`` can retune them.
     """
 
     def __init__(
@@ -35,10 +34,12 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
         super().__init__(app)
         self.window_seconds = max(1, window_seconds)
         self.exempt_paths = tuple(exempt_paths or ())
-        self._lock = asyncio.Lock()
-        self._requests: Dict[str, Deque[float]] = defaultdict(deque)
-        self.unauthenticated_limit = max(1, unauthenticated_limit)
-        self.authenticated_limit = max(1, authenticated_limit or limit)
+        self.authenticated_policy = rate_limit_policy(
+            "api:authenticated", max(1, authenticated_limit or limit), self.window_seconds
+        )
+        self.unauthenticated_policy = rate_limit_policy(
+            "api:anonymous", max(1, unauthenticated_limit), self.window_seconds
+        )
 
     async def dispatch(self, request: Request, call_next):
         path = request.url.path
@@ -46,41 +47,30 @@ class RateLimiterMiddleware(BaseHTTPMiddleware):
             return await call_next(request)
 
         client_host = getattr(request.client, "host", "anonymous")
-        bucket_key, limit = self._resolve_bucket(request, client_host)
-        now = time.monotonic()
-
-        async with self._lock:
-            bucket = self._requests[bucket_key]
-            # Drop timestamps outside of the sliding window
-            while bucket and (now - bucket[0]) > self.window_seconds:
-                bucket.popleft()
-
-            if len(bucket) >= limit:
-                retry_after = max(1, int(self.window_seconds - (now - bucket[0])))
-                return JSONResponse(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={"detail": "Too many requests. Please try again later."},
-                    headers={"Retry-After": str(retry_after)},
-                )
-
-            bucket.append(now)
+        bucket_key, policy = self._resolve_bucket(request, client_host)
+        decision = await get_rate_limiter().hit(policy, bucket_key)
+        if not decision.allowed:
+            return JSONResponse(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                content={"detail": "Too many requests. Please try again later."},
+                headers={"Retry-After": str(decision.retry_after)},
+            )
 
         return await call_next(request)
 
     def _is_exempt_path(self, path: str) -> bool:
         return any(path.startswith(prefix) for prefix in self.exempt_paths)
 
-    def _resolve_bucket(self, request: Request, client_host: str) -> Tuple[str, int]:
+    def _resolve_bucket(self, request: Request, client_host: str) -> Tuple[str, RateLimitPolicy]:
         tenant_ids = getattr(request.state, "tenant_ids", None)
         bank_id = getattr(request.state, "bank_id", None)
         if tenant_ids:
-            return f"tenant:{tenant_ids[0]}", self.authenticated_limit
+            return f"tenant:{tenant_ids[0]}", self.authenticated_policy
         if bank_id:
-            return f"tenant:{bank_id}", self.authenticated_limit
+            return f"tenant:{bank_id}", self.authenticated_policy
 
         auth_header = request.headers.get("Authorization")
         if auth_header:
-            return f"user:{client_host}", self.authenticated_limit
-
-        return f"ip:{client_host}", self.unauthenticated_limit
+            return f"user:{client_host}", self.authenticated_policy
 
+        return f"ip:{client_host}", self.unauthenticated_policy
@@ -5,13 +5,16 @@ SQLAlchemy models for LCopilot database schema.
 import uuid
 from datetime import datetime, timezone
 from enum import Enum
-from sqlalchemy import Column, String, Integer, DateTime, Date, Boolean, ForeignKey, Text, JSON, Float, CheckConstraint
+from sqlalchemy import Column, String, Integer, DateTime, Date, Boolean, ForeignKey, Text, JSON, Float, CheckConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from .database import Base
 
+# Blob-offloaded session payloads (importing registers the offload hook)
+from .models.result_blob import ResultBlob, indexed_field, result_payload_property
+
 # Import version models
 from .models.lc_versions import LCVersion, LCVersionStatus
 
@@ -65,7 +68,7 @@ from .models.saved_view import SavedView
 from .models.api_tokens_webhooks import APIToken, WebhookSubscription, WebhookDelivery
 
 # Import duplicate detection models
-from .models.duplicate_detection import LCFingerprint, LCSimilarity, LCMergeHistory
+from .models.duplicate_detection import LCFingerprint, LCFingerprintBand, LCSimilarity, LCMergeHistory
 
 # Import bank org models
 from .models.bank_orgs import BankOrg, UserOrgAccess, OrgKind, OrgAccessRole
@@ -392,15 +395,43 @@ class ValidationSession(Base):
     processing_started_at = Column(DateTime(timezone=True), nullable=True)
     processing_completed_at = Column(DateTime(timezone=True), nullable=True)
     
-    # Extracted data (JSON fields)
-    extracted_data = Column(JSON, nullable=True)
-    validation_results = Column(JSON, nullable=True)
+    # Extracted data (JSON fields). Payloads of RESULT_BLOB_MIN_BYTES or more
+    # move to result_blobs at flush and the column keeps a pointer plus the
+    # fields bank queues filter on (app/models/result_blob.py). Read and
+    # assign the full payloads through extracted_data / validation_results;
+    # in SQL those names still refer to the columns.
+    stored_extracted_data = Column("extracted_data", JSON, nullable=True)
+    stored_validation_results = Column("validation_results", JSON, nullable=True)
+    extracted_data = result_payload_property("stored_extracted_data")
+    validation_results = result_payload_property("stored_validation_results")
+    # Bumped on every rewrite of validation_results; keys the cached public
+    # results envelope (app/cache/results_cache.py).
+    results_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Job list projection (2026-10). Derived from the JSON fields above by
+    # app/models/job_summary.py whenever they are written, so job lists
+    # never load the blobs. NULL summary_updated_at = not summarised yet.
+    summary_lc_number = Column(String(128), nullable=True)
+    summary_supplier_name = Column(String(255), nullable=True)
+    summary_invoice_amount = Column(String(64), nullable=True)
+    summary_invoice_currency = Column(String(16), nullable=True)
+    summary_document_count = Column(Integer, nullable=True)
+    summary_discrepancy_count = Column(Integer, nullable=True)
+    summary_document_status = Column(JSON, nullable=True)
+    summary_top_issue = Column(JSON, nullable=True)
+    summary_verdict = Column(String(32), nullable=True)
+    summary_updated_at = Column(DateTime(timezone=True), nullable=True)
     
     # Audit trail
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     deleted_at = Column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        # Keyset pagination of a user's jobs, newest first.
+        Index("ix_validation_sessions_user_created_id", "user_id", "created_at", "id"),
+    )
+
     # Relationships
     user = relationship(
         "User",
@@ -426,6 +457,11 @@ class ValidationSession(Base):
     lc_version = relationship("LCVersion", back_populates="validation_session", uselist=False)
     usage_records = relationship("UsageRecord", back_populates="session")
 
+    @property
+    def bank_metadata(self) -> dict:
+        """``extracted_data["bank_metadata"]`` without loading an offloaded blob."""
+        return indexed_field(self.stored_extracted_data, "bank_metadata") or {}
+
 
 class Document(Base):
     """Represents a single user-uploaded file and its metadata."""
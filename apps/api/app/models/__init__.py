@@ -146,6 +146,18 @@ from .proofline import (
     TradeCaseStatus,
 )
 
+# Content-hash extraction reuse across jobs
+from .extraction_store import DocumentExtractionRecord
+
+# Daily analytics rollups (importing registers the refresh hooks)
+from .analytics_rollup import AnalyticsDailyRollup
+
+# Job list summary columns (importing registers the summary hooks)
+from . import job_summary as _job_summary  # noqa: F401
+
+# Blob storage for large session payloads (the legacy module registers the hook)
+from .result_blob import ResultBlob
+
 __all__ = [
     "User",
     "UserRole",
@@ -239,4 +251,10 @@ __all__ = [
     "TradeCaseOutcome",
     "TradeCaseParty",
     "TradeCaseStatus",
+    # Extraction store
+    "DocumentExtractionRecord",
+    # Analytics rollups
+    "AnalyticsDailyRollup",
+    # Result blobs
+    "ResultBlob",
 ]
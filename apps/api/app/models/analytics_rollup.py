@@ -0,0 +1,256 @@
+"""Daily analytics rollups of validation sessions.
+
+One row per (day, user, company, status) holds the session count, the
+number of sessions with both processing timestamps, the sum of their
+processing seconds and the discrepancy count. Dashboards read these rows
+instead of looping over days against ``validation_sessions``.
+
+A bucket is always recomputed from the source rows, never incremented, so
+status transitions and retries cannot drift it. ``register_rollup_hooks``
+(run at import) records which sessions a transaction touched and recomputes
+their (day, user) buckets in a separate transaction after commit.
+``backfill_rollups`` rebuilds a day range in one statement.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import date, datetime
+from typing import Any, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    and_,
+    case,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from .base import Base
+
+logger = logging.getLogger(__name__)
+
+_PENDING_SESSION_IDS = "analytics_rollup_session_ids"
+_PENDING_BUCKETS = "analytics_rollup_buckets"
+_TRACKED_SESSION_FIELDS = ("status", "processing_started_at", "processing_completed_at", "company_id")
+
+Bucket = Tuple[date, Any]  # (day, user_id)
+
+
+class AnalyticsDailyRollup(Base):
+    """Per-day session counts, processing time and discrepancies."""
+
+    __tablename__ = "analytics_daily_rollups"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    day = Column(Date, nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    company_id = Column(UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=True)
+    status = Column(String(50), nullable=False)
+    jobs = Column(Integer, nullable=False, default=0)
+    processing_jobs = Column(Integer, nullable=False, default=0)
+    processing_seconds = Column(Float, nullable=False, default=0.0)
+    discrepancy_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_analytics_daily_rollups_day", "day"),
+        Index("ix_analytics_daily_rollups_user_day", "user_id", "day"),
+        Index("ix_analytics_daily_rollups_company_day", "company_id", "day"),
+    )
+
+
+def _source_tables():
+    tables = Base.metadata.tables
+    return tables["validation_sessions"], tables["discrepancies"]
+
+
+def _rollup_select(*criteria: Any):
+    """Grouped rollup rows for the sessions matching ``criteria``."""
+    sessions, discrepancies = _source_tables()
+    has_timing = and_(
+        sessions.c.processing_started_at.isnot(None),
+        sessions.c.processing_completed_at.isnot(None),
+    )
+    per_session = (
+        select(
+            func.date(sessions.c.created_at).label("day"),
+            sessions.c.user_id,
+            sessions.c.company_id,
+            sessions.c.status,
+            case((has_timing, 1), else_=0).label("timed"),
+            case(
+                (
+                    has_timing,
+                    func.extract("epoch", sessions.c.processing_completed_at - sessions.c.processing_started_at),
+                ),
+                else_=0,
+            ).label("seconds"),
+            select(func.count(discrepancies.c.id))
+            .where(discrepancies.c.validation_session_id == sessions.c.id)
+            .scalar_subquery()
+            .label("discrepancies"),
+        )
+        .where(*criteria)
+        .subquery()
+    )
+    return select(
+        per_session.c.day,
+        per_session.c.user_id,
+        per_session.c.company_id,
+        per_session.c.status,
+        func.count().label("jobs"),
+        func.coalesce(func.sum(per_session.c.timed), 0).label("processing_jobs"),
+        func.coalesce(func.sum(per_session.c.seconds), 0).label("processing_seconds"),
+        func.coalesce(func.sum(per_session.c.discrepancies), 0).label("discrepancy_count"),
+    ).group_by(per_session.c.day, per_session.c.user_id, per_session.c.company_id, per_session.c.status)
+
+
+def _insert_from(select_stmt):
+    return insert(AnalyticsDailyRollup.__table__).from_select(
+        ["day", "user_id", "company_id", "status", "jobs", "processing_jobs", "processing_seconds", "discrepancy_count"],
+        select_stmt,
+    )
+
+
+def _bucket_lock_key(bucket: Bucket) -> int:
+    digest = hashlib.blake2b(f"analytics_rollup:{bucket[0]}:{bucket[1]}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def recompute_buckets(conn: Connection, buckets: Iterable[Bucket]) -> int:
+    """Rebuild the rollup rows of each (day, user) bucket from source rows."""
+    sessions, _ = _source_tables()
+    rollups = AnalyticsDailyRollup.__table__
+    count = 0
+    for bucket in sorted(set(buckets), key=lambda item: (item[0], str(item[1]))):
+        day, user_id = bucket
+        if conn.dialect.name == "postgresql":
+            # Serialises concurrent rebuilds of one bucket until commit.
+            conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _bucket_lock_key(bucket)})
+        conn.execute(delete(rollups).where(rollups.c.day == day, rollups.c.user_id == user_id))
+        conn.execute(
+            _insert_from(
+                _rollup_select(func.date(sessions.c.created_at) == day, sessions.c.user_id == user_id)
+            )
+        )
+        count += 1
+    return count
+
+
+def buckets_for_sessions(conn: Connection, session_ids: Iterable[Any]) -> Set[Bucket]:
+    sessions, _ = _source_tables()
+    ids = [session_id for session_id in session_ids if session_id is not None]
+    if not ids:
+        return set()
+    rows = conn.execute(
+        select(func.date(sessions.c.created_at), sessions.c.user_id)
+        .where(sessions.c.id.in_(ids))
+        .distinct()
+    ).all()
+    return {(_as_date(day), user_id) for day, user_id in rows}
+
+
+def backfill_rollups(conn: Connection, start_day: Optional[date] = None, end_day: Optional[date] = None) -> int:
+    """Rebuild every bucket between ``start_day`` and ``end_day`` (inclusive)."""
+    sessions, _ = _source_tables()
+    rollups = AnalyticsDailyRollup.__table__
+    session_day = func.date(sessions.c.created_at)
+    criteria = []
+    rollup_criteria = []
+    if start_day is not None:
+        criteria.append(session_day >= start_day)
+        rollup_criteria.append(rollups.c.day >= start_day)
+    if end_day is not None:
+        criteria.append(session_day <= end_day)
+        rollup_criteria.append(rollups.c.day <= end_day)
+    conn.execute(delete(rollups).where(*rollup_criteria))
+    result = conn.execute(_insert_from(_rollup_select(*criteria)))
+    return int(result.rowcount or 0)
+
+
+def _as_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def _session_changed(obj: Any) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _TRACKED_SESSION_FIELDS)
+
+
+def _after_flush(session: Session, flush_context: Any) -> None:
+    session_ids: Set[Any] = session.info.setdefault(_PENDING_SESSION_IDS, set())
+    buckets: Set[Bucket] = session.info.setdefault(_PENDING_BUCKETS, set())
+    for obj in session.new:
+        table = getattr(obj, "__tablename__", None)
+        if table == "validation_sessions":
+            session_ids.add(obj.id)
+        elif table == "discrepancies":
+            session_ids.add(obj.validation_session_id)
+    for obj in session.dirty:
+        if getattr(obj, "__tablename__", None) == "validation_sessions" and _session_changed(obj):
+            session_ids.add(obj.id)
+    for obj in session.deleted:
+        table = getattr(obj, "__tablename__", None)
+        if table == "validation_sessions":
+            loaded = inspect(obj).dict
+            if loaded.get("created_at") is not None and "user_id" in loaded:
+                buckets.add((_as_date(loaded["created_at"]), loaded["user_id"]))
+        elif table == "discrepancies":
+            session_ids.add(inspect(obj).dict.get("validation_session_id"))
+
+
+def _after_commit(session: Session) -> None:
+    session_ids = session.info.pop(_PENDING_SESSION_IDS, None) or set()
+    buckets = session.info.pop(_PENDING_BUCKETS, None) or set()
+    if not session_ids and not buckets:
+        return
+    bind = session.get_bind()
+    if not isinstance(bind, Engine):
+        return
+    try:
+        with bind.begin() as conn:
+            recompute_buckets(conn, buckets | buckets_for_sessions(conn, session_ids))
+    except Exception as exc:
+        # Rollups are derived data; the backfill script repairs any gap.
+        logger.warning("Analytics rollup refresh failed for %d sessions: %s", len(session_ids), exc)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_SESSION_IDS, None)
+    session.info.pop(_PENDING_BUCKETS, None)
+
+
+def register_rollup_hooks() -> None:
+    """Keep rollups current for every ORM session (idempotent)."""
+    for name, handler in (
+        ("after_flush", _after_flush),
+        ("after_commit", _after_commit),
+        ("after_rollback", _after_rollback),
+    ):
+        if not event.contains(Session, name, handler):
+            event.listen(Session, name, handler)
+
+
+register_rollup_hooks()
@@ -56,6 +56,7 @@ class LCFingerprint(Base):
     # Content fingerprint - hash of normalized LC data
     content_hash = Column(String(64), nullable=False, index=True)  # SHA-256 hash
     fingerprint_data = Column(JSONB, nullable=False)  # Normalized LC data for comparison
+    minhash_signature = Column(JSONB, nullable=True)  # MinHash of fields + goods text (lc_minhash)
     
     # Metadata
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -76,6 +77,12 @@ class LCFingerprint(Base):
         foreign_keys="LCSimilarity.fingerprint_id_2",
         back_populates="fingerprint_2"
     )
+    bands = relationship(
+        "LCFingerprintBand",
+        back_populates="fingerprint",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
     
     __table_args__ = (
         UniqueConstraint('validation_session_id', name='uq_lc_fingerprints_session'),
@@ -85,6 +92,20 @@ class LCFingerprint(Base):
     )
 
 
+class LCFingerprintBand(Base):
+    """LSH band of a fingerprint's MinHash signature (near-duplicate lookup key)"""
+    __tablename__ = "lc_fingerprint_bands"
+
+    fingerprint_id = Column(UUID(as_uuid=True), ForeignKey("lc_fingerprints.id", ondelete="CASCADE"), primary_key=True)
+    band_key = Column(String(40), primary_key=True)  # "<version>:<band>:<hash>"
+
+    fingerprint = relationship("LCFingerprint", back_populates="bands")
+
+    __table_args__ = (
+        Index('idx_lc_fingerprint_bands_key', 'band_key'),
+    )
+
+
 class LCSimilarity(Base):
     """Similarity scores between LC pairs"""
     __tablename__ = "lc_similarities"
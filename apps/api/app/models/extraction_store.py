@@ -0,0 +1,53 @@
+"""Tenant-scoped store of per-document extraction results.
+
+One row per (company, document SHA-256, document type) under a given
+extractor, model and prompt version. It lets a re-uploaded document, even
+under a new filename or in a new job, skip OCR and the vision LLM.
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+JSON_VALUE = JSON().with_variant(JSONB, "postgresql")
+
+
+class DocumentExtractionRecord(Base):
+    """Stored OCR text, artifacts and launch-pipeline result for one document."""
+
+    __tablename__ = "document_extraction_records"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    company_id = Column(
+        UUID(as_uuid=True), ForeignKey("companies.id", ondelete="CASCADE"), nullable=False
+    )
+    content_sha256 = Column(String(64), nullable=False)
+    document_type = Column(String(64), nullable=False)
+    extractor_version = Column(String(32), nullable=False)
+    model = Column(String(128), nullable=False)
+    prompt_version = Column(String(64), nullable=False)
+    payload = Column(JSON_VALUE, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "company_id",
+            "content_sha256",
+            "document_type",
+            "extractor_version",
+            "model",
+            "prompt_version",
+            name="uq_document_extraction_record_key",
+        ),
+        Index("ix_document_extraction_records_company_used", "company_id", "last_used_at"),
+    )
@@ -0,0 +1,293 @@
+"""Job list summary columns on ``validation_sessions``.
+
+``GET /api/jobs`` used to load every session's ``validation_results`` and
+``extracted_data`` blobs and lazily load its documents and discrepancies,
+only to show a handful of fields. Those fields are now stored in the
+``summary_*`` columns:
+
+- ``register_job_summary_hooks`` (run at import) recomputes the blob-derived
+  fields before flush whenever a session is created or either blob is
+  reassigned. That covers finalisation, re-validation, field overrides and
+  review edits without touching each writer.
+- After the flush, document and discrepancy counts switch to the session's
+  rows whenever it has any, matching the old ``len(session.documents) or
+  <count in the result>`` rule. Sessions whose document or discrepancy rows
+  were added or deleted in the flush are recounted too.
+
+Sessions written before the columns existed have ``summary_updated_at``
+NULL and are listed with empty summary fields until
+``scripts/backfill_job_summaries.py`` (a one-off operator step after the
+migration) fills them in with ``refresh_job_summary``.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import case, event, func, inspect, select, update
+from sqlalchemy.orm import Session
+
+from .base import Base
+
+_PENDING_COUNTS = "job_summary_pending_counts"
+_BLOB_FIELDS = ("stored_validation_results", "stored_extracted_data")
+_COUNTED_TABLES = {"documents": "document", "discrepancies": "discrepancy"}
+
+SUMMARY_COLUMNS = (
+    "summary_lc_number",
+    "summary_supplier_name",
+    "summary_invoice_amount",
+    "summary_invoice_currency",
+    "summary_document_count",
+    "summary_discrepancy_count",
+    "summary_document_status",
+    "summary_top_issue",
+    "summary_verdict",
+    "summary_updated_at",
+)
+
+
+def _normalize_party(value: Any) -> Optional[str]:
+    if not value:
+        return None
+    if isinstance(value, dict):
+        for key in ("name", "company", "full_name", "legal_name", "value"):
+            if value.get(key):
+                return str(value[key]).strip()
+        return None
+    return str(value).strip()
+
+
+def extract_supplier(extracted_data: Dict[str, Any]) -> Optional[str]:
+    invoice = extracted_data.get("invoice") or {}
+    bl = extracted_data.get("bill_of_lading") or {}
+    lc = extracted_data.get("lc") or {}
+    return (
+        _normalize_party(invoice.get("consignee"))
+        or _normalize_party(invoice.get("buyer"))
+        or _normalize_party(bl.get("consignee"))
+        or _normalize_party(lc.get("beneficiary"))
+        or _normalize_party(lc.get("applicant"))
+    )
+
+
+def extract_invoice_amount(extracted_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    invoice = extracted_data.get("invoice") or {}
+    amount_field = invoice.get("invoice_amount") or invoice.get("amount")
+    currency = invoice.get("currency") or invoice.get("invoice_currency")
+
+    if isinstance(amount_field, dict):
+        currency = currency or amount_field.get("currency")
+        amount = amount_field.get("value")
+    else:
+        amount = amount_field
+
+    if amount is None:
+        return None, currency
+    return str(amount), currency
+
+
+def summarize_documents(results_payload: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    documents: List[Dict[str, Any]] = []
+    if isinstance(results_payload, dict):
+        if results_payload.get("version") == "structured_result_v1":
+            documents = results_payload.get("documents_structured") or []
+        elif isinstance(results_payload.get("structured_result"), dict) and results_payload["structured_result"].get("version") == "structured_result_v1":
+            documents = results_payload["structured_result"].get("documents_structured") or []
+        else:
+            documents = results_payload.get("documents") or []
+    if not documents:
+        return None
+
+    summary = {"success": 0, "warning": 0, "error": 0}
+    for doc in documents:
+        status = (doc.get("status") or "success").lower()
+        if status not in summary:
+            status = "warning"
+        summary[status] += 1
+    return summary
+
+
+def extract_top_issue(results_payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    option_e_source: Optional[Dict[str, Any]] = None
+    if isinstance(results_payload, dict):
+        if results_payload.get("version") == "structured_result_v1":
+            option_e_source = results_payload
+        elif isinstance(results_payload.get("structured_result"), dict) and results_payload["structured_result"].get("version") == "structured_result_v1":
+            option_e_source = results_payload["structured_result"]
+
+    if option_e_source:
+        issues = option_e_source.get("issues") or []
+        if issues:
+            first = issues[0]
+            docs = first.get("documents") or []
+            return {
+                "title": first.get("title"),
+                "severity": first.get("severity"),
+                "documentName": docs[0] if docs else None,
+                "rule": first.get("rule"),
+            }
+
+    issue_cards = results_payload.get("issue_cards") or []
+    if issue_cards:
+        top_card = issue_cards[0]
+        return {
+            "title": top_card.get("title"),
+            "severity": top_card.get("severity"),
+            "documentName": top_card.get("documentName"),
+            "rule": top_card.get("rule"),
+        }
+
+    discrepancies = results_payload.get("discrepancies") or []
+    if discrepancies:
+        first = discrepancies[0]
+        return {
+            "title": first.get("title") or first.get("rule"),
+            "severity": first.get("severity"),
+            "documentName": (first.get("documents") or [None])[0],
+            "rule": first.get("rule"),
+        }
+
+    return None
+
+
+def _structured_result(results_payload: Dict[str, Any]) -> Dict[str, Any]:
+    nested = results_payload.get("structured_result")
+    return nested if isinstance(nested, dict) else results_payload
+
+
+def _extract_lc_number(extracted_data: Dict[str, Any], results_payload: Dict[str, Any]) -> Optional[str]:
+    if "lc_number" in extracted_data:
+        return extracted_data.get("lc_number")
+    if "lcNumber" in extracted_data:
+        return extracted_data.get("lcNumber")
+    bank_meta = extracted_data.get("bank_metadata") or {}
+    return bank_meta.get("lc_number") or bank_meta.get("lcNumber") or results_payload.get("lc_number")
+
+
+def _extract_verdict(results_payload: Dict[str, Any]) -> Optional[str]:
+    structured = _structured_result(results_payload)
+    for source in (results_payload, structured):
+        bank_verdict = source.get("bank_verdict")
+        if isinstance(bank_verdict, dict) and bank_verdict.get("verdict"):
+            return str(bank_verdict["verdict"]).strip().upper()
+    verdict = (
+        results_payload.get("final_verdict")
+        or results_payload.get("ruleset_verdict")
+        or structured.get("final_verdict")
+    )
+    return str(verdict).strip().upper() if isinstance(verdict, str) and verdict.strip() else None
+
+
+def _clip(value: Any, length: int) -> Optional[str]:
+    return None if value is None else str(value)[:length]
+
+
+def summarize_job(validation_results: Any, extracted_data: Any) -> Dict[str, Any]:
+    """``summary_*`` column values derived from a session's JSON blobs."""
+    results_payload = validation_results if isinstance(validation_results, dict) else {}
+    session_extracted = extracted_data if isinstance(extracted_data, dict) else {}
+    extracted = results_payload.get("extracted_data") or session_extracted
+    supplier_name = extract_supplier(extracted)
+    invoice_amount, invoice_currency = extract_invoice_amount(extracted)
+    structured = _structured_result(results_payload)
+    documents = structured.get("documents_structured") or structured.get("documents") or []
+    return {
+        "summary_lc_number": _clip(_extract_lc_number(session_extracted, results_payload), 128),
+        "summary_supplier_name": _clip(supplier_name, 255),
+        "summary_invoice_amount": _clip(invoice_amount, 64),
+        "summary_invoice_currency": _clip(invoice_currency, 16),
+        "summary_document_count": len(documents) if isinstance(documents, list) else 0,
+        "summary_discrepancy_count": len(results_payload.get("discrepancies") or []),
+        "summary_document_status": summarize_documents(results_payload),
+        "summary_top_issue": extract_top_issue(results_payload),
+        "summary_verdict": _clip(_extract_verdict(results_payload), 32),
+        "summary_updated_at": datetime.now(timezone.utc),
+    }
+
+
+def _count_later(db: Session, obj: Any, attribute: str) -> None:
+    # Objects, not ids: new rows only get their ids during the flush.
+    db.info.setdefault(_PENDING_COUNTS, []).append((obj, attribute))
+
+
+def refresh_job_summary(db: Session, validation_session: Any) -> None:
+    """Recompute one session's summary; counts settle on the next flush."""
+    for key, value in summarize_job(
+        validation_session.validation_results, validation_session.extracted_data
+    ).items():
+        setattr(validation_session, key, value)
+    _count_later(db, validation_session, "id")
+
+
+def recount_job_summaries(conn: Any, session_ids: Iterable[Any]) -> None:
+    """Prefer document/discrepancy row counts over result counts when rows exist."""
+    ids = [session_id for session_id in set(session_ids) if session_id is not None]
+    if not ids:
+        return
+    tables = Base.metadata.tables
+    sessions = tables["validation_sessions"]
+    values = {}
+    for table_name, label in _COUNTED_TABLES.items():
+        rows = tables[table_name]
+        row_count = (
+            select(func.count(rows.c.id))
+            .where(rows.c.validation_session_id == sessions.c.id)
+            .scalar_subquery()
+        )
+        column = sessions.c[f"summary_{label}_count"]
+        values[column.name] = case((row_count > 0, row_count), else_=column)
+    conn.execute(
+        update(sessions)
+        .where(sessions.c.id.in_(ids), sessions.c.summary_updated_at.isnot(None))
+        .values(**values)
+    )
+
+
+def _blob_changed(obj: Any) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _BLOB_FIELDS)
+
+
+def _before_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    for obj in list(session.new) + list(session.dirty):
+        table = getattr(obj, "__tablename__", None)
+        if table == "validation_sessions":
+            if obj in session.new or _blob_changed(obj):
+                refresh_job_summary(session, obj)
+        elif table in _COUNTED_TABLES and obj in session.new:
+            _count_later(session, obj, "validation_session_id")
+    for obj in session.deleted:
+        if getattr(obj, "__tablename__", None) in _COUNTED_TABLES:
+            _count_later(session, obj, "validation_session_id")
+
+
+def _after_flush_postexec(session: Session, flush_context: Any) -> None:
+    pending = session.info.pop(_PENDING_COUNTS, None)
+    if not pending:
+        return
+    session_ids = {inspect(obj).dict.get(attribute) for obj, attribute in pending}
+    session_ids.discard(None)
+    recount_job_summaries(session.connection(), session_ids)
+    for obj in list(session.identity_map.values()):
+        if getattr(obj, "__tablename__", None) == "validation_sessions" and obj.id in session_ids:
+            session.expire(obj, ["summary_document_count", "summary_discrepancy_count"])
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_COUNTS, None)
+
+
+def register_job_summary_hooks() -> None:
+    """Keep summary columns current for every ORM session (idempotent)."""
+    for name, handler in (
+        ("before_flush", _before_flush),
+        ("after_flush_postexec", _after_flush_postexec),
+        ("after_rollback", _after_rollback),
+    ):
+        if not event.contains(Session, name, handler):
+            event.listen(Session, name, handler)
+
+
+register_job_summary_hooks()
@@ -0,0 +1,244 @@
+"""Compressed, content-addressed storage for large session payloads.
+
+``ValidationSession.validation_results`` and ``extracted_data`` hold whole
+structured results, OCR text and debug traces. Keeping them inline bloats
+``validation_sessions`` and rewrites the TOASTed value on every update.
+
+``register_result_blob_hooks`` (run at import) moves a payload whose JSON
+encoding reaches ``RESULT_BLOB_MIN_BYTES`` into ``result_blobs`` before it
+is flushed: gzip-compressed and keyed by the SHA-256 of its canonical JSON,
+so an unchanged re-save or an identical payload on another session stores
+nothing new. The session column keeps a small index document instead::
+
+    {"_blob": {"v": 1, "sha256": "...", "codec": "gzip", "raw_size": 123456},
+     "bank_metadata": {...}, "lc_number": "...",
+     "discrepancies": [{"discrepancy_type": "..."}, ...]}
+
+which carries every field the bank queue filters query with JSONB
+operators, so those queries and their row counts are unchanged.
+
+Callers keep using ``session.validation_results`` / ``extracted_data``:
+``result_payload_property`` returns the full payload, reading and
+decompressing the blob once per instance, while the SQL expression is the
+index column. Code that only needs an indexed key reads it with
+``indexed_field`` (e.g. ``ValidationSession.bank_metadata``) and never
+touches ``result_blobs``. Small payloads stay inline, and rows written before this
+layer existed read as before (``scripts/offload_result_blobs.py`` moves them).
+
+The same hook increments ``results_version`` whenever ``validation_results``
+of an existing session is rewritten, so renderings of a result can be
+cached under (session id, version) and never need invalidating.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String, event, insert, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy.orm.exc import DetachedInstanceError
+from sqlalchemy.sql import func
+
+from .base import Base
+
+BLOB_FORMAT_VERSION = 1
+BLOB_CODEC = "gzip"
+_POINTER_KEY = "_blob"
+_PAYLOAD_CACHE = "_result_payload_cache"
+_OFFLOADED_ATTRIBUTES = {
+    "validation_sessions": ("stored_validation_results", "stored_extracted_data"),
+}
+# Rewrites of this one bump results_version (see the module docstring).
+_VERSIONED_ATTRIBUTE = "stored_validation_results"
+# Top-level keys the bank queues filter and sort on (app/routers/bank.py).
+_INDEXED_KEYS = ("bank_metadata", "lc_number", "lcNumber")
+
+
+class ResultBlob(Base):
+    """One compressed JSON payload, addressed by the SHA-256 of its encoding."""
+
+    __tablename__ = "result_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    codec = Column(String(16), nullable=False, default=BLOB_CODEC)
+    raw_size = Column(Integer, nullable=False)
+    stored_size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+def encode_payload(payload: Any) -> bytes:
+    """Canonical JSON encoding; equal payloads always hash the same."""
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def compress_payload(raw: bytes) -> bytes:
+    # mtime=0 keeps the bytes deterministic for a given payload.
+    return gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+def decode_blob(codec: str, data: bytes) -> Any:
+    if codec != BLOB_CODEC:
+        raise ValueError(f"Unsupported result blob codec: {codec}")
+    return json.loads(gzip.decompress(data))
+
+
+def blob_pointer(stored: Any) -> Optional[Dict[str, Any]]:
+    """The ``_blob`` pointer of an index document, or None for inline values."""
+    if isinstance(stored, dict):
+        pointer = stored.get(_POINTER_KEY)
+        if isinstance(pointer, dict) and pointer.get("sha256"):
+            return pointer
+    return None
+
+
+def indexed_field(stored: Any, key: str) -> Any:
+    """``key`` of a payload read from its stored column, without loading a blob.
+
+    Only valid for the keys copied into the index document.
+    """
+    if key not in _INDEXED_KEYS:
+        raise KeyError(f"{key} is not kept in result blob index documents")
+    return stored.get(key) if isinstance(stored, dict) else None
+
+
+def index_document(payload: Dict[str, Any], pointer: Dict[str, Any]) -> Dict[str, Any]:
+    index: Dict[str, Any] = {_POINTER_KEY: pointer}
+    for key in _INDEXED_KEYS:
+        if key in payload:
+            index[key] = payload[key]
+    discrepancies = payload.get("discrepancies")
+    if isinstance(discrepancies, list):
+        index["discrepancies"] = [
+            {"discrepancy_type": item["discrepancy_type"]}
+            if isinstance(item, dict) and "discrepancy_type" in item
+            else {}
+            for item in discrepancies
+        ]
+    return index
+
+
+def write_result_blob(conn: Any, raw: bytes) -> Dict[str, Any]:
+    """Store ``raw`` (canonical JSON) if it is not stored yet; return its pointer."""
+    sha256 = hashlib.sha256(raw).hexdigest()
+    data = compress_payload(raw)
+    values = {
+        "sha256": sha256,
+        "codec": BLOB_CODEC,
+        "raw_size": len(raw),
+        "stored_size": len(data),
+        "data": data,
+    }
+    table = ResultBlob.__table__
+    if conn.dialect.name == "postgresql":
+        conn.execute(pg_insert(table).values(**values).on_conflict_do_nothing(index_elements=["sha256"]))
+    elif conn.execute(select(table.c.sha256).where(table.c.sha256 == sha256)).first() is None:
+        conn.execute(insert(table).values(**values))
+    return {"v": BLOB_FORMAT_VERSION, "sha256": sha256, "codec": BLOB_CODEC, "raw_size": len(raw)}
+
+
+def read_result_blob(db: Session, pointer: Dict[str, Any]) -> Any:
+    table = ResultBlob.__table__
+    with db.no_autoflush:
+        row = db.execute(
+            select(table.c.codec, table.c.data).where(table.c.sha256 == pointer["sha256"])
+        ).first()
+    if row is None:
+        raise LookupError(f"Result blob {pointer['sha256']} is missing")
+    return decode_blob(row.codec, row.data)
+
+
+def _cache(obj: Any) -> Dict[str, Tuple[str, Any]]:
+    return obj.__dict__.setdefault(_PAYLOAD_CACHE, {})
+
+
+def load_result_payload(obj: Any, stored_attribute: str) -> Any:
+    """The full payload behind ``stored_attribute``, inline or from its blob."""
+    stored = getattr(obj, stored_attribute)
+    pointer = blob_pointer(stored)
+    if pointer is None:
+        return stored
+    cached = _cache(obj).get(stored_attribute)
+    if cached is not None and cached[0] == pointer["sha256"]:
+        return cached[1]
+    db = object_session(obj)
+    if db is None:
+        raise DetachedInstanceError(
+            f"{type(obj).__name__}.{stored_attribute} is stored as a blob and the instance is not bound to a Session"
+        )
+    payload = read_result_blob(db, pointer)
+    _cache(obj)[stored_attribute] = (pointer["sha256"], payload)
+    return payload
+
+
+def result_payload_property(stored_attribute: str) -> hybrid_property:
+    """Full-payload accessor over a blob-offloadable JSON column.
+
+    Assigning always marks the column modified (in-place edits of the
+    returned dict included), so callers need no ``flag_modified``.
+    """
+
+    def fget(self: Any) -> Any:
+        return load_result_payload(self, stored_attribute)
+
+    def fset(self: Any, value: Any) -> None:
+        _cache(self).pop(stored_attribute, None)
+        setattr(self, stored_attribute, value)
+        flag_modified(self, stored_attribute)
+
+    def expr(cls: Any) -> Any:
+        return getattr(cls, stored_attribute)
+
+    return hybrid_property(fget, fset, expr=expr)
+
+
+def offload_result_payload(db: Session, obj: Any, stored_attribute: str, min_bytes: int) -> bool:
+    """Move an inline payload of at least ``min_bytes`` into ``result_blobs``."""
+    payload = getattr(obj, stored_attribute)
+    if not isinstance(payload, dict) or blob_pointer(payload) is not None:
+        return False
+    raw = encode_payload(payload)
+    if len(raw) < min_bytes:
+        return False
+    pointer = write_result_blob(db.connection(), raw)
+    setattr(obj, stored_attribute, index_document(payload, pointer))
+    _cache(obj)[stored_attribute] = (pointer["sha256"], payload)
+    return True
+
+
+def _min_bytes() -> int:
+    from app.config import settings
+
+    return int(getattr(settings, "RESULT_BLOB_MIN_BYTES", 16384) or 0)
+
+
+def _before_flush(session: Session, flush_context: Any, instances: Any) -> None:
+    min_bytes = _min_bytes()
+    for obj in list(session.new) + list(session.dirty):
+        attributes = _OFFLOADED_ATTRIBUTES.get(getattr(obj, "__tablename__", None), ())
+        if not attributes:
+            continue
+        is_new = obj in session.new
+        state = inspect(obj)
+        changed = [name for name in attributes if is_new or state.attrs[name].history.has_changes()]
+        if _VERSIONED_ATTRIBUTE in changed and not is_new:
+            # In SQL, so concurrent writers cannot hand out the same version.
+            obj.results_version = type(obj).results_version + 1
+        if min_bytes > 0:
+            for attribute in changed:
+                offload_result_payload(session, obj, attribute, min_bytes)
+
+
+def register_result_blob_hooks() -> None:
+    """Offload large session payloads for every ORM session (idempotent)."""
+    if not event.contains(Session, "before_flush", _before_flush):
+        event.listen(Session, "before_flush", _before_flush)
+
+
+register_result_blob_hooks()
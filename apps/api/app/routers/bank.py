@@ -18,7 +18,7 @@ import time
 
 from ..core.security import require_bank_or_admin, require_bank_admin, get_current_user
 from ..database import get_db, SessionLocal
-from ..models import User, ValidationSession
+from ..models import SessionStatus, User, ValidationSession
 from ..models.admin import JobQueue, JobStatus
 from ..services.analytics_service import AnalyticsService
 from ..services.entitlements import EntitlementService, EntitlementError
@@ -270,9 +270,8 @@ def list_bank_jobs(
         
         results = []
         for job in jobs:
-            # Extract bank metadata from extracted_data
-            metadata = job.extracted_data or {}
-            bank_metadata = metadata.get("bank_metadata", {})
+            # Bank metadata comes from the index document, never the blob
+            bank_metadata = job.bank_metadata
             
             results.append({
                 "id": str(job.id),
@@ -362,8 +361,7 @@ def get_job_status(
             raise HTTPException(status_code=404, detail="Job not found")
         
         # Extract bank metadata
-        metadata = job.extracted_data or {}
-        bank_metadata = metadata.get("bank_metadata", {})
+        bank_metadata = job.bank_metadata
         
         # Log job status access
         audit_service.log_action(
@@ -579,8 +577,7 @@ def check_duplicate_lc(
         # Build previous validation results
         previous_validations = []
         for session in existing_sessions:
-            metadata = session.extracted_data or {}
-            bank_metadata = metadata.get("bank_metadata", {})
+            bank_metadata = session.bank_metadata
             validation_results = session.validation_results or {}
             discrepancies = validation_results.get("discrepancies", [])
             
@@ -873,8 +870,7 @@ def get_bank_results(
         results = []
         for session in sessions:
             # Extract bank metadata
-            metadata = session.extracted_data or {}
-            bank_metadata = metadata.get("bank_metadata", {})
+            bank_metadata = session.bank_metadata
             
             # Extract validation results
             validation_results = session.validation_results or {}
@@ -1261,8 +1257,7 @@ def _generate_summary_report_html(sessions: List[ValidationSession], user: User)
     """
     
     for session in sessions:
-        metadata = session.extracted_data or {}
-        bank_metadata = metadata.get("bank_metadata", {})
+        bank_metadata = session.bank_metadata
         validation_results = session.validation_results or {}
         discrepancies = validation_results.get("discrepancies", [])
         
@@ -1561,8 +1556,7 @@ def export_results_csv(
         
         # Write rows
         for session in sessions:
-            metadata = session.extracted_data or {}
-            bank_metadata = metadata.get("bank_metadata", {})
+            bank_metadata = session.bank_metadata
             validation_results = session.validation_results or {}
             discrepancies = validation_results.get("discrepancies", [])
             
@@ -1732,8 +1726,7 @@ def get_client_names(
         sessions = sessions_query.all()
         
         for session in sessions:
-            metadata = session.extracted_data or {}
-            bank_metadata = metadata.get("bank_metadata", {})
+            bank_metadata = session.bank_metadata
             client_name = bank_metadata.get("client_name")
             
             if client_name and isinstance(client_name, str):
@@ -2186,8 +2179,7 @@ def get_client_stats(
         client_stats: Dict[str, Dict] = {}
         
         for session in all_sessions:
-            metadata = session.extracted_data or {}
-            bank_metadata = metadata.get("bank_metadata", {})
+            bank_metadata = session.bank_metadata
             client_name = bank_metadata.get("client_name")
             
             if not client_name or not isinstance(client_name, str):
@@ -2456,8 +2448,7 @@ def get_client_dashboard(
         # Build LC results list (similar to get_bank_results)
         lc_results = []
         for session in sessions:
-            metadata = session.extracted_data or {}
-            bank_metadata = metadata.get("bank_metadata", {})
+            bank_metadata = session.bank_metadata
             validation_results = session.validation_results or {}
             discrepancies = validation_results.get("discrepancies", [])
             
@@ -2649,8 +2640,7 @@ async def stream_job_updates(
 
                 snapshots: List[Dict[str, Any]] = []
                 for job in jobs:
-                    metadata = job.extracted_data or {}
-                    bank_metadata = metadata.get("bank_metadata", {})
+                    bank_metadata = job.bank_metadata
 
                     processing_time = None
                     if job.processing_started_at and job.processing_completed_at:
@@ -104,24 +104,19 @@ def get_duplicate_candidates(
         
         # Convert to response format
         candidates = []
+        # (the service already loaded each candidate's session)
         for cand_data in candidates_data:
-            # Get the session for additional details
-            cand_session = db.query(ValidationSession).filter(
-                ValidationSession.id == cand_data['session_id']
-            ).first()
-            
-            if cand_session:
-                candidates.append(DuplicateCandidate(
-                    session_id=cand_data['session_id'],
-                    lc_number=cand_data['lc_number'],
-                    client_name=cand_data['client_name'],
-                    similarity_score=cand_data['similarity_score'],
-                    content_similarity=cand_data.get('content_similarity'),
-                    metadata_similarity=cand_data.get('metadata_similarity'),
-                    field_matches=cand_data.get('field_matches'),
-                    detected_at=fingerprint.created_at,  # Use fingerprint creation time
-                    completed_at=cand_session.processing_completed_at,
-                ))
+            candidates.append(DuplicateCandidate(
+                session_id=cand_data['session_id'],
+                lc_number=cand_data['lc_number'],
+                client_name=cand_data['client_name'],
+                similarity_score=cand_data['similarity_score'],
+                content_similarity=cand_data.get('content_similarity'),
+                metadata_similarity=cand_data.get('metadata_similarity'),
+                field_matches=cand_data.get('field_matches'),
+                detected_at=fingerprint.created_at,  # Use fingerprint creation time
+                completed_at=cand_data.get('completed_at'),
+            ))
         
         # Log audit
         audit_service.log_action(
@@ -4,6 +4,8 @@ Public validation job status and results endpoints for exporter/importer flows.
 
 from __future__ import annotations
 
+import asyncio
+import base64
 import copy
 import math
 from uuid import UUID, uuid4
@@ -13,11 +15,13 @@ from decimal import Decimal
 
 from fastapi.encoders import jsonable_encoder
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import desc
+from sqlalchemy import and_, desc, or_
 import logging
 
+from app.cache import results_cache
 from app.database import SessionLocal, get_db
 from app.models import User, ValidationSession, SessionStatus
 from app.core.security import get_current_user
@@ -25,6 +29,7 @@ from app.core.rbac import RBACPolicyEngine, Permission
 from app.config import settings
 from app.middleware.audit_middleware import create_audit_context
 from app.models.audit_log import AuditResult
+from app.models.job_summary import SUMMARY_COLUMNS
 from app.services.audit_service import AuditService
 from app.routers.validation import (
     refresh_structured_result_after_field_override as _refresh_structured_result_after_field_override,
@@ -94,67 +99,6 @@ def _extract_lc_number(session: ValidationSession) -> str | None:
     )
 
 
-def _normalize_party(value: Any) -> Optional[str]:
-    if not value:
-        return None
-    if isinstance(value, dict):
-        for key in ("name", "company", "full_name", "legal_name", "value"):
-            if value.get(key):
-                return str(value[key]).strip()
-        return None
-    return str(value).strip()
-
-
-def _extract_supplier(extracted_data: Dict[str, Any]) -> Optional[str]:
-    invoice = extracted_data.get("invoice") or {}
-    bl = extracted_data.get("bill_of_lading") or {}
-    lc = extracted_data.get("lc") or {}
-    return (
-        _normalize_party(invoice.get("consignee"))
-        or _normalize_party(invoice.get("buyer"))
-        or _normalize_party(bl.get("consignee"))
-        or _normalize_party(lc.get("beneficiary"))
-        or _normalize_party(lc.get("applicant"))
-    )
-
-
-def _extract_invoice_amount(extracted_data: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
-    invoice = extracted_data.get("invoice") or {}
-    amount_field = invoice.get("invoice_amount") or invoice.get("amount")
-    currency = invoice.get("currency") or invoice.get("invoice_currency")
-
-    if isinstance(amount_field, dict):
-        currency = currency or amount_field.get("currency")
-        amount = amount_field.get("value")
-    else:
-        amount = amount_field
-
-    if amount is None:
-        return None, currency
-    return str(amount), currency
-
-
-def _summarize_documents(results_payload: Dict[str, Any]) -> Optional[Dict[str, int]]:
-    documents: List[Dict[str, Any]] = []
-    if isinstance(results_payload, dict):
-        if results_payload.get("version") == "structured_result_v1":
-            documents = results_payload.get("documents_structured") or []
-        elif isinstance(results_payload.get("structured_result"), dict) and results_payload["structured_result"].get("version") == "structured_result_v1":
-            documents = results_payload["structured_result"].get("documents_structured") or []
-        else:
-            documents = results_payload.get("documents") or []
-    if not documents:
-        return None
-
-    summary = {"success": 0, "warning": 0, "error": 0}
-    for doc in documents:
-        status = (doc.get("status") or "success").lower()
-        if status not in summary:
-            status = "warning"
-        summary[status] += 1
-    return summary
-
-
 def _looks_like_structured_result(payload: Any) -> bool:
     if not isinstance(payload, dict):
         return False
@@ -206,71 +150,6 @@ def _count_option_e_documents(payload: Any) -> int:
     return 0
 
 
-def _extract_top_issue(results_payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    option_e_source: Optional[Dict[str, Any]] = None
-    if isinstance(results_payload, dict):
-        if results_payload.get("version") == "structured_result_v1":
-            option_e_source = results_payload
-        elif isinstance(results_payload.get("structured_result"), dict) and results_payload["structured_result"].get("version") == "structured_result_v1":
-            option_e_source = results_payload["structured_result"]
-
-    if option_e_source:
-        issues = option_e_source.get("issues") or []
-        if issues:
-            first = issues[0]
-            docs = first.get("documents") or []
-            return {
-                "title": first.get("title"),
-                "severity": first.get("severity"),
-                "documentName": docs[0] if docs else None,
-                "rule": first.get("rule"),
-            }
-
-    issue_cards = results_payload.get("issue_cards") or []
-    if issue_cards:
-        top_card = issue_cards[0]
-        return {
-            "title": top_card.get("title"),
-            "severity": top_card.get("severity"),
-            "documentName": top_card.get("documentName"),
-            "rule": top_card.get("rule"),
-        }
-
-    discrepancies = results_payload.get("discrepancies") or []
-    if discrepancies:
-        first = discrepancies[0]
-        return {
-            "title": first.get("title") or first.get("rule"),
-            "severity": first.get("severity"),
-            "documentName": (first.get("documents") or [None])[0],
-            "rule": first.get("rule"),
-        }
-
-    return None
-
-
-def _summarize_job_overview(session: ValidationSession) -> Dict[str, Any]:
-    results_payload = session.validation_results or {}
-    extracted_data = (
-        results_payload.get("extracted_data")
-        or session.extracted_data
-        or {}
-    )
-
-    supplier_name = _extract_supplier(extracted_data)
-    invoice_amount, invoice_currency = _extract_invoice_amount(extracted_data)
-    document_status = _summarize_documents(results_payload)
-    top_issue = _extract_top_issue(results_payload)
-
-    return {
-        "supplierName": supplier_name,
-        "invoiceAmount": invoice_amount,
-        "invoiceCurrency": invoice_currency,
-        "documentStatus": document_status,
-        "topIssue": top_issue,
-    }
-
-
 def _normalize_job_id(job_id_str: str) -> UUID:
     """Strip 'job_' prefix if present and parse as UUID."""
     if job_id_str.startswith("job_"):
@@ -940,37 +819,98 @@ def get_job_status(
     return response_payload
 
 
-@router.get("/api/results/{job_id}")
-def get_job_results(
-    job_id: str,  # Accept string to handle 'job_' prefix
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-):
-    logger = logging.getLogger(__name__)
+_TERMINAL_STATUSES = (SessionStatus.COMPLETED.value, SessionStatus.FAILED.value)
+
+
+def _render_job_results(session: ValidationSession) -> Optional[results_cache.RenderedResults]:
+    structured_result = _extract_option_e_payload(session.validation_results or {})
+    if not structured_result:
+        return None
+    return results_cache.render(
+        build_public_validation_envelope(
+            job_id=str(session.id),
+            structured_result=structured_result,
+            telemetry={"UnifiedStructuredResultServed": True},
+        )
+    )
+
+
+async def prerender_job_results(session: ValidationSession) -> None:
+    """Cache the public envelope of a just-finalised session (best effort)."""
     try:
-        job_uuid = _normalize_job_id(job_id)
-    except ValueError:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid job ID format: {job_id}")
-    session = (
-        db.query(ValidationSession)
-        .options(
-            selectinload(ValidationSession.documents),
-            selectinload(ValidationSession.discrepancies),
+        rendered = _render_job_results(session)
+        if rendered is not None:
+            await results_cache.put(session.id, session.results_version, rendered)
+    except Exception:
+        logging.getLogger(__name__).warning("Results pre-render skipped for %s", session.id, exc_info=True)
+
+
+def _etag_matches(if_none_match: Optional[str], *etags: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    # If-None-Match uses weak comparison.
+    return "*" in tags or not {tag[2:] if tag.startswith("W/") else tag for tag in tags}.isdisjoint(etags)
+
+
+def _accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _rendered_results_response(rendered: results_cache.RenderedResults, request: Request) -> Response:
+    gzipped = _accepts_gzip(request.headers.get("accept-encoding"))
+    # private: per-user data; no-cache: browsers revalidate every poll with If-None-Match.
+    headers = {
+        "ETag": rendered.gzip_etag if gzipped else rendered.etag,
+        "Cache-Control": "private, no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    # Either encoding's tag proves the client holds the current envelope.
+    if _etag_matches(request.headers.get("if-none-match"), rendered.etag, rendered.gzip_etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=rendered.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=rendered.json_body(), media_type="application/json", headers=headers)
+
+
+def _load_job_results_gate(
+    db: Session, job_uuid: UUID, current_user: User
+) -> Tuple[Any, Optional[ValidationSession]]:
+    """Access, review and status gates of ``get_job_results`` (blocking DB work).
+
+    Returns the gate row and, when a stuck session had to be closed out, the
+    loaded session.
+    """
+    # Only the columns the gates need: polls of unfinished jobs and cache hits
+    # never load the result payload.
+    job = (
+        db.query(
+            ValidationSession.id,
+            ValidationSession.user_id,
+            ValidationSession.status,
+            ValidationSession.review_state,
+            ValidationSession.results_version,
+            ValidationSession.validation_results.isnot(None).label("has_results"),
         )
         .filter(ValidationSession.id == job_uuid, ValidationSession.deleted_at.is_(None))
         .first()
     )
 
-    if not session:
+    if not job:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
 
-    _ensure_access(session, current_user)
+    _ensure_access(job, current_user)
 
     # Concierge review gate: if this session went through the human review queue,
     # its results are withheld from the customer until an operator delivers it.
     # System admins bypass (they review via the admin queue). The customer polls
     # the dedicated status endpoint (GET /api/lcopilot/status/{job_id}) meanwhile.
-    review_state = getattr(session, "review_state", None)
+    review_state = job.review_state
     if review_state and review_state != "delivered":
         _is_admin = bool(
             current_user
@@ -990,46 +930,69 @@ def get_job_results(
                 },
             )
 
+    job_status = job.status
+    session: Optional[ValidationSession] = None
     # If the pipeline persisted results but left the status non-terminal, close it out here
-    if (
-        session.validation_results
-        and session.status not in [SessionStatus.COMPLETED.value, SessionStatus.FAILED.value]
-    ):
-        session.status = SessionStatus.COMPLETED.value
-        session.processing_completed_at = session.processing_completed_at or datetime.now(timezone.utc)
-        db.commit()
-        db.refresh(session)
+    if job.has_results and job_status not in _TERMINAL_STATUSES:
+        session = db.query(ValidationSession).filter(ValidationSession.id == job_uuid).first()
+        if session is not None and session.validation_results:
+            session.status = SessionStatus.COMPLETED.value
+            session.processing_completed_at = session.processing_completed_at or datetime.now(timezone.utc)
+            db.commit()
+            db.refresh(session)
+        job_status = session.status if session is not None else job_status
 
-    if session.status not in [SessionStatus.COMPLETED.value, SessionStatus.FAILED.value]:
+    if job_status not in _TERMINAL_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
-            detail=f"Job is not completed yet (status={session.status})",
+            detail=f"Job is not completed yet (status={job_status})",
         )
 
-    stored_payload = session.validation_results or {}
-    structured_result = _extract_option_e_payload(stored_payload)
-    if structured_result and isinstance(stored_payload, dict):
-        nested = stored_payload.get("structured_result") if isinstance(stored_payload.get("structured_result"), dict) else None
-        if nested is not structured_result and nested != structured_result:
-            session.validation_results = {**stored_payload, "structured_result": structured_result}
-            db.commit()
-            db.refresh(session)
-    if not structured_result:
+    return job, session
+
+
+def _load_and_render_job_results(
+    db: Session, job_uuid: UUID, session: Optional[ValidationSession]
+) -> Tuple[ValidationSession, results_cache.RenderedResults]:
+    """Cache-miss path of ``get_job_results``: load the payload and render it (blocking)."""
+    if session is None:
+        session = db.query(ValidationSession).filter(ValidationSession.id == job_uuid).first()
+    rendered = _render_job_results(session) if session is not None else None
+    if rendered is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail={"error_code": "no_structured_result", "message": "Results not available yet"}
         )
+    return session, rendered
+
+
+@router.get("/api/results/{job_id}")
+async def get_job_results(
+    job_id: str,  # Accept string to handle 'job_' prefix
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    logger = logging.getLogger(__name__)
+    try:
+        job_uuid = _normalize_job_id(job_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid job ID format: {job_id}")
+    # Database work runs in a worker thread; only the cache calls are awaited here.
+    job, session = await asyncio.to_thread(_load_job_results_gate, db, job_uuid, current_user)
+
+    rendered = await results_cache.get(job.id, job.results_version)
+    if rendered is None:
+        session, rendered = await asyncio.to_thread(_load_and_render_job_results, db, job_uuid, session)
+        # Keyed by the version the payload was read with, not the one above.
+        await results_cache.put(session.id, session.results_version, rendered)
 
     logger.info(
         "UnifiedStructuredResultServed",
-        extra={"job_id": str(session.id), "version": structured_result.get("version")},
+        extra={"job_id": str(job.id), "results_version": job.results_version},
     )
 
-    return build_public_validation_envelope(
-        job_id=str(session.id),
-        structured_result=structured_result,
-        telemetry={"UnifiedStructuredResultServed": True},
-    )
+    return _rendered_results_response(rendered, request)
 
 
 @router.post("/api/results/{job_id}/field-overrides")
@@ -1171,20 +1134,47 @@ async def save_job_field_override(
     return response_payload
 
 
+_JOB_LIST_COLUMNS = (
+    ValidationSession.id,
+    ValidationSession.status,
+    ValidationSession.created_at,
+    ValidationSession.processing_completed_at,
+    *(getattr(ValidationSession, name) for name in SUMMARY_COLUMNS),
+)
+
+
+def _encode_job_cursor(created_at: datetime, job_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{job_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_job_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        created_at, job_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(job_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
 @router.get("/api/jobs")
 def list_user_jobs(
     limit: int = Query(default=10, ge=1, le=100, description="Maximum number of jobs to return"),
     status_filter: Optional[str] = Query(default=None, description="Filter by status (completed, processing, failed)"),
+    cursor: Optional[str] = Query(default=None, description="nextCursor from the previous page"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """
     List recent validation sessions for the current user.
     
-    Returns a paginated list of validation jobs with basic metadata.
+    Returns one page of validation jobs, newest first, read from the
+    per-session summary columns only. Pass ``nextCursor`` back as ``cursor``
+    for the following page. Sessions not yet summarised by
+    ``scripts/backfill_job_summaries.py`` are listed with empty summary fields.
     """
     query = (
-        db.query(ValidationSession)
+        db.query(*_JOB_LIST_COLUMNS)
         .filter(
             ValidationSession.user_id == current_user.id,
             ValidationSession.deleted_at.is_(None)
@@ -1194,28 +1184,42 @@ def list_user_jobs(
     # Filter by status if provided
     if status_filter:
         query = query.filter(ValidationSession.status == status_filter)
+
+    # Keyset pagination on (created_at, id), newest first
+    if cursor:
+        cursor_created_at, cursor_id = _decode_job_cursor(cursor)
+        query = query.filter(
+            or_(
+                ValidationSession.created_at < cursor_created_at,
+                and_(ValidationSession.created_at == cursor_created_at, ValidationSession.id < cursor_id),
+            )
+        )
+    query = query.order_by(desc(ValidationSession.created_at), desc(ValidationSession.id))
     
-    # Order by most recent first
-    query = query.order_by(desc(ValidationSession.created_at))
-    
-    # Limit results
-    sessions = query.limit(limit).all()
+    rows = query.limit(limit + 1).all()
+    next_cursor = _encode_job_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+    rows = rows[:limit]
     
     return {
         "jobs": [
             {
-                "jobId": str(session.id),
-                "status": session.status,
-                "progress": _status_to_progress(session.status),
-                "lcNumber": _extract_lc_number(session),
-                "createdAt": session.created_at.isoformat() if session.created_at else None,
-                "completedAt": session.processing_completed_at.isoformat() if session.processing_completed_at else None,
-                "documentCount": len(session.documents) if session.documents else _count_option_e_documents(session.validation_results or {}),
-                "discrepancyCount": len(session.discrepancies) if session.discrepancies else len((session.validation_results or {}).get("discrepancies") or []),
-                **_summarize_job_overview(session),
+                "jobId": str(row.id),
+                "status": row.status,
+                "progress": _status_to_progress(row.status),
+                "lcNumber": row.summary_lc_number,
+                "createdAt": row.created_at.isoformat() if row.created_at else None,
+                "completedAt": row.processing_completed_at.isoformat() if row.processing_completed_at else None,
+                "documentCount": row.summary_document_count or 0,
+                "discrepancyCount": row.summary_discrepancy_count or 0,
+                "supplierName": row.summary_supplier_name,
+                "invoiceAmount": row.summary_invoice_amount,
+                "invoiceCurrency": row.summary_invoice_currency,
+                "documentStatus": row.summary_document_status,
+                "topIssue": row.summary_top_issue,
+                "verdict": row.summary_verdict,
             }
-            for session in sessions
+            for row in rows
         ],
-        "total": len(sessions),
+        "total": len(rows),
+        "nextCursor": next_cursor,
     }
-
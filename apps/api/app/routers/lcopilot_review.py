@@ -25,7 +25,6 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from sqlalchemy.orm.attributes import flag_modified
 
 from app.database import get_db
 from app.core.security import get_current_user, require_sysadmin
@@ -80,7 +79,6 @@ def _persist_structured(db: Session, session: ValidationSession, sr: Dict[str, A
     stored = dict(session.validation_results or {})
     stored["structured_result"] = sr
     session.validation_results = stored
-    flag_modified(session, "validation_results")
 
 
 def _status_payload(db: Session, session: ValidationSession) -> Dict[str, Any]:
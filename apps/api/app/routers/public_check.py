@@ -21,10 +21,9 @@
     Cheap, non-consuming probe so the page can tell the visitor up front
     whether they've already used today's free run.
 
-Cost control: ONE run per client IP per 24 h, enforced with a Redis counter
+Cost control: ONE run per client IP per 24 h, enforced with a Redis window
 (:mod:`app.utils.anon_rate_limit`). The generic ``RateLimiterMiddleware`` is
-in-memory / per-process / short-window and cannot express a path-scoped
-24 h limit. An un-rate-limited public endpoint that runs Sonnet/Opus on every
+short-window and cannot express a path-scoped 24 h limit. An un-rate-limited public endpoint that runs Sonnet/Opus on every
 hit is unbounded free model spend, so this limiter is load-bearing — and so is
 the ``PUBLIC_LC_CHECK_ENABLED`` kill switch.
 
@@ -197,7 +196,9 @@ def _trim_result(envelope: Any) -> Dict[str, Any]:
 async def public_lc_check_availability(request: Request) -> Dict[str, Any]:
     """Has this visitor already used today's free LC check? (non-consuming)."""
     _ensure_enabled()
-    retry_after = await peek_anon_run(request=request, scope=_RATE_SCOPE, limit=_limit_per_window())
+    retry_after = await peek_anon_run(
+        request=request, scope=_RATE_SCOPE, limit=_limit_per_window(), window_seconds=_window_seconds()
+    )
     if retry_after is not None:
         return {"available": False, "retry_after_seconds": int(retry_after), "signup_cta": True}
     return {"available": True}
@@ -43,7 +43,7 @@ from ..schemas.rules import (
 from ..services.rules_storage import RulesStorageService
 from ..services.rules_importer import RulesImporter
 from ..services.rules_audit import record_rule_audit
-from ..services.rules_service import get_rules_service
+from ..services.rules_service import invalidate_rules_cache
 from ..metrics.rules_metrics import rules_update_total
 
 try:
@@ -155,13 +155,13 @@ def _assert_ruleset_import_integrity(
 rules_router = APIRouter(prefix="/admin/rules", tags=["admin-rules"])
 
 
-def _clear_rules_cache(domain: Optional[str], jurisdiction: Optional[str]) -> None:
+async def _clear_rules_cache(domain: Optional[str], jurisdiction: Optional[str]) -> None:
+    """Invalidate cached rulesets in every API worker (local cache, Redis, pub/sub)."""
     try:
-        rules_service = get_rules_service()
         if domain and jurisdiction:
-            rules_service.clear_cache(domain=domain, jurisdiction=jurisdiction)
+            await invalidate_rules_cache(domain=domain, jurisdiction=jurisdiction)
         else:
-            rules_service.clear_cache()
+            await invalidate_rules_cache()
     except Exception as exc:  # noqa: BLE001
         logger.warning("Failed to clear rules cache: %s", exc)
 
@@ -556,12 +556,8 @@ async def upload_ruleset(
         else None
     )
     
-    # Clear cache so dashboard refreshes instantly
-    try:
-        rules_service = get_rules_service()
-        rules_service.clear_cache()
-    except Exception:
-        pass  # Don't fail upload if cache clear fails
+    # Clear cache so dashboard refreshes instantly (never fails the upload)
+    await _clear_rules_cache(None, None)
 
     return RulesetUploadResponse(
         ruleset=RulesetResponse.model_validate(ruleset),
@@ -683,7 +679,7 @@ async def publish_ruleset(
         )
     
     # Invalidate cache for this domain/jurisdiction
-    _clear_rules_cache(ruleset.domain, ruleset.jurisdiction)
+    await _clear_rules_cache(ruleset.domain, ruleset.jurisdiction)
     
     return RulesetResponse.model_validate(ruleset)
 
@@ -778,7 +774,7 @@ async def rollback_ruleset(
     db.commit()
     db.refresh(target_ruleset)
 
-    _clear_rules_cache(target_ruleset.domain, target_ruleset.jurisdiction)
+    await _clear_rules_cache(target_ruleset.domain, target_ruleset.jurisdiction)
     
     return RulesetResponse.model_validate(target_ruleset)
 
@@ -821,7 +817,7 @@ async def archive_ruleset(
     db.commit()
     db.refresh(ruleset)
     
-    _clear_rules_cache(ruleset.domain, ruleset.jurisdiction)
+    await _clear_rules_cache(ruleset.domain, ruleset.jurisdiction)
     logger.info(f"Archived ruleset {ruleset_id} by user {current_user.id}")
     
     return RulesetResponse.model_validate(ruleset)
@@ -866,7 +862,7 @@ async def delete_ruleset(
         db.delete(ruleset)
         db.commit()
         
-        _clear_rules_cache(ruleset.domain, ruleset.jurisdiction)
+        await _clear_rules_cache(ruleset.domain, ruleset.jurisdiction)
         logger.info(f"Hard deleted ruleset {ruleset_id} ({deleted_rules} rules) by user {current_user.id}")
         
         return {"success": True, "message": f"Ruleset permanently deleted ({deleted_rules} rules removed)"}
@@ -891,7 +887,7 @@ async def delete_ruleset(
         
         db.commit()
         
-        _clear_rules_cache(ruleset.domain, ruleset.jurisdiction)
+        await _clear_rules_cache(ruleset.domain, ruleset.jurisdiction)
         logger.info(f"Soft deleted (archived) ruleset {ruleset_id} by user {current_user.id}")
         
         return {"success": True, "message": "Ruleset archived"}
@@ -1267,7 +1263,7 @@ async def update_rule(
 
     db.commit()
     db.refresh(rule)
-    _clear_rules_cache(rule.domain, rule.jurisdiction)
+    await _clear_rules_cache(rule.domain, rule.jurisdiction)
     return _serialize_rule_record(rule)
 
 
@@ -1291,7 +1287,7 @@ async def delete_rule(
         )
         rules_update_total.labels(action="delete").inc()
         db.commit()
-        _clear_rules_cache(rule.domain, rule.jurisdiction)
+        await _clear_rules_cache(rule.domain, rule.jurisdiction)
         return RuleDeleteResponse(rule_id=rule_id, archived=False)
 
     rule.is_active = False
@@ -1306,7 +1302,7 @@ async def delete_rule(
     )
     rules_update_total.labels(action="archive").inc()
     db.commit()
-    _clear_rules_cache(rule.domain, rule.jurisdiction)
+    await _clear_rules_cache(rule.domain, rule.jurisdiction)
     return RuleDeleteResponse(rule_id=rule_id, archived=True)
 
 
@@ -1399,5 +1395,5 @@ async def bulk_sync_rules(
 
     db.commit()
     for domain, jurisdiction in cache_keys:
-        _clear_rules_cache(domain, jurisdiction)
+        await _clear_rules_cache(domain, jurisdiction)
     return BulkSyncResponse(items=response_items)
@@ -5,16 +5,20 @@ Endpoints for tracking containers and vessels with real-time data
 from multiple sources (carrier APIs, AIS providers).
 """
 
+import asyncio
 import os
 import re
 import httpx
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Awaitable, Callable, Tuple
 from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
+from app.cache import tracking_cache
+from app.config import settings
 from app.database import get_db
 from app.models import User
 from app.models.tracking import (
@@ -238,17 +242,20 @@ async def fetch_track_trace_api(container_number: str) -> Optional[Dict]:
     if not api_key:
         return None
     
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"https://api.tracktraceship.com/v1/container/{container_number}",
-                headers={"X-API-Key": api_key}
-            )
-            if response.status_code == 200:
-                return response.json()
-    except Exception as e:
-        logger.error(f"Track&Trace API error: {e}")
-    return None
+    async def _load() -> Optional[Dict]:
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.get(
+                    f"https://api.tracktraceship.com/v1/container/{container_number}",
+                    headers={"X-API-Key": api_key}
+                )
+                if response.status_code == 200:
+                    return response.json()
+        except Exception as e:
+            logger.error(f"Track&Trace API error: {e}")
+        return None
+    
+    return await tracking_cache.fetch("tracktrace", container_number, _load)
 
 
 async def fetch_searates_tracking(container_number: str) -> Optional[Dict]:
@@ -257,17 +264,20 @@ async def fetch_searates_tracking(container_number: str) -> Optional[Dict]:
     if not api_key:
         return None
     
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                "https://api.searates.com/v1/tracking",
-                params={"container": container_number, "api_key": api_key}
-            )
-            if response.status_code == 200:
-                return response.json()
-    except Exception as e:
-        logger.error(f"Searates API error: {e}")
-    return None
+    async def _load() -> Optional[Dict]:
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.get(
+                    "https://api.searates.com/v1/tracking",
+                    params={"container": container_number, "api_key": api_key}
+                )
+                if response.status_code == 200:
+                    return response.json()
+        except Exception as e:
+            logger.error(f"Searates API error: {e}")
+        return None
+    
+    return await tracking_cache.fetch("searates", container_number, _load)
 
 
 async def fetch_portcast_tracking(container_number: str) -> Optional[Dict]:
@@ -276,50 +286,67 @@ async def fetch_portcast_tracking(container_number: str) -> Optional[Dict]:
     if not api_key:
         return None
     
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                "https://api.portcast.io/api/v1/tracking/container",
-                params={"container_number": container_number},
-                headers={"Authorization": f"Bearer {api_key}"}
-            )
-            if response.status_code == 200:
-                return response.json()
-    except Exception as e:
-        logger.error(f"Portcast API error: {e}")
+    async def _load() -> Optional[Dict]:
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                response = await client.get(
+                    "https://api.portcast.io/api/v1/tracking/container",
+                    params={"container_number": container_number},
+                    headers={"Authorization": f"Bearer {api_key}"}
+                )
+                if response.status_code == 200:
+                    return response.json()
+        except Exception as e:
+            logger.error(f"Portcast API error: {e}")
+        return None
+    
+    return await tracking_cache.fetch("portcast", container_number, _load)
 
 
 async def fetch_vessel_ais(identifier: str, search_type: str = "name") -> Optional[Dict]:
     """Fetch vessel AIS data from Datalastic or MarineTraffic."""
+    reference = f"{search_type}:{identifier}"
     api_key = os.getenv("DATALASTIC_API_KEY")
     if api_key:
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                if search_type == "imo":
-                    url = f"https://api.datalastic.com/api/v0/vessel?api-key={api_key}&imo={identifier}"
-                elif search_type == "mmsi":
-                    url = f"https://api.datalastic.com/api/v0/vessel?api-key={api_key}&mmsi={identifier}"
-                else:
-                    url = f"https://api.datalastic.com/api/v0/vessel?api-key={api_key}&name={identifier}"
-                
-                response = await client.get(url)
-                if response.status_code == 200:
-                    return response.json()
-        except Exception as e:
-            logger.error(f"Datalastic API error: {e}")
+        async def _load_datalastic() -> Optional[Dict]:
+            try:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    if search_type == "imo":
+                        url = f"https://api.datalastic.com/api/v0/vessel?api-key={api_key}&imo={identifier}"
+                    elif search_type == "mmsi":
+                        url = f"https://api.datalastic.com/api/v0/vessel?api-key={api_key}&mmsi={identifier}"
+                    else:
+                        url = f"https://api.datalastic.com/api/v0/vessel?api-key={api_key}&name={identifier}"
+                    
+                    response = await client.get(url)
+                    if response.status_code == 200:
+                        return response.json()
+            except Exception as e:
+                logger.error(f"Datalastic API error: {e}")
+            return None
+        
+        data = await tracking_cache.fetch("datalastic", reference, _load_datalastic)
+        if data:
+            return data
     
     mt_api_key = os.getenv("MARINETRAFFIC_API_KEY")
     if mt_api_key:
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(
-                    f"https://services.marinetraffic.com/api/vesselmaster/{mt_api_key}",
-                    params={"imo": identifier} if search_type == "imo" else {"mmsi": identifier}
-                )
-                if response.status_code == 200:
-                    return response.json()
-        except Exception as e:
-            logger.error(f"MarineTraffic API error: {e}")
+        async def _load_marinetraffic() -> Optional[Dict]:
+            try:
+                async with httpx.AsyncClient(timeout=30.0) as client:
+                    response = await client.get(
+                        f"https://services.marinetraffic.com/api/vesselmaster/{mt_api_key}",
+                        params={"imo": identifier} if search_type == "imo" else {"mmsi": identifier}
+                    )
+                    if response.status_code == 200:
+                        return response.json()
+            except Exception as e:
+                logger.error(f"MarineTraffic API error: {e}")
+            return None
+        
+        data = await tracking_cache.fetch("marinetraffic", reference, _load_marinetraffic)
+        if data:
+            return data
     
     return None
 
@@ -1580,194 +1607,295 @@ async def get_import_template():
 
 # ============== Background Alert Processing ==============
 
-async def check_and_send_alerts(db: Session):
-    """
-    Background task to check alerts and send notifications.
-    Should be run periodically (e.g., every 15 minutes).
-    """
-    # Get all active alerts
-    alerts = db.query(TrackingAlertModel).filter(
-        TrackingAlertModel.is_active == True
-    ).all()
-    
-    logger.info(f"Checking {len(alerts)} active alerts")
-    
-    for alert in alerts:
-        try:
-            # Get user info
-            user = db.query(User).filter(User.id == alert.user_id).first()
-            if not user:
-                logger.warning(f"User {alert.user_id} not found for alert {alert.id}")
-                continue
-            
-            user_email = alert.email_address or user.email if alert.notify_email else None
-            user_phone = alert.phone_number if alert.notify_sms else None
-            
-            if alert.tracking_type == "container":
-                tracking_data = await _track_container_internal(alert.reference)
-                
-                # Check for arrival alert
-                if alert.alert_type == AlertType.ARRIVAL.value and tracking_data.eta:
-                    try:
-                        eta_date = datetime.fromisoformat(tracking_data.eta.replace("Z", "+00:00"))
-                        now = datetime.now(eta_date.tzinfo)
-                        hours_until_arrival = (eta_date - now).total_seconds() / 3600
-                        
-                        # Alert if within 24 hours
-                        if 0 <= hours_until_arrival <= 24:
-                            await notification_service.send_container_arrival_alert(
-                                container_number=tracking_data.container_number,
-                                vessel=tracking_data.vessel.name if tracking_data.vessel else "Unknown",
-                                port=tracking_data.destination.name,
-                                eta=tracking_data.eta,
-                                user_email=user_email,
-                                user_phone=user_phone,
-                                user_name=user.email.split("@")[0] if user.email else "User",
-                            )
-                            
-                            # Update alert
-                            alert.last_triggered = datetime.utcnow()
-                            alert.trigger_count += 1
-                            
-                            # Log notification
-                            notification = TrackingNotificationModel(
-                                id=uuid.uuid4(),
-                                alert_id=alert.id,
-                                user_id=user.id,
-                                notification_type="email" if user_email else "sms",
-                                recipient=user_email or user_phone or "unknown",
-                                subject=f"Arrival Alert: {tracking_data.container_number}",
-                                trigger_reason=f"ETA within {int(hours_until_arrival)} hours",
-                                shipment_reference=alert.reference,
-                                shipment_status=tracking_data.status,
-                                status=NotificationStatus.SENT.value,
-                                sent_at=datetime.utcnow(),
-                            )
-                            db.add(notification)
-                            
-                            logger.info(f"Sent arrival alert for container {alert.reference}")
-                    except Exception as e:
-                        logger.error(f"Error processing arrival alert: {e}")
-                
-                # Check for delay alert
-                elif alert.alert_type == AlertType.DELAY.value:
-                    if tracking_data.status == "delayed":
-                        await notification_service.send_delay_alert(
+@dataclass
+class _AlertDispatch:
+    """One notification the sweeper decided to send, plus its log row."""
+
+    alert: TrackingAlertModel
+    user: User
+    send: Callable[[], Awaitable[Any]]
+    recipient_email: Optional[str]
+    recipient_phone: Optional[str]
+    subject: Optional[str]  # None: sent but not logged as a TrackingNotification
+    trigger_reason: str
+    shipment_status: str
+    log_message: str
+
+
+def _vessel_search_type(reference: str) -> str:
+    return "imo" if reference.startswith("IMO") else \
+        "mmsi" if reference.isdigit() and len(reference) == 9 else "name"
+
+
+def _alert_tracking_key(alert: TrackingAlertModel) -> Tuple[str, str]:
+    """(tracking type, reference) as the provider sees it, so duplicates collapse."""
+    if alert.tracking_type == "container":
+        return "container", re.sub(r'[^A-Z0-9]', '', (alert.reference or "").upper())
+    return alert.tracking_type, alert.reference
+
+
+async def _fetch_alert_references(keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Any]:
+    """Track each distinct reference once, with bounded upstream concurrency."""
+    limit = asyncio.Semaphore(max(1, int(getattr(settings, "TRACKING_ALERT_FETCH_CONCURRENCY", 8))))
+
+    async def _fetch(key: Tuple[str, str]):
+        tracking_type, reference = key
+        async with limit:
+            if tracking_type == "container":
+                return await _track_container_internal(reference)
+            return await _track_vessel_internal(reference, _vessel_search_type(reference))
+
+    results = await asyncio.gather(*(_fetch(key) for key in keys), return_exceptions=True)
+    return dict(zip(keys, results))
+
+
+def _evaluate_alert(
+    alert: TrackingAlertModel,
+    user: User,
+    tracking_data: Any,
+    shipment: Optional[TrackedShipment],
+) -> Optional[_AlertDispatch]:
+    """Decide whether an alert fires against freshly fetched tracking data."""
+    user_email = alert.email_address or user.email if alert.notify_email else None
+    user_phone = alert.phone_number if alert.notify_sms else None
+    user_name = user.email.split("@")[0] if user.email else "User"
+
+    def dispatch(send, subject, trigger_reason, log_message) -> _AlertDispatch:
+        return _AlertDispatch(
+            alert=alert,
+            user=user,
+            send=send,
+            recipient_email=user_email,
+            recipient_phone=user_phone,
+            subject=subject,
+            trigger_reason=trigger_reason,
+            shipment_status=tracking_data.status,
+            log_message=log_message,
+        )
+
+    if alert.tracking_type == "container":
+        # Check for arrival alert
+        if alert.alert_type == AlertType.ARRIVAL.value and tracking_data.eta:
+            try:
+                eta_date = datetime.fromisoformat(tracking_data.eta.replace("Z", "+00:00"))
+                now = datetime.now(eta_date.tzinfo)
+                hours_until_arrival = (eta_date - now).total_seconds() / 3600
+
+                # Alert if within 24 hours
+                if 0 <= hours_until_arrival <= 24:
+                    return dispatch(
+                        lambda: notification_service.send_container_arrival_alert(
                             container_number=tracking_data.container_number,
-                            original_eta="Unknown",  # Would need to track previous ETA
-                            new_eta=tracking_data.eta or "Unknown",
-                            delay_hours=alert.threshold_hours or 0,
-                            reason="Shipping delay detected",
+                            vessel=tracking_data.vessel.name if tracking_data.vessel else "Unknown",
+                            port=tracking_data.destination.name,
+                            eta=tracking_data.eta,
                             user_email=user_email,
                             user_phone=user_phone,
-                            user_name=user.email.split("@")[0] if user.email else "User",
-                        )
-                        alert.last_triggered = datetime.utcnow()
-                        alert.trigger_count += 1
-                        
-                        # Log notification
-                        notification = TrackingNotificationModel(
-                            id=uuid.uuid4(),
-                            alert_id=alert.id,
-                            user_id=user.id,
-                            notification_type="email" if user_email else "sms",
-                            recipient=user_email or user_phone or "unknown",
-                            subject=f"Delay Alert: {tracking_data.container_number}",
-                            trigger_reason="Shipment status is delayed",
-                            shipment_reference=alert.reference,
-                            shipment_status=tracking_data.status,
-                            status=NotificationStatus.SENT.value,
-                            sent_at=datetime.utcnow(),
-                        )
-                        db.add(notification)
-                        
-                        logger.info(f"Sent delay alert for container {alert.reference}")
-                
-                # Check for LC risk alert
-                elif alert.alert_type == AlertType.LC_RISK.value:
-                    # Get linked shipment to check LC expiry
-                    shipment = db.query(TrackedShipment).filter(
-                        TrackedShipment.reference == alert.reference,
-                        TrackedShipment.user_id == alert.user_id,
-                    ).first()
-                    
-                    if shipment and shipment.lc_expiry and tracking_data.eta:
-                        try:
-                            eta_date = datetime.fromisoformat(tracking_data.eta.replace("Z", "+00:00"))
-                            lc_expiry = shipment.lc_expiry
-                            
-                            # Make timezone aware if needed
-                            if lc_expiry.tzinfo is None:
-                                from datetime import timezone
-                                lc_expiry = lc_expiry.replace(tzinfo=timezone.utc)
-                            
-                            days_until_lc_expiry = (lc_expiry - eta_date).days
-                            threshold = alert.threshold_days or 7  # Default 7 days
-                            
-                            # Alert if ETA is within threshold days of LC expiry
-                            if days_until_lc_expiry <= threshold and days_until_lc_expiry >= 0:
-                                await notification_service.send_lc_risk_alert(
-                                    container_number=tracking_data.container_number,
-                                    eta=tracking_data.eta,
-                                    lc_expiry=lc_expiry.strftime("%Y-%m-%d"),
-                                    days_remaining=days_until_lc_expiry,
-                                    user_email=user_email,
-                                    user_phone=user_phone,
-                                    user_name=user.email.split("@")[0] if user.email else "User",
-                                )
-                                alert.last_triggered = datetime.utcnow()
-                                alert.trigger_count += 1
-                                
-                                notification = TrackingNotificationModel(
-                                    id=uuid.uuid4(),
-                                    alert_id=alert.id,
-                                    user_id=user.id,
-                                    notification_type="email" if user_email else "sms",
-                                    recipient=user_email or user_phone or "unknown",
-                                    subject=f"LC Risk Alert: {tracking_data.container_number}",
-                                    trigger_reason=f"LC expires in {days_until_lc_expiry} days",
-                                    shipment_reference=alert.reference,
-                                    shipment_status=tracking_data.status,
-                                    status=NotificationStatus.SENT.value,
-                                    sent_at=datetime.utcnow(),
-                                )
-                                db.add(notification)
-                                
-                                logger.info(f"Sent LC risk alert for {alert.reference}")
-                        except Exception as e:
-                            logger.error(f"Error processing LC risk alert: {e}")
-            
-            elif alert.tracking_type == "vessel":
-                search_type = "imo" if alert.reference.startswith("IMO") else \
-                             "mmsi" if alert.reference.isdigit() and len(alert.reference) == 9 else "name"
-                tracking_data = await _track_vessel_internal(alert.reference, search_type)
-                
-                if alert.alert_type == AlertType.ARRIVAL.value and tracking_data.eta:
-                    try:
-                        eta_date = datetime.fromisoformat(tracking_data.eta.replace("Z", "+00:00"))
-                        now = datetime.now(eta_date.tzinfo)
-                        hours_until_arrival = (eta_date - now).total_seconds() / 3600
-                        
-                        if 0 <= hours_until_arrival <= 24:
-                            await notification_service.send_container_arrival_alert(
-                                container_number=tracking_data.name,
-                                vessel=tracking_data.name,
-                                port=tracking_data.destination or "Unknown",
+                            user_name=user_name,
+                        ),
+                        f"Arrival Alert: {tracking_data.container_number}",
+                        f"ETA within {int(hours_until_arrival)} hours",
+                        f"Sent arrival alert for container {alert.reference}",
+                    )
+            except Exception as e:
+                logger.error(f"Error processing arrival alert: {e}")
+
+        # Check for delay alert
+        elif alert.alert_type == AlertType.DELAY.value:
+            if tracking_data.status == "delayed":
+                return dispatch(
+                    lambda: notification_service.send_delay_alert(
+                        container_number=tracking_data.container_number,
+                        original_eta="Unknown",  # Would need to track previous ETA
+                        new_eta=tracking_data.eta or "Unknown",
+                        delay_hours=alert.threshold_hours or 0,
+                        reason="Shipping delay detected",
+                        user_email=user_email,
+                        user_phone=user_phone,
+                        user_name=user_name,
+                    ),
+                    f"Delay Alert: {tracking_data.container_number}",
+                    "Shipment status is delayed",
+                    f"Sent delay alert for container {alert.reference}",
+                )
+
+        # Check for LC risk alert
+        elif alert.alert_type == AlertType.LC_RISK.value:
+            if shipment and shipment.lc_expiry and tracking_data.eta:
+                try:
+                    eta_date = datetime.fromisoformat(tracking_data.eta.replace("Z", "+00:00"))
+                    lc_expiry = shipment.lc_expiry
+
+                    # Make timezone aware if needed
+                    if lc_expiry.tzinfo is None:
+                        from datetime import timezone
+                        lc_expiry = lc_expiry.replace(tzinfo=timezone.utc)
+
+                    days_until_lc_expiry = (lc_expiry - eta_date).days
+                    threshold = alert.threshold_days or 7  # Default 7 days
+
+                    # Alert if ETA is within threshold days of LC expiry
+                    if days_until_lc_expiry <= threshold and days_until_lc_expiry >= 0:
+                        return dispatch(
+                            lambda: notification_service.send_lc_risk_alert(
+                                container_number=tracking_data.container_number,
                                 eta=tracking_data.eta,
+                                lc_expiry=lc_expiry.strftime("%Y-%m-%d"),
+                                days_remaining=days_until_lc_expiry,
                                 user_email=user_email,
                                 user_phone=user_phone,
-                                user_name=user.email.split("@")[0] if user.email else "User",
-                            )
-                            alert.last_triggered = datetime.utcnow()
-                            alert.trigger_count += 1
-                            logger.info(f"Sent arrival alert for vessel {alert.reference}")
-                    except Exception as e:
-                        logger.error(f"Error processing vessel arrival alert: {e}")
-        
+                                user_name=user_name,
+                            ),
+                            f"LC Risk Alert: {tracking_data.container_number}",
+                            f"LC expires in {days_until_lc_expiry} days",
+                            f"Sent LC risk alert for {alert.reference}",
+                        )
+                except Exception as e:
+                    logger.error(f"Error processing LC risk alert: {e}")
+
+    elif alert.tracking_type == "vessel":
+        if alert.alert_type == AlertType.ARRIVAL.value and tracking_data.eta:
+            try:
+                eta_date = datetime.fromisoformat(tracking_data.eta.replace("Z", "+00:00"))
+                now = datetime.now(eta_date.tzinfo)
+                hours_until_arrival = (eta_date - now).total_seconds() / 3600
+
+                if 0 <= hours_until_arrival <= 24:
+                    return dispatch(
+                        lambda: notification_service.send_container_arrival_alert(
+                            container_number=tracking_data.name,
+                            vessel=tracking_data.name,
+                            port=tracking_data.destination or "Unknown",
+                            eta=tracking_data.eta,
+                            user_email=user_email,
+                            user_phone=user_phone,
+                            user_name=user_name,
+                        ),
+                        None,
+                        "",
+                        f"Sent arrival alert for vessel {alert.reference}",
+                    )
+            except Exception as e:
+                logger.error(f"Error processing vessel arrival alert: {e}")
+
+    return None
+
+
+async def _process_alert_batch(db: Session, alerts: List[TrackingAlertModel]) -> int:
+    """Fetch, evaluate and notify one batch of alerts; returns notifications sent."""
+    user_ids = {alert.user_id for alert in alerts}
+    users = {
+        user.id: user
+        for user in db.query(User).filter(User.id.in_(user_ids)).all()
+    } if user_ids else {}
+
+    lc_risk = [alert for alert in alerts if alert.alert_type == AlertType.LC_RISK.value]
+    shipments: Dict[Tuple[Any, str], TrackedShipment] = {}
+    if lc_risk:
+        for shipment in db.query(TrackedShipment).filter(
+            TrackedShipment.reference.in_({alert.reference for alert in lc_risk}),
+            TrackedShipment.user_id.in_({alert.user_id for alert in lc_risk}),
+        ).all():
+            shipments.setdefault((shipment.user_id, shipment.reference), shipment)
+
+    trackable = []
+    for alert in alerts:
+        if alert.user_id not in users:
+            logger.warning(f"User {alert.user_id} not found for alert {alert.id}")
+            continue
+        if alert.tracking_type in ("container", "vessel"):
+            trackable.append(alert)
+
+    keys = list(dict.fromkeys(_alert_tracking_key(alert) for alert in trackable))
+    tracked = await _fetch_alert_references(keys)
+
+    dispatches: List[_AlertDispatch] = []
+    for alert in trackable:
+        tracking_data = tracked.get(_alert_tracking_key(alert))
+        if isinstance(tracking_data, BaseException):
+            logger.error(f"Error processing alert {alert.id}: {tracking_data}")
+            continue
+        try:
+            dispatch = _evaluate_alert(
+                alert,
+                users[alert.user_id],
+                tracking_data,
+                shipments.get((alert.user_id, alert.reference)),
+            )
         except Exception as e:
             logger.error(f"Error processing alert {alert.id}: {e}")
-    
-    db.commit()
+            continue
+        if dispatch is not None:
+            dispatches.append(dispatch)
+
+    send_limit = asyncio.Semaphore(max(1, int(getattr(settings, "TRACKING_ALERT_SEND_CONCURRENCY", 8))))
+
+    async def _send(dispatch: _AlertDispatch):
+        async with send_limit:
+            return await dispatch.send()
+
+    outcomes = await asyncio.gather(*(_send(dispatch) for dispatch in dispatches), return_exceptions=True)
+
+    notifications: List[TrackingNotificationModel] = []
+    sent = 0
+    for dispatch, outcome in zip(dispatches, outcomes):
+        alert = dispatch.alert
+        if isinstance(outcome, BaseException):
+            logger.error(f"Error processing alert {alert.id}: {outcome}")
+            continue
+        alert.last_triggered = datetime.utcnow()
+        alert.trigger_count += 1
+        sent += 1
+        if dispatch.subject is not None:
+            notifications.append(TrackingNotificationModel(
+                id=uuid.uuid4(),
+                alert_id=alert.id,
+                user_id=dispatch.user.id,
+                notification_type="email" if dispatch.recipient_email else "sms",
+                recipient=dispatch.recipient_email or dispatch.recipient_phone or "unknown",
+                subject=dispatch.subject,
+                trigger_reason=dispatch.trigger_reason,
+                shipment_reference=alert.reference,
+                shipment_status=dispatch.shipment_status,
+                status=NotificationStatus.SENT.value,
+                sent_at=datetime.utcnow(),
+            ))
+        logger.info(dispatch.log_message)
+
+    if notifications:
+        db.add_all(notifications)
+    return sent
+
+
+async def check_and_send_alerts(db: Session):
+    """
+    Background task to check alerts and send notifications.
+    Should be run periodically (e.g., every 15 minutes).
+
+    Alerts are swept in keyset-ordered batches. Within a batch, users and
+    LC-linked shipments are loaded in one query each, every distinct
+    (tracking type, reference) is tracked once no matter how many alerts
+    watch it, and provider responses come from app.cache.tracking_cache.
+    """
+    batch_size = max(1, int(getattr(settings, "TRACKING_ALERT_BATCH_SIZE", 500)))
+    checked = sent = 0
+    last_id = None
+
+    while True:
+        query = db.query(TrackingAlertModel).filter(TrackingAlertModel.is_active == True)
+        if last_id is not None:
+            query = query.filter(TrackingAlertModel.id > last_id)
+        alerts = query.order_by(TrackingAlertModel.id).limit(batch_size).all()
+        if not alerts:
+            break
+        last_id = alerts[-1].id
+        checked += len(alerts)
+        sent += await _process_alert_batch(db, alerts)
+        db.commit()
+        if len(alerts) < batch_size:
+            break
+
+    logger.info(f"Checked {checked} active alerts, sent {sent} notifications")
 
 
 # ============== Admin/Health Endpoints ==============
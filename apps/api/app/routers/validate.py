@@ -221,6 +221,7 @@ from app.services.extraction.ai_first_extractor import (
     extract_inspection_ai_first,
 )
 from app.services.extraction.launch_pipeline import get_launch_extraction_pipeline, LaunchExtractionPipeline
+from app.services.extraction.parsed_document import ParsedDocument
 from app.services.extraction.iso20022_lc_extractor import detect_iso20022_schema
 from app.services.extraction.lc_taxonomy import (
     build_lc_classification,
@@ -1504,6 +1505,7 @@ async def _build_document_context(
     document_tags: Optional[Dict[str, Any]] = None,
     job_id: Optional[str] = None,
     previous_extraction: Optional[Dict[str, Any]] = None,
+    extraction_store: Optional[Any] = None,
 ) -> Dict[str, Any]:
     """
     Attempt to extract basic structured fields from uploaded documents.
@@ -1515,6 +1517,11 @@ async def _build_document_context(
     filename matches a previously-extracted document are injected from the cache
     instead of re-running the vision LLM. This avoids re-extracting all documents
     when the user goes back to upload a missing file and re-clicks Extract.
+
+    When ``extraction_store`` (a ``DocumentExtractionStore``) is provided,
+    files whose SHA-256 and document type were already extracted for the same
+    company skip OCR and the vision LLM, whatever their filename or job; fresh
+    results are recorded on it for the caller to flush.
     """
     if not files_list:
         logger.debug("No files provided for extraction")
@@ -1599,20 +1606,57 @@ async def _build_document_context(
     }
 
     # ===========================================================================
-    # PARALLEL OCR EXTRACTION - Process all files concurrently for better performance
-    # This significantly speeds up 10-12 document batches (from ~6min to ~2min)
+    # PER-DOCUMENT EXTRACTION PIPELINE
+    # Each file runs OCR -> (LC gate) -> vision LLM extraction as its own task,
+    # so a clean PDF is extracted while a slow scan is still in OCR instead of
+    # waiting at a global OCR barrier. LC documents are queued first and are
+    # assembled by the main loop as soon as their own OCR lands; supporting
+    # documents wait only for the LC gate (their content-type promotion reads
+    # the LC's required document types) before taking an extraction slot.
     # ===========================================================================
     ocr_concurrency = max(1, int(os.getenv("OCR_MAX_CONCURRENCY", str(settings.OCR_MAX_CONCURRENCY))))
     ocr_semaphore = asyncio.Semaphore(ocr_concurrency)
-    
+    extraction_llm_concurrency = max(1, int(os.getenv("EXTRACTION_LLM_CONCURRENCY", str(settings.EXTRACTION_LLM_CONCURRENCY))))
+    _extraction_semaphore = asyncio.Semaphore(extraction_llm_concurrency)
+    # One ParsedDocument per upload, shared by OCR, the launch pipeline and
+    # the vision extractor so each file's bytes are parsed/rendered once.
+    parsed_documents: Dict[int, ParsedDocument] = {}
+    extracted_texts: Dict[int, Optional[str]] = {}
+    extraction_artifacts_by_idx: Dict[int, Dict[str, Any]] = {}
+    extraction_errors: Dict[int, str] = {}
+    # Wall-clock stage timings per file index, merged into doc_info["timings_ms"].
+    stage_timings: Dict[int, Dict[str, float]] = {}
+
+    def _elapsed_ms(started_at: float) -> float:
+        return round((time.perf_counter() - started_at) * 1000, 2)
+
     async def _extract_with_semaphore(idx: int, upload_file) -> tuple:
         """Extract text with concurrency limit."""
+        queued_at = time.perf_counter()
         async with ocr_semaphore:
+            stage_timings.setdefault(idx, {})["ocr_queue"] = _elapsed_ms(queued_at)
             filename = getattr(upload_file, "filename", f"document_{idx+1}")
             document_type = _resolve_document_type(filename, idx, normalized_tags)
             logger.info(f"[OCR {idx+1}/{len(files_list)}] Starting extraction for {filename}")
             try:
-                extraction_result = await _extract_text_from_upload(upload_file, document_type=document_type)
+                parsed_document: Optional[ParsedDocument] = parsed_documents.get(idx)
+                try:
+                    upload_bytes = b"" if parsed_document is not None else await upload_file.read()
+                    await upload_file.seek(0)
+                except Exception:
+                    upload_bytes = b""
+                if upload_bytes:
+                    parsed_document = ParsedDocument.from_bytes(
+                        upload_bytes,
+                        filename=filename,
+                        content_type=getattr(upload_file, "content_type", None),
+                    )
+                    parsed_documents[idx] = parsed_document
+                extraction_result = await _extract_text_from_upload(
+                    upload_file,
+                    document_type=document_type,
+                    parsed_document=parsed_document,
+                )
                 text = extraction_result.get("text") or ""
                 artifacts = extraction_result.get("artifacts") or _empty_extraction_artifacts_v1(raw_text=text)
                 logger.info(f"[OCR {idx+1}/{len(files_list)}] Completed {filename}: {len(text) if text else 0} chars")
@@ -1620,30 +1664,6 @@ async def _build_document_context(
             except Exception as e:
                 logger.warning(f"[OCR {idx+1}/{len(files_list)}] Failed {filename}: {e}")
                 return (idx, None, _empty_extraction_artifacts_v1(), str(e))
-    
-    # Run all OCR extractions in parallel (bounded by semaphore)
-    logger.info(f"Starting parallel OCR extraction for {len(files_list)} files (concurrency={ocr_concurrency})")
-    ocr_start = time.time()
-    ocr_tasks = [_extract_with_semaphore(i, f) for i, f in enumerate(files_list)]
-    ocr_results = await asyncio.gather(*ocr_tasks, return_exceptions=True)
-    
-    # Build lookup dicts from OCR stage results
-    extracted_texts: Dict[int, Optional[str]] = {}
-    extraction_artifacts_by_idx: Dict[int, Dict[str, Any]] = {}
-    extraction_errors: Dict[int, str] = {}
-    for result in ocr_results:
-        if isinstance(result, Exception):
-            logger.error(f"OCR task failed with exception: {result}")
-            continue
-        idx, text, artifacts, error = result
-        extracted_texts[idx] = text
-        extraction_artifacts_by_idx[idx] = artifacts or _empty_extraction_artifacts_v1(raw_text=text or "")
-        if error:
-            extraction_errors[idx] = error
-    
-    ocr_elapsed = time.time() - ocr_start
-    logger.info(f"Parallel OCR complete: {len(extracted_texts)} files in {ocr_elapsed:.2f}s")
-    # ===========================================================================
 
     # ===================================================================
     # PREVIOUS EXTRACTION CACHE — reuse results from a prior session
@@ -1683,83 +1703,151 @@ async def _build_document_context(
             return False
     _processing_order.sort(key=lambda i: 0 if _is_lc_index(i) else 1)
 
-    # ===================================================================
-    # PARALLEL VISION LLM EXTRACTION for supporting documents.
-    # LC must be processed first (sequential) to set primary_lc_anchor_seen
-    # and lc_required_document_types. Supporting doc extractions are fired
-    # in parallel after the LC is done, then results are consumed by the
-    # main loop at the process_document call site.
-    # ===================================================================
-    _parallel_prefetch_fired = False
+    # Documents already extracted for this company (same bytes, same type)
+    # are served from the extraction store and skip OCR and the vision LLM.
+    store_keys: Dict[int, Tuple[str, str]] = {}
+    stored_extractions: Dict[int, Dict[str, Any]] = {}
+    if extraction_store is not None:
+        for idx, upload_file in enumerate(files_list):
+            filename = getattr(upload_file, "filename", f"document_{idx+1}")
+            try:
+                upload_bytes = await upload_file.read()
+                await upload_file.seek(0)
+            except Exception:
+                continue
+            if not upload_bytes:
+                continue
+            parsed_documents[idx] = ParsedDocument.from_bytes(
+                upload_bytes,
+                filename=filename,
+                content_type=getattr(upload_file, "content_type", None),
+            )
+            store_keys[idx] = (
+                parsed_documents[idx].content_hash,
+                _resolve_document_type(filename, idx, normalized_tags),
+            )
+        try:
+            # One blocking ORM query; run it off the event loop.
+            stored_by_key = await asyncio.to_thread(extraction_store.lookup, list(store_keys.values()))
+        except Exception as store_exc:
+            logger.warning("Extraction store lookup failed; extracting every file: %s", store_exc)
+            stored_by_key = {}
+        for idx, store_key in store_keys.items():
+            if store_key in stored_by_key:
+                stored_extractions[idx] = stored_by_key[store_key]
+
+    # Set by the main loop once every LC document has been assembled into
+    # ``context``; supporting-document extraction starts behind it.
+    _lc_gate = asyncio.Event()
     _parallel_extraction_results: Dict[int, Optional[Dict[str, Any]]] = {}
-    extraction_llm_concurrency = max(1, int(os.getenv("EXTRACTION_LLM_CONCURRENCY", str(settings.EXTRACTION_LLM_CONCURRENCY))))
 
-    for idx in _processing_order:
-        # ---- Fire parallel extraction after all LC docs are processed ----
-        if not _parallel_prefetch_fired and not _is_lc_index(idx):
-            _parallel_prefetch_fired = True
-            _non_lc_indices = [i for i in _processing_order if not _is_lc_index(i)]
-            _extraction_semaphore = asyncio.Semaphore(extraction_llm_concurrency)
-
-            # Prep: identify which supporting docs need vision LLM
-            _pending_extractions: List[tuple] = []
-            for _nidx in _non_lc_indices:
-                _nf = files_list[_nidx]
-                _nfname = getattr(_nf, "filename", f"document_{_nidx+1}")
-                _ndoctype = _resolve_document_type(_nfname, _nidx, normalized_tags)
-                _ntext = extracted_texts.get(_nidx)
-                _nctype = getattr(_nf, "content_type", "unknown")
-                _nartifacts = extraction_artifacts_by_idx.get(_nidx) or _empty_extraction_artifacts_v1(raw_text=_ntext or "")
-
-                if not _ntext:
-                    continue  # no text, loop body will handle skip
-                _ncached = _cached_doc_by_filename.get(_nfname)
-                if _ncached and isinstance(_ncached, dict) and _ncached.get("extracted_fields"):
-                    continue  # cache hit, loop body will handle
-
-                # Content type promotion (uses LC context from phase 1)
-                _nctr = _maybe_promote_document_type_from_content(
-                    filename=_nfname, current_type=_ndoctype,
-                    extracted_text=_ntext,
-                    required_document_types=lc_required_document_types,
-                    has_primary_lc_anchor=primary_lc_anchor_seen,
-                )
-                if _nctr.get("promoted"):
-                    _ndoctype = str(_nctr.get("document_type") or _ndoctype)
-
-                _fbytes = await _nf.read()
-                await _nf.seek(0)
-                _pending_extractions.append((_nidx, _ntext, _ndoctype, _nfname, _nartifacts, _fbytes, _nctype))
-
-            if _pending_extractions:
-                async def _extract_parallel(_item: tuple) -> tuple:
-                    _i, _txt, _dt, _fn, _art, _fb, _ct = _item
-                    async with _extraction_semaphore:
-                        _pipeline = LaunchExtractionPipeline()
-                        try:
-                            _res = await _pipeline.process_document(
-                                extracted_text=_txt, document_type=_dt, filename=_fn,
-                                extraction_artifacts_v1=_art, file_bytes=_fb, content_type=_ct,
-                            )
-                            return (_i, _res)
-                        except Exception as _exc:
-                            logger.warning("Parallel extraction failed for %s: %s", _fn, _exc, exc_info=True)
-                            return (_i, None)
+    async def _extract_supporting_document(idx: int) -> None:
+        """Vision LLM extraction for one supporting document, after the LC gate."""
+        gate_started_at = time.perf_counter()
+        await _lc_gate.wait()
+        stage_timings.setdefault(idx, {})["lc_gate_wait"] = _elapsed_ms(gate_started_at)
+
+        _nf = files_list[idx]
+        _nfname = getattr(_nf, "filename", f"document_{idx+1}")
+        _ntext = extracted_texts.get(idx)
+        if not _ntext:
+            return  # no text, loop body will handle skip
+        _ncached = _cached_doc_by_filename.get(_nfname)
+        if _ncached and isinstance(_ncached, dict) and _ncached.get("extracted_fields"):
+            return  # cache hit, loop body will handle
+
+        # Content type promotion (uses LC context from the gate)
+        _ndoctype = _resolve_document_type(_nfname, idx, normalized_tags)
+        _nctr = _maybe_promote_document_type_from_content(
+            filename=_nfname, current_type=_ndoctype,
+            extracted_text=_ntext,
+            required_document_types=lc_required_document_types,
+            has_primary_lc_anchor=primary_lc_anchor_seen,
+        )
+        if _nctr.get("promoted"):
+            _ndoctype = str(_nctr.get("document_type") or _ndoctype)
 
-                logger.info(
-                    "Starting parallel vision LLM for %d supporting docs (concurrency=%d)",
-                    len(_pending_extractions), extraction_llm_concurrency,
-                )
-                _par_start = time.time()
-                _par_results = await asyncio.gather(*[_extract_parallel(p) for p in _pending_extractions])
-                for _pi, _pr in _par_results:
-                    _parallel_extraction_results[_pi] = _pr
-                logger.info(
-                    "Parallel vision LLM done: %d docs in %.2fs",
-                    len(_pending_extractions), time.time() - _par_start,
+        _nparsed = parsed_documents.get(idx)
+        if _nparsed is not None:
+            _fbytes = _nparsed.content
+        else:
+            _fbytes = await _nf.read()
+            await _nf.seek(0)
+        _nartifacts = extraction_artifacts_by_idx.get(idx) or _empty_extraction_artifacts_v1(raw_text=_ntext or "")
+
+        queued_at = time.perf_counter()
+        async with _extraction_semaphore:
+            stage_timings[idx]["extraction_queue"] = _elapsed_ms(queued_at)
+            started_at = time.perf_counter()
+            _pipeline = LaunchExtractionPipeline()
+            try:
+                _parallel_extraction_results[idx] = await _pipeline.process_document(
+                    extracted_text=_ntext, document_type=_ndoctype, filename=_nfname,
+                    extraction_artifacts_v1=_nartifacts, file_bytes=_fbytes, content_type=getattr(_nf, "content_type", "unknown"),
+                    parsed_document=_nparsed,
                 )
-        # ---- End parallel prefetch ----
+            except Exception as _exc:
+                logger.warning("Parallel extraction failed for %s: %s", _nfname, _exc, exc_info=True)
+                _parallel_extraction_results[idx] = None
+            stage_timings[idx]["launch_pipeline"] = _elapsed_ms(started_at)
+
+    async def _run_document_pipeline(idx: int) -> None:
+        started_at = time.perf_counter()
+        stored = stored_extractions.get(idx)
+        if stored is not None:
+            stored_text = stored.get("text") or ""
+            extracted_texts[idx] = stored_text
+            extraction_artifacts_by_idx[idx] = stored.get("artifacts") or _empty_extraction_artifacts_v1(raw_text=stored_text)
+            _parallel_extraction_results[idx] = stored.get("launch_result")
+            stage_timings.setdefault(idx, {})["pipeline"] = _elapsed_ms(started_at)
+            return
+        try:
+            _, text, artifacts, error = await _extract_with_semaphore(idx, files_list[idx])
+            extracted_texts[idx] = text
+            extraction_artifacts_by_idx[idx] = artifacts or _empty_extraction_artifacts_v1(raw_text=text or "")
+            if error:
+                extraction_errors[idx] = error
+            stage_timings.setdefault(idx, {})["ocr_stage"] = _elapsed_ms(started_at)
+            # LC documents are extracted by the main loop itself, in order.
+            if not _is_lc_index(idx):
+                await _extract_supporting_document(idx)
+        except Exception as e:
+            logger.error(f"Document pipeline failed for index {idx}: {e}", exc_info=True)
+        finally:
+            stage_timings.setdefault(idx, {})["pipeline"] = _elapsed_ms(started_at)
+
+    async def _documents_in_order():
+        """Yield file indexes in processing order as each one's pipeline is ready.
+
+        Tasks are created in processing order, so LC files take the first OCR
+        slots (asyncio semaphores are FIFO). Reaching the first supporting file
+        means every LC has been assembled, which opens the LC gate.
+        """
+        tasks = {idx: asyncio.create_task(_run_document_pipeline(idx)) for idx in _processing_order}
+        try:
+            for idx in _processing_order:
+                if not _is_lc_index(idx) and not _lc_gate.is_set():
+                    _lc_gate.set()
+                # LC tasks finish at OCR; supporting-doc tasks also include
+                # their (gated) extraction, which overlaps with earlier files.
+                await tasks[idx]
+                yield idx
+        finally:
+            _lc_gate.set()
+            pending = [task for task in tasks.values() if not task.done()]
+            for task in pending:
+                task.cancel()
+            # Let cancelled pipelines unwind before the request moves on, so
+            # none of them is still holding an OCR/extraction slot.
+            await asyncio.gather(*pending, return_exceptions=True)
 
+    logger.info(
+        "Starting per-document extraction pipeline for %d files (ocr_concurrency=%d, extraction_concurrency=%d)",
+        len(files_list), ocr_concurrency, extraction_llm_concurrency,
+    )
+    pipeline_started_at = time.perf_counter()
+
+    async for idx in _documents_in_order():
         upload_file = files_list[idx]
         filename = getattr(upload_file, "filename", f"document_{idx+1}")
         content_type = getattr(upload_file, "content_type", "unknown")
@@ -1780,7 +1868,7 @@ async def _build_document_context(
         
         logger.info(f"Processing file {idx+1}/{len(files_list)}: {filename} (type: {document_type}, content-type: {content_type})")
         
-        # Use pre-extracted text + artifacts from parallel OCR phase
+        # Use pre-extracted text + artifacts from this file's pipeline task
         extracted_text = extracted_texts.get(idx)
         extraction_artifacts_v1 = extraction_artifacts_by_idx.get(idx) or _empty_extraction_artifacts_v1(raw_text=extracted_text or "")
         doc_info["extraction_artifacts_v1"] = extraction_artifacts_v1
@@ -1791,6 +1879,9 @@ async def _build_document_context(
                 doc_info.setdefault("timings_ms", {})["ocr"] = round(float(ocr_elapsed_ms), 2)
             except Exception:
                 pass
+        doc_info["timings_ms"].update(stage_timings.get(idx) or {})
+        if idx in stored_extractions:
+            doc_info["_reused_from_extraction_store"] = True
 
         artifacts_index = context.setdefault("document_artifacts_v1", {})
         artifacts_index[document_id] = extraction_artifacts_v1
@@ -1874,8 +1965,12 @@ async def _build_document_context(
             logger.info("Using parallel-prefetched extraction for %s", filename)
         elif document_type in ("letter_of_credit", "swift_message", "lc_application", "commercial_invoice", "proforma_invoice", "bill_of_lading", "packing_list", "certificate_of_origin", "insurance_certificate", "insurance_policy", "inspection_certificate", "pre_shipment_inspection", "quality_certificate", "weight_certificate", "weight_list", "measurement_certificate", "analysis_certificate", "lab_test_report", "sgs_certificate", "bureau_veritas_certificate", "intertek_certificate", "beneficiary_certificate", "manufacturer_certificate", "conformity_certificate", "non_manipulation_certificate", "phytosanitary_certificate", "fumigation_certificate", "health_certificate", "veterinary_certificate", "sanitary_certificate", "halal_certificate", "kosher_certificate", "organic_certificate", "gsp_form_a", "eur1_movement_certificate", "customs_declaration", "export_license", "import_license", "air_waybill", "sea_waybill", "road_transport_document", "railway_consignment_note", "forwarder_certificate_of_receipt", "shipping_company_certificate", "warehouse_receipt", "cargo_manifest", "supporting_document"):
             try:
-                file_bytes = await upload_file.read()
-                await upload_file.seek(0)
+                parsed_document = parsed_documents.get(idx)
+                if parsed_document is not None:
+                    file_bytes = parsed_document.content
+                else:
+                    file_bytes = await upload_file.read()
+                    await upload_file.seek(0)
                 launch_pipeline_result = await launch_pipeline.process_document(
                     extracted_text=extracted_text,
                     document_type=document_type,
@@ -1883,11 +1978,28 @@ async def _build_document_context(
                     extraction_artifacts_v1=extraction_artifacts_v1,
                     file_bytes=file_bytes,
                     content_type=content_type,
+                    parsed_document=parsed_document,
                 )
             except Exception as launch_exc:
                 logger.warning("Launch extraction pipeline failed for %s: %s", filename, launch_exc, exc_info=True)
                 launch_pipeline_result = None
-        doc_info.setdefault("timings_ms", {})["launch_pipeline"] = round((time.perf_counter() - launch_pipeline_started_at) * 1000, 2)
+        if idx in _parallel_extraction_results:
+            doc_info.setdefault("timings_ms", {})["launch_pipeline"] = (stage_timings.get(idx) or {}).get("launch_pipeline", 0.0)
+        else:
+            doc_info.setdefault("timings_ms", {})["launch_pipeline"] = round((time.perf_counter() - launch_pipeline_started_at) * 1000, 2)
+        if (
+            extraction_store is not None
+            and idx in store_keys
+            and idx not in stored_extractions
+            and launch_pipeline_result
+            and launch_pipeline_result.get("handled")
+        ):
+            extraction_store.record(
+                *store_keys[idx],
+                text=extracted_text,
+                artifacts=extraction_artifacts_v1,
+                launch_result=launch_pipeline_result,
+            )
 
         try:
             if launch_pipeline_result and launch_pipeline_result.get("handled"):
@@ -2193,6 +2305,13 @@ async def _build_document_context(
         entry["present"] = True
         entry["count"] += 1
 
+    logger.info(
+        "Per-document extraction pipeline complete: %d files in %.2fs (slowest file %.2fs)",
+        len(files_list),
+        time.perf_counter() - pipeline_started_at,
+        max((timings.get("pipeline", 0.0) for timings in stage_timings.values()), default=0.0) / 1000,
+    )
+
     text_backed_documents = any(
         bool(((doc.get("extraction_artifacts_v1") or {}).get("raw_text") or "").strip())
         or bool((doc.get("raw_text_preview") or "").strip())
@@ -6,12 +6,17 @@ import asyncio
 import logging
 import os
 import re
-from io import BytesIO
-from typing import Any, Dict, List, Optional, Tuple
+import weakref
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from app.config import settings
+from app.utils import pdf_workers
 from app.utils.logger import TRACE_LOG_LEVEL
 
+if TYPE_CHECKING:
+    from app.services.extraction.parsed_document import ParsedDocument
+
 
 logger = logging.getLogger(__name__)
 
@@ -355,11 +360,21 @@ def _extract_plaintext_bytes(file_bytes: bytes) -> str:
     return ""
 
 
+def _pdf_tiff_normalization_applies(file_bytes: bytes, page_count: int) -> bool:
+    """Whether ``_normalize_ocr_input`` would render this PDF to a multi-page TIFF."""
+    if not getattr(settings, "OCR_NORMALIZATION_SHIM_ENABLED", True):
+        return False
+    if page_count and page_count > int(getattr(settings, "OCR_MAX_PAGES", 50) or 50):
+        return False
+    return len(file_bytes) <= int(getattr(settings, "OCR_MAX_BYTES", 50 * 1024 * 1024) or (50 * 1024 * 1024))
+
+
 def _normalize_ocr_input(
     file_bytes: bytes,
     filename: str,
     content_type: str,
     provider_name: Optional[str] = None,
+    parsed_document: Optional["ParsedDocument"] = None,
 ) -> Dict[str, Any]:
     detected_mime = _detect_input_mime_type(file_bytes, filename, content_type)
     dpi = max(72, int(getattr(settings, "OCR_NORMALIZATION_DPI", 300) or 300))
@@ -375,17 +390,9 @@ def _normalize_ocr_input(
         }
 
     if detected_mime == "application/pdf":
-        page_count = 0
-        try:
-            from PyPDF2 import PdfReader  # type: ignore[reportMissingImports]
+        page_count = _pdf_page_count(file_bytes, parsed_document=parsed_document)
 
-            page_count = len(PdfReader(BytesIO(file_bytes)).pages)
-        except Exception:
-            page_count = 0
-
-        if (
-            page_count and page_count > int(getattr(settings, "OCR_MAX_PAGES", 50) or 50)
-        ) or len(file_bytes) > int(getattr(settings, "OCR_MAX_BYTES", 50 * 1024 * 1024) or (50 * 1024 * 1024)):
+        if not _pdf_tiff_normalization_applies(file_bytes, page_count):
             return {
                 "content": file_bytes,
                 "content_type": detected_mime,
@@ -397,33 +404,15 @@ def _normalize_ocr_input(
             }
 
         try:
-            from pdf2image import convert_from_bytes  # type: ignore
-            from PIL import ImageOps  # type: ignore
-
-            rendered_pages = convert_from_bytes(file_bytes, dpi=dpi, fmt="png", thread_count=1)
-            if not rendered_pages:
-                raise ValueError("pdf_render_empty")
-            normalized_pages = []
-            for image in rendered_pages:
-                normalized = ImageOps.exif_transpose(image)
-                if normalized.mode != "RGB":
-                    normalized = normalized.convert("RGB")
-                normalized_pages.append(normalized)
-
-            buffer = BytesIO()
-            normalized_pages[0].save(
-                buffer,
-                format="TIFF",
-                save_all=True,
-                append_images=normalized_pages[1:],
-                compression="tiff_deflate",
-                dpi=(dpi, dpi),
-            )
+            if parsed_document is not None:
+                tiff_bytes, rendered_pages = parsed_document.render_tiff(dpi=dpi)
+            else:
+                tiff_bytes, rendered_pages = pdf_workers.render_pdf_tiff(file_bytes, dpi)
             return {
-                "content": buffer.getvalue(),
+                "content": tiff_bytes,
                 "content_type": "image/tiff",
                 "original_content_type": detected_mime,
-                "page_count": len(normalized_pages),
+                "page_count": rendered_pages,
                 "dpi": dpi,
                 "provider": provider_name,
                 "error_code": None,
@@ -443,17 +432,14 @@ def _normalize_ocr_input(
 
     if detected_mime.startswith("image/"):
         try:
-            from PIL import Image, ImageOps  # type: ignore
-
-            image = Image.open(BytesIO(file_bytes))
-            normalized = ImageOps.exif_transpose(image)
-            if normalized.mode != "RGB":
-                normalized = normalized.convert("RGB")
-
-            buffer = BytesIO()
-            normalized.save(buffer, format="PNG", dpi=(dpi, dpi))
+            normalized_bytes = _normalize_runtime_image_bytes(
+                file_bytes,
+                dpi=dpi,
+                output_format="PNG",
+                parsed_document=parsed_document,
+            )
             return {
-                "content": buffer.getvalue(),
+                "content": normalized_bytes,
                 "content_type": "image/png",
                 "original_content_type": detected_mime,
                 "page_count": 1,
@@ -491,8 +477,15 @@ def _prepare_provider_ocr_payload(
     file_bytes: bytes,
     filename: str,
     content_type: str,
+    parsed_document: Optional["ParsedDocument"] = None,
 ) -> Dict[str, Any]:
-    normalized_input = _normalize_ocr_input(file_bytes, filename, content_type, provider_name)
+    normalized_input = _normalize_ocr_input(
+        file_bytes,
+        filename,
+        content_type,
+        provider_name,
+        parsed_document=parsed_document,
+    )
     original_mime = _detect_input_mime_type(file_bytes, filename, content_type)
 
     compat_enabled = _ocr_compatibility_v1_enabled()
@@ -654,11 +647,11 @@ def _provider_runtime_limits(provider_name: str) -> Dict[str, Any]:
     )
 
 
-def _pdf_page_count(file_bytes: bytes) -> int:
+def _pdf_page_count(file_bytes: bytes, parsed_document: Optional["ParsedDocument"] = None) -> int:
+    if parsed_document is not None:
+        return parsed_document.page_count
     try:
-        from PyPDF2 import PdfReader  # type: ignore[reportMissingImports]
-
-        return len(PdfReader(BytesIO(file_bytes)).pages)
+        return pdf_workers.pdf_page_count(file_bytes)
     except Exception:
         return 0
 
@@ -668,28 +661,12 @@ def _render_pdf_runtime_images(
     *,
     dpi: int,
     output_format: str,
+    parsed_document: Optional["ParsedDocument"] = None,
 ) -> List[bytes]:
-    from pdf2image import convert_from_bytes  # type: ignore
-    from PIL import ImageOps  # type: ignore
-
-    fmt = output_format.upper()
-    save_format = "JPEG" if fmt == "JPEG" else "PNG"
-    rendered_pages = convert_from_bytes(file_bytes, dpi=dpi, fmt=save_format.lower(), thread_count=1)
-    page_payloads: List[bytes] = []
-    for image in rendered_pages:
-        normalized = ImageOps.exif_transpose(image)
-        if fmt == "JPEG":
-            if normalized.mode != "RGB":
-                normalized = normalized.convert("RGB")
-        elif normalized.mode != "RGB":
-            normalized = normalized.convert("RGB")
-        buffer = BytesIO()
-        save_kwargs: Dict[str, Any] = {"format": save_format, "dpi": (dpi, dpi)}
-        if save_format == "JPEG":
-            save_kwargs["quality"] = 90
-        normalized.save(buffer, **save_kwargs)
-        page_payloads.append(buffer.getvalue())
-    return page_payloads
+    if parsed_document is not None:
+        return parsed_document.render_pages(dpi=dpi, output_format=output_format)
+    save_format = "JPEG" if output_format.upper() == "JPEG" else "PNG"
+    return pdf_workers.render_pdf_pages(file_bytes, dpi, (save_format,))[save_format]
 
 
 def _normalize_runtime_image_bytes(
@@ -697,23 +674,11 @@ def _normalize_runtime_image_bytes(
     *,
     dpi: int,
     output_format: str,
+    parsed_document: Optional["ParsedDocument"] = None,
 ) -> bytes:
-    from PIL import Image, ImageOps  # type: ignore
-
-    image = Image.open(BytesIO(file_bytes))
-    normalized = ImageOps.exif_transpose(image)
-    save_format = "JPEG" if output_format.upper() == "JPEG" else "PNG"
-    if save_format == "JPEG":
-        if normalized.mode != "RGB":
-            normalized = normalized.convert("RGB")
-    elif normalized.mode != "RGB":
-        normalized = normalized.convert("RGB")
-    buffer = BytesIO()
-    save_kwargs: Dict[str, Any] = {"format": save_format, "dpi": (dpi, dpi)}
-    if save_format == "JPEG":
-        save_kwargs["quality"] = 90
-    normalized.save(buffer, **save_kwargs)
-    return buffer.getvalue()
+    if parsed_document is not None:
+        return parsed_document.normalized_image(dpi=dpi, output_format=output_format)
+    return pdf_workers.normalize_image_bytes(file_bytes, dpi, output_format)
 
 
 def _build_runtime_payload_entry(
@@ -729,7 +694,10 @@ def _build_runtime_payload_entry(
     retry_used: bool,
     dpi: Optional[int] = None,
     page_index: Optional[int] = None,
+    render: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
+    """One provider payload. With ``render`` set, ``content`` is produced on
+    first use by ``_materialize_runtime_payload`` (lazy page/format rendering)."""
     return {
         "provider": provider_name,
         "content": file_bytes,
@@ -743,6 +711,7 @@ def _build_runtime_payload_entry(
         "bytes_sent": int(bytes_sent),
         "payload_source": payload_source,
         "retry_used": bool(retry_used),
+        "render": render,
     }
 
 
@@ -751,11 +720,12 @@ def _build_google_docai_payload_plan(
     file_bytes: bytes,
     filename: str,
     content_type: str,
+    parsed_document: Optional["ParsedDocument"] = None,
 ) -> Dict[str, Any]:
     input_mime = _detect_input_mime_type(file_bytes, filename, content_type)
     limits = _provider_runtime_limits(provider_name)
     dpi = max(72, int(getattr(settings, "OCR_NORMALIZATION_DPI", 300) or 300))
-    page_count = _pdf_page_count(file_bytes) if input_mime == "application/pdf" else 1
+    page_count = _pdf_page_count(file_bytes, parsed_document=parsed_document) if input_mime == "application/pdf" else 1
 
     if page_count and page_count > int(limits["max_pages"]):
         return {"groups": [], "aggregate_pages": False, "error_code": "OCR_UNSUPPORTED_FORMAT", "error": f"page_limit_exceeded:{page_count}"}
@@ -777,8 +747,33 @@ def _build_google_docai_payload_plan(
             dpi=dpi,
         )
         fallback_groups = [primary]
+        if parsed_document is not None and _pdf_tiff_normalization_applies(file_bytes, page_count):
+            # The TIFF retry is rendered only if the direct PDF attempt fails.
+            fallback_groups.append(
+                _build_runtime_payload_entry(
+                    provider_name=provider_name,
+                    file_bytes=b"",
+                    filename=filename,
+                    input_mime=input_mime,
+                    normalized_mime="image/tiff",
+                    page_count=max(1, page_count),
+                    bytes_sent=0,
+                    payload_source="runtime_pdf_retry_image",
+                    retry_used=True,
+                    dpi=dpi,
+                    render={"kind": "pdf_tiff"},
+                )
+            )
+            groups.append(fallback_groups)
+            return {"groups": groups, "aggregate_pages": False, "error_code": None, "error": None}
         try:
-            normalized = _normalize_ocr_input(file_bytes, filename, content_type, provider_name)
+            normalized = _normalize_ocr_input(
+                file_bytes,
+                filename,
+                content_type,
+                provider_name,
+                parsed_document=parsed_document,
+            )
             if normalized.get("error_code") is None and normalized.get("content"):
                 fallback_groups.append(
                     _build_runtime_payload_entry(
@@ -799,7 +794,12 @@ def _build_google_docai_payload_plan(
         groups.append(fallback_groups)
     elif input_mime.startswith("image/"):
         try:
-            primary_bytes = _normalize_runtime_image_bytes(file_bytes, dpi=dpi, output_format="PNG")
+            primary_bytes = _normalize_runtime_image_bytes(
+                file_bytes,
+                dpi=dpi,
+                output_format="PNG",
+                parsed_document=parsed_document,
+            )
             group = [
                 _build_runtime_payload_entry(
                     provider_name=provider_name,
@@ -843,6 +843,7 @@ def _build_textract_payload_plan(
     file_bytes: bytes,
     filename: str,
     content_type: str,
+    parsed_document: Optional["ParsedDocument"] = None,
 ) -> Dict[str, Any]:
     input_mime = _detect_input_mime_type(file_bytes, filename, content_type)
     limits = _provider_runtime_limits(provider_name)
@@ -851,49 +852,48 @@ def _build_textract_payload_plan(
     groups: List[List[Dict[str, Any]]] = []
     try:
         if input_mime == "application/pdf":
-            png_pages = _render_pdf_runtime_images(file_bytes, dpi=dpi, output_format="PNG")
-            jpeg_pages = _render_pdf_runtime_images(file_bytes, dpi=dpi, output_format="JPEG")
-            page_count = len(png_pages)
+            # Pages are rendered when their OCR call is scheduled, and the
+            # JPEG retry only when that page's PNG attempt was rejected.
+            page_count = _pdf_page_count(file_bytes, parsed_document=parsed_document)
+            if page_count <= 0:
+                return {"groups": [], "aggregate_pages": True, "error_code": "OCR_UNSUPPORTED_FORMAT", "error": "pdf_page_count_unavailable"}
             if page_count > int(limits["max_pages"]):
                 return {"groups": [], "aggregate_pages": True, "error_code": "OCR_UNSUPPORTED_FORMAT", "error": f"page_limit_exceeded:{page_count}"}
-            for page_index, page_bytes in enumerate(png_pages, start=1):
-                if len(page_bytes) > int(limits["max_bytes"]):
-                    return {"groups": [], "aggregate_pages": True, "error_code": "OCR_UNSUPPORTED_FORMAT", "error": f"byte_limit_exceeded:{len(page_bytes)}"}
-                group = [
-                    _build_runtime_payload_entry(
-                        provider_name=provider_name,
-                        file_bytes=page_bytes,
-                        filename=filename,
-                        input_mime=input_mime,
-                        normalized_mime="image/png",
-                        page_count=page_count,
-                        page_index=page_index,
-                        bytes_sent=len(page_bytes),
-                        payload_source="runtime_pdf_page_png",
-                        retry_used=False,
-                        dpi=dpi,
-                    )
-                ]
-                if page_index <= len(jpeg_pages):
-                    group.append(
+            for page_index in range(1, page_count + 1):
+                groups.append(
+                    [
                         _build_runtime_payload_entry(
                             provider_name=provider_name,
-                            file_bytes=jpeg_pages[page_index - 1],
+                            file_bytes=b"",
+                            filename=filename,
+                            input_mime=input_mime,
+                            normalized_mime="image/png",
+                            page_count=page_count,
+                            page_index=page_index,
+                            bytes_sent=0,
+                            payload_source="runtime_pdf_page_png",
+                            retry_used=False,
+                            dpi=dpi,
+                            render={"kind": "pdf_page", "page_index": page_index, "format": "PNG"},
+                        ),
+                        _build_runtime_payload_entry(
+                            provider_name=provider_name,
+                            file_bytes=b"",
                             filename=filename,
                             input_mime=input_mime,
                             normalized_mime="image/jpeg",
                             page_count=page_count,
                             page_index=page_index,
-                            bytes_sent=len(jpeg_pages[page_index - 1]),
+                            bytes_sent=0,
                             payload_source="runtime_pdf_page_jpeg_retry",
                             retry_used=True,
                             dpi=dpi,
-                        )
-                    )
-                groups.append(group)
+                            render={"kind": "pdf_page", "page_index": page_index, "format": "JPEG"},
+                        ),
+                    ]
+                )
         elif input_mime.startswith("image/"):
-            png_bytes = _normalize_runtime_image_bytes(file_bytes, dpi=dpi, output_format="PNG")
-            jpeg_bytes = _normalize_runtime_image_bytes(file_bytes, dpi=dpi, output_format="JPEG")
+            png_bytes = _normalize_runtime_image_bytes(file_bytes, dpi=dpi, output_format="PNG", parsed_document=parsed_document)
             groups.append(
                 [
                     _build_runtime_payload_entry(
@@ -910,15 +910,16 @@ def _build_textract_payload_plan(
                     ),
                     _build_runtime_payload_entry(
                         provider_name=provider_name,
-                        file_bytes=jpeg_bytes,
+                        file_bytes=b"",
                         filename=filename,
                         input_mime=input_mime,
                         normalized_mime="image/jpeg",
                         page_count=1,
-                        bytes_sent=len(jpeg_bytes),
+                        bytes_sent=0,
                         payload_source="runtime_image_jpeg_retry",
                         retry_used=True,
                         dpi=dpi,
+                        render={"kind": "image", "format": "JPEG"},
                     ),
                 ]
             )
@@ -935,9 +936,16 @@ def _build_provider_runtime_payload_plan(
     file_bytes: bytes,
     filename: str,
     content_type: str,
+    parsed_document: Optional["ParsedDocument"] = None,
 ) -> Dict[str, Any]:
     if not _ocr_adapter_runtime_payload_fix_v1_enabled():
-        payload = _prepare_provider_ocr_payload(provider_name, file_bytes, filename, content_type)
+        payload = _prepare_provider_ocr_payload(
+            provider_name,
+            file_bytes,
+            filename,
+            content_type,
+            parsed_document=parsed_document,
+        )
         if payload.get("error_code"):
             return {
                 "groups": [],
@@ -967,10 +975,52 @@ def _build_provider_runtime_payload_plan(
 
     provider_key = str(provider_name or "").strip().lower()
     if provider_key in {"google_documentai", "ocr_service"}:
-        return _build_google_docai_payload_plan(provider_name, file_bytes, filename, content_type)
+        return _build_google_docai_payload_plan(provider_name, file_bytes, filename, content_type, parsed_document=parsed_document)
     if provider_key == "aws_textract":
-        return _build_textract_payload_plan(provider_name, file_bytes, filename, content_type)
-    return _build_google_docai_payload_plan(provider_name, file_bytes, filename, content_type)
+        return _build_textract_payload_plan(provider_name, file_bytes, filename, content_type, parsed_document=parsed_document)
+    return _build_google_docai_payload_plan(provider_name, file_bytes, filename, content_type, parsed_document=parsed_document)
+
+
+async def _warm_provider_runtime_payloads(
+    provider_name: str,
+    file_bytes: bytes,
+    filename: str,
+    content_type: str,
+    parsed_document: Optional["ParsedDocument"],
+) -> None:
+    """Render the artifacts a provider plan will need in the CPU pool.
+
+    Plan builders are synchronous; warming the ``ParsedDocument`` memo first
+    means their page counts, renders and re-encodes are cache hits instead of
+    CPU work on the event loop. Failures are memoised and surface through the
+    plan builder's own error handling.
+    """
+    if parsed_document is None:
+        return
+    input_mime = _detect_input_mime_type(file_bytes, filename, content_type)
+    dpi = max(72, int(getattr(settings, "OCR_NORMALIZATION_DPI", 300) or 300))
+    payload_fix_enabled = _ocr_adapter_runtime_payload_fix_v1_enabled()
+    shim_enabled = bool(getattr(settings, "OCR_NORMALIZATION_SHIM_ENABLED", True))
+    try:
+        if input_mime == "application/pdf":
+            page_count = await parsed_document.page_count_async()
+            if payload_fix_enabled:
+                return  # page images and the TIFF retry are rendered per OCR call (_materialize_runtime_payload)
+            if not shim_enabled:
+                return
+            limits = {
+                "max_pages": int(getattr(settings, "OCR_MAX_PAGES", 50) or 50),
+                "max_bytes": int(getattr(settings, "OCR_MAX_BYTES", 50 * 1024 * 1024) or (50 * 1024 * 1024)),
+            }
+            if page_count > int(limits["max_pages"]) or len(file_bytes) > int(limits["max_bytes"]):
+                return
+            await parsed_document.render_tiff_async(dpi=dpi)
+        elif input_mime.startswith("image/"):
+            if not payload_fix_enabled and not shim_enabled:
+                return
+            await parsed_document.normalized_image_async(dpi=dpi, output_format="PNG")
+    except Exception as exc:  # noqa: BLE001 - plan builders report the memoised error
+        logger.debug("ocr.payload_warm_failed provider=%s file=%s error=%s", provider_name, filename, exc)
 
 
 def _build_provider_attempt_record(
@@ -998,9 +1048,162 @@ def _build_provider_attempt_record(
         "page_count": int(payload.get("page_count") or 1),
         "bytes_sent": int(payload.get("bytes_sent") or 0),
         "payload_source": payload.get("payload_source"),
+        "cache_hit": bool(payload.get("cache_hit")),
+    }
+
+
+def _ocr_result_to_cache_payload(result: Any) -> Dict[str, Any]:
+    elements: List[Dict[str, Any]] = []
+    for element in getattr(result, "elements", None) or []:
+        bbox = getattr(element, "bounding_box", None)
+        elements.append(
+            {
+                "text": element.text,
+                "confidence": element.confidence,
+                "element_type": element.element_type,
+                "bbox": [bbox.x1, bbox.y1, bbox.x2, bbox.y2, bbox.page] if bbox else None,
+            }
+        )
+    metadata = getattr(result, "metadata", None)
+    return {
+        "full_text": getattr(result, "full_text", "") or "",
+        "overall_confidence": getattr(result, "overall_confidence", None),
+        "elements": elements,
+        "metadata": metadata if isinstance(metadata, dict) else {},
+        "processing_time_ms": getattr(result, "processing_time_ms", 0) or 0,
+        "provider": getattr(result, "provider", None),
+        "error": getattr(result, "error", None),
     }
 
 
+def _ocr_result_from_cache_payload(payload: Dict[str, Any]) -> Any:
+    from uuid import uuid4
+    from app.ocr.base import BoundingBox, OCRResult, OCRTextElement
+
+    elements = []
+    for element in payload.get("elements") or []:
+        bbox = element.get("bbox")
+        elements.append(
+            OCRTextElement(
+                text=element.get("text") or "",
+                confidence=element.get("confidence") or 0.0,
+                bounding_box=BoundingBox(*bbox) if bbox else None,
+                element_type=element.get("element_type") or "word",
+            )
+        )
+    return OCRResult(
+        document_id=uuid4(),
+        full_text=payload.get("full_text") or "",
+        overall_confidence=payload.get("overall_confidence") or 0.0,
+        elements=elements,
+        metadata=payload.get("metadata") or {},
+        processing_time_ms=int(payload.get("processing_time_ms") or 0),
+        provider=payload.get("provider") or "",
+        error=payload.get("error"),
+    )
+
+
+def _ocr_cache_payload_usable(payload: Dict[str, Any]) -> bool:
+    text = payload.get("full_text") if "full_text" in payload else payload.get("text")
+    return bool((text or "").strip()) and not payload.get("error")
+
+
+async def _run_ocr_payload_cached(
+    provider_name: str,
+    content: bytes,
+    content_type: str,
+    call: Callable[[], Awaitable[Dict[str, Any]]],
+) -> Tuple[Dict[str, Any], bool]:
+    """Run one provider payload through the per-page OCR cache.
+
+    The key is the hash of the bytes actually sent, so unchanged pages of a
+    re-uploaded document are served from cache and concurrent uploads of the
+    same bytes share one provider call. Only non-empty, error-free results
+    are stored.
+    """
+    if not getattr(settings, "OCR_CACHE_ENABLED", True):
+        return await call(), False
+    from app.cache import ocr_cache
+
+    cache_key = ocr_cache.build_page_key(provider_name, content, content_type)
+    return await ocr_cache.get_or_compute(cache_key, call, should_cache=_ocr_cache_payload_usable)
+
+
+_ocr_page_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+
+
+@asynccontextmanager
+async def _ocr_provider_slot(provider_name: str) -> AsyncIterator[None]:
+    """Bound concurrent page calls per OCR provider (``OCR_PROVIDER_MAX_CONCURRENCY``)."""
+    loop = asyncio.get_running_loop()
+    semaphores = _ocr_page_semaphores.get(loop)
+    if semaphores is None:
+        semaphores = _ocr_page_semaphores[loop] = {}
+    semaphore = semaphores.get(provider_name)
+    if semaphore is None:
+        limit = max(1, int(getattr(settings, "OCR_PROVIDER_MAX_CONCURRENCY", 8) or 8))
+        semaphore = semaphores[provider_name] = asyncio.Semaphore(limit)
+    async with semaphore:
+        yield
+
+
+async def _materialize_runtime_payload(
+    payload: Dict[str, Any],
+    file_bytes: bytes,
+    parsed_document: "ParsedDocument",
+) -> Dict[str, Any]:
+    """Render a lazy payload's page/format; byte-limit violations come back as ``guardrail_error``.
+
+    Render failures are reported the same way, so one bad page fails only its
+    own attempt instead of cancelling every other page group (a failed
+    ``_normalize_ocr_input`` used to drop the TIFF retry entry likewise).
+    """
+    render = payload.get("render")
+    if not render:
+        return payload
+    dpi = int(payload.get("dpi") or 300)
+    if render.get("kind") == "pdf_tiff":
+        try:
+            content, rendered_pages = await parsed_document.render_tiff_async(dpi=dpi)
+        except Exception as exc:  # noqa: BLE001 - surfaced as this attempt's error
+            payload["guardrail_error"] = f"tiff_render_failed:{exc}"
+            return payload
+        payload["page_count"] = int(rendered_pages or payload.get("page_count") or 1)
+    else:
+        try:
+            if render.get("kind") == "pdf_page":
+                content = await parsed_document.render_page_async(
+                    dpi=dpi,
+                    page_index=int(render.get("page_index") or 1),
+                    output_format=str(render.get("format") or "PNG"),
+                )
+            else:
+                content = await parsed_document.normalized_image_async(
+                    dpi=dpi, output_format=str(render.get("format") or "PNG")
+                )
+        except Exception as exc:  # noqa: BLE001 - surfaced as this attempt's error
+            payload["guardrail_error"] = f"page_render_failed:{exc}"
+            return payload
+    payload["content"] = content
+    payload["bytes_sent"] = len(content)
+    max_bytes = int(_provider_runtime_limits(str(payload.get("provider") or "")).get("max_bytes") or 0)
+    if max_bytes and len(content) > max_bytes:
+        payload["guardrail_error"] = f"byte_limit_exceeded:{len(content)}"
+    return payload
+
+
+async def _gather_ocr_page_groups(coros: List[Awaitable[Any]]) -> List[Any]:
+    """Run page groups concurrently, results in page order; the first failure cancels the rest."""
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
 def _map_ocr_provider_error_code(error: Optional[str]) -> Optional[str]:
     if not error:
         return None
@@ -1451,8 +1654,17 @@ def _select_best_extraction_stage(
     return {"stage": selected_stage, "text": selected_text}
 
 
-async def _extract_text_from_upload(upload_file: Any, document_type: Optional[str] = None) -> Dict[str, Any]:
-    """Extract text + normalized OCR artifacts from an uploaded file."""
+async def _extract_text_from_upload(
+    upload_file: Any,
+    document_type: Optional[str] = None,
+    parsed_document: Optional["ParsedDocument"] = None,
+) -> Dict[str, Any]:
+    """Extract text + normalized OCR artifacts from an uploaded file.
+
+    When ``parsed_document`` is supplied its memoised text layers, page count
+    and page renders are reused instead of re-parsing the upload bytes. PDF
+    parsing and rendering run in the CPU process pool (``app.utils.cpu_pool``).
+    """
     filename = getattr(upload_file, "filename", "unknown")
     content_type = getattr(upload_file, "content_type", "unknown")
     hotfix_enabled = _extraction_fallback_hotfix_enabled()
@@ -1460,8 +1672,11 @@ async def _extract_text_from_upload(upload_file: Any, document_type: Optional[st
     logger.log(TRACE_LOG_LEVEL, "Starting text extraction for %s (type=%s)", filename, content_type)
 
     try:
-        file_bytes = await upload_file.read()
-        await upload_file.seek(0)
+        if parsed_document is not None:
+            file_bytes = parsed_document.content
+        else:
+            file_bytes = await upload_file.read()
+            await upload_file.seek(0)
         logger.info(f"? Read {len(file_bytes)} bytes from {filename}")
     except Exception as e:
         logger.error(f"? Failed to read file {filename}: {e}", exc_info=True)
@@ -1513,10 +1728,13 @@ async def _extract_text_from_upload(upload_file: Any, document_type: Optional[st
         text_output = _extract_plaintext_bytes(file_bytes)
         _record_extraction_stage(artifacts, filename=filename, stage="plaintext_native", text=text_output)
     else:
+        if parsed_document is None:
+            from app.services.extraction.parsed_document import ParsedDocument
+
+            parsed_document = ParsedDocument.from_bytes(file_bytes, filename=filename, content_type=content_type)
         logger.info("validate.extraction.stage_entered file=%s stage=%s", filename, "pdfminer_native")
         try:
-            from pdfminer.high_level import extract_text  # type: ignore
-            text_output = extract_text(BytesIO(file_bytes))
+            text_output = await parsed_document.native_text_async()
             _record_extraction_stage(artifacts, filename=filename, stage="pdfminer_native", text=text_output)
         except Exception as exc:
             _record_extraction_stage(
@@ -1530,15 +1748,7 @@ async def _extract_text_from_upload(upload_file: Any, document_type: Optional[st
         if len((text_output or "").strip()) < min_chars_for_skip:
             logger.info("validate.extraction.stage_entered file=%s stage=%s", filename, "pypdf_native")
             try:
-                from PyPDF2 import PdfReader  # type: ignore[reportMissingImports]
-                reader = PdfReader(BytesIO(file_bytes))
-                pieces = []
-                for page in reader.pages:
-                    try:
-                        pieces.append(page.extract_text() or "")
-                    except Exception:
-                        continue
-                pypdf_text = "\n".join(pieces)
+                pypdf_text = await parsed_document.pypdf_text_async()
                 _record_extraction_stage(artifacts, filename=filename, stage="pypdf_native", text=pypdf_text)
                 if len((pypdf_text or "").strip()) > len((text_output or "").strip()):
                     text_output = pypdf_text
@@ -1631,11 +1841,8 @@ async def _extract_text_from_upload(upload_file: Any, document_type: Optional[st
         _record_extraction_reason_code(artifacts, "EXTRACTION_EMPTY_ALL_STAGES")
         return _finalize_text_extraction_result(artifacts, stage="plaintext_native", text="")
 
-    page_count = 0
-    try:
-        from PyPDF2 import PdfReader  # type: ignore[reportMissingImports]
-        page_count = len(PdfReader(BytesIO(file_bytes)).pages)
-    except Exception:
+    page_count = await parsed_document.page_count_async()
+    if not page_count:
         page_count = 1 if detected_input_mime.startswith("image/") else 0
 
     if page_count > settings.OCR_MAX_PAGES or len(file_bytes) > settings.OCR_MAX_BYTES:
@@ -1698,7 +1905,7 @@ async def _extract_text_from_upload(upload_file: Any, document_type: Optional[st
         _record_extraction_reason_code(artifacts, "EXTRACTION_EMPTY_ALL_STAGES")
         return _finalize_text_extraction_result(artifacts, stage="native_pdf_text", text="")
 
-    ocr_result = await _try_ocr_providers(file_bytes, filename, content_type)
+    ocr_result = await _try_ocr_providers(file_bytes, filename, content_type, parsed_document=parsed_document)
     ocr_text = ocr_result.get("text") or ""
     ocr_artifacts = ocr_result.get("artifacts") or _empty_extraction_artifacts_v1(raw_text=ocr_text)
     artifacts = _merge_extraction_artifacts(artifacts, ocr_artifacts)
@@ -1729,7 +1936,12 @@ async def _extract_text_from_upload(upload_file: Any, document_type: Optional[st
         )
 
     if hotfix_enabled:
-        secondary_result = await _try_secondary_ocr_adapter(file_bytes, filename, content_type)
+        secondary_result = await _try_secondary_ocr_adapter(
+            file_bytes,
+            filename,
+            content_type,
+            parsed_document=parsed_document,
+        )
         secondary_text = secondary_result.get("text") or ""
         secondary_artifacts = secondary_result.get("artifacts") or _empty_extraction_artifacts_v1(raw_text=secondary_text)
         artifacts = _merge_extraction_artifacts(artifacts, secondary_artifacts)
@@ -1790,11 +2002,17 @@ async def _extract_text_from_upload(upload_file: Any, document_type: Optional[st
     return _finalize_text_extraction_result(artifacts, stage="ocr_provider_primary", text="")
 
 
-async def _try_secondary_ocr_adapter(file_bytes: bytes, filename: str, content_type: str) -> Dict[str, Any]:
+async def _try_secondary_ocr_adapter(
+    file_bytes: bytes,
+    filename: str,
+    content_type: str,
+    parsed_document: Optional["ParsedDocument"] = None,
+) -> Dict[str, Any]:
     """Attempt a deterministic secondary OCR path that bypasses the factory adapter chain."""
     artifacts = _empty_extraction_artifacts_v1()
     provider_attempts: List[Dict[str, Any]] = []
-    plan = _build_provider_runtime_payload_plan("ocr_service", file_bytes, filename, content_type)
+    await _warm_provider_runtime_payloads("ocr_service", file_bytes, filename, content_type, parsed_document)
+    plan = _build_provider_runtime_payload_plan("ocr_service", file_bytes, filename, content_type, parsed_document=parsed_document)
     first_group = (plan.get("groups") or [[]])[0] if isinstance(plan.get("groups"), list) else []
     first_payload = first_group[0] if first_group else {}
     artifacts["normalization"] = {
@@ -1908,8 +2126,21 @@ async def _try_secondary_ocr_adapter(file_bytes: bytes, filename: str, content_t
             group_success = False
             for payload in group:
                 attempt_number = len(provider_attempts) + 1
-                payload = dict(payload)
+                payload = await _materialize_runtime_payload(dict(payload), file_bytes, parsed_document)
                 payload["attempt_number"] = attempt_number
+                if payload.get("guardrail_error"):
+                    provider_attempts.append(
+                        _build_provider_attempt_record(
+                            stage="ocr_secondary",
+                            provider_name="ocr_service",
+                            payload=payload,
+                            text="",
+                            status="error",
+                            error_code="OCR_UNSUPPORTED_FORMAT",
+                            error=payload["guardrail_error"],
+                        )
+                    )
+                    continue
                 logger.info(
                     "validate.extraction.provider_input provider=%s attempt=%s original_mime=%s normalized_mime=%s page_count=%s dpi=%s bytes_sent=%s payload_source=%s retry_used=%s",
                     "ocr_service",
@@ -1922,13 +2153,28 @@ async def _try_secondary_ocr_adapter(file_bytes: bytes, filename: str, content_t
                     payload.get("payload_source"),
                     payload.get("retry_used"),
                 )
-                result = await asyncio.wait_for(
-                    service.extract_text(
-                        payload.get("content") or file_bytes,
-                        filename=payload.get("filename") or filename,
-                        content_type=payload.get("normalized_mime") or content_type,
-                    ),
-                    timeout=settings.OCR_TIMEOUT_SEC,
+                payload_content = payload.get("content") or file_bytes
+                payload_mime = payload.get("normalized_mime") or content_type
+
+                async def _call_secondary(
+                    payload_content: bytes = payload_content,
+                    payload_mime: str = payload_mime,
+                    payload_filename: str = payload.get("filename") or filename,
+                ) -> Dict[str, Any]:
+                    return await asyncio.wait_for(
+                        service.extract_text(
+                            payload_content,
+                            filename=payload_filename,
+                            content_type=payload_mime,
+                        ),
+                        timeout=settings.OCR_TIMEOUT_SEC,
+                    )
+
+                result, payload["cache_hit"] = await _run_ocr_payload_cached(
+                    "ocr_service",
+                    payload_content,
+                    payload_mime,
+                    _call_secondary,
                 )
                 text = result.get("text") or ""
                 error = result.get("error")
@@ -2077,10 +2323,23 @@ async def _try_secondary_ocr_adapter(file_bytes: bytes, filename: str, content_t
     return {"text": "", "artifacts": artifacts}
 
 
-async def _try_ocr_providers(file_bytes: bytes, filename: str, content_type: str) -> Dict[str, Any]:
+async def _try_ocr_providers(
+    file_bytes: bytes,
+    filename: str,
+    content_type: str,
+    parsed_document: Optional["ParsedDocument"] = None,
+) -> Dict[str, Any]:
     """Try OCR providers in configured order; return text + normalized artifacts."""
     from uuid import uuid4
     from app.ocr.factory import get_ocr_factory
+    from app.services.extraction.parsed_document import ensure_parsed_document
+
+    parsed_document = ensure_parsed_document(
+        parsed_document,
+        file_bytes,
+        filename=filename,
+        content_type=content_type,
+    )
 
     provider_map = {
         "gdocai": "google_documentai",
@@ -2169,7 +2428,8 @@ async def _try_ocr_providers(file_bytes: bytes, filename: str, content_type: str
                 )
                 continue
 
-            plan = _build_provider_runtime_payload_plan(full_provider_name, file_bytes, filename, content_type)
+            await _warm_provider_runtime_payloads(full_provider_name, file_bytes, filename, content_type, parsed_document)
+            plan = _build_provider_runtime_payload_plan(full_provider_name, file_bytes, filename, content_type, parsed_document=parsed_document)
             first_group = (plan.get("groups") or [[]])[0] if isinstance(plan.get("groups"), list) else []
             first_payload = first_group[0] if first_group else {}
             if plan.get("error_code"):
@@ -2224,44 +2484,113 @@ async def _try_ocr_providers(file_bytes: bytes, filename: str, content_type: str
                 provider_results: List[Any] = []
                 selected_payload = first_payload
 
-                for group in plan.get("groups") or []:
-                    group_success = False
-                    for payload in group:
+                async def _run_group(
+                    group: List[Dict[str, Any]],
+                    adapter: Any = adapter,
+                    provider_name: str = full_provider_name,
+                ) -> List[Dict[str, Any]]:
+                    """OCR one page: later payloads (format fallbacks) only after a retryable failure."""
+                    outcomes: List[Dict[str, Any]] = []
+                    for planned in group:
+                        payload = await _materialize_runtime_payload(dict(planned), file_bytes, parsed_document)
+                        if payload.get("guardrail_error"):
+                            outcomes.append({
+                                "payload": payload,
+                                "result": None,
+                                "text": "",
+                                "error_text": payload["guardrail_error"],
+                                "success": False,
+                                "error_code": "OCR_UNSUPPORTED_FORMAT",
+                            })
+                            continue
+                        payload_content = payload.get("content") or file_bytes
+                        payload_mime = payload.get("normalized_mime") or content_type
+
+                        async def _call_provider(
+                            adapter: Any = adapter,
+                            payload_content: bytes = payload_content,
+                            payload_mime: str = payload_mime,
+                            payload_filename: str = payload.get("filename") or filename,
+                        ) -> Dict[str, Any]:
+                            async with _ocr_provider_slot(provider_name):
+                                provider_result = await asyncio.wait_for(
+                                    adapter.process_file_bytes(
+                                        payload_content,
+                                        payload_filename,
+                                        payload_mime,
+                                        uuid4(),
+                                    ),
+                                    timeout=settings.OCR_TIMEOUT_SEC,
+                                )
+                            return _ocr_result_to_cache_payload(provider_result)
+
+                        cached_result, payload["cache_hit"] = await _run_ocr_payload_cached(
+                            provider_name,
+                            payload_content,
+                            payload_mime,
+                            _call_provider,
+                        )
+                        result = _ocr_result_from_cache_payload(cached_result)
+                        text = getattr(result, "full_text", "") or ""
+                        error_text = getattr(result, "error", None)
+                        success = bool((text or "").strip()) and not error_text
+                        error_code = None if success else (_map_ocr_provider_error_code(error_text) if error_text else "OCR_EMPTY_RESULT")
+                        outcomes.append({
+                            "payload": payload,
+                            "result": result,
+                            "text": text,
+                            "error_text": error_text,
+                            "success": success,
+                            "error_code": error_code,
+                        })
+                        should_retry_normalized_pdf = (
+                            str(payload.get("payload_source") or "") == "runtime_pdf_direct"
+                            and str(error_code or "") in {"OCR_UNSUPPORTED_FORMAT", "OCR_EMPTY_RESULT"}
+                        )
+                        if success or (error_code != "OCR_UNSUPPORTED_FORMAT" and not should_retry_normalized_pdf):
+                            break
+                    return outcomes
+
+                groups = plan.get("groups") or []
+                if plan.get("aggregate_pages"):
+                    # Per-page plans: every page in flight at once (bounded by
+                    # the provider slot), text reassembled in page order.
+                    group_outcomes = await _gather_ocr_page_groups([_run_group(group) for group in groups])
+                else:
+                    group_outcomes = []
+                    for group in groups:
+                        outcomes = await _run_group(group)
+                        group_outcomes.append(outcomes)
+                        if outcomes and outcomes[-1]["success"]:
+                            break
+
+                for outcomes in group_outcomes:
+                    for outcome in outcomes:
                         attempt_number = len(attempts) + 1
-                        payload = dict(payload)
+                        payload = outcome["payload"]
                         payload["attempt_number"] = attempt_number
+                        error_code = outcome["error_code"]
+                        error_text = outcome["error_text"]
                         logger.info(
-                            "validate.extraction.provider_input provider=%s attempt=%s original_mime=%s normalized_mime=%s page_count=%s dpi=%s bytes_sent=%s payload_source=%s retry_used=%s",
+                            "validate.extraction.provider_input provider=%s attempt=%s original_mime=%s normalized_mime=%s page_count=%s page_index=%s dpi=%s bytes_sent=%s payload_source=%s retry_used=%s",
                             full_provider_name,
                             attempt_number,
                             payload.get("input_mime"),
                             payload.get("normalized_mime"),
                             payload.get("page_count"),
+                            payload.get("page_index"),
                             payload.get("dpi"),
                             payload.get("bytes_sent"),
                             payload.get("payload_source"),
                             payload.get("retry_used"),
                         )
-                        result = await asyncio.wait_for(
-                            adapter.process_file_bytes(
-                                payload.get("content") or file_bytes,
-                                payload.get("filename") or filename,
-                                payload.get("normalized_mime") or content_type,
-                                uuid4(),
-                            ),
-                            timeout=settings.OCR_TIMEOUT_SEC,
-                        )
-                        text = getattr(result, "full_text", "") or ""
-                        error_text = getattr(result, "error", None)
-                        success = bool((text or "").strip()) and not error_text
-                        error_code = None if success else (_map_ocr_provider_error_code(error_text) if error_text else "OCR_EMPTY_RESULT")
                         attempts.append(
                             _build_provider_attempt_record(
                                 stage="ocr_provider_primary",
                                 provider_name=full_provider_name,
                                 payload=payload,
-                                text=text,
-                                status="success" if success else "empty_output" if not error_text else "error",
+                                text=outcome["text"],
+                                status="success" if outcome["success"] else "empty_output" if not error_text else "error",
                                 error_code=error_code,
                                 error=error_text,
                             )
@@ -2276,7 +2605,7 @@ async def _try_ocr_providers(file_bytes: bytes, filename: str, content_type: str
                             attempts[-1]["text_len"],
                             attempts[-1]["retry_used"],
                         )
-                        if success:
+                        if outcome["success"]:
                             _record_runtime(
                                 provider_name=full_provider_name,
                                 error_code=None,
@@ -2287,10 +2616,9 @@ async def _try_ocr_providers(file_bytes: bytes, filename: str, content_type: str
                                 success=True,
                             )
                             selected_payload = payload
-                            collected_texts.append(text)
-                            provider_results.append(result)
-                            group_success = True
-                            break
+                            collected_texts.append(outcome["text"])
+                            provider_results.append(outcome["result"])
+                            continue
                         logger.warning(
                             "validate.extraction.provider_failure provider=%s attempt=%s normalized_mime=%s page_count=%s bytes_sent=%s error_code=%s",
                             full_provider_name,
@@ -2308,14 +2636,6 @@ async def _try_ocr_providers(file_bytes: bytes, filename: str, content_type: str
                             attempt_number=attempt_number,
                             payload=payload,
                         )
-                        should_retry_normalized_pdf = (
-                            str(payload.get("payload_source") or "") == "runtime_pdf_direct"
-                            and str(error_code or "") in {"OCR_UNSUPPORTED_FORMAT", "OCR_EMPTY_RESULT"}
-                        )
-                        if error_code != "OCR_UNSUPPORTED_FORMAT" and not should_retry_normalized_pdf:
-                            break
-                    if group_success and not plan.get("aggregate_pages"):
-                        break
 
                 if collected_texts:
                     merged_text = _merge_text_sources(*collected_texts)
@@ -2415,7 +2735,7 @@ async def _try_ocr_providers(file_bytes: bytes, filename: str, content_type: str
 
         artifacts = _empty_extraction_artifacts_v1()
         artifacts["provider_attempts"] = attempts
-        last_plan = _build_provider_runtime_payload_plan(provider_map.get(provider_order[0], provider_order[0]), file_bytes, filename, content_type)
+        last_plan = _build_provider_runtime_payload_plan(provider_map.get(provider_order[0], provider_order[0]), file_bytes, filename, content_type, parsed_document=parsed_document)
         last_group = (last_plan.get("groups") or [[]])[0] if isinstance(last_plan.get("groups"), list) else []
         last_input = last_group[0] if last_group else {}
         artifacts["normalization"] = {
@@ -2436,7 +2756,7 @@ async def _try_ocr_providers(file_bytes: bytes, filename: str, content_type: str
     except Exception as exc:
         artifacts = _empty_extraction_artifacts_v1()
         artifacts["provider_attempts"] = attempts
-        fallback_plan = _build_provider_runtime_payload_plan(provider_map.get(provider_order[0], provider_order[0]), file_bytes, filename, content_type)
+        fallback_plan = _build_provider_runtime_payload_plan(provider_map.get(provider_order[0], provider_order[0]), file_bytes, filename, content_type, parsed_document=parsed_document)
         fallback_group = (fallback_plan.get("groups") or [[]])[0] if isinstance(fallback_plan.get("groups"), list) else []
         fallback_input = fallback_group[0] if fallback_group else {}
         artifacts["normalization"] = {
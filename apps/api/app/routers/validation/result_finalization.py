@@ -1441,6 +1441,11 @@ async def finalize_validation_result(
         validation_session.processing_completed_at = func.now()
         db.commit()
         db.refresh(validation_session)
+        # Render the public envelope now so the results page's first poll
+        # is a cache hit.
+        from app.routers.jobs_public import prerender_job_results
+
+        await prerender_job_results(validation_session)
     else:
         db.commit()
 
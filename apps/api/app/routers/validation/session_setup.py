@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any, Dict, Optional
 from uuid import uuid4
 
@@ -238,12 +239,21 @@ async def prepare_validation_session(
         except Exception as _reuse_exc:
             logger.warning("Failed to load previous session %s for reuse: %s", reuse_job_id, _reuse_exc)
 
+    # Same-company documents already extracted under the current extractor,
+    # model and prompt version are reused by content hash, whatever the job.
+    from app.services.extraction.extraction_store import DocumentExtractionStore
+
+    extraction_store = DocumentExtractionStore.for_company(db, getattr(current_user, "company_id", None))
     extracted_context = await _build_document_context(
         files_list,
         document_tags,
         job_id=job_id,
         previous_extraction=previous_extraction,
+        extraction_store=extraction_store,
     )
+    if extraction_store is not None:
+        # Blocking ORM writes and a commit; keep them off the event loop.
+        await asyncio.to_thread(extraction_store.flush)
     checkpoint("ocr_extraction_complete")
 
     # Incremental merge: if we have previous docs and only extracted new files,
@@ -1774,6 +1774,7 @@ async def execute_validation_pipeline(
             _rulhub_error_msg: Optional[str] = None
             _rulhub_request_preview: Optional[Dict[str, Any]] = None
             db_rules_timed_out = False
+            _pipeline_timings: Dict[str, Any] = {}  # per-pass ms from the tiered pipeline
 
             if _use_rulhub:
                 try:
@@ -2794,6 +2795,7 @@ async def execute_validation_pipeline(
                     validate_document_with_pipeline(
                         document_data=db_rule_payload,
                         document_type=primary_doc_type,
+                        timings_out=_pipeline_timings,
                     ),
                     DB_RULE_TIMEOUT_SECONDS,
                     [],
@@ -2858,6 +2860,7 @@ async def execute_validation_pipeline(
                 ],
                 "rule_watch_debug": rule_watch_debug,
                 "timed_out": db_rules_timed_out,
+                "pipeline_timings": _pipeline_timings or None,
             }
             if db_rules_timed_out:
                 _append_timeout_event(
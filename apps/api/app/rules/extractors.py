@@ -5,8 +5,10 @@ Field extraction utilities for different document types.
 import json
 import re
 import xml.etree.ElementTree as ET
+from bisect import bisect_right
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 from decimal import Decimal, InvalidOperation
 
 from .models import ExtractedField, FieldType, DocumentType
@@ -398,6 +400,103 @@ def _normalize_incoterm(value: str) -> Optional[str]:
     return f"{term} {normalized_location}".strip()
 
 
+@lru_cache(maxsize=1024)
+def _compiled(pattern: str, flags: int = re.IGNORECASE) -> "re.Pattern[str]":
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=1024)
+def _compiled_inline_label(pattern: str) -> "re.Pattern[str]":
+    """Label followed by an optional ``:``/``-`` and a same-line value."""
+    return re.compile(pattern + r'\s*[:\-]?\s*(.+)$', re.IGNORECASE)
+
+
+# Constructs whose meaning changes when a label pattern is run case-sensitively
+# over a whole upper-cased document instead of case-insensitively per line.
+_LABEL_SCAN_UNSAFE = re.compile(r"\(\?[=!<P#a-zA-Z]|\\[AZxuUN0-9]")
+
+
+@lru_cache(maxsize=1024)
+def _compiled_label_scan(pattern: str) -> Optional["re.Pattern[str]"]:
+    """
+    Case-sensitive MULTILINE form of ``pattern`` for scanning an upper-cased
+    ASCII document, or None when that is not equivalent to a case-insensitive
+    per-line search (lowercase literals, lookarounds, inline flags, ...).
+    """
+    if _LABEL_SCAN_UNSAFE.search(pattern) or re.search(r"[a-z]", re.sub(r"\\.", "", pattern)):
+        return None
+    try:
+        return re.compile(pattern, re.MULTILINE)
+    except re.error:
+        return None
+
+
+class _LabelIndex:
+    """
+    Line positions of label patterns for one document.
+
+    Each pattern is resolved with a single scan of the upper-cased document
+    the first time it is looked up, and every later lookup for any field is a
+    dict hit. Lines with non-ASCII text, and patterns ``_compiled_label_scan``
+    rejects, are matched line by line exactly as before.
+    """
+
+    def __init__(self, lines: List[str]) -> None:
+        self.lines = lines
+        self._positions: Dict[str, List[int]] = {}
+        self._starts: List[int] = []
+        self._slow_lines: Set[int] = set()
+        scan_lines = []
+        offset = 0
+        for index, line in enumerate(lines):
+            if not line.isascii():
+                self._slow_lines.add(index)
+                line = ""
+            self._starts.append(offset)
+            scan_lines.append(line.upper())
+            offset += len(line) + 1
+        self._text = "\n".join(scan_lines)
+
+    def positions(self, pattern: str) -> List[int]:
+        found = self._positions.get(pattern)
+        if found is None:
+            found = self._scan(pattern)
+            self._positions[pattern] = found
+        return found
+
+    def hits(self, patterns: List[str]) -> List[Tuple[int, str]]:
+        """``(line index, pattern)`` pairs in line order, then in ``patterns`` order."""
+        ordered = sorted(
+            (index, order)
+            for order, pattern in enumerate(patterns)
+            for index in self.positions(pattern)
+        )
+        return [(index, patterns[order]) for index, order in ordered]
+
+    def _scan(self, pattern: str) -> List[int]:
+        regex = _compiled(pattern)
+        scan = _compiled_label_scan(pattern)
+        if scan is None or not self.lines:
+            return [index for index, line in enumerate(self.lines) if regex.search(line)]
+
+        found = [index for index in self._slow_lines if regex.search(self.lines[index])]
+        position = 0
+        while position <= len(self._text):
+            match = scan.search(self._text, position)
+            if match is None:
+                break
+            index = bisect_right(self._starts, match.start()) - 1
+            next_start = self._starts[index + 1] if index + 1 < len(self._starts) else len(self._text) + 1
+            # A match running into the next line (e.g. ``\s*`` over the newline)
+            # only counts if the line matches on its own.
+            if index not in self._slow_lines and (
+                match.end() < next_start or regex.search(self.lines[index])
+            ):
+                found.append(index)
+            position = next_start
+        return sorted(found)
+
+
 class DocumentFieldExtractor:
     """Extracts structured fields from OCR text for different document types."""
     
@@ -506,6 +605,49 @@ class DocumentFieldExtractor:
             r"E\s*[- ]?\s*TIN(?:\s*NO\.?|\s*NUMBER)?",
             r"\bETIN\b(?:\s*NO\.?|\s*NUMBER)?",
         ],
+        "invoice_number": [
+            r'(?:INVOICE|INV\.?)\s*(?:NO\.?|NUMBER)',
+            r'INVOICE\s*#',
+        ],
+        "invoice_date": [
+            r'INVOICE\s+DATE',
+            r'DATE',
+        ],
+        "invoice_amount": [
+            r'(?:TOTAL|INVOICE)\s+AMOUNT',
+            r'AMOUNT\s+DUE',
+            r'TOTAL\s+\(FOR TESTING\)',
+        ],
+        "consignee": [
+            r'CONSIGNEE',
+            r'SHIP\s+TO',
+        ],
+        "buyer": [
+            r'(?:BUYER|IMPORTER|APPLICANT)',
+            r'BUYER\s*\(APPLICANT\)',
+        ],
+        "lc_number": [
+            r'(?:L/?C|LETTER\s+OF\s+CREDIT)\s*(?:NO\.?|NUMBER|REF\.?|REFERENCE)',
+            r'(?:L/?C)\s*[:#]',
+            r'DOCUMENTARY\s+CREDIT\s*(?:NO\.?|NUMBER)',
+        ],
+        "total_packages": [
+            r"TOTAL\s+PACKAGES",
+            r"NO\.?\s+OF\s+PACKAGES",
+            r"PACKAGES",
+        ],
+        "dimensions": [
+            r"DIMENSIONS",
+            r"MEASUREMENTS",
+            r"MEASUREMENT",
+        ],
+        "combined_weight": [
+            r"GROSS\s*/\s*NET",
+            r"GROSS\s*WT\s*/\s*NET\s*WT",
+            r"GROSS\s*WGT\s*/\s*NET\s*WGT",
+            r"G\.?\s*W\.?\s*/\s*N\.?\s*W\.?",
+            r"GW\s*/\s*NW",
+        ],
     }
     
     LABEL_BREAK_PATTERN = re.compile(r"^[A-Z0-9][A-Z0-9\s/()\-]{2,}[:：]")
@@ -896,10 +1038,7 @@ class DocumentFieldExtractor:
         invoice_number = self._extract_label_value(
             text,
             lines,
-            label_patterns=[
-                r'(?:INVOICE|INV\.?)\s*(?:NO\.?|NUMBER)',
-                r'INVOICE\s*#'
-            ],
+            label_patterns=self.FIELD_LABEL_ALIASES["invoice_number"],
             inline_capture=r'(?:INVOICE|INV\.?)\s*(?:NO\.?|NUMBER)\s*[:\-]?\s*([A-Z0-9-]+)'
         )
         if invoice_number:
@@ -914,10 +1053,7 @@ class DocumentFieldExtractor:
         invoice_date = self._extract_label_value(
             text,
             lines,
-            label_patterns=[
-                r'INVOICE\s+DATE',
-                r'DATE'
-            ],
+            label_patterns=self.FIELD_LABEL_ALIASES["invoice_date"],
             inline_capture=r'(?:INVOICE\s+DATE|DATE)\s*[:\-]?\s*([0-9A-Za-z ,./-]+)'
         )
         if invoice_date:
@@ -942,11 +1078,7 @@ class DocumentFieldExtractor:
         invoice_amount = self._extract_label_value(
             text,
             lines,
-            label_patterns=[
-                r'(?:TOTAL|INVOICE)\s+AMOUNT',
-                r'AMOUNT\s+DUE',
-                r'TOTAL\s+\(FOR TESTING\)'
-            ],
+            label_patterns=self.FIELD_LABEL_ALIASES["invoice_amount"],
             inline_capture=r'(?:TOTAL|INVOICE)\s+AMOUNT\s*[:\-]?\s*([0-9,.\sA-Za-z]+)'
         )
         if not invoice_amount:
@@ -965,10 +1097,7 @@ class DocumentFieldExtractor:
         consignee = self._extract_label_value(
             text,
             lines,
-            label_patterns=[
-                r'CONSIGNEE',
-                r'SHIP\s+TO'
-            ]
+            label_patterns=self.FIELD_LABEL_ALIASES["consignee"],
         )
         if consignee:
             fields.append(ExtractedField(
@@ -982,10 +1111,7 @@ class DocumentFieldExtractor:
         buyer = self._extract_label_value(
             text,
             lines,
-            label_patterns=[
-                r'(?:BUYER|IMPORTER|APPLICANT)',
-                r'BUYER\s*\(APPLICANT\)'
-            ]
+            label_patterns=self.FIELD_LABEL_ALIASES["buyer"],
         )
         if buyer:
             fields.append(ExtractedField(
@@ -1000,11 +1126,7 @@ class DocumentFieldExtractor:
         lc_number = self._extract_label_value(
             text,
             lines,
-            label_patterns=[
-                r'(?:L/?C|LETTER\s+OF\s+CREDIT)\s*(?:NO\.?|NUMBER|REF\.?|REFERENCE)',
-                r'(?:L/?C)\s*[:#]',
-                r'DOCUMENTARY\s+CREDIT\s*(?:NO\.?|NUMBER)',
-            ],
+            label_patterns=self.FIELD_LABEL_ALIASES["lc_number"],
             inline_capture=r'(?:L/?C|LETTER\s+OF\s+CREDIT|DOCUMENTARY\s+CREDIT)\s*(?:NO\.?|NUMBER|REF\.?|REFERENCE|[:#])?\s*[:\-]?\s*([A-Z0-9\-\/]+)'
         )
         if lc_number:
@@ -1262,7 +1384,7 @@ class DocumentFieldExtractor:
         total_packages, packages_reason = self._extract_label_value_with_reason(
             text,
             lines,
-            [r"TOTAL\s+PACKAGES", r"NO\.?\s+OF\s+PACKAGES", r"PACKAGES"],
+            self.FIELD_LABEL_ALIASES["total_packages"],
         )
         if total_packages:
             total_packages = total_packages.strip()
@@ -1314,7 +1436,7 @@ class DocumentFieldExtractor:
         dimensions, dimensions_reason = self._extract_label_value_with_reason(
             text,
             lines,
-            [r"DIMENSIONS", r"MEASUREMENTS", r"MEASUREMENT"],
+            self.FIELD_LABEL_ALIASES["dimensions"],
         )
         dimensions = self._normalize_dimension_text(dimensions)
         self._append_field(
@@ -1583,7 +1705,7 @@ class DocumentFieldExtractor:
     
     def _extract_pattern(self, text: str, pattern: str, group: int = 0) -> Optional[str]:
         """Extract text using regex pattern."""
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+        match = _compiled(pattern, re.IGNORECASE | re.MULTILINE).search(text)
         if match:
             return match.group(group).strip()
         return None
@@ -1591,7 +1713,7 @@ class DocumentFieldExtractor:
     def _extract_label_block(self, text: str, patterns: List[str]) -> Optional[str]:
         """Extract multi-line block following a label."""
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = _compiled(pattern).search(text)
             if match:
                 captured = match.group(1).strip()
                 if captured:
@@ -1631,32 +1753,35 @@ class DocumentFieldExtractor:
         This helps with table-based invoices where labels and values are on separate lines.
         """
         if inline_capture:
-            match = re.search(inline_capture, text, re.IGNORECASE)
+            match = _compiled(inline_capture).search(text)
             if match:
                 value = match.group(1).strip()
                 if value:
                     return value
 
-        for i, line in enumerate(lines):
-            for pattern in label_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    match_inline = re.search(pattern + r'\s*[:\-]?\s*(.+)$', line, re.IGNORECASE)
-                    if match_inline:
-                        inline_value = match_inline.group(1).strip()
-                        if inline_value:
-                            return inline_value
-                    for j in range(i + 1, min(i + 6, len(lines))):
-                        candidate = lines[j].strip()
-                        if candidate:
-                            return candidate
+        for i, pattern in self._label_index(lines).hits(label_patterns):
+            match_inline = _compiled_inline_label(pattern).search(lines[i])
+            if match_inline:
+                inline_value = match_inline.group(1).strip()
+                if inline_value:
+                    return inline_value
+            for j in range(i + 1, min(i + 6, len(lines))):
+                candidate = lines[j].strip()
+                if candidate:
+                    return candidate
         return None
 
     def _label_present(self, lines: List[str], label_patterns: List[str]) -> bool:
-        for line in lines:
-            for pattern in label_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    return True
-        return False
+        index = self._label_index(lines)
+        return any(index.positions(pattern) for pattern in label_patterns)
+
+    def _label_index(self, lines: List[str]) -> _LabelIndex:
+        """Label index for ``lines``; built once per document and reused across fields."""
+        index = getattr(self, "_cached_label_index", None)
+        if index is None or index.lines is not lines:
+            index = _LabelIndex(lines)
+            self._cached_label_index = index
+        return index
 
     def _extract_label_value_with_reason(
         self,
@@ -1683,18 +1808,11 @@ class DocumentFieldExtractor:
             r"(?:GROSS\s*(?:WEIGHT|WT|WGT)|G\.?\s*W\.?|GW)\s*[:\-]?\s*([0-9][0-9,\.]*\s*(?:KGS?|KG|LBS?|LB)?)\s*/\s*(?:NET\s*(?:WEIGHT|WT|WGT)|N\.?\s*W\.?|NW)\s*[:\-]?\s*([0-9][0-9,\.]*\s*(?:KGS?|KG|LBS?|LB)?)",
         ]
         for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+            match = _compiled(pattern, re.IGNORECASE | re.MULTILINE).search(text)
             if match:
                 return match.group(1).strip(), match.group(2).strip(), None
 
-        combined_label_patterns = [
-            r"GROSS\s*/\s*NET",
-            r"GROSS\s*WT\s*/\s*NET\s*WT",
-            r"GROSS\s*WGT\s*/\s*NET\s*WGT",
-            r"G\.?\s*W\.?\s*/\s*N\.?\s*W\.?",
-            r"GW\s*/\s*NW",
-        ]
-        if self._label_present(lines, combined_label_patterns):
+        if self._label_present(lines, self.FIELD_LABEL_ALIASES["combined_weight"]):
             return None, None, "parser_failed"
         return None, None, None
 
@@ -565,21 +565,21 @@ class DocumentAIService:
         loop = asyncio.get_running_loop()
         cache_key = document_hash or hashlib.sha256(file_content).hexdigest()
 
-        cached = await ocr_cache.get(cache_key)
-        if cached:
-            cached_result = cached.copy()
-            cached_result["cache_hit"] = True
-            return cached_result
-
-        start = time.perf_counter()
-        result = await loop.run_in_executor(None, self._process_document_sync, file_content, mime_type)
-        duration_ms = (time.perf_counter() - start) * 1000
-        result["processing_time_ms"] = round(duration_ms, 2)
-        result["cache_hit"] = False
-
-        if result.get("success"):
-            await ocr_cache.set(cache_key, result)
-
+        async def _process() -> Dict[str, Any]:
+            start = time.perf_counter()
+            result = await loop.run_in_executor(None, self._process_document_sync, file_content, mime_type)
+            duration_ms = (time.perf_counter() - start) * 1000
+            result["processing_time_ms"] = round(duration_ms, 2)
+            return result
+
+        # Concurrent uploads of the same bytes share one Document AI call.
+        result, cache_hit = await ocr_cache.get_or_compute(
+            cache_key,
+            _process,
+            should_cache=lambda payload: bool(payload.get("success")),
+        )
+        result = dict(result)
+        result["cache_hit"] = cache_hit
         return result
 
     def _process_document_sync(self, file_content: bytes, mime_type: str) -> Dict[str, Any]:
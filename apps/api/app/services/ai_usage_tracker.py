@@ -5,7 +5,6 @@ Tracks per-LC, per-user, and per-tenant AI usage with rate limiting and quota en
 """
 
 import os
-import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple, List, Any
 from enum import Enum
@@ -16,6 +15,7 @@ from sqlalchemy import func, and_, or_
 
 from ..models import User, Company, ValidationSession
 from ..models.base import Base
+from ..utils.rate_limiter import RateLimitPolicy, get_rate_limiter, rate_limit_policy
 from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -63,49 +63,12 @@ class AIUsageRecord(Base):
     session = relationship("ValidationSession")
 
 
-class RateLimiter:
-    """Token bucket rate limiter."""
-    
-    def __init__(self, max_tokens: int, refill_rate: float, burst: int = 5):
-        """
-        Args:
-            max_tokens: Maximum tokens in bucket
-            refill_rate: Tokens per second
-            burst: Additional burst capacity
-        """
-        self.max_tokens = max_tokens
-        self.refill_rate = refill_rate
-        self.burst = burst
-        self.tokens = max_tokens
-        self.last_refill = time.time()
-    
-    def acquire(self, tokens: int = 1) -> bool:
-        """Try to acquire tokens. Returns True if successful."""
-        now = time.time()
-        elapsed = now - self.last_refill
-        
-        # Refill tokens
-        self.tokens = min(
-            self.max_tokens + self.burst,
-            self.tokens + elapsed * self.refill_rate
-        )
-        self.last_refill = now
-        
-        if self.tokens >= tokens:
-            self.tokens -= tokens
-            return True
-        return False
-
-
 class AIUsageTracker:
     """Tracks and enforces AI usage quotas."""
     
     def __init__(self, db: Session):
         self.db = db
         
-        # Rate limiters: keyed by (scope, identifier)
-        self._rate_limiters: Dict[Tuple[str, str], RateLimiter] = {}
-        
         # Per-LC counters: keyed by validation_session_id
         self._per_lc_counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
         
@@ -148,23 +111,15 @@ class AIUsageTracker:
         self.rate_limit_per_tenant_per_min = int(os.getenv("AI_RATE_LIMIT_PER_TENANT_PER_MIN", "50"))
         self.min_interval_per_lc_ms = int(os.getenv("AI_MIN_INTERVAL_PER_LC_MS", "2000"))
     
-    def _get_rate_limiter(self, scope: str, identifier: str) -> RateLimiter:
-        """Get or create rate limiter for scope/identifier."""
-        key = (scope, identifier)
-        if key not in self._rate_limiters:
-            if scope == "user":
-                max_tokens = self.rate_limit_per_user_per_min
-            elif scope == "tenant":
-                max_tokens = self.rate_limit_per_tenant_per_min
-            else:
-                max_tokens = 10
-            
-            self._rate_limiters[key] = RateLimiter(
-                max_tokens=max_tokens,
-                refill_rate=max_tokens / 60.0,  # tokens per second
-                burst=5
-            )
-        return self._rate_limiters[key]
+    def _rate_limit_policy(self, scope: str) -> RateLimitPolicy:
+        """Per-minute policy for a scope; windows are shared by every tracker in the process."""
+        if scope == "user":
+            limit = self.rate_limit_per_user_per_min
+        elif scope == "tenant":
+            limit = self.rate_limit_per_tenant_per_min
+        else:
+            limit = 10
+        return rate_limit_policy(f"ai:{scope}", limit, 60)
     
     def check_quota(
         self,
@@ -234,13 +189,12 @@ class AIUsageTracker:
                     return False, "Tenant quota in reserve zone - chat unavailable", {}
                 # For other features, allow but with reduced output tokens
         
-        # 4. Rate limiting
-        user_limiter = self._get_rate_limiter("user", str(user.id))
-        if not user_limiter.acquire():
+        # 4. Rate limiting (sync callers, so the engine's in-process window)
+        limiter = get_rate_limiter()
+        if not limiter.hit_local(self._rate_limit_policy("user"), str(user.id)).allowed:
             return False, "Rate limit exceeded: too many requests per minute", {}
         
-        tenant_limiter = self._get_rate_limiter("tenant", str(user.company_id))
-        if not tenant_limiter.acquire():
+        if not limiter.hit_local(self._rate_limit_policy("tenant"), str(user.company_id)).allowed:
             return False, "Tenant rate limit exceeded", {}
         
         # 5. Per-LC interval guard
@@ -1,5 +1,10 @@
 """
 Analytics service for computing dashboard metrics.
+
+Job counts, processing-time averages and discrepancy totals are read from
+``analytics_daily_rollups`` (see ``app.models.analytics_rollup``), so those
+metrics cover whole UTC days. Hour/day-of-week patterns and per-document
+breakdowns still query the source tables.
 """
 
 import json
@@ -21,6 +26,7 @@ from ..models import (
     User,
     UserRole,
 )
+from ..models.analytics_rollup import AnalyticsDailyRollup
 from ..models.audit_log import AuditLog, AuditAction, AuditResult
 from ..schemas.analytics import (
     SummaryStats,
@@ -98,6 +104,66 @@ class AnalyticsService:
             end = datetime(start.year, start.month + 1, 1)
         return start, end
 
+    _ROLLUP_SUMS = (
+        func.sum(AnalyticsDailyRollup.jobs),
+        func.sum(AnalyticsDailyRollup.processing_jobs),
+        func.sum(AnalyticsDailyRollup.processing_seconds),
+        func.sum(AnalyticsDailyRollup.discrepancy_count),
+    )
+
+    @staticmethod
+    def _role_scope(user: User) -> Dict[str, Any]:
+        """Rollup filter for roles that only see their own jobs."""
+        if user.role in [UserRole.EXPORTER, UserRole.IMPORTER]:
+            return {"user_id": user.id}
+        return {}
+
+    def _rollup_query(self, start: datetime, end: datetime, *columns: Any,
+                      user_id: Optional[UUID] = None,
+                      company_ids: Optional[List[UUID]] = None):
+        """Query ``columns`` over the rollup days covering ``start``..``end``."""
+        query = self.db.query(*columns).filter(
+            AnalyticsDailyRollup.day.between(start.date(), end.date())
+        )
+        if user_id is not None:
+            query = query.filter(AnalyticsDailyRollup.user_id == user_id)
+        if company_ids:
+            query = query.filter(AnalyticsDailyRollup.company_id.in_(company_ids))
+        return query
+
+    def _rollup_status_totals(self, start: datetime, end: datetime,
+                              **scope: Any) -> Dict[str, Dict[str, float]]:
+        """Summed rollup counters per session status."""
+        rows = self._rollup_query(
+            start, end,
+            AnalyticsDailyRollup.status,
+            *self._ROLLUP_SUMS,
+            **scope,
+        ).group_by(AnalyticsDailyRollup.status).all()
+        return {status: self._rollup_counters(*sums) for status, *sums in rows}
+
+    @staticmethod
+    def _rollup_counters(jobs: Any, processing_jobs: Any, processing_seconds: Any,
+                         discrepancy_count: Any) -> Dict[str, float]:
+        return {
+            "jobs": int(jobs or 0),
+            "processing_jobs": int(processing_jobs or 0),
+            "processing_seconds": float(processing_seconds or 0),
+            "discrepancy_count": int(discrepancy_count or 0),
+        }
+
+    @staticmethod
+    def _avg_processing_minutes(totals: Dict[str, Dict[str, float]],
+                                statuses: Optional[List[str]] = None) -> Optional[float]:
+        selected = [
+            counters for status, counters in totals.items()
+            if statuses is None or status in statuses
+        ]
+        processing_jobs = sum(counters["processing_jobs"] for counters in selected)
+        if not processing_jobs:
+            return None
+        return sum(counters["processing_seconds"] for counters in selected) / 60 / processing_jobs
+
     def get_summary_stats(self, user: User, time_range: TimeRange = "30d",
                          start_date: Optional[datetime] = None,
                          end_date: Optional[datetime] = None) -> SummaryStats:
@@ -105,23 +171,9 @@ class AnalyticsService:
 
         start, end = self._parse_time_range(time_range, start_date, end_date)
 
-        # Base query filtered by user role
-        base_query = self.db.query(ValidationSession).filter(
-            ValidationSession.created_at.between(start, end)
-        )
-
-        # Apply role-based filtering
-        if user.role in [UserRole.EXPORTER, UserRole.IMPORTER]:
-            base_query = base_query.filter(ValidationSession.user_id == user.id)
-
-        # Get job counts by status
-        status_counts = base_query.with_entities(
-            ValidationSession.status,
-            func.count(ValidationSession.id).label('count')
-        ).group_by(ValidationSession.status).all()
-
-        # Convert to dict
-        status_dict = {status: count for status, count in status_counts}
+        # Job counts and processing time by status from the daily rollups
+        totals = self._rollup_status_totals(start, end, **self._role_scope(user))
+        status_dict = {status: counters["jobs"] for status, counters in totals.items()}
 
         total_jobs = sum(status_dict.values())
         success_count = status_dict.get('completed', 0)
@@ -130,25 +182,7 @@ class AnalyticsService:
 
         rejection_rate = (rejection_count / max(total_jobs, 1)) * 100
 
-        # Calculate average processing time
-        processing_times = base_query.filter(
-            and_(
-                ValidationSession.processing_started_at.isnot(None),
-                ValidationSession.processing_completed_at.isnot(None)
-            )
-        ).with_entities(
-            ValidationSession.processing_started_at,
-            ValidationSession.processing_completed_at
-        ).all()
-
-        avg_processing_time = None
-        if processing_times:
-            total_minutes = 0
-            for start_time, end_time in processing_times:
-                if start_time and end_time:
-                    delta = end_time - start_time
-                    total_minutes += delta.total_seconds() / 60
-            avg_processing_time = total_minutes / len(processing_times)
+        avg_processing_time = self._avg_processing_minutes(totals)
 
         # Document distribution
         doc_query = self.db.query(
@@ -283,59 +317,31 @@ class AnalyticsService:
 
         start, end = self._parse_time_range(time_range, start_date, end_date)
 
-        # Generate daily timeline
+        # One grouped rollup query instead of a round-trip per day
+        daily_rows = self._rollup_query(
+            start, end,
+            AnalyticsDailyRollup.day,
+            AnalyticsDailyRollup.status,
+            *self._ROLLUP_SUMS,
+            **self._role_scope(user),
+        ).group_by(AnalyticsDailyRollup.day, AnalyticsDailyRollup.status).all()
+
+        daily: Dict[date, Dict[str, Dict[str, float]]] = defaultdict(dict)
+        for day, status, *sums in daily_rows:
+            daily[day][status] = self._rollup_counters(*sums)
+
         timeline = []
         current_date = start.date()
         end_date_only = end.date()
 
         while current_date <= end_date_only:
-            day_start = datetime.combine(current_date, datetime.min.time())
-            day_end = datetime.combine(current_date, datetime.max.time())
-
-            # Jobs query for this day
-            day_jobs_query = self.db.query(ValidationSession).filter(
-                ValidationSession.created_at.between(day_start, day_end)
-            )
-
-            # Apply role filtering
-            if user.role in [UserRole.EXPORTER, UserRole.IMPORTER]:
-                day_jobs_query = day_jobs_query.filter(ValidationSession.user_id == user.id)
-
-            # Get daily metrics
-            jobs_submitted = day_jobs_query.count()
-            jobs_completed = day_jobs_query.filter(ValidationSession.status == 'completed').count()
-            jobs_rejected = day_jobs_query.filter(ValidationSession.status == 'failed').count()
-
+            totals = daily.get(current_date, {})
+            jobs_submitted = sum(counters["jobs"] for counters in totals.values())
+            jobs_completed = totals.get('completed', {}).get("jobs", 0)
+            jobs_rejected = totals.get('failed', {}).get("jobs", 0)
             # Processing time for completed jobs
-            processing_times = day_jobs_query.filter(
-                and_(
-                    ValidationSession.status == 'completed',
-                    ValidationSession.processing_started_at.isnot(None),
-                    ValidationSession.processing_completed_at.isnot(None)
-                )
-            ).with_entities(
-                ValidationSession.processing_started_at,
-                ValidationSession.processing_completed_at
-            ).all()
-
-            avg_processing_time = None
-            if processing_times:
-                total_minutes = sum(
-                    (end_time - start_time).total_seconds() / 60
-                    for start_time, end_time in processing_times
-                    if start_time and end_time
-                )
-                avg_processing_time = total_minutes / len(processing_times)
-
-            # Discrepancy count for this day
-            discrepancy_query = self.db.query(Discrepancy).join(ValidationSession).filter(
-                Discrepancy.created_at.between(day_start, day_end)
-            )
-
-            if user.role in [UserRole.EXPORTER, UserRole.IMPORTER]:
-                discrepancy_query = discrepancy_query.filter(ValidationSession.user_id == user.id)
-
-            discrepancy_count = discrepancy_query.count()
+            avg_processing_time = self._avg_processing_minutes(totals, ['completed'])
+            discrepancy_count = sum(counters["discrepancy_count"] for counters in totals.values())
 
             success_rate = (jobs_completed / max(jobs_submitted, 1)) * 100
 
@@ -415,36 +421,18 @@ class AnalyticsService:
             )
         )
 
-        total_jobs = user_jobs.count()
-        successful_jobs = user_jobs.filter(ValidationSession.status == 'completed').count()
-        rejected_jobs = user_jobs.filter(ValidationSession.status == 'failed').count()
-        pending_jobs = user_jobs.filter(
-            ValidationSession.status.in_(['created', 'processing'])
-        ).count()
+        totals = self._rollup_status_totals(start, end, user_id=target_user.id)
+        total_jobs = sum(counters["jobs"] for counters in totals.values())
+        successful_jobs = totals.get('completed', {}).get("jobs", 0)
+        rejected_jobs = totals.get('failed', {}).get("jobs", 0)
+        pending_jobs = sum(
+            totals.get(status, {}).get("jobs", 0) for status in ('created', 'processing')
+        )
 
         rejection_rate = (rejected_jobs / max(total_jobs, 1)) * 100
 
         # Processing time
-        processing_query = user_jobs.filter(
-            and_(
-                ValidationSession.processing_started_at.isnot(None),
-                ValidationSession.processing_completed_at.isnot(None)
-            )
-        )
-
-        avg_processing_time = None
-        if processing_query.count() > 0:
-            processing_times = processing_query.with_entities(
-                ValidationSession.processing_started_at,
-                ValidationSession.processing_completed_at
-            ).all()
-
-            total_minutes = sum(
-                (end_time - start_time).total_seconds() / 60
-                for start_time, end_time in processing_times
-                if start_time and end_time
-            )
-            avg_processing_time = total_minutes / len(processing_times)
+        avg_processing_time = self._avg_processing_minutes(totals)
 
         # Time to correction (from rejection to resubmission)
         # This is complex - simplified version
@@ -528,52 +516,24 @@ class AnalyticsService:
 
         start, end = self._parse_time_range(time_range, start_date, end_date)
 
+        totals = self._rollup_status_totals(start, end)
+
         # Total system jobs
-        total_system_jobs = self.db.query(ValidationSession).filter(
-            ValidationSession.created_at.between(start, end)
-        ).count()
+        total_system_jobs = sum(counters["jobs"] for counters in totals.values())
 
         # Active users (users with jobs in the period)
-        total_active_users = self.db.query(
-            func.count(func.distinct(ValidationSession.user_id))
-        ).filter(
-            ValidationSession.created_at.between(start, end)
+        total_active_users = self._rollup_query(
+            start, end, func.count(func.distinct(AnalyticsDailyRollup.user_id))
         ).scalar() or 0
 
         jobs_per_user_avg = total_system_jobs / max(total_active_users, 1)
 
         # System rejection rate
-        rejected_jobs = self.db.query(ValidationSession).filter(
-            and_(
-                ValidationSession.created_at.between(start, end),
-                ValidationSession.status == 'failed'
-            )
-        ).count()
-
+        rejected_jobs = totals.get('failed', {}).get("jobs", 0)
         system_rejection_rate = (rejected_jobs / max(total_system_jobs, 1)) * 100
 
         # Average system processing time
-        system_processing_query = self.db.query(ValidationSession).filter(
-            and_(
-                ValidationSession.created_at.between(start, end),
-                ValidationSession.processing_started_at.isnot(None),
-                ValidationSession.processing_completed_at.isnot(None)
-            )
-        )
-
-        avg_system_processing_time = None
-        if system_processing_query.count() > 0:
-            processing_times = system_processing_query.with_entities(
-                ValidationSession.processing_started_at,
-                ValidationSession.processing_completed_at
-            ).all()
-
-            total_minutes = sum(
-                (end_time - start_time).total_seconds() / 60
-                for start_time, end_time in processing_times
-                if start_time and end_time
-            )
-            avg_system_processing_time = total_minutes / len(processing_times)
+        avg_system_processing_time = self._avg_processing_minutes(totals)
 
         # Usage by role
         usage_by_role_query = self.db.query(
@@ -625,26 +585,21 @@ class AnalyticsService:
             for doc_type, count in doc_type_query
         ]
 
-        # Success rates by document type
-        doc_success_rates = {}
-        for doc_type, _ in doc_type_query:
-            total_jobs_for_type = self.db.query(ValidationSession).join(Document).filter(
-                and_(
-                    Document.document_type == doc_type,
-                    ValidationSession.created_at.between(start, end)
-                )
-            ).count()
-
-            successful_jobs_for_type = self.db.query(ValidationSession).join(Document).filter(
-                and_(
-                    Document.document_type == doc_type,
-                    ValidationSession.created_at.between(start, end),
-                    ValidationSession.status == 'completed'
-                )
-            ).count()
+        # Success rates by document type (one grouped query)
+        doc_success_query = self.db.query(
+            Document.document_type,
+            func.count(func.distinct(ValidationSession.id)),
+            func.count(func.distinct(
+                case((ValidationSession.status == 'completed', ValidationSession.id))
+            )),
+        ).join(ValidationSession).filter(
+            ValidationSession.created_at.between(start, end)
+        ).group_by(Document.document_type).all()
 
-            success_rate = (successful_jobs_for_type / max(total_jobs_for_type, 1)) * 100
-            doc_success_rates[doc_type] = round(success_rate, 2)
+        doc_success_rates = {
+            doc_type: round((successful_jobs_for_type / max(total_jobs_for_type, 1)) * 100, 2)
+            for doc_type, total_jobs_for_type, successful_jobs_for_type in doc_success_query
+        }
 
         return SystemMetrics(
             total_system_jobs=total_system_jobs,
@@ -757,35 +712,38 @@ class AnalyticsService:
         scoped_tenants = self._normalize_uuid_list(tenant_ids)
         lookback_start = datetime.utcnow() - timedelta(days=lookback_days)
 
-        session_query = self.db.query(ValidationSession).filter(ValidationSession.created_at >= lookback_start)
-        if scoped_tenants:
-            session_query = session_query.filter(ValidationSession.company_id.in_(scoped_tenants))
-
-        total_jobs = session_query.count()
-        completed = session_query.filter(ValidationSession.status == SessionStatus.COMPLETED.value).count()
-        failed = session_query.filter(ValidationSession.status == SessionStatus.FAILED.value).count()
-
-        total_tenants = (
-            self.db.query(func.count(func.distinct(ValidationSession.company_id)))
-            .filter(ValidationSession.created_at >= lookback_start)
-        )
-        if scoped_tenants:
-            total_tenants = total_tenants.filter(ValidationSession.company_id.in_(scoped_tenants))
-        total_tenants_value = total_tenants.scalar() or 0
-
-        # Trend data (daily counts)
-        trend_rows = (
-            self.db.query(
-                func.date_trunc("day", ValidationSession.created_at).label("day"),
-                func.count(ValidationSession.id).label("jobs"),
-            )
-            .filter(ValidationSession.created_at >= lookback_start)
-        )
-        if scoped_tenants:
-            trend_rows = trend_rows.filter(ValidationSession.company_id.in_(scoped_tenants))
+        lookback_end = datetime.utcnow()
+        scope = {"company_ids": scoped_tenants}
+
+        # Daily job counts by status; totals and the trend are folded from these rows.
+        daily_rows = self._rollup_query(
+            lookback_start, lookback_end,
+            AnalyticsDailyRollup.day,
+            AnalyticsDailyRollup.status,
+            func.sum(AnalyticsDailyRollup.jobs),
+            **scope,
+        ).group_by(AnalyticsDailyRollup.day, AnalyticsDailyRollup.status).all()
+
+        daily_jobs: Dict[date, int] = defaultdict(int)
+        status_jobs: Counter = Counter()
+        for day, status, jobs in daily_rows:
+            daily_jobs[day] += int(jobs or 0)
+            status_jobs[status] += int(jobs or 0)
+
+        total_jobs = sum(status_jobs.values())
+        completed = status_jobs[SessionStatus.COMPLETED.value]
+        failed = status_jobs[SessionStatus.FAILED.value]
+
+        total_tenants_value = self._rollup_query(
+            lookback_start, lookback_end,
+            func.count(func.distinct(AnalyticsDailyRollup.company_id)),
+            **scope,
+        ).scalar() or 0
 
-        trend_rows = trend_rows.group_by("day").order_by("day").all()
-        trend = [{"date": row.day.date().isoformat(), "jobs": row.jobs} for row in trend_rows]
+        trend = [
+            {"date": day.isoformat(), "jobs": jobs}
+            for day, jobs in sorted(daily_jobs.items())
+        ]
 
         pass_rate = (completed / total_jobs * 100) if total_jobs else 0
 
@@ -934,15 +892,8 @@ class AnalyticsService:
 
     def _calculate_rejection_rate(self, start: datetime, end: datetime) -> float:
         """Calculate rejection rate for a time period."""
-        total_jobs = self.db.query(ValidationSession).filter(
-            ValidationSession.created_at.between(start, end)
-        ).count()
-
-        rejected_jobs = self.db.query(ValidationSession).filter(
-            and_(
-                ValidationSession.created_at.between(start, end),
-                ValidationSession.status == 'failed'
-            )
-        ).count()
+        totals = self._rollup_status_totals(start, end)
+        total_jobs = sum(counters["jobs"] for counters in totals.values())
+        rejected_jobs = totals.get('failed', {}).get("jobs", 0)
 
         return (rejected_jobs / max(total_jobs, 1)) * 100
@@ -109,8 +109,8 @@ class AuditService:
 
         return sanitized
 
-    def log_action(
-        self,
+    @staticmethod
+    def audit_log_values(
         action: Union[str, AuditAction],
         user: Optional[models.User] = None,
         user_id: Optional[UUID] = None,
@@ -137,74 +137,45 @@ class AuditService:
         metadata: Optional[Dict[str, Any]] = None,
         audit_metadata: Optional[Dict[str, Any]] = None,
         duration_ms: Optional[int] = None,
-        retention_days: int = 2555  # 7 years default
-    ) -> AuditLog:
+        retention_days: int = 2555,
+        user_role: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
-        Log an audit event with comprehensive tracking.
-
-        Args:
-            action: Action performed
-            user: User object (optional)
-            user_id: User ID (optional, extracted from user if not provided)
-            user_email: User email (optional, extracted from user if not provided)
-            correlation_id: Request correlation ID
-            session_id: User session ID
-            resource_type: Type of resource affected
-            resource_id: Resource identifier
-            lc_number: LC number if applicable
-            lc_version: LC version if applicable
-            result: Action result
-            ip_address: Client IP address
-            user_agent: Client user agent
-            endpoint: API endpoint
-            http_method: HTTP method
-            status_code: HTTP status code
-            error_message: Error message if failed
-            file_content: Single file content for hashing
-            files_content: Multiple files content for hashing
-            file_size: File size in bytes
-            file_count: Number of files
-            request_data: Request payload (will be sanitized)
-            response_data: Response data (will be sanitized)
-            metadata: Additional metadata (legacy alias)
-            audit_metadata: Additional metadata for audit records
-            duration_ms: Action duration in milliseconds
-            retention_days: How long to retain this log (default 7 years)
+        Build ``AuditLog`` column values without touching the database.
 
-        Returns:
-            Created AuditLog instance
+        Takes the same arguments as ``log_action``; ``user_role`` may be given
+        directly when no ``User`` object is at hand (e.g. the buffered
+        request audit writer).
         """
         # Extract user info if user object provided
         if user:
             user_id = user_id or user.id
             user_email = user_email or user.email
             user_role = getattr(user, 'role', None)
-        else:
-            user_role = None
 
         # Generate correlation ID if not provided
         if not correlation_id:
-            correlation_id = self.generate_correlation_id()
+            correlation_id = AuditService.generate_correlation_id()
 
         # Calculate file hash if content provided
         file_hash = None
         if file_content:
-            file_hash = self.calculate_file_hash(file_content)
+            file_hash = AuditService.calculate_file_hash(file_content)
             file_size = file_size or len(file_content)
             file_count = file_count or 1
         elif files_content:
-            file_hash = self.calculate_multiple_files_hash(files_content)
+            file_hash = AuditService.calculate_multiple_files_hash(files_content)
             file_size = file_size or sum(len(content) for content in files_content)
             file_count = file_count or len(files_content)
 
         # Sanitize sensitive data
         sanitized_request_data = None
         if request_data:
-            sanitized_request_data = self.sanitize_request_data(request_data)
+            sanitized_request_data = AuditService.sanitize_request_data(request_data)
 
         sanitized_response_data = None
         if response_data:
-            sanitized_response_data = self.sanitize_request_data(response_data)
+            sanitized_response_data = AuditService.sanitize_request_data(response_data)
 
         # Merge legacy metadata alias
         if metadata:
@@ -218,8 +189,8 @@ class AuditService:
         # Calculate retention deadline
         retention_until = datetime.utcnow() + timedelta(days=retention_days)
 
-        # Create audit log entry
-        audit_log = AuditLog(
+        # Column values for the audit log entry
+        return dict(
             correlation_id=correlation_id,
             session_id=session_id,
             user_id=user_id,
@@ -246,8 +217,104 @@ class AuditService:
             response_data=sanitized_response_data,
             audit_metadata=audit_metadata,
             retention_until=retention_until,
-            archived="active"
+            archived="active",
+        )
+
+    def log_action(
+        self,
+        action: Union[str, AuditAction],
+        user: Optional[models.User] = None,
+        user_id: Optional[UUID] = None,
+        user_email: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+        session_id: Optional[str] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        lc_number: Optional[str] = None,
+        lc_version: Optional[str] = None,
+        result: Union[str, AuditResult] = AuditResult.SUCCESS,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        http_method: Optional[str] = None,
+        status_code: Optional[int] = None,
+        error_message: Optional[str] = None,
+        file_content: Optional[bytes] = None,
+        files_content: Optional[List[bytes]] = None,
+        file_size: Optional[int] = None,
+        file_count: Optional[int] = None,
+        request_data: Optional[Dict[str, Any]] = None,
+        response_data: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        audit_metadata: Optional[Dict[str, Any]] = None,
+        duration_ms: Optional[int] = None,
+        retention_days: int = 2555  # 7 years default
+    ) -> AuditLog:
+        """
+        Log an audit event with comprehensive tracking.
+
+        Args:
+            action: Action performed
+            user: User object (optional)
+            user_id: User ID (optional, extracted from user if not provided)
+            user_email: User email (optional, extracted from user if not provided)
+            correlation_id: Request correlation ID
+            session_id: User session ID
+            resource_type: Type of resource affected
+            resource_id: Resource identifier
+            lc_number: LC number if applicable
+            lc_version: LC version if applicable
+            result: Action result
+            ip_address: Client IP address
+            user_agent: Client user agent
+            endpoint: API endpoint
+            http_method: HTTP method
+            status_code: HTTP status code
+            error_message: Error message if failed
+            file_content: Single file content for hashing
+            files_content: Multiple files content for hashing
+            file_size: File size in bytes
+            file_count: Number of files
+            request_data: Request payload (will be sanitized)
+            response_data: Response data (will be sanitized)
+            metadata: Additional metadata (legacy alias)
+            audit_metadata: Additional metadata for audit records
+            duration_ms: Action duration in milliseconds
+            retention_days: How long to retain this log (default 7 years)
+
+        Returns:
+            Created AuditLog instance
+        """
+        values = self.audit_log_values(
+            action=action,
+            user=user,
+            user_id=user_id,
+            user_email=user_email,
+            correlation_id=correlation_id,
+            session_id=session_id,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            lc_number=lc_number,
+            lc_version=lc_version,
+            result=result,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            endpoint=endpoint,
+            http_method=http_method,
+            status_code=status_code,
+            error_message=error_message,
+            file_content=file_content,
+            files_content=files_content,
+            file_size=file_size,
+            file_count=file_count,
+            request_data=request_data,
+            response_data=response_data,
+            metadata=metadata,
+            audit_metadata=audit_metadata,
+            duration_ms=duration_ms,
+            retention_days=retention_days,
         )
+        audit_log = AuditLog(**values)
 
         self.db.add(audit_log)
         self.db.commit()
@@ -0,0 +1,422 @@
+"""
+Buffered, off-request writer for request audit events.
+
+``AuditMiddleware`` used to open a DB session, re-resolve the bearer token's
+user and commit one ``AuditLog`` row before every response was returned.
+It now only builds the row values and calls ``AuditLogWriter.submit``:
+
+- Events wait in a bounded in-process buffer (``AUDIT_BUFFER_MAX_EVENTS``).
+- A background task drains it every ``AUDIT_FLUSH_INTERVAL_MS`` (or as soon
+  as a full batch is waiting) with one bulk insert per
+  ``AUDIT_FLUSH_BATCH_SIZE`` rows. Users are resolved from the token subject
+  in one query per batch.
+- If the buffer is full, or an insert fails, events are appended to a local
+  JSONL spill file (``AUDIT_SPILL_PATH``) and fsynced. The file is replayed
+  once inserts succeed again; rows keep their ids, so a replay interrupted
+  part-way cannot duplicate rows on Postgres.
+- Lines that cannot be decoded, and rows the database rejects (a batch that
+  fails for a non-connection reason is retried row by row), are moved to
+  ``<spill>.corrupt`` so they never block the rest of the replay.
+- ``audit_buffer_depth`` and ``audit_events_total{outcome}`` expose the
+  back-pressure.
+
+Where no long-lived event loop exists (AWS Lambda) or
+``AUDIT_WRITER_ENABLED`` is false, the middleware drains the buffer before
+returning instead, so events are never left in a frozen container.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.exc import (
+    DBAPIError,
+    DisconnectionError,
+    InterfaceError,
+    OperationalError,
+    SQLAlchemyError,
+)
+
+from app.config import settings
+from app.metrics.audit_metrics import (
+    audit_buffer_depth,
+    audit_events_total,
+    audit_flush_batch_size,
+    audit_flush_seconds,
+)
+from app.models import AuditLog, User
+
+logger = logging.getLogger(__name__)
+
+# Token subject (email) carried until the flusher resolves it to a user.
+SUBJECT_KEY = "_subject"
+
+_DATETIME_FIELDS = ("timestamp", "retention_until")
+_UUID_FIELDS = ("id", "user_id")
+_DB_RETRY_BACKOFF_SEC = 5.0
+
+
+def writer_enabled() -> bool:
+    return bool(getattr(settings, "AUDIT_WRITER_ENABLED", True))
+
+
+def _encode(event: Dict[str, Any]) -> str:
+    payload = dict(event)
+    for key in _DATETIME_FIELDS:
+        if isinstance(payload.get(key), datetime):
+            payload[key] = payload[key].isoformat()
+    for key in _UUID_FIELDS:
+        if payload.get(key) is not None:
+            payload[key] = str(payload[key])
+    return json.dumps(payload, default=str)
+
+
+def _decode(line: str) -> Dict[str, Any]:
+    event = json.loads(line)
+    if not isinstance(event, dict):
+        raise ValueError(f"expected a JSON object, got {type(event).__name__}")
+    for key in _DATETIME_FIELDS:
+        if isinstance(event.get(key), str):
+            event[key] = datetime.fromisoformat(event[key])
+    for key in _UUID_FIELDS:
+        if isinstance(event.get(key), str):
+            event[key] = uuid.UUID(event[key])
+    return event
+
+
+def _is_data_error(exc: Exception) -> bool:
+    """True when the database rejected the rows, not when it could not be reached."""
+    if isinstance(exc, (OperationalError, InterfaceError, DisconnectionError)):
+        return False
+    if isinstance(exc, DBAPIError) and exc.connection_invalidated:
+        return False
+    return isinstance(exc, SQLAlchemyError)
+
+
+class AuditLogWriter:
+    """Bounded buffer plus bulk-inserting flusher for ``AuditLog`` rows."""
+
+    def __init__(
+        self,
+        session_factory: Optional[Callable[[], Any]] = None,
+        *,
+        max_events: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        self._session_factory = session_factory
+        self.max_events = max(1, int(max_events or getattr(settings, "AUDIT_BUFFER_MAX_EVENTS", 10000) or 10000))
+        self.batch_size = max(1, int(batch_size or getattr(settings, "AUDIT_FLUSH_BATCH_SIZE", 500) or 500))
+        interval_ms = getattr(settings, "AUDIT_FLUSH_INTERVAL_MS", 1000) or 1000
+        self.flush_interval = float(flush_interval if flush_interval is not None else interval_ms / 1000.0)
+        self.spill_path = spill_path or getattr(settings, "AUDIT_SPILL_PATH", "/tmp/lcopilot_audit_spill.jsonl")
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._db_retry_at = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._stats: Dict[str, int] = {"submitted": 0, "written": 0, "spilled": 0, "replayed": 0, "quarantined": 0, "lost": 0}
+
+    # -- producer side (event loop) -------------------------------------
+
+    def submit(self, event: Dict[str, Any]) -> None:
+        """Queue one event; never blocks on the database."""
+        event.setdefault("id", uuid.uuid4())
+        with self._buffer_lock:
+            self._stats["submitted"] += 1
+            overflow = len(self._buffer) >= self.max_events
+            if not overflow:
+                self._buffer.append(event)
+                depth = len(self._buffer)
+        if overflow:
+            self._spill([event])
+            return
+        audit_buffer_depth.set(depth)
+        if depth >= self.batch_size and self._wake is not None:
+            self._wake.set()
+
+    def ensure_started(self) -> None:
+        """Start the flusher on the running loop if it is not running there."""
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._wake = asyncio.Event()
+        self._task = loop.create_task(self._run(), name="audit-log-writer")
+
+    async def drain(self) -> int:
+        """Flush everything buffered now (used where no flusher can run)."""
+        return await asyncio.to_thread(self.flush)
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+        await self.drain()
+
+    async def _run(self) -> None:
+        while True:
+            wake = self._wake
+            try:
+                await asyncio.wait_for(wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as exc:  # pragma: no cover - flush already contains its failures
+                logger.warning("Audit writer flush crashed: %s", exc)
+
+    # -- consumer side (worker thread) ----------------------------------
+
+    def flush(self) -> int:
+        """Insert buffered events in batches; spill them if the DB is unavailable."""
+        with self._flush_lock:
+            written = 0
+            while True:
+                batch = self._take(self.batch_size)
+                if not batch:
+                    break
+                if time.monotonic() < self._db_retry_at or not self._insert(batch):
+                    self._spill(batch + self._take(None))
+                    break
+                written += len(batch)
+            if time.monotonic() >= self._db_retry_at:
+                self._replay_spill()
+            return written
+
+    def stats(self) -> Dict[str, int]:
+        with self._buffer_lock:
+            return {**self._stats, "buffered": len(self._buffer)}
+
+    def _take(self, limit: Optional[int]) -> List[Dict[str, Any]]:
+        with self._buffer_lock:
+            count = len(self._buffer) if limit is None else min(limit, len(self._buffer))
+            batch = [self._buffer.popleft() for _ in range(count)]
+            audit_buffer_depth.set(len(self._buffer))
+        return batch
+
+    def _open_session(self):
+        if self._session_factory is None:
+            from app.database import SessionLocal
+
+            self._session_factory = SessionLocal
+        return self._session_factory()
+
+    def _insert(self, events: List[Dict[str, Any]], *, replay: bool = False) -> bool:
+        """Write ``events``; False means the database is unreachable and they were not written."""
+        started = time.perf_counter()
+        try:
+            self._execute(events, replay=replay)
+        except Exception as exc:
+            if not _is_data_error(exc):
+                self._db_retry_at = time.monotonic() + _DB_RETRY_BACKOFF_SEC
+                logger.warning("Audit bulk insert of %d events failed: %s", len(events), exc)
+                return False
+            logger.warning("Audit bulk insert of %d events rejected, retrying row by row: %s", len(events), exc)
+            return self._insert_rows(events, replay=replay)
+        self._count_written(len(events), replay=replay, started=started)
+        return True
+
+    def _insert_rows(self, events: List[Dict[str, Any]], *, replay: bool) -> bool:
+        """Insert one row at a time and quarantine the rows the database rejects."""
+        rejected: List[Dict[str, Any]] = []
+        try:
+            for event in events:
+                started = time.perf_counter()
+                try:
+                    self._execute([event], replay=replay)
+                except Exception as exc:
+                    if not _is_data_error(exc):
+                        self._db_retry_at = time.monotonic() + _DB_RETRY_BACKOFF_SEC
+                        logger.warning("Audit row insert failed: %s", exc)
+                        return False
+                    logger.warning("Audit event %s rejected: %s", event.get("id"), exc)
+                    rejected.append(event)
+                    continue
+                self._count_written(1, replay=replay, started=started)
+            return True
+        finally:
+            self._quarantine([_encode(event) + "\n" for event in rejected])
+
+    def _execute(self, events: List[Dict[str, Any]], *, replay: bool) -> None:
+        db = None
+        try:
+            db = self._open_session()
+            rows = self._resolve_users(db, events)
+            stmt = insert(AuditLog.__table__)
+            if replay and db.get_bind().dialect.name == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+                stmt = pg_insert(AuditLog.__table__).on_conflict_do_nothing(index_elements=["id"])
+            db.execute(stmt, rows)
+            db.commit()
+        except Exception:
+            if db is not None:
+                db.rollback()
+            raise
+        finally:
+            if db is not None:
+                db.close()
+
+    def _count_written(self, count: int, *, replay: bool, started: float) -> None:
+        audit_flush_seconds.observe(time.perf_counter() - started)
+        audit_flush_batch_size.observe(count)
+        outcome = "replayed" if replay else "written"
+        audit_events_total.labels(outcome=outcome).inc(count)
+        with self._buffer_lock:
+            self._stats[outcome] += count
+
+    @staticmethod
+    def _resolve_users(db: Any, events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        subjects = {event.get(SUBJECT_KEY) for event in events if event.get(SUBJECT_KEY) and not event.get("user_id")}
+        users: Dict[str, Any] = {}
+        if subjects:
+            users = {
+                row.email: row
+                for row in db.execute(
+                    select(User.id, User.email, User.role).where(
+                        User.email.in_(subjects),
+                        User.is_active == True,  # noqa: E712
+                        User.deleted_at.is_(None),
+                    )
+                )
+            }
+        rows = []
+        for event in events:
+            row = {key: value for key, value in event.items() if key != SUBJECT_KEY}
+            user = users.get(event.get(SUBJECT_KEY))
+            if user is not None:
+                row.update(user_id=user.id, user_email=user.email, user_role=user.role)
+            rows.append(row)
+        return rows
+
+    # -- spill file -----------------------------------------------------
+
+    def _spill(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        try:
+            with self._spill_lock:
+                directory = os.path.dirname(self.spill_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.spill_path, "a", encoding="utf-8") as handle:
+                    handle.write("".join(_encode(event) + "\n" for event in events))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+        except Exception as exc:
+            audit_events_total.labels(outcome="lost").inc(len(events))
+            with self._buffer_lock:
+                self._stats["lost"] += len(events)
+            logger.error("Audit spill of %d events to %s failed: %s", len(events), self.spill_path, exc)
+            return
+        audit_events_total.labels(outcome="spilled").inc(len(events))
+        with self._buffer_lock:
+            self._stats["spilled"] += len(events)
+
+    def _quarantine(self, lines: List[str]) -> None:
+        """Move undecodable or rejected spill lines aside to ``<spill>.corrupt``."""
+        if not lines:
+            return
+        corrupt_path = self.spill_path + ".corrupt"
+        try:
+            with self._spill_lock:
+                with open(corrupt_path, "a", encoding="utf-8") as handle:
+                    handle.write("".join(lines))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+        except OSError as exc:
+            outcome = "lost"
+            logger.error("Audit quarantine of %d events to %s failed: %s", len(lines), corrupt_path, exc)
+        else:
+            outcome = "quarantined"
+            logger.error("Moved %d unusable audit events to %s", len(lines), corrupt_path)
+        audit_events_total.labels(outcome=outcome).inc(len(lines))
+        with self._buffer_lock:
+            self._stats[outcome] += len(lines)
+
+    def _read_replay_file(self, replay_path: str) -> Optional[List[Dict[str, Any]]]:
+        """Decode the replay file line by line; bad lines are quarantined and dropped from it."""
+        events: List[Dict[str, Any]] = []
+        good_lines: List[str] = []
+        bad_lines: List[str] = []
+        try:
+            with open(replay_path, "r", encoding="utf-8") as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    line = line if line.endswith("\n") else line + "\n"
+                    try:
+                        events.append(_decode(line))
+                    except (ValueError, TypeError) as exc:
+                        logger.warning("Unreadable audit spill line in %s: %s", replay_path, exc)
+                        bad_lines.append(line)
+                    else:
+                        good_lines.append(line)
+            if bad_lines:
+                self._quarantine(bad_lines)
+                # Rewrite without them so an interrupted replay does not quarantine them twice.
+                temp_path = replay_path + ".tmp"
+                with open(temp_path, "w", encoding="utf-8") as handle:
+                    handle.write("".join(good_lines))
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                os.replace(temp_path, replay_path)
+        except OSError as exc:
+            logger.error("Audit spill file %s is unreadable: %s", replay_path, exc)
+            return None
+        return events
+
+    def _replay_spill(self) -> None:
+        replay_path = self.spill_path + ".replay"
+        with self._spill_lock:
+            if not os.path.exists(replay_path):
+                if not os.path.exists(self.spill_path):
+                    return
+                os.replace(self.spill_path, replay_path)
+        events = self._read_replay_file(replay_path)
+        if events is None:
+            return
+        for start in range(0, len(events), self.batch_size):
+            if not self._insert(events[start:start + self.batch_size], replay=True):
+                return  # keep the file; ids make the next replay idempotent
+        os.remove(replay_path)
+        if events:
+            logger.info("Replayed %d spilled audit events", len(events))
+
+
+_writer: Optional[AuditLogWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditLogWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditLogWriter()
+    return _writer
+
+
+async def close_audit_writer() -> None:
+    """Stop the flusher and write (or spill) whatever is still buffered."""
+    if _writer is not None:
+        await _writer.close()
@@ -58,8 +58,7 @@ class BankNotificationService:
             return False
         
         # Extract LC details
-        metadata = session.extracted_data or {}
-        bank_metadata = metadata.get("bank_metadata", {})
+        bank_metadata = session.bank_metadata
         lc_number = bank_metadata.get("lc_number", "N/A")
         client_name = bank_metadata.get("client_name", "Unknown Client")
         
@@ -134,8 +133,7 @@ class BankNotificationService:
         threshold = notification_prefs.get("high_discrepancy_threshold", 5)
         
         # Extract LC details
-        metadata = session.extracted_data or {}
-        bank_metadata = metadata.get("bank_metadata", {})
+        bank_metadata = session.bank_metadata
         lc_number = bank_metadata.get("lc_number", "N/A")
         client_name = bank_metadata.get("client_name", "Unknown Client")
         
@@ -0,0 +1,227 @@
+"""
+Compiled rule plans for DB-backed rulesets.
+
+``validate_document_async`` used to re-interpret every rule dict on every
+request: document-type and LC-type filtering, the activation heuristics
+(tag / title / field-path scans), condition normalisation and field-path
+splitting. None of that depends on the request, so ``compile_ruleset`` does
+it once per ruleset version:
+
+- every rule becomes a ``RulePlanEntry``: a ``CompiledRule`` (normalised
+  conditions, pre-split field paths, precompiled regexes) plus its
+  ``RuleActivationTraits``;
+- entries are indexed by rule ``document_type`` and by workflow LC type, so
+  ``CompiledRuleset.select`` returns the candidate rules for a request
+  without scanning the whole ruleset.
+
+Plans are cached next to the raw ruleset (``DBRulesAdapter._compiled_cache``)
+and rebuilt when the ruleset id, version or any rule checksum changes.
+Rules services without their own cache go through ``get_or_compile``, which
+memoises on the identity of the ruleset's rules list.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from app.core.lc_types import LCType
+from app.services.rule_evaluator import CompiledRule, compile_rule
+
+logger = logging.getLogger(__name__)
+
+_WORKFLOW_LC_TYPES = (LCType.EXPORT.value, LCType.IMPORT.value, LCType.UNKNOWN.value)
+# Rule document types that apply to every request document type.
+_DOC_AGNOSTIC_TYPES = (None, "", "lc")
+_SELECTION_CACHE_MAX = 64
+_COMPILE_CACHE_MAX = 32
+
+
+@dataclass(frozen=True)
+class RulePlanEntry:
+    """One rule of a compiled ruleset."""
+
+    compiled: CompiledRule
+    activation: Any  # validator.RuleActivationTraits
+
+    @property
+    def rule(self) -> Dict[str, Any]:
+        return self.compiled.rule
+
+
+@dataclass
+class CompiledRuleset:
+    """Indexed, evaluator-ready form of a ruleset returned by ``get_active_ruleset``."""
+
+    ruleset_data: Dict[str, Any]
+    domain: str
+    version_key: str
+    entries: Tuple[RulePlanEntry, ...]
+    _doc_agnostic: Tuple[int, ...] = ()
+    _by_document_type: Dict[Any, Tuple[int, ...]] = field(default_factory=dict)
+    _by_lc_type: Dict[str, FrozenSet[int]] = field(default_factory=dict)
+    _selection_cache: Dict[Tuple[Any, Optional[str]], Tuple[RulePlanEntry, ...]] = field(default_factory=dict)
+
+    @property
+    def ruleset_version(self) -> Optional[str]:
+        return self.ruleset_data.get("ruleset_version")
+
+    @property
+    def rulebook_version(self) -> Optional[str]:
+        return self.ruleset_data.get("rulebook_version")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def select(self, document_type: Optional[str], lc_type: Optional[str] = None) -> Tuple[RulePlanEntry, ...]:
+        """Rules in scope for ``document_type`` (and ``lc_type`` when given), in ruleset order.
+
+        Matches the validator's former per-rule filters: a rule applies when
+        its ``document_type`` is empty, ``"lc"`` or the request type, or when
+        it belongs to an ``lc_ops`` pack; and when ``_rule_matches_lc_type``
+        accepts it for this ruleset's domain.
+        """
+        try:
+            cache_key = (document_type, lc_type)
+            cached = self._selection_cache.get(cache_key)
+        except TypeError:
+            cache_key, cached = None, None
+        if cached is not None:
+            return cached
+
+        indices = set(self._doc_agnostic)
+        if cache_key is not None:
+            indices.update(self._by_document_type.get(document_type, ()))
+        if lc_type is not None:
+            indices.intersection_update(self._by_lc_type.get(lc_type, frozenset()))
+        selected = tuple(self.entries[idx] for idx in sorted(indices))
+
+        if cache_key is not None:
+            if len(self._selection_cache) >= _SELECTION_CACHE_MAX:
+                self._selection_cache.clear()
+            self._selection_cache[cache_key] = selected
+        return selected
+
+
+def ruleset_version_key(ruleset_data: Dict[str, Any]) -> str:
+    """Identity of a ruleset's content: id, version and per-rule checksums."""
+    ruleset_meta = ruleset_data.get("ruleset") or {}
+    digest = hashlib.sha1()
+    for rule in ruleset_data.get("rules") or []:
+        if isinstance(rule, dict):
+            digest.update(f"{rule.get('rule_id')}:{rule.get('checksum')}|".encode("utf-8"))
+    return ":".join(
+        [
+            str(ruleset_meta.get("id") or ""),
+            str(ruleset_data.get("ruleset_version") or ""),
+            str(ruleset_meta.get("published_at") or ""),
+            digest.hexdigest(),
+        ]
+    )
+
+
+def compile_ruleset(ruleset_data: Dict[str, Any], domain: str) -> CompiledRuleset:
+    """Compile a ruleset payload into an indexed ``CompiledRuleset``."""
+    # Imported lazily: validator imports this module.
+    from app.services.validator import _rule_matches_lc_type, build_rule_activation_traits
+
+    domain_lower = (domain or "").lower()
+    entries: List[RulePlanEntry] = []
+    doc_agnostic: List[int] = []
+    by_document_type: Dict[Any, List[int]] = {}
+    by_lc_type: Dict[str, List[int]] = {lc_type: [] for lc_type in _WORKFLOW_LC_TYPES}
+
+    for rule in ruleset_data.get("rules") or []:
+        if not isinstance(rule, dict):
+            continue
+        try:
+            entry = RulePlanEntry(
+                compiled=compile_rule(rule),
+                activation=build_rule_activation_traits(rule, domain_lower),
+            )
+        except Exception as exc:  # noqa: BLE001 - one malformed row must not sink the ruleset
+            logger.warning("Skipping uncompilable rule %s in %s: %s", rule.get("rule_id"), domain, exc)
+            continue
+        idx = len(entries)
+        entries.append(entry)
+
+        rule_document_type = rule.get("document_type")
+        rule_domain = str(rule.get("domain") or "").strip().lower()
+        if rule_document_type in _DOC_AGNOSTIC_TYPES or rule_domain == "lc_ops":
+            doc_agnostic.append(idx)
+        else:
+            try:
+                by_document_type.setdefault(rule_document_type, []).append(idx)
+            except TypeError:
+                pass  # unhashable document_type never equals a request type
+
+        for lc_type in _WORKFLOW_LC_TYPES:
+            if _rule_matches_lc_type(rule, domain, lc_type):
+                by_lc_type[lc_type].append(idx)
+
+    compiled = CompiledRuleset(
+        ruleset_data=ruleset_data,
+        domain=domain,
+        version_key=ruleset_version_key(ruleset_data),
+        entries=tuple(entries),
+        _doc_agnostic=tuple(doc_agnostic),
+        _by_document_type={key: tuple(value) for key, value in by_document_type.items()},
+        _by_lc_type={key: frozenset(value) for key, value in by_lc_type.items()},
+    )
+    logger.info(
+        "Compiled ruleset",
+        extra={
+            "domain": domain,
+            "ruleset_version": compiled.ruleset_version,
+            "rule_count": len(entries),
+            "document_types": len(by_document_type),
+        },
+    )
+    return compiled
+
+
+_compile_cache: "OrderedDict[Tuple[str, int], Tuple[Any, CompiledRuleset]]" = OrderedDict()
+_compile_cache_lock = threading.Lock()
+
+
+def get_or_compile(ruleset_data: Dict[str, Any], domain: str) -> CompiledRuleset:
+    """Compile ``ruleset_data``, reusing the plan while the same rules list is served.
+
+    The cache holds a reference to the rules list, so its ``id`` cannot be
+    reused by another list while the entry is alive.
+    """
+    rules = ruleset_data.get("rules")
+    if not isinstance(rules, list):
+        return compile_ruleset(ruleset_data, domain)
+    cache_key = (domain, id(rules))
+    with _compile_cache_lock:
+        cached = _compile_cache.get(cache_key)
+        if cached is not None and cached[0] is rules:
+            _compile_cache.move_to_end(cache_key)
+            return cached[1]
+
+    compiled = compile_ruleset(ruleset_data, domain)
+    with _compile_cache_lock:
+        _compile_cache[cache_key] = (rules, compiled)
+        while len(_compile_cache) > _COMPILE_CACHE_MAX:
+            _compile_cache.popitem(last=False)
+    return compiled
+
+
+def clear_compile_cache() -> None:
+    with _compile_cache_lock:
+        _compile_cache.clear()
+
+
+__all__ = [
+    "CompiledRuleset",
+    "RulePlanEntry",
+    "clear_compile_cache",
+    "compile_ruleset",
+    "get_or_compile",
+    "ruleset_version_key",
+]
@@ -1,21 +1,28 @@
 """
 Document Storage Service
 
-Handles PDF storage to S3 with versioning and retrieval.
+Handles PDF storage to S3 with versioning and retrieval. Transfers go
+through the non-blocking backends in ``app.services.object_storage``, so
+large evidence packs do not stall the event loop.
 """
 
 import os
-import io
-import uuid
+import asyncio
 import hashlib
 import logging
 from datetime import datetime
-from typing import Optional, Tuple, List, Dict, Any
+from typing import AsyncIterator, BinaryIO, Optional, Tuple, List, Dict, Any, Union
 
-import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+from app.services.object_storage import (
+    DEFAULT_CHUNK_SIZE,
+    ByteRange,
+    ObjectStorage,
+    build_object_storage,
+)
+
 logger = logging.getLogger(__name__)
 
 # Environment variables
@@ -32,29 +39,44 @@ S3_CONFIG = Config(
 )
 
 
+def _s3_client():
+    from app.utils.s3_client import get_s3_client
+    return get_s3_client(config=S3_CONFIG)
+
+
+def _checksum_and_size(body: Union[bytes, BinaryIO]) -> Tuple[str, int]:
+    """SHA256 and size of bytes or a seekable file (rewound afterwards)."""
+    if isinstance(body, (bytes, bytearray)):
+        return hashlib.sha256(body).hexdigest(), len(body)
+    digest = hashlib.sha256()
+    size = 0
+    start = body.tell()
+    while True:
+        chunk = body.read(DEFAULT_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+        size += len(chunk)
+    body.seek(start)
+    return digest.hexdigest(), size
+
+
 class DocumentStorageService:
     """
     Service for storing generated documents in S3.
     
     Features:
-    - Upload PDFs with versioning
+    - Upload PDFs with versioning (multipart for large files and streams)
+    - Full, ranged and streaming downloads
     - Generate signed URLs for downloads
     - Track document versions
     - Calculate checksums for integrity
     """
     
-    def __init__(self):
-        self._client = None
+    def __init__(self, backend: Optional[ObjectStorage] = None):
         self._bucket = S3_BUCKET
         self._region = S3_REGION
-    
-    @property
-    def client(self):
-        """Lazy-load S3 client"""
-        if self._client is None:
-            from app.utils.s3_client import get_s3_client
-            self._client = get_s3_client(config=S3_CONFIG)
-        return self._client
+        self._backend = backend or build_object_storage(self._bucket, client_factory=_s3_client)
     
     def _generate_s3_key(
         self,
@@ -71,13 +93,9 @@ class DocumentStorageService:
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
         return f"doc-generator/{company_id}/{document_set_id}/{document_type}_v{version}_{timestamp}.pdf"
     
-    def _calculate_checksum(self, data: bytes) -> str:
-        """Calculate SHA256 checksum of document"""
-        return hashlib.sha256(data).hexdigest()
-    
     async def upload_document(
         self,
-        pdf_bytes: bytes,
+        pdf_bytes: Union[bytes, BinaryIO],
         company_id: str,
         document_set_id: str,
         document_type: str,
@@ -87,6 +105,9 @@ class DocumentStorageService:
     ) -> Dict[str, Any]:
         """
         Upload a PDF document to S3.
+
+        ``pdf_bytes`` may also be a seekable binary file (e.g. an upload's
+        spooled temp file), which is streamed rather than read into memory.
         
         Returns:
             {
@@ -100,7 +121,10 @@ class DocumentStorageService:
         """
         try:
             s3_key = self._generate_s3_key(company_id, document_set_id, document_type, version)
-            checksum = self._calculate_checksum(pdf_bytes)
+            if isinstance(pdf_bytes, (bytes, bytearray)):
+                checksum, file_size = _checksum_and_size(pdf_bytes)
+            else:
+                checksum, file_size = await asyncio.to_thread(_checksum_and_size, pdf_bytes)
             
             # Prepare metadata
             s3_metadata = {
@@ -114,50 +138,64 @@ class DocumentStorageService:
                 s3_metadata.update(metadata)
             
             # Upload to S3
-            self.client.put_object(
-                Bucket=self._bucket,
-                Key=s3_key,
-                Body=pdf_bytes,
-                ContentType="application/pdf",
-                ContentDisposition=f'attachment; filename="{file_name}"',
-                Metadata=s3_metadata,
+            await self._backend.put(
+                s3_key,
+                pdf_bytes,
+                content_type="application/pdf",
+                content_disposition=f'attachment; filename="{file_name}"',
+                metadata=s3_metadata,
             )
             
-            logger.info(f"Uploaded document to S3: {s3_key} ({len(pdf_bytes)} bytes)")
+            logger.info(f"Uploaded document to S3: {s3_key} ({file_size} bytes)")
             
             return {
                 "s3_key": s3_key,
                 "s3_bucket": self._bucket,
                 "s3_region": self._region,
-                "file_size": len(pdf_bytes),
+                "file_size": file_size,
                 "checksum": checksum,
                 "version": version,
             }
             
-        except ClientError as e:
+        except (ClientError, OSError) as e:
             logger.error(f"S3 upload error: {e}")
             raise Exception(f"Failed to store document: {str(e)}")
     
-    async def get_document(self, s3_key: str) -> Tuple[bytes, Dict[str, str]]:
+    async def get_document(
+        self,
+        s3_key: str,
+        byte_range: Optional[ByteRange] = None,
+    ) -> Tuple[bytes, Dict[str, str]]:
         """
-        Retrieve a document from S3.
+        Retrieve a document (or an inclusive ``(start, end)`` byte range of it) from S3.
         
         Returns: (pdf_bytes, metadata)
         """
         try:
-            response = self.client.get_object(Bucket=self._bucket, Key=s3_key)
-            pdf_bytes = response['Body'].read()
-            metadata = response.get('Metadata', {})
+            pdf_bytes, metadata = await self._backend.get(s3_key, byte_range=byte_range)
             
             logger.info(f"Retrieved document from S3: {s3_key}")
             
             return pdf_bytes, metadata
             
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'NoSuchKey':
-                raise FileNotFoundError(f"Document not found: {s3_key}")
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Document not found: {s3_key}")
+        except (ClientError, OSError) as e:
             logger.error(f"S3 retrieval error: {e}")
             raise Exception(f"Failed to retrieve document: {str(e)}")
+
+    def stream_document(
+        self,
+        s3_key: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        byte_range: Optional[ByteRange] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream a document (or a byte range of it) in chunks, e.g. into a
+        ``StreamingResponse``. Raises FileNotFoundError on the first read
+        when the key does not exist.
+        """
+        return self._backend.stream(s3_key, chunk_size=chunk_size, byte_range=byte_range)
     
     async def get_signed_url(
         self,
@@ -177,22 +215,12 @@ class DocumentStorageService:
             Pre-signed URL
         """
         try:
-            params = {
-                'Bucket': self._bucket,
-                'Key': s3_key,
-            }
-            
-            if response_content_disposition:
-                params['ResponseContentDisposition'] = response_content_disposition
-            
-            url = self.client.generate_presigned_url(
-                'get_object',
-                Params=params,
-                ExpiresIn=expires_in
+            return await self._backend.presigned_url(
+                s3_key,
+                expires_in=expires_in,
+                response_content_disposition=response_content_disposition,
             )
             
-            return url
-            
         except ClientError as e:
             logger.error(f"Error generating signed URL: {e}")
             raise Exception(f"Failed to generate download URL: {str(e)}")
@@ -200,10 +228,10 @@ class DocumentStorageService:
     async def delete_document(self, s3_key: str) -> bool:
         """Delete a document from S3."""
         try:
-            self.client.delete_object(Bucket=self._bucket, Key=s3_key)
+            await self._backend.delete(s3_key)
             logger.info(f"Deleted document from S3: {s3_key}")
             return True
-        except ClientError as e:
+        except (ClientError, OSError) as e:
             logger.error(f"S3 deletion error: {e}")
             return False
     
@@ -223,24 +251,19 @@ class DocumentStorageService:
             if document_type:
                 prefix = f"{prefix}{document_type}_"
             
-            response = self.client.list_objects_v2(
-                Bucket=self._bucket,
-                Prefix=prefix
-            )
-            
             documents = []
-            for obj in response.get('Contents', []):
-                key = obj['Key']
+            for obj in await self._backend.list(prefix):
+                key = obj['key']
                 documents.append({
                     "s3_key": key,
-                    "size": obj['Size'],
-                    "last_modified": obj['LastModified'].isoformat(),
+                    "size": obj['size'],
+                    "last_modified": obj['last_modified'].isoformat(),
                     "document_type": self._extract_doc_type(key),
                 })
             
             return sorted(documents, key=lambda x: x['last_modified'], reverse=True)
             
-        except ClientError as e:
+        except (ClientError, OSError) as e:
             logger.error(f"S3 list error: {e}")
             return []
     
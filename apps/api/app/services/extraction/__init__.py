@@ -10,6 +10,8 @@ Key Components (active extraction pipeline, Part 1):
 - iso20022_lc_extractor: ISO 20022 XML specialization
 - lc_document: Canonical LCDocument Pydantic model
 - launch_pipeline: Orchestrator (_process_lc_like, _shape_lc_financial_payload)
+- parsed_document: ParsedDocument, the parse-once upload artifact shared by OCR,
+  launch_pipeline and the vision extractor
 
 Secondary components still referenced by Part 2 (validation layer):
 - lc_extractor, lc_extractor_v2, lc_baseline: LCBaseline dataclass + v2 extraction, used by
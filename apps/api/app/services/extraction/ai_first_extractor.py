@@ -34,10 +34,46 @@ import os
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.utils.regex_registry import register_pattern
 
 logger = logging.getLogger(__name__)
 
+# Exporter BIN / TIN, shared by the invoice, B/L and packing list fallbacks.
+_EXPORTER_BIN_RE = register_pattern(
+    "common",
+    "exporter_bin",
+    r"(?:EXPORTER\s+)?(?:B\.?I\.?N\.?|BIN|BUSINESS\s+IDENTIFICATION|BUSINESS\s+ID(?:ENTIFICATION)?|VAT\s*REG(?:ISTRATION)?|VAT\s*REG\.?|VAT\s*NO\.?|VAT\s*REG\s*NO\.?|VAT\s*REGISTRATION\s*NO\.?|VAT\s*REGISTRATION\s*NUMBER)\s*(?:NO\.?|NUMBER|#|:)?\s*([0-9][0-9\-]+)",
+    re.I,
+)
+_EXPORTER_TIN_RE = register_pattern(
+    "common",
+    "exporter_tin",
+    r"(?:EXPORTER\s+)?(?:T\.?I\.?N\.?|TIN|TAX\s+IDENTIFICATION|TAX\s+ID(?:ENTIFICATION)?|TAX\s*REG(?:ISTRATION)?|TAX\s*REG\.?|TAXPAYER\s+ID(?:ENTIFICATION)?|E-?TIN|ETIN)\s*(?:NO\.?|NUMBER|#|:)?\s*([0-9][0-9\-]+)",
+    re.I,
+)
+_EVIDENCE_SEPARATORS_RE = register_pattern("common", "evidence_separators", r"[\s,:\-\/]+")
+_COMPARISON_NOISE_RE = register_pattern("common", "comparison_noise", r"[,\s\-\/]")
+_WHITESPACE_RUN_RE = register_pattern("common", "whitespace_run", r"\s+")
+_UNDERSCORE_RUN_RE = register_pattern("common", "underscore_run", r"_+")
+_SLASH_SPLIT_RE = register_pattern("common", "slash_split", r"\s*/\s*")
+_JSON_OBJECT_RE = register_pattern("common", "json_object", r"\{[\s\S]*\}")
+
+# LC fields re-extracted by regex to cross-check AI output.
+_LC_CROSSCHECK_RE = {
+    field_name: register_pattern("lc", f"crosscheck_{field_name}", pattern, re.I)
+    for field_name, pattern in {
+        "lc_number": r"(?:LC|L/C|Credit).*?(?:No\.?|Number|Ref)\s*[:\-]?\s*([A-Z0-9\-\/]+)",
+        "amount": r"(?:Amount|Value)\s*[:\-]?\s*([\d,]+(?:\.\d+)?)",
+        "currency": r"(?:Currency|CCY)\s*[:\-]?\s*([A-Z]{3})|([A-Z]{3})\s+[\d,]+\.\d{2}",
+        "port_of_loading": r"(?:Port of Loading|POL|Loading Port)\s*[:\-]?\s*([^\n]+)",
+        "port_of_discharge": r"(?:Port of Discharge|POD|Destination)\s*[:\-]?\s*([^\n]+)",
+        "applicant": r"(?:Applicant|Buyer|Importer)\s*[:\-]?\s*([^\n]+)",
+        "beneficiary": r"(?:Beneficiary|Seller|Exporter)\s*[:\-]?\s*([^\n]+)",
+    }.items()
+}
+
 
 def _resolve_llm_trace(provider: Any, provider_used: str, router_layer: str = "L1") -> Dict[str, Any]:
     model = None
@@ -121,6 +157,54 @@ async def _generate_extraction_with_model_routing(
     return response, tokens_in, tokens_out, provider_used, llm_trace
 
 
+async def _cached_ai_extraction(
+    document_type: str,
+    raw_text: str,
+    prompt_parts: Tuple[str, ...],
+    model: str,
+    run: Callable[[], Awaitable[Tuple[Optional[Dict[str, Any]], str]]],
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Serve an AI extraction from the content-addressed cache, calling ``run`` on a miss.
+
+    Failed extractions (no result) are not cached, so the next attempt
+    reaches the model again.
+    """
+    from app.cache import extraction_cache
+
+    if not extraction_cache.enabled():
+        return await run()
+
+    cache_key = extraction_cache.build_key(
+        raw_text,
+        document_type,
+        extraction_cache.prompt_version(*prompt_parts),
+        model,
+    )
+
+    async def _compute() -> Dict[str, Any]:
+        result, provider_used = await run()
+        return {"result": result, "provider": provider_used}
+
+    payload, cache_hit = await extraction_cache.get_or_compute(
+        cache_key,
+        _compute,
+        should_cache=lambda entry: bool(entry.get("result")),
+    )
+    if cache_hit:
+        _log_ai_first_event(
+            "extraction_cache_hit",
+            document_type=document_type,
+            provider=payload.get("provider"),
+            model=model,
+        )
+    return payload.get("result"), payload.get("provider") or "none"
+
+
+def _extraction_cache_model() -> str:
+    extraction_cfg = _resolve_extraction_config()
+    return f"{extraction_cfg['primary_provider']}/{extraction_cfg['primary_model']}"
+
+
 
 
 class FieldStatus(str, Enum):
@@ -195,9 +279,9 @@ def _build_text_evidence(
         end = min(len(text), match.end() + 40)
         snippet = text[start:end].replace("\n", " ").strip()
     elif len(candidate) >= 5:
-        normalized_candidate = re.sub(r"[\s,:\-\/]+", "", candidate).lower()
+        normalized_candidate = _EVIDENCE_SEPARATORS_RE.sub("", candidate).lower()
         for line in text.splitlines():
-            normalized_line = re.sub(r"[\s,:\-\/]+", "", line).lower()
+            normalized_line = _EVIDENCE_SEPARATORS_RE.sub("", line).lower()
             if normalized_candidate and normalized_candidate in normalized_line:
                 snippet = line.strip()
                 break
@@ -479,7 +563,26 @@ class AIFirstExtractor:
         self,
         raw_text: str,
     ) -> Tuple[Optional[Dict[str, Any]], str]:
-        """Run AI extraction."""
+        """Run AI extraction (cached per document text, prompt and model)."""
+        from .ai_lc_extractor import (
+            LC_EXTRACTION_PROMPT,
+            LC_EXTRACTION_SYSTEM_PROMPT,
+            resolve_lc_extraction_route,
+        )
+
+        lc_provider, lc_model = resolve_lc_extraction_route()
+        return await _cached_ai_extraction(
+            "letter_of_credit",
+            raw_text,
+            (LC_EXTRACTION_PROMPT, LC_EXTRACTION_SYSTEM_PROMPT),
+            f"{lc_provider}/{lc_model}",
+            lambda: self._call_lc_model(raw_text),
+        )
+
+    async def _call_lc_model(
+        self,
+        raw_text: str,
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
         try:
             from .ai_lc_extractor import extract_lc_with_ai
             
@@ -569,7 +672,12 @@ class AIFirstExtractor:
         
         if field_name in self.VALIDATORS:
             validator = self.VALIDATORS[field_name]
-            pattern = re.compile(validator["pattern"], validator.get("flags", 0))
+            pattern = register_pattern(
+                "validator",
+                f"{type(self).__name__}.{field_name}",
+                validator["pattern"],
+                validator.get("flags", 0),
+            )
             str_value = str(value)
             
             if not pattern.match(str_value):
@@ -625,20 +733,11 @@ class AIFirstExtractor:
     
     def _regex_extract_field(self, field_name: str, raw_text: str) -> Optional[str]:
         """Extract field using regex (for cross-validation)."""
-        patterns = {
-            "lc_number": r"(?:LC|L/C|Credit).*?(?:No\.?|Number|Ref)\s*[:\-]?\s*([A-Z0-9\-\/]+)",
-            "amount": r"(?:Amount|Value)\s*[:\-]?\s*([\d,]+(?:\.\d+)?)",
-            "currency": r"(?:Currency|CCY)\s*[:\-]?\s*([A-Z]{3})|([A-Z]{3})\s+[\d,]+\.\d{2}",
-            "port_of_loading": r"(?:Port of Loading|POL|Loading Port)\s*[:\-]?\s*([^\n]+)",
-            "port_of_discharge": r"(?:Port of Discharge|POD|Destination)\s*[:\-]?\s*([^\n]+)",
-            "applicant": r"(?:Applicant|Buyer|Importer)\s*[:\-]?\s*([^\n]+)",
-            "beneficiary": r"(?:Beneficiary|Seller|Exporter)\s*[:\-]?\s*([^\n]+)",
-        }
-        
-        if field_name not in patterns:
+        pattern = _LC_CROSSCHECK_RE.get(field_name)
+        if pattern is None:
             return None
         
-        match = re.search(patterns[field_name], raw_text, re.I)
+        match = pattern.search(raw_text)
         if match:
             # Return first non-empty group
             for group in match.groups():
@@ -652,7 +751,7 @@ class AIFirstExtractor:
             return ""
         s = str(value).strip().upper()
         # Remove common variations
-        s = re.sub(r'[,\s\-\/]', '', s)
+        s = _COMPARISON_NOISE_RE.sub('', s)
         return s
     
     def _normalize_field(self, field_name: str, value: Any) -> Any:
@@ -849,7 +948,7 @@ class AIFirstExtractor:
                 if key.startswith("_"):
                     continue
                 normalized_key = canonical_field_key(key)
-                source_key_normalized = re.sub(r"_+", "_", re.sub(r"\s+", "_", str(key).strip().lower().replace("&", "_and_").replace("/", "_"))).strip("_")
+                source_key_normalized = _UNDERSCORE_RUN_RE.sub("_", _WHITESPACE_RUN_RE.sub("_", str(key).strip().lower().replace("&", "_and_").replace("/", "_"))).strip("_")
 
                 # Handle combined key/value variants before generic canonical mapping.
                 if doc_type == "bill_of_lading":
@@ -866,7 +965,7 @@ class AIFirstExtractor:
                         continue
 
                     if (normalized_key in {"vessel_and_voyage", "vessel_voyage", "vessel_voy", "vsl_voyage", "vsl_voy", "vvd"} or ("vessel" in source_key_normalized and "voy" in source_key_normalized)) and isinstance(value, str):
-                        parts = [p.strip() for p in re.split(r"\s*/\s*", value, maxsplit=1)]
+                        parts = [p.strip() for p in _SLASH_SPLIT_RE.split(value, maxsplit=1)]
                         if len(parts) == 2:
                             vessel_part, voyage_part = parts
                             if vessel_part and "vessel_name" in allowed:
@@ -996,6 +1095,27 @@ DOCUMENT TEXT:
 Return ONLY valid JSON, no other text:"""
 
 
+# Regex fallback patterns.
+_INVOICE_NUMBER_RE = register_pattern(
+    "invoice",
+    "invoice_number",
+    r"Invoice\s*(?:No\.?|Number|#)\s*[:\-]?\s*([A-Z0-9\-\/]+)",
+    re.I,
+)
+_INVOICE_TOTAL_RE = register_pattern(
+    "invoice",
+    "total",
+    r"Total\s*[:\-]?\s*([A-Z]{3})?\s*([\d,]+(?:\.\d{2})?)",
+    re.I,
+)
+_INVOICE_LC_REFERENCE_RE = register_pattern(
+    "invoice",
+    "lc_reference",
+    r"(?:L/?C|Letter of Credit|Credit)\s*(?:No\.?|Ref|#)\s*[:\-]?\s*([A-Z0-9\-\/]+)",
+    re.I,
+)
+
+
 class InvoiceAIFirstExtractor(AIFirstExtractor):
     """AI-first extractor for Commercial Invoices."""
     
@@ -1067,7 +1187,19 @@ class InvoiceAIFirstExtractor(AIFirstExtractor):
         self,
         raw_text: str,
     ) -> Tuple[Optional[Dict[str, Any]], str]:
-        """Run AI extraction for invoice."""
+        """Run AI extraction for invoice (cached per document text, prompt and model)."""
+        return await _cached_ai_extraction(
+            "commercial_invoice",
+            raw_text,
+            (INVOICE_EXTRACTION_PROMPT, INVOICE_EXTRACTION_SYSTEM_PROMPT),
+            _extraction_cache_model(),
+            lambda: self._call_invoice_model(raw_text),
+        )
+
+    async def _call_invoice_model(
+        self,
+        raw_text: str,
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
         try:
             from ..llm_provider import LLMProviderFactory
             
@@ -1138,35 +1270,27 @@ class InvoiceAIFirstExtractor(AIFirstExtractor):
         result: Dict[str, Any] = {}
         
         # Invoice number
-        match = re.search(r"Invoice\s*(?:No\.?|Number|#)\s*[:\-]?\s*([A-Z0-9\-\/]+)", raw_text, re.I)
+        match = _INVOICE_NUMBER_RE.search(raw_text)
         if match:
             result["invoice_number"] = match.group(1).strip()
         
         # Amount
-        match = re.search(r"Total\s*[:\-]?\s*([A-Z]{3})?\s*([\d,]+(?:\.\d{2})?)", raw_text, re.I)
+        match = _INVOICE_TOTAL_RE.search(raw_text)
         if match:
             if match.group(1):
                 result["currency"] = match.group(1)
             result["amount"] = match.group(2).replace(",", "")
         
         # LC Reference
-        match = re.search(r"(?:L/?C|Letter of Credit|Credit)\s*(?:No\.?|Ref|#)\s*[:\-]?\s*([A-Z0-9\-\/]+)", raw_text, re.I)
+        match = _INVOICE_LC_REFERENCE_RE.search(raw_text)
         if match:
             result["lc_reference"] = match.group(1).strip()
         
         # Exporter BIN/TIN variants
-        match = re.search(
-            r"(?:EXPORTER\s+)?(?:B\.?I\.?N\.?|BIN|BUSINESS\s+IDENTIFICATION|BUSINESS\s+ID(?:ENTIFICATION)?|VAT\s*REG(?:ISTRATION)?|VAT\s*REG\.?|VAT\s*NO\.?|VAT\s*REG\s*NO\.?|VAT\s*REGISTRATION\s*NO\.?|VAT\s*REGISTRATION\s*NUMBER)\s*(?:NO\.?|NUMBER|#|:)?\s*([0-9][0-9\-]+)",
-            raw_text,
-            re.I,
-        )
+        match = _EXPORTER_BIN_RE.search(raw_text)
         if match:
             result["exporter_bin"] = match.group(1).strip()
-        match = re.search(
-            r"(?:EXPORTER\s+)?(?:T\.?I\.?N\.?|TIN|TAX\s+IDENTIFICATION|TAX\s+ID(?:ENTIFICATION)?|TAX\s*REG(?:ISTRATION)?|TAX\s*REG\.?|TAXPAYER\s+ID(?:ENTIFICATION)?|E-?TIN|ETIN)\s*(?:NO\.?|NUMBER|#|:)?\s*([0-9][0-9\-]+)",
-            raw_text,
-            re.I,
-        )
+        match = _EXPORTER_TIN_RE.search(raw_text)
         if match:
             result["exporter_tin"] = match.group(1).strip()
         
@@ -1243,6 +1367,65 @@ DOCUMENT TEXT:
 Return ONLY valid JSON, no other text:"""
 
 
+# Regex fallback patterns.
+_BL_NUMBER_RE = register_pattern(
+    "bill_of_lading",
+    "bl_number",
+    r"B/?L\s*(?:No\.?|Number|#)\s*[:\-]?\s*([A-Z0-9\-\/]+)",
+    re.I,
+)
+_BL_SHIPPER_RE = register_pattern("bill_of_lading", "shipper", r"Shipper\s*[:\-]?\s*([^\n]+)", re.I)
+_BL_CONSIGNEE_RE = register_pattern("bill_of_lading", "consignee", r"Consignee\s*[:\-]?\s*([^\n]+)", re.I)
+_BL_PORT_OF_LOADING_RE = register_pattern(
+    "bill_of_lading",
+    "port_of_loading",
+    r"Port of Loading\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+_BL_PORT_OF_DISCHARGE_RE = register_pattern(
+    "bill_of_lading",
+    "port_of_discharge",
+    r"Port of Discharge\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+_BL_SHIPPED_ON_BOARD_DATE_RE = register_pattern(
+    "bill_of_lading",
+    "shipped_on_board_date",
+    r"(?:Shipped|On Board|Laden)\s*(?:Date)?\s*[:\-]?\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}|\d{4}-\d{2}-\d{2})",
+    re.I,
+)
+_BL_VESSEL_VOYAGE_RE = register_pattern(
+    "bill_of_lading",
+    "vessel_voyage",
+    r"(?:VSL|VESSEL)\s*/\s*VOY(?:AGE)?\s*[:\-]?\s*([^\n\r\-/]{2,60}?)\s*(?:/|\s{2,}|\s+-\s+)\s*([A-Z0-9\-\/\.]{2,30})\b",
+    re.I,
+)
+_BL_VOYAGE_NUMBER_RE = register_pattern(
+    "bill_of_lading",
+    "voyage_number",
+    r"(?:VOY(?:AGE)?(?:\s*(?:NO\.?|NUMBER|#))?|VSL\s*/\s*VOY(?:AGE)?|VESSEL\s*/\s*VOY(?:AGE)?|VESSEL\s+VOY(?:AGE)?)\s*[:\-]?\s*([A-Z0-9\-\/\.]+)",
+    re.I,
+)
+_BL_GROSS_NET_WEIGHT_RE = register_pattern(
+    "bill_of_lading",
+    "gross_net_weight",
+    r"(?:GROSS\s*/\s*NET|G\.?\s*W\.?\s*/\s*N\.?\s*W\.?|GW\s*/\s*NW)\s*(?:WEIGHT|WT|WGT)?\s*[:\-]?\s*([0-9][0-9,\.]*\s*(?:KGS?|KG|LBS?|LB)?)\s*/\s*([0-9][0-9,\.]*\s*(?:KGS?|KG|LBS?|LB)?)",
+    re.I,
+)
+_BL_GROSS_WEIGHT_RE = register_pattern(
+    "bill_of_lading",
+    "gross_weight",
+    r"(?:TOTAL\s+)?(?:GROSS\s*(?:WEIGHT|WT|WGT)|G\.?\s*W\.?|G\.?\s*WT\.?|G\.?\s*WGT\.?|G/\s*W|G\s*W)\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+_BL_NET_WEIGHT_RE = register_pattern(
+    "bill_of_lading",
+    "net_weight",
+    r"(?:TOTAL\s+)?(?:NET\s*(?:WEIGHT|WT|WGT)|N\.?\s*W\.?|N\.?\s*WT\.?|N\.?\s*WGT\.?|N/\s*W|N\s*W)\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+
+
 class BLAIFirstExtractor(AIFirstExtractor):
     """AI-first extractor for Bills of Lading."""
     
@@ -1299,7 +1482,19 @@ class BLAIFirstExtractor(AIFirstExtractor):
         self,
         raw_text: str,
     ) -> Tuple[Optional[Dict[str, Any]], str]:
-        """Run AI extraction for B/L."""
+        """Run AI extraction for B/L (cached per document text, prompt and model)."""
+        return await _cached_ai_extraction(
+            "bill_of_lading",
+            raw_text,
+            (BL_EXTRACTION_PROMPT, BL_EXTRACTION_SYSTEM_PROMPT),
+            _extraction_cache_model(),
+            lambda: self._call_bl_model(raw_text),
+        )
+
+    async def _call_bl_model(
+        self,
+        raw_text: str,
+    ) -> Tuple[Optional[Dict[str, Any]], str]:
         try:
             from ..llm_provider import LLMProviderFactory
             
@@ -1370,41 +1565,37 @@ class BLAIFirstExtractor(AIFirstExtractor):
         result: Dict[str, Any] = {}
         
         # B/L number
-        match = re.search(r"B/?L\s*(?:No\.?|Number|#)\s*[:\-]?\s*([A-Z0-9\-\/]+)", raw_text, re.I)
+        match = _BL_NUMBER_RE.search(raw_text)
         if match:
             result["bl_number"] = match.group(1).strip()
         
         # Shipper
-        match = re.search(r"Shipper\s*[:\-]?\s*([^\n]+)", raw_text, re.I)
+        match = _BL_SHIPPER_RE.search(raw_text)
         if match:
             result["shipper"] = match.group(1).strip()
         
         # Consignee
-        match = re.search(r"Consignee\s*[:\-]?\s*([^\n]+)", raw_text, re.I)
+        match = _BL_CONSIGNEE_RE.search(raw_text)
         if match:
             result["consignee"] = match.group(1).strip()
         
         # Port of Loading
-        match = re.search(r"Port of Loading\s*[:\-]?\s*([^\n]+)", raw_text, re.I)
+        match = _BL_PORT_OF_LOADING_RE.search(raw_text)
         if match:
             result["port_of_loading"] = match.group(1).strip()
         
         # Port of Discharge
-        match = re.search(r"Port of Discharge\s*[:\-]?\s*([^\n]+)", raw_text, re.I)
+        match = _BL_PORT_OF_DISCHARGE_RE.search(raw_text)
         if match:
             result["port_of_discharge"] = match.group(1).strip()
         
         # Shipped on board date
-        match = re.search(r"(?:Shipped|On Board|Laden)\s*(?:Date)?\s*[:\-]?\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}|\d{4}-\d{2}-\d{2})", raw_text, re.I)
+        match = _BL_SHIPPED_ON_BOARD_DATE_RE.search(raw_text)
         if match:
             result["shipped_on_board_date"] = match.group(1).strip()
         
         # Vessel/Voyage combined line (e.g., "VSL/VOY: EVER GLORY / 123E")
-        combo_match = re.search(
-            r"(?:VSL|VESSEL)\s*/\s*VOY(?:AGE)?\s*[:\-]?\s*([^\n\r\-/]{2,60}?)\s*(?:/|\s{2,}|\s+-\s+)\s*([A-Z0-9\-\/\.]{2,30})\b",
-            raw_text,
-            re.I,
-        )
+        combo_match = _BL_VESSEL_VOYAGE_RE.search(raw_text)
         if combo_match:
             vessel_candidate = combo_match.group(1).strip(" .:-")
             voy_candidate = combo_match.group(2).strip()
@@ -1415,57 +1606,33 @@ class BLAIFirstExtractor(AIFirstExtractor):
 
         # Voyage number
         if "voyage_number" not in result:
-            match = re.search(
-                r"(?:VOY(?:AGE)?(?:\s*(?:NO\.?|NUMBER|#))?|VSL\s*/\s*VOY(?:AGE)?|VESSEL\s*/\s*VOY(?:AGE)?|VESSEL\s+VOY(?:AGE)?)\s*[:\-]?\s*([A-Z0-9\-\/\.]+)",
-                raw_text,
-                re.I,
-            )
+            match = _BL_VOYAGE_NUMBER_RE.search(raw_text)
             if match:
                 result["voyage_number"] = match.group(1).strip()
         
         # Combined Gross/Net line variants (e.g., "GROSS/NET WEIGHT: 1200/1100 KGS")
-        combo_match = re.search(
-            r"(?:GROSS\s*/\s*NET|G\.?\s*W\.?\s*/\s*N\.?\s*W\.?|GW\s*/\s*NW)\s*(?:WEIGHT|WT|WGT)?\s*[:\-]?\s*([0-9][0-9,\.]*\s*(?:KGS?|KG|LBS?|LB)?)\s*/\s*([0-9][0-9,\.]*\s*(?:KGS?|KG|LBS?|LB)?)",
-            raw_text,
-            re.I,
-        )
+        combo_match = _BL_GROSS_NET_WEIGHT_RE.search(raw_text)
         if combo_match:
             result["gross_weight"] = combo_match.group(1).strip()
             result["net_weight"] = combo_match.group(2).strip()
 
         # Gross weight
         if "gross_weight" not in result:
-            match = re.search(
-                r"(?:TOTAL\s+)?(?:GROSS\s*(?:WEIGHT|WT|WGT)|G\.?\s*W\.?|G\.?\s*WT\.?|G\.?\s*WGT\.?|G/\s*W|G\s*W)\s*[:\-]?\s*([^\n]+)",
-                raw_text,
-                re.I,
-            )
+            match = _BL_GROSS_WEIGHT_RE.search(raw_text)
             if match:
                 result["gross_weight"] = match.group(1).strip()
         
         # Net weight
         if "net_weight" not in result:
-            match = re.search(
-                r"(?:TOTAL\s+)?(?:NET\s*(?:WEIGHT|WT|WGT)|N\.?\s*W\.?|N\.?\s*WT\.?|N\.?\s*WGT\.?|N/\s*W|N\s*W)\s*[:\-]?\s*([^\n]+)",
-                raw_text,
-                re.I,
-            )
+            match = _BL_NET_WEIGHT_RE.search(raw_text)
             if match:
                 result["net_weight"] = match.group(1).strip()
         
         # Exporter BIN/TIN
-        match = re.search(
-            r"(?:EXPORTER\s+)?(?:B\.?I\.?N\.?|BIN|BUSINESS\s+IDENTIFICATION|BUSINESS\s+ID(?:ENTIFICATION)?|VAT\s*REG(?:ISTRATION)?|VAT\s*REG\.?|VAT\s*NO\.?|VAT\s*REG\s*NO\.?|VAT\s*REGISTRATION\s*NO\.?|VAT\s*REGISTRATION\s*NUMBER)\s*(?:NO\.?|NUMBER|#|:)?\s*([0-9][0-9\-]+)",
-            raw_text,
-            re.I,
-        )
+        match = _EXPORTER_BIN_RE.search(raw_text)
         if match:
             result["exporter_bin"] = match.group(1).strip()
-        match = re.search(
-            r"(?:EXPORTER\s+)?(?:T\.?I\.?N\.?|TIN|TAX\s+IDENTIFICATION|TAX\s+ID(?:ENTIFICATION)?|TAX\s*REG(?:ISTRATION)?|TAX\s*REG\.?|TAXPAYER\s+ID(?:ENTIFICATION)?|E-?TIN|ETIN)\s*(?:NO\.?|NUMBER|#|:)?\s*([0-9][0-9\-]+)",
-            raw_text,
-            re.I,
-        )
+        match = _EXPORTER_TIN_RE.search(raw_text)
         if match:
             result["exporter_tin"] = match.group(1).strip()
         
@@ -1539,6 +1706,51 @@ DOCUMENT TEXT:
 Return ONLY valid JSON, no other text:"""
 
 
+# Regex fallback patterns.
+_PACKING_LIST_NUMBER_RE = register_pattern(
+    "packing_list",
+    "packing_list_number",
+    r"Packing\s*List\s*(?:No\.?|#)\s*[:\-]?\s*([A-Z0-9\-\/]+)",
+    re.I,
+)
+_PACKING_LIST_TOTAL_PACKAGES_RE = register_pattern(
+    "packing_list",
+    "total_packages",
+    r"Total\s*(?:Packages?|Cartons?)\s*[:\-]?\s*(\d+)",
+    re.I,
+)
+_PACKING_LIST_GROSS_WEIGHT_RE = register_pattern(
+    "packing_list",
+    "gross_weight",
+    r"(?:GROSS\s*WEIGHT|G\.?\s*W\.?|G/\s*W)\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+_PACKING_LIST_NET_WEIGHT_RE = register_pattern(
+    "packing_list",
+    "net_weight",
+    r"(?:NET\s*WEIGHT|N\.?\s*W\.?|N/\s*W)\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+_PACKING_LIST_DIMENSIONS_RE = register_pattern(
+    "packing_list",
+    "dimensions",
+    r"(?:Dimensions|Dimension|Measurements|Measurement|Size)\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+_PACKING_LIST_SIZE_BREAKDOWN_RE = register_pattern(
+    "packing_list",
+    "size_breakdown",
+    r"(?:SIZE\s*BREAKDOWN|SIZE\s*DETAILS|SIZE\s*/\s*QTY|SIZE\s*QTY|SIZE\s*&\s*QTY|SIZE\s*WISE|SIZE\s*-\s*WISE|SIZE\s*DISTRIBUTION|SIZE\s*RATIO|SIZE\s*RUN|SIZE\s*MATRIX|SIZE\s*ASSORTMENT|ASSORTMENT|PRE-?\s*PACK|PREPACK|RATIO\s*PACK|QTY\s*PER\s*SIZE|QTY\s*/\s*SIZE|SIZE\s*PER\s*SIZE|SIZE\s*-\s*COLOR|SIZE\s*&\s*COLOR|SIZE\s*/\s*COLOR|SIZE\s*COLOR)\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+_PACKING_LIST_CARTON_SIZE_RE = register_pattern(
+    "packing_list",
+    "carton_size",
+    r"(?:CARTON\s*SIZE|CTN\s*SIZE|CARTON\s*DIMENSIONS?|CASE\s*SIZE|CTN\s*DIMENSIONS?|PACKING\s*SIZE|PACKAGE\s*SIZE)\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+
+
 class PackingListAIFirstExtractor(AIFirstExtractor):
     """AI-first extractor for Packing Lists."""
     
@@ -1570,7 +1782,7 @@ class PackingListAIFirstExtractor(AIFirstExtractor):
             return self._empty_result("empty_input")
         
         ai_result, ai_provider = await self._run_ai_extraction_generic(
-            raw_text, PACKING_LIST_EXTRACTION_PROMPT, PACKING_LIST_EXTRACTION_SYSTEM_PROMPT
+            raw_text, PACKING_LIST_EXTRACTION_PROMPT, PACKING_LIST_EXTRACTION_SYSTEM_PROMPT, "packing_list"
         )
         
         if not ai_result and use_fallback_on_ai_failure:
@@ -1595,39 +1807,31 @@ class PackingListAIFirstExtractor(AIFirstExtractor):
         """Regex fallback for packing list."""
         result: Dict[str, Any] = {}
         
-        match = re.search(r"Packing\s*List\s*(?:No\.?|#)\s*[:\-]?\s*([A-Z0-9\-\/]+)", raw_text, re.I)
+        match = _PACKING_LIST_NUMBER_RE.search(raw_text)
         if match:
             result["packing_list_number"] = match.group(1).strip()
         
-        match = re.search(r"Total\s*(?:Packages?|Cartons?)\s*[:\-]?\s*(\d+)", raw_text, re.I)
+        match = _PACKING_LIST_TOTAL_PACKAGES_RE.search(raw_text)
         if match:
             result["total_packages"] = match.group(1)
         
-        match = re.search(r"(?:GROSS\s*WEIGHT|G\.?\s*W\.?|G/\s*W)\s*[:\-]?\s*([^\n]+)", raw_text, re.I)
+        match = _PACKING_LIST_GROSS_WEIGHT_RE.search(raw_text)
         if match:
             result["gross_weight"] = match.group(1).strip()
         
-        match = re.search(r"(?:NET\s*WEIGHT|N\.?\s*W\.?|N/\s*W)\s*[:\-]?\s*([^\n]+)", raw_text, re.I)
+        match = _PACKING_LIST_NET_WEIGHT_RE.search(raw_text)
         if match:
             result["net_weight"] = match.group(1).strip()
         
-        match = re.search(r"(?:Dimensions|Dimension|Measurements|Measurement|Size)\s*[:\-]?\s*([^\n]+)", raw_text, re.I)
+        match = _PACKING_LIST_DIMENSIONS_RE.search(raw_text)
         if match:
             result["dimensions"] = match.group(1).strip()
         
-        match = re.search(
-            r"(?:SIZE\s*BREAKDOWN|SIZE\s*DETAILS|SIZE\s*/\s*QTY|SIZE\s*QTY|SIZE\s*&\s*QTY|SIZE\s*WISE|SIZE\s*-\s*WISE|SIZE\s*DISTRIBUTION|SIZE\s*RATIO|SIZE\s*RUN|SIZE\s*MATRIX|SIZE\s*ASSORTMENT|ASSORTMENT|PRE-?\s*PACK|PREPACK|RATIO\s*PACK|QTY\s*PER\s*SIZE|QTY\s*/\s*SIZE|SIZE\s*PER\s*SIZE|SIZE\s*-\s*COLOR|SIZE\s*&\s*COLOR|SIZE\s*/\s*COLOR|SIZE\s*COLOR)\s*[:\-]?\s*([^\n]+)",
-            raw_text,
-            re.I,
-        )
+        match = _PACKING_LIST_SIZE_BREAKDOWN_RE.search(raw_text)
         if match:
             result["size_breakdown"] = match.group(1).strip()
         
-        match = re.search(
-            r"(?:CARTON\s*SIZE|CTN\s*SIZE|CARTON\s*DIMENSIONS?|CASE\s*SIZE|CTN\s*DIMENSIONS?|PACKING\s*SIZE|PACKAGE\s*SIZE)\s*[:\-]?\s*([^\n]+)",
-            raw_text,
-            re.I,
-        )
+        match = _PACKING_LIST_CARTON_SIZE_RE.search(raw_text)
         if match:
             result["carton_size"] = match.group(1).strip()
 
@@ -1636,18 +1840,10 @@ class PackingListAIFirstExtractor(AIFirstExtractor):
             if fallback_size:
                 result["packing_size_breakdown"] = fallback_size
         
-        match = re.search(
-            r"(?:EXPORTER\s+)?(?:B\.?I\.?N\.?|BIN|BUSINESS\s+IDENTIFICATION|BUSINESS\s+ID(?:ENTIFICATION)?|VAT\s*REG(?:ISTRATION)?|VAT\s*REG\.?|VAT\s*NO\.?|VAT\s*REG\s*NO\.?|VAT\s*REGISTRATION\s*NO\.?|VAT\s*REGISTRATION\s*NUMBER)\s*(?:NO\.?|NUMBER|#|:)?\s*([0-9][0-9\-]+)",
-            raw_text,
-            re.I,
-        )
+        match = _EXPORTER_BIN_RE.search(raw_text)
         if match:
             result["exporter_bin"] = match.group(1).strip()
-        match = re.search(
-            r"(?:EXPORTER\s+)?(?:T\.?I\.?N\.?|TIN|TAX\s+IDENTIFICATION|TAX\s+ID(?:ENTIFICATION)?|TAX\s*REG(?:ISTRATION)?|TAX\s*REG\.?|TAXPAYER\s+ID(?:ENTIFICATION)?|E-?TIN|ETIN)\s*(?:NO\.?|NUMBER|#|:)?\s*([0-9][0-9\-]+)",
-            raw_text,
-            re.I,
-        )
+        match = _EXPORTER_TIN_RE.search(raw_text)
         if match:
             result["exporter_tin"] = match.group(1).strip()
         
@@ -1715,6 +1911,21 @@ DOCUMENT TEXT:
 Return ONLY valid JSON, no other text:"""
 
 
+# Regex fallback patterns.
+_COO_CERTIFICATE_NUMBER_RE = register_pattern(
+    "certificate_of_origin",
+    "certificate_number",
+    r"Certificate\s*(?:No\.?|#|Number)\s*[:\-]?\s*([A-Z0-9\-\/]+)",
+    re.I,
+)
+_COO_COUNTRY_OF_ORIGIN_RE = register_pattern(
+    "certificate_of_origin",
+    "country_of_origin",
+    r"Country\s*of\s*Origin\s*[:\-]?\s*([A-Za-z\s]+?)(?:\n|$)",
+    re.I,
+)
+
+
 class CertificateOfOriginAIFirstExtractor(AIFirstExtractor):
     """AI-first extractor for Certificate of Origin."""
     
@@ -1746,7 +1957,7 @@ class CertificateOfOriginAIFirstExtractor(AIFirstExtractor):
             return self._empty_result("empty_input")
         
         ai_result, ai_provider = await self._run_ai_extraction_generic(
-            raw_text, COO_EXTRACTION_PROMPT, COO_EXTRACTION_SYSTEM_PROMPT
+            raw_text, COO_EXTRACTION_PROMPT, COO_EXTRACTION_SYSTEM_PROMPT, "certificate_of_origin"
         )
         
         if not ai_result and use_fallback_on_ai_failure:
@@ -1771,11 +1982,11 @@ class CertificateOfOriginAIFirstExtractor(AIFirstExtractor):
         """Regex fallback for certificate of origin."""
         result: Dict[str, Any] = {}
         
-        match = re.search(r"Certificate\s*(?:No\.?|#|Number)\s*[:\-]?\s*([A-Z0-9\-\/]+)", raw_text, re.I)
+        match = _COO_CERTIFICATE_NUMBER_RE.search(raw_text)
         if match:
             result["certificate_number"] = match.group(1).strip()
         
-        match = re.search(r"Country\s*of\s*Origin\s*[:\-]?\s*([A-Za-z\s]+?)(?:\n|$)", raw_text, re.I)
+        match = _COO_COUNTRY_OF_ORIGIN_RE.search(raw_text)
         if match:
             result["country_of_origin"] = match.group(1).strip()
         
@@ -1845,6 +2056,27 @@ DOCUMENT TEXT:
 Return ONLY valid JSON, no other text:"""
 
 
+# Regex fallback patterns.
+_INSURANCE_CERTIFICATE_NUMBER_RE = register_pattern(
+    "insurance",
+    "certificate_number",
+    r"(?:Certificate|Policy)\s*(?:No\.?|#|Number)\s*[:\-]?\s*([A-Z0-9\-\/]+)",
+    re.I,
+)
+_INSURANCE_INSURED_AMOUNT_RE = register_pattern(
+    "insurance",
+    "insured_amount",
+    r"(?:Sum\s+Insured|Insured\s+(?:Amount|Value))\s*[:\-]?\s*([A-Z]{3})?\s*([\d,]+(?:\.\d{2})?)",
+    re.I,
+)
+_INSURANCE_COVERAGE_TYPE_RE = register_pattern(
+    "insurance",
+    "coverage_type",
+    r"(ALL\s*RISKS?|ICC[\-\s]?[ABC]|INSTITUTE\s+CARGO)",
+    re.I,
+)
+
+
 class InsuranceCertificateAIFirstExtractor(AIFirstExtractor):
     """AI-first extractor for Insurance Certificates."""
     
@@ -1881,7 +2113,7 @@ class InsuranceCertificateAIFirstExtractor(AIFirstExtractor):
             return self._empty_result("empty_input")
         
         ai_result, ai_provider = await self._run_ai_extraction_generic(
-            raw_text, INSURANCE_EXTRACTION_PROMPT, INSURANCE_EXTRACTION_SYSTEM_PROMPT
+            raw_text, INSURANCE_EXTRACTION_PROMPT, INSURANCE_EXTRACTION_SYSTEM_PROMPT, "insurance_certificate"
         )
         
         if not ai_result and use_fallback_on_ai_failure:
@@ -1906,17 +2138,17 @@ class InsuranceCertificateAIFirstExtractor(AIFirstExtractor):
         """Regex fallback for insurance certificate."""
         result: Dict[str, Any] = {}
         
-        match = re.search(r"(?:Certificate|Policy)\s*(?:No\.?|#|Number)\s*[:\-]?\s*([A-Z0-9\-\/]+)", raw_text, re.I)
+        match = _INSURANCE_CERTIFICATE_NUMBER_RE.search(raw_text)
         if match:
             result["certificate_number"] = match.group(1).strip()
         
-        match = re.search(r"(?:Sum\s+Insured|Insured\s+(?:Amount|Value))\s*[:\-]?\s*([A-Z]{3})?\s*([\d,]+(?:\.\d{2})?)", raw_text, re.I)
+        match = _INSURANCE_INSURED_AMOUNT_RE.search(raw_text)
         if match:
             if match.group(1):
                 result["currency"] = match.group(1)
             result["insured_amount"] = match.group(2).replace(",", "")
         
-        match = re.search(r"(ALL\s*RISKS?|ICC[\-\s]?[ABC]|INSTITUTE\s+CARGO)", raw_text, re.I)
+        match = _INSURANCE_COVERAGE_TYPE_RE.search(raw_text)
         if match:
             result["coverage_type"] = match.group(1).strip().upper()
         
@@ -1983,6 +2215,21 @@ DOCUMENT TEXT:
 Return ONLY valid JSON, no other text:"""
 
 
+# Regex fallback patterns.
+_INSPECTION_CERTIFICATE_NUMBER_RE = register_pattern(
+    "inspection",
+    "certificate_number",
+    r"(?:Certificate|Report)\s*(?:No\.?|#|Number)\s*[:\-]?\s*([A-Z0-9\-\/]+)",
+    re.I,
+)
+_INSPECTION_AGENCY_RE = register_pattern(
+    "inspection",
+    "inspection_agency",
+    r"(?:Inspection|Surveyed)\s*(?:By|Agency)\s*[:\-]?\s*([^\n]+)",
+    re.I,
+)
+
+
 class InspectionCertificateAIFirstExtractor(AIFirstExtractor):
     """AI-first extractor for Inspection Certificates."""
     
@@ -2014,7 +2261,7 @@ class InspectionCertificateAIFirstExtractor(AIFirstExtractor):
             return self._empty_result("empty_input")
         
         ai_result, ai_provider = await self._run_ai_extraction_generic(
-            raw_text, INSPECTION_EXTRACTION_PROMPT, INSPECTION_EXTRACTION_SYSTEM_PROMPT
+            raw_text, INSPECTION_EXTRACTION_PROMPT, INSPECTION_EXTRACTION_SYSTEM_PROMPT, "inspection_certificate"
         )
         
         if not ai_result and use_fallback_on_ai_failure:
@@ -2037,11 +2284,11 @@ class InspectionCertificateAIFirstExtractor(AIFirstExtractor):
         """Regex fallback for inspection certificate."""
         result: Dict[str, Any] = {}
         
-        match = re.search(r"(?:Certificate|Report)\s*(?:No\.?|#|Number)\s*[:\-]?\s*([A-Z0-9\-\/]+)", raw_text, re.I)
+        match = _INSPECTION_CERTIFICATE_NUMBER_RE.search(raw_text)
         if match:
             result["certificate_number"] = match.group(1).strip()
         
-        match = re.search(r"(?:Inspection|Surveyed)\s*(?:By|Agency)\s*[:\-]?\s*([^\n]+)", raw_text, re.I)
+        match = _INSPECTION_AGENCY_RE.search(raw_text)
         if match:
             result["inspection_agency"] = match.group(1).strip()
         
@@ -2070,7 +2317,7 @@ def _extract_candidate_json_text(response: str) -> str:
         clean = clean.split("```")[1]
         if clean.startswith("json"):
             clean = clean[4:]
-    match = re.search(r"\{[\s\S]*\}", clean)
+    match = _JSON_OBJECT_RE.search(clean)
     return match.group(0) if match else clean
 
 
@@ -2387,8 +2634,23 @@ async def _run_ai_extraction_generic(
     raw_text: str,
     prompt_template: str,
     system_prompt: str,
+    document_type: Optional[str] = None,
+) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Generic AI extraction for any document type (cached per document text, prompt and model)."""
+    return await _cached_ai_extraction(
+        document_type or "generic",
+        raw_text,
+        (prompt_template, system_prompt),
+        _extraction_cache_model(),
+        lambda: _call_generic_model(raw_text, prompt_template, system_prompt),
+    )
+
+
+async def _call_generic_model(
+    raw_text: str,
+    prompt_template: str,
+    system_prompt: str,
 ) -> Tuple[Optional[Dict[str, Any]], str]:
-    """Generic AI extraction for any document type."""
     try:
         from ..llm_provider import LLMProviderFactory
         
@@ -83,6 +83,27 @@ DOCUMENT TEXT:
 Return ONLY valid JSON, no other text:"""
 
 
+def resolve_lc_extraction_route() -> Tuple[str, str]:
+    """(provider, model) for LC extraction.
+
+    The LC is the anchor document; use the best model available.
+    """
+    import os as _os
+    lc_model = (
+        _os.getenv("EXTRACTION_LC_MODEL")
+        or _os.getenv("EXTRACTION_VISION_L2_MODEL")
+        or _os.getenv("EXTRACTION_PRIMARY_MODEL")
+        or "z-ai/glm-5.2"
+    )
+    lc_provider = (
+        _os.getenv("EXTRACTION_LC_PROVIDER")
+        or _os.getenv("EXTRACTION_VISION_L2_PROVIDER")
+        or _os.getenv("EXTRACTION_PRIMARY_PROVIDER")
+        or "openrouter"
+    )
+    return lc_provider, lc_model
+
+
 async def extract_lc_with_ai(
     ocr_text: str,
     max_chars: int = 12000,
@@ -110,20 +131,7 @@ async def extract_lc_with_ai(
     
     # Ensemble disabled — single Opus/Sonnet call is more accurate and
     # costs the same as running 3 providers in parallel.
-    # The LC is the anchor document; use the best model available.
-    import os as _os
-    lc_model = (
-        _os.getenv("EXTRACTION_LC_MODEL")
-        or _os.getenv("EXTRACTION_VISION_L2_MODEL")
-        or _os.getenv("EXTRACTION_PRIMARY_MODEL")
-        or "z-ai/glm-5.2"
-    )
-    lc_provider = (
-        _os.getenv("EXTRACTION_LC_PROVIDER")
-        or _os.getenv("EXTRACTION_VISION_L2_PROVIDER")
-        or _os.getenv("EXTRACTION_PRIMARY_PROVIDER")
-        or "openrouter"
-    )
+    lc_provider, lc_model = resolve_lc_extraction_route()
 
     prompt = LC_EXTRACTION_PROMPT.format(document_text=text_to_process)
 
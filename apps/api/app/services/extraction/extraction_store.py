@@ -0,0 +1,204 @@
+"""
+Tenant-scoped reuse of per-document extraction results.
+
+Exporters re-submit the same LC (and often the same certificates) with each
+shipment's new documents, under new filenames and in new jobs. The filename
+based ``reuse_job_id`` path cannot see those repeats, so each one went back
+through OCR and the vision LLM.
+
+``DocumentExtractionStore`` keys a document by the SHA-256 of its bytes and
+its pre-OCR document type, scoped to one company. A record holds the OCR
+text, the extraction artifacts and the launch-pipeline result. It is only
+served while its extractor version, model and prompt version match the
+running configuration, so a prompt or model change misses instead of
+returning stale fields.
+
+The store is request-scoped: ``lookup`` loads every candidate in one query
+before OCR starts, ``record`` snapshots fresh results as they are produced,
+and ``flush`` writes them, bumps hit counters and applies retention
+(``EXTRACTION_STORE_RETENTION_DAYS`` and
+``EXTRACTION_STORE_MAX_RECORDS_PER_COMPANY``) in one savepoint.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.extraction_store import DocumentExtractionRecord
+
+logger = logging.getLogger(__name__)
+
+# Bump when the shape of stored text/artifacts/launch results changes.
+EXTRACTOR_VERSION = "1"
+
+StoreKey = Tuple[str, str]  # (content_sha256, document_type)
+
+
+def store_enabled() -> bool:
+    return bool(getattr(settings, "EXTRACTION_STORE_ENABLED", True))
+
+
+def current_model() -> str:
+    provider = getattr(settings, "EXTRACTION_PRIMARY_PROVIDER", None) or "default"
+    model = getattr(settings, "EXTRACTION_PRIMARY_MODEL", None) or "default"
+    return f"{provider}:{model}"[:128]
+
+
+def current_prompt_version() -> str:
+    return str(getattr(settings, "EXTRACTION_PROMPT_VERSION", "1") or "1")[:64]
+
+
+def _retention_cutoff() -> datetime:
+    days = max(1, int(getattr(settings, "EXTRACTION_STORE_RETENTION_DAYS", 90) or 90))
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def _max_records() -> int:
+    return max(0, int(getattr(settings, "EXTRACTION_STORE_MAX_RECORDS_PER_COMPANY", 5000) or 0))
+
+
+class DocumentExtractionStore:
+    """Request-scoped view of one company's stored extractions."""
+
+    def __init__(self, db: Session, company_id: Any) -> None:
+        self.db = db
+        self.company_id = company_id
+        self.extractor_version = EXTRACTOR_VERSION
+        self.model = current_model()
+        self.prompt_version = current_prompt_version()
+        self._hit_ids: List[Any] = []
+        self._pending: Dict[StoreKey, Tuple[Dict[str, Any], int]] = {}
+
+    @classmethod
+    def for_company(cls, db: Optional[Session], company_id: Any) -> Optional["DocumentExtractionStore"]:
+        if db is None or not company_id or not store_enabled():
+            return None
+        return cls(db, company_id)
+
+    def lookup(self, keys: Iterable[StoreKey]) -> Dict[StoreKey, Dict[str, Any]]:
+        """Stored payloads for the given keys, loaded in one query."""
+        wanted = {(sha, doc_type) for sha, doc_type in keys if sha and doc_type}
+        if not wanted:
+            return {}
+        rows = (
+            self.db.query(DocumentExtractionRecord)
+            .filter(DocumentExtractionRecord.company_id == self.company_id)
+            .filter(DocumentExtractionRecord.content_sha256.in_({sha for sha, _ in wanted}))
+            .filter(DocumentExtractionRecord.extractor_version == self.extractor_version)
+            .filter(DocumentExtractionRecord.model == self.model)
+            .filter(DocumentExtractionRecord.prompt_version == self.prompt_version)
+            .filter(DocumentExtractionRecord.created_at >= _retention_cutoff())
+            .all()
+        )
+        found: Dict[StoreKey, Dict[str, Any]] = {}
+        for row in rows:
+            key = (row.content_sha256, row.document_type)
+            if key in wanted and isinstance(row.payload, dict):
+                found[key] = row.payload
+                self._hit_ids.append(row.id)
+        if found:
+            logger.info("Extraction store: %d/%d documents reused for company %s", len(found), len(wanted), self.company_id)
+        return found
+
+    def record(
+        self,
+        content_sha256: str,
+        document_type: str,
+        *,
+        text: Optional[str],
+        artifacts: Optional[Dict[str, Any]],
+        launch_result: Dict[str, Any],
+    ) -> None:
+        """Snapshot a fresh extraction; callers keep mutating their own dicts."""
+        if not content_sha256 or not document_type:
+            return
+        try:
+            encoded = json.dumps(
+                {"text": text or "", "artifacts": artifacts or {}, "launch_result": launch_result},
+                default=str,
+            )
+        except (TypeError, ValueError) as exc:
+            logger.debug("Extraction store: result for %s is not serialisable: %s", content_sha256, exc)
+            return
+        self._pending[(content_sha256, document_type)] = (json.loads(encoded), len(encoded))
+
+    def flush(self) -> None:
+        """Persist recorded results and hit counters, then apply retention."""
+        if not self._pending and not self._hit_ids:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            with self.db.begin_nested():
+                if self._hit_ids:
+                    (
+                        self.db.query(DocumentExtractionRecord)
+                        .filter(DocumentExtractionRecord.id.in_(self._hit_ids))
+                        .update(
+                            {
+                                DocumentExtractionRecord.hit_count: DocumentExtractionRecord.hit_count + 1,
+                                DocumentExtractionRecord.last_used_at: now,
+                            },
+                            synchronize_session=False,
+                        )
+                    )
+                for (sha, doc_type), (payload, size_bytes) in self._pending.items():
+                    self.db.query(DocumentExtractionRecord).filter(
+                        DocumentExtractionRecord.company_id == self.company_id,
+                        DocumentExtractionRecord.content_sha256 == sha,
+                        DocumentExtractionRecord.document_type == doc_type,
+                        DocumentExtractionRecord.extractor_version == self.extractor_version,
+                        DocumentExtractionRecord.model == self.model,
+                        DocumentExtractionRecord.prompt_version == self.prompt_version,
+                    ).delete(synchronize_session=False)
+                    self.db.add(
+                        DocumentExtractionRecord(
+                            company_id=self.company_id,
+                            content_sha256=sha,
+                            document_type=doc_type,
+                            extractor_version=self.extractor_version,
+                            model=self.model,
+                            prompt_version=self.prompt_version,
+                            payload=payload,
+                            size_bytes=size_bytes,
+                            hit_count=0,
+                            created_at=now,
+                            last_used_at=now,
+                        )
+                    )
+                self.db.flush()
+                self._apply_retention()
+            self.db.commit()
+        except Exception as exc:
+            self.db.rollback()
+            logger.warning("Extraction store flush failed for company %s: %s", self.company_id, exc)
+        finally:
+            self._pending.clear()
+            self._hit_ids.clear()
+
+    def _apply_retention(self) -> None:
+        scoped = self.db.query(DocumentExtractionRecord).filter(
+            DocumentExtractionRecord.company_id == self.company_id
+        )
+        scoped.filter(DocumentExtractionRecord.created_at < _retention_cutoff()).delete(
+            synchronize_session=False
+        )
+        cap = _max_records()
+        if not cap:
+            return
+        overflow_ids = [
+            row_id
+            for (row_id,) in scoped.with_entities(DocumentExtractionRecord.id)
+            .order_by(DocumentExtractionRecord.last_used_at.desc(), DocumentExtractionRecord.created_at.desc())
+            .offset(cap)
+            .all()
+        ]
+        if overflow_ids:
+            self.db.query(DocumentExtractionRecord).filter(
+                DocumentExtractionRecord.id.in_(overflow_ids)
+            ).delete(synchronize_session=False)
@@ -35,8 +35,22 @@ except ImportError:  # pragma: no cover - direct module loading in tests/scripts
     _lc_taxonomy_spec.loader.exec_module(_lc_taxonomy_module)
     build_lc_classification = _lc_taxonomy_module.build_lc_classification
 
+from app.utils.regex_registry import register_pattern
+
 logger = logging.getLogger(__name__)
 
+_ISO_NAMESPACE_RE = register_pattern(
+    "iso20022",
+    "namespace",
+    r"urn:iso:std:iso:20022:tech:xsd:((?:tsrv|tsmt|tsin)\.\d{3})",
+    re.IGNORECASE,
+)
+_EMBEDDED_DOCUMENT_RE = register_pattern("iso20022", "embedded_document", r'(<Document\b[^>]*>.*?</Document\s*>)', re.DOTALL)
+_REQUIRED_DOCS_SPLIT_RE = register_pattern("iso20022", "required_docs_split", r'[|\n]')
+_CCY_ATTRIBUTE_RE = register_pattern("iso20022", "ccy_attribute", r'Ccy\s*=\s*["\'](\w{3})["\']')
+_XML_TAG_RE = register_pattern("iso20022", "xml_tag", r'<[^>]+>')
+_WHITESPACE_RUN_RE = register_pattern("common", "whitespace_run", r"\s+")
+
 
 class ISO20022ParseError(Exception):
     """Raised when an ISO 20022 LC payload cannot be parsed."""
@@ -86,7 +100,7 @@ def detect_iso20022_schema(xml_text: str) -> Tuple[Optional[str], float]:
     if not xml_text or "<" not in xml_text:
         return None, 0.0
 
-    namespace_match = re.search(r"urn:iso:std:iso:20022:tech:xsd:((?:tsrv|tsmt|tsin)\.\d{3})", xml_text, re.IGNORECASE)
+    namespace_match = _ISO_NAMESPACE_RE.search(xml_text)
     if namespace_match:
         return namespace_match.group(1).lower(), 0.96
     
@@ -136,7 +150,7 @@ def extract_iso20022_lc_enhanced(xml_text: str) -> Dict[str, Any]:
     # ISO 20022 PDFs often embed the XML inside non-XML prose (headers,
     # footers, bank instructions).  Extract just the <Document>…</Document>
     # portion so ElementTree can parse it.
-    doc_match = re.search(r'(<Document\b[^>]*>.*?</Document\s*>)', xml_text, re.DOTALL)
+    doc_match = _EMBEDDED_DOCUMENT_RE.search(xml_text)
     if doc_match:
         xml_text = doc_match.group(1)
 
@@ -377,7 +391,7 @@ def _extract_documentary_credit(root: ET.Element, context: Dict[str, Any]) -> No
         reqrd_docs = _get_descendant_text(root, "ReqrdDocs") or _get_descendant_text(root, "DocReqrd")
         if reqrd_docs:
             # Pipe-delimited or newline-delimited list
-            parts = [p.strip() for p in re.split(r'[|\n]', reqrd_docs) if p.strip()]
+            parts = [p.strip() for p in _REQUIRED_DOCS_SPLIT_RE.split(reqrd_docs) if p.strip()]
             if parts:
                 context["documents_required"] = parts
 
@@ -1083,7 +1097,7 @@ async def extract_iso20022_with_ai_fallback(
 def _xml_to_plain_text(xml_text: str) -> str:
     """Convert XML to plain text for AI processing."""
     # Extract embedded XML first (same logic as the structured parser).
-    doc_match = re.search(r'(<Document\b[^>]*>.*?</Document\s*>)', xml_text, re.DOTALL)
+    doc_match = _EMBEDDED_DOCUMENT_RE.search(xml_text)
     if doc_match:
         xml_text = doc_match.group(1)
 
@@ -1105,9 +1119,9 @@ def _xml_to_plain_text(xml_text: str) -> str:
     except Exception:
         # Fallback: strip tags with regex but preserve Ccy attributes first.
         # Pull currency attributes before stripping tags.
-        ccy_match = re.search(r'Ccy\s*=\s*["\'](\w{3})["\']', xml_text)
-        text = re.sub(r'<[^>]+>', ' ', xml_text)
-        text = re.sub(r'\s+', ' ', text)
+        ccy_match = _CCY_ATTRIBUTE_RE.search(xml_text)
+        text = _XML_TAG_RE.sub(' ', xml_text)
+        text = _WHITESPACE_RUN_RE.sub(' ', text)
         if ccy_match:
             text = f"Currency: {ccy_match.group(1)}\n{text.strip()}"
         return text.strip()
@@ -28,6 +28,7 @@ from app.services.extraction.multimodal_document_extractor import (
     extract_document_multimodal_first,
     get_last_tier_attempts,
 )
+from app.services.extraction.parsed_document import ParsedDocument, ensure_parsed_document
 from app.services.facts import (
     build_bl_fact_set,
     build_coo_fact_set,
@@ -38,6 +39,7 @@ from app.services.facts import (
     build_packing_list_fact_set,
     build_supporting_fact_set,
 )
+from app.utils.regex_registry import register_pattern
 
 logger = logging.getLogger(__name__)
 
@@ -177,35 +179,34 @@ def _looks_like_swift_mt700(text: Optional[str]) -> bool:
     return len(set(matches)) >= 2
 
 
-def _extract_pdf_text_fast(file_bytes: Optional[bytes]) -> str:
+def _extract_pdf_text_fast(
+    file_bytes: Optional[bytes],
+    parsed_document: Optional[ParsedDocument] = None,
+) -> str:
     """Pull raw text out of a PDF using pdfminer.six (free, instant).
 
     Returns "" on any failure (non-PDF input, parser error, encrypted file).
     Used to give the vision LLM both the page images AND the actual text
     content — character-perfect text is more reliable than reading text
-    out of a JPEG.
+    out of a JPEG. Falls back to PyPDF2 (less accurate but more permissive
+    on weird PDFs) for the first 20 pages. When the OCR stage already built a
+    ``ParsedDocument`` its memoised text layer is reused.
     """
-    if not file_bytes:
+    parsed = ensure_parsed_document(parsed_document, file_bytes)
+    if parsed is None:
         return ""
-    try:
-        from io import BytesIO
-        from pdfminer.high_level import extract_text
-        text = extract_text(BytesIO(file_bytes)) or ""
-        return text.strip()
-    except Exception:
-        try:
-            # Fallback: PyPDF2 (less accurate but more permissive on weird PDFs).
-            from io import BytesIO
-            from PyPDF2 import PdfReader  # type: ignore
-            reader = PdfReader(BytesIO(file_bytes))
-            chunks = []
-            for page in reader.pages[:20]:
-                chunk = page.extract_text() or ""
-                if chunk.strip():
-                    chunks.append(chunk)
-            return "\n".join(chunks).strip()
-        except Exception:
-            return ""
+    return parsed.best_native_text(pypdf_page_limit=20)
+
+
+async def _extract_pdf_text_fast_async(
+    file_bytes: Optional[bytes],
+    parsed_document: Optional[ParsedDocument] = None,
+) -> str:
+    """``_extract_pdf_text_fast`` with the parse run in the CPU process pool."""
+    parsed = ensure_parsed_document(parsed_document, file_bytes)
+    if parsed is None:
+        return ""
+    return await parsed.best_native_text_async(pypdf_page_limit=20)
 
 
 def _resolve_extraction_lane(*, extraction_method: Optional[str], support_only: bool = False) -> str:
@@ -252,6 +253,7 @@ class LaunchExtractionPipeline:
         extraction_artifacts_v1: Optional[Dict[str, Any]] = None,
         file_bytes: Optional[bytes] = None,
         content_type: Optional[str] = None,
+        parsed_document: Optional[ParsedDocument] = None,
     ) -> Dict[str, Any]:
         extraction_artifacts_v1 = extraction_artifacts_v1 or {}
         normalized_doc_type = _canonicalize_launch_doc_type(str(document_type or "").strip().lower())
@@ -260,7 +262,13 @@ class LaunchExtractionPipeline:
             ocr_confidence=extraction_artifacts_v1.get("ocr_confidence"),
             metadata=extraction_artifacts_v1,
         )
-        self._current_pdf_text = _extract_pdf_text_fast(file_bytes)
+        self._current_parsed_document = ensure_parsed_document(
+            parsed_document,
+            file_bytes,
+            filename=filename,
+            content_type=content_type,
+        )
+        self._current_pdf_text = await _extract_pdf_text_fast_async(file_bytes, self._current_parsed_document)
 
         if normalized_doc_type in {
             "letter_of_credit",
@@ -436,7 +444,7 @@ class LaunchExtractionPipeline:
             # Pull raw PDF text via pdfminer so the vision LLM has BOTH the
             # rendered page images AND the actual text characters. Empty
             # string when extraction fails (image-only PDF, encrypted, etc.).
-            pdf_text_for_vision = _extract_pdf_text_fast(file_bytes) or extracted_text
+            pdf_text_for_vision = getattr(self, "_current_pdf_text", "") or extracted_text
             multimodal_struct = await extract_document_multimodal_first(
                 document_type=document_type,
                 filename=filename,
@@ -444,6 +452,7 @@ class LaunchExtractionPipeline:
                 content_type=content_type,
                 extracted_text=pdf_text_for_vision,
                 subtype_hint=lc_subtype,
+                parsed_document=getattr(self, "_current_parsed_document", None),
             )
 
             # If vision failed AND the extracted text looks like raw SWIFT
@@ -648,6 +657,7 @@ class LaunchExtractionPipeline:
                 content_type=content_type,
                 extracted_text=getattr(self, "_current_pdf_text", "") or extracted_text,
                 subtype_hint=invoice_subtype,
+                parsed_document=getattr(self, "_current_parsed_document", None),
             )
             invoice_struct = multimodal_struct or await extract_invoice_ai_first(extracted_text)
             extraction_status = invoice_struct.get("_status", "unknown")
@@ -828,6 +838,7 @@ class LaunchExtractionPipeline:
                 content_type=content_type,
                 extracted_text=getattr(self, "_current_pdf_text", "") or extracted_text,
                 subtype_hint=transport_subtype,
+                parsed_document=getattr(self, "_current_parsed_document", None),
             )
             bl_struct = multimodal_struct or await extract_bl_ai_first(extracted_text)
             extraction_status = bl_struct.get("_status", "unknown")
@@ -983,6 +994,7 @@ class LaunchExtractionPipeline:
                 file_bytes=file_bytes,
                 content_type=content_type,
                 extracted_text=getattr(self, "_current_pdf_text", "") or extracted_text,
+                parsed_document=getattr(self, "_current_parsed_document", None),
             )
             packing_struct = multimodal_struct or await extract_packing_list_ai_first(extracted_text)
             extraction_status = packing_struct.get("_status", "unknown")
@@ -1141,6 +1153,7 @@ class LaunchExtractionPipeline:
                 content_type=content_type,
                 extracted_text=getattr(self, "_current_pdf_text", "") or extracted_text,
                 subtype_hint=regulatory_subtype,
+                parsed_document=getattr(self, "_current_parsed_document", None),
             )
             coo_struct = multimodal_struct or await extract_coo_ai_first(extracted_text)
             extraction_status = coo_struct.get("_status", "unknown")
@@ -1309,6 +1322,7 @@ class LaunchExtractionPipeline:
                 content_type=content_type,
                 extracted_text=getattr(self, "_current_pdf_text", "") or extracted_text,
                 subtype_hint=insurance_subtype,
+                parsed_document=getattr(self, "_current_parsed_document", None),
             )
             insurance_struct = multimodal_struct or await extract_insurance_ai_first(extracted_text)
             extraction_status = insurance_struct.get("_status", "unknown")
@@ -1517,6 +1531,7 @@ class LaunchExtractionPipeline:
             content_type=content_type,
             extracted_text=getattr(self, "_current_pdf_text", "") or extracted_text,
             subtype_hint=supporting_guess.get("subtype"),
+            parsed_document=getattr(self, "_current_parsed_document", None),
         )
         base_patch = {
             "ocr_quality": {
@@ -1626,6 +1641,7 @@ class LaunchExtractionPipeline:
                 content_type=content_type,
                 extracted_text=getattr(self, "_current_pdf_text", "") or extracted_text,
                 subtype_hint=inspection_subtype,
+                parsed_document=getattr(self, "_current_parsed_document", None),
             )
             inspection_struct = multimodal_struct or await extract_inspection_ai_first(extracted_text)
             extraction_status = inspection_struct.get("_status", "unknown")
@@ -2405,6 +2421,16 @@ def _detect_lc_financial_subtype(*, filename: str, document_type: str, extracted
     return str(document_type or "letter_of_credit").strip().lower() or "letter_of_credit"
 
 
+_MT700_ISO_DATE_RE = register_pattern("lc", "mt700_iso_date", r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})")
+_MT700_SHORT_DATE_RE = register_pattern("lc", "mt700_short_date", r"(?<!\d)(\d{2})[-/](\d{1,2})[-/](\d{1,2})(?!\d)")
+_MT700_DIGIT_DATE_RE = register_pattern("lc", "mt700_digit_date", r"(\d{8}|\d{6})")
+_MT700_ISSUE_DATE_RE = register_pattern("lc", "mt700_31c", r":?31C:\s*([^\n\r]+)", re.IGNORECASE)
+_MT700_EXPIRY_RE = register_pattern("lc", "mt700_31d", r":?31D:\s*([^\n\r]+)", re.IGNORECASE)
+_MT700_LATEST_SHIPMENT_RE = register_pattern("lc", "mt700_44c", r":?44C:\s*([^\n\r]+)", re.IGNORECASE)
+_MT700_EXPIRY_DATE_PREFIX_RE = register_pattern("lc", "mt700_expiry_date_prefix", r"^\s*\d{6,8}")
+_WHITESPACE_RUN_RE = register_pattern("common", "whitespace_run", r"\s+")
+
+
 def _coerce_mt700_date_iso(value: Any) -> Optional[str]:
     raw_value = str(value or "").strip()
     if not raw_value:
@@ -2413,7 +2439,7 @@ def _coerce_mt700_date_iso(value: Any) -> Optional[str]:
     # Try ISO-style YYYY-MM-DD or YYYY/MM/DD first (pilot-5 realistic
     # PDFs emit ":31C: DATE OF ISSUE 2026-03-08" where the dashes prevent
     # the 6/8-digit run-length regex below from matching).
-    iso_match = re.search(r"(\d{4})[-/](\d{1,2})[-/](\d{1,2})", raw_value)
+    iso_match = _MT700_ISO_DATE_RE.search(raw_value)
     if iso_match:
         try:
             return date(
@@ -2425,7 +2451,7 @@ def _coerce_mt700_date_iso(value: Any) -> Optional[str]:
             pass
 
     # Try YY-MM-DD or YY/MM/DD (SWIFT legacy with separators).
-    short_match = re.search(r"(?<!\d)(\d{2})[-/](\d{1,2})[-/](\d{1,2})(?!\d)", raw_value)
+    short_match = _MT700_SHORT_DATE_RE.search(raw_value)
     if short_match:
         try:
             yy = int(short_match.group(1))
@@ -2440,7 +2466,7 @@ def _coerce_mt700_date_iso(value: Any) -> Optional[str]:
 
     # Fall back to a run of 6 or 8 consecutive digits (canonical MT700
     # :31C:260308 or :31C:20260308).
-    match = re.search(r"(\d{8}|\d{6})", raw_value)
+    match = _MT700_DIGIT_DATE_RE.search(raw_value)
     if not match:
         return None
 
@@ -2465,16 +2491,16 @@ def _extract_mt700_timeline_fields(raw_text: str) -> Dict[str, Any]:
     if not source:
         return {}
 
-    def _find(pattern: str) -> Optional[str]:
-        match = re.search(pattern, source, flags=re.IGNORECASE)
+    def _find(pattern: Any) -> Optional[str]:
+        match = pattern.search(source)
         if not match:
             return None
         value = str(match.group(1) or "").strip()
         return value or None
 
-    issue_raw = _find(r":?31C:\s*([^\n\r]+)")
-    expiry_raw = _find(r":?31D:\s*([^\n\r]+)")
-    latest_raw = _find(r":?44C:\s*([^\n\r]+)")
+    issue_raw = _find(_MT700_ISSUE_DATE_RE)
+    expiry_raw = _find(_MT700_EXPIRY_RE)
+    latest_raw = _find(_MT700_LATEST_SHIPMENT_RE)
 
     timeline: Dict[str, Any] = {}
     issue_date = _coerce_mt700_date_iso(issue_raw)
@@ -2489,9 +2515,9 @@ def _extract_mt700_timeline_fields(raw_text: str) -> Dict[str, Any]:
         timeline["latest_shipment_date"] = latest_shipment_date
 
     if expiry_raw:
-        place = re.sub(r"^\s*\d{6,8}", "", expiry_raw).strip(" ,-/")
+        place = _MT700_EXPIRY_DATE_PREFIX_RE.sub("", expiry_raw).strip(" ,-/")
         if place:
-            timeline["place_of_expiry"] = re.sub(r"\s+", " ", place)
+            timeline["place_of_expiry"] = _WHITESPACE_RUN_RE.sub(" ", place)
 
     return timeline
 
@@ -3612,9 +3638,13 @@ def _shape_transport_payload(
     return _apply_canonical_normalization(shaped)
 
 
+_LOOKUP_KEY_NOISE_RE = register_pattern("common", "lookup_key_noise", r"[^a-z0-9]+")
+_CURRENCY_TOKEN_RE = register_pattern("common", "currency_token", r"\b([A-Z]{3})\b")
+
+
 def _normalize_lookup_key(value: str) -> str:
-    compact = re.sub(r"[^a-z0-9]+", " ", str(value or "").strip().lower())
-    return re.sub(r"\s+", " ", compact).strip()
+    compact = _LOOKUP_KEY_NOISE_RE.sub(" ", str(value or "").strip().lower())
+    return _WHITESPACE_RUN_RE.sub(" ", compact).strip()
 
 
 def _normalize_country_value(value: Any) -> Any:
@@ -3664,7 +3694,7 @@ def _normalize_currency_value(value: Any) -> Any:
     normalized = registry.normalize(raw)
     if normalized:
         return normalized
-    token_match = re.search(r"\b([A-Z]{3})\b", raw.upper())
+    token_match = _CURRENCY_TOKEN_RE.search(raw.upper())
     if token_match and registry.is_valid(token_match.group(1)):
         return token_match.group(1)
     return raw
@@ -3684,7 +3714,7 @@ def _normalize_document_alias(value: Any) -> Any:
     direct = CANONICAL_DOCUMENT_ALIASES.get(key)
     if direct:
         return direct
-    snake = re.sub(r"\s+", "_", key)
+    snake = _WHITESPACE_RUN_RE.sub("_", key)
     return CANONICAL_DOCUMENT_ALIASES.get(snake, value.strip())
 
 
@@ -3779,8 +3809,8 @@ def _split_lc_availability_value(payload: Dict[str, Any]) -> None:
         return
     payload["available_by"] = matched_method
     # Try to recover the bank-name half by stripping the "BY <METHOD>" tail.
-    import re as _re
-    cleaned = _re.sub(r"(?i)\bby\s+" + matched_method + r"\b.*$", "", text).strip(" /,;\n")
+    method_tail = register_pattern("lc", f"available_by_tail_{matched_method}", r"(?i)\bby\s+" + matched_method + r"\b.*$")
+    cleaned = method_tail.sub("", text).strip(" /,;\n")
     if cleaned and cleaned.upper() != upper:
         payload["available_with"] = cleaned
     elif cleaned == "" or cleaned.upper() == matched_method:
@@ -3789,6 +3819,9 @@ def _split_lc_availability_value(payload: Dict[str, Any]) -> None:
         payload["available_with"] = None
 
 
+_EXPIRY_DATE_WITH_PLACE_RE = register_pattern("lc", "expiry_date_with_place", r"(\d{4}-\d{2}-\d{2})\s*([A-Za-z][A-Za-z\s,]+)$")
+
+
 def _split_lc_expiry_place(payload: Dict[str, Any]) -> None:
     """Recover `expiry_place` from a glued `expiry_date` like '2026-10-15USA'.
 
@@ -3801,8 +3834,7 @@ def _split_lc_expiry_place(payload: Dict[str, Any]) -> None:
     if not isinstance(expiry, str):
         return
     # Look for an ISO date prefix followed by trailing letters.
-    import re as _re
-    m = _re.match(r"(\d{4}-\d{2}-\d{2})\s*([A-Za-z][A-Za-z\s,]+)$", expiry.strip())
+    m = _EXPIRY_DATE_WITH_PLACE_RE.match(expiry.strip())
     if m:
         payload["expiry_date"] = m.group(1)
         payload["expiry_place"] = m.group(2).strip()
@@ -7,6 +7,8 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from app.utils.regex_registry import register_pattern
+
 
 SWIFT_VARIANTS = {
     "mt700", "mt701", "mt705", "mt707", "mt708", "mt710", "mt711", "mt720", "mt721",
@@ -48,6 +50,22 @@ MT700_FIELD_HINTS = (
 )
 TENOR_DAYS_RE = re.compile(r"\b(\d{1,3})\s*DAYS?\b", re.IGNORECASE)
 
+_COUNTRY_SEGMENT_SPLIT_RE = register_pattern("lc", "country_segment_split", r"[\n,;/]+")
+_COUNTRY_NAME_NOISE_RE = register_pattern("lc", "country_name_noise", r"[^a-z0-9\s.]")
+_WHITESPACE_RUN_RE = register_pattern("common", "whitespace_run", r"\s+")
+_NON_DIGIT_RE = register_pattern("common", "non_digit", r"\D")
+_FIRST_INT_RE = register_pattern("common", "first_int", r"(\d+)")
+_MT700_EXPIRY_PLACE_RE = register_pattern("lc", "mt700_expiry_place", r"^\s*\d{6}\s*([A-Za-z][A-Za-z\s\-.]{1,})\s*$")
+_EXACT_WORDING_PATTERNS = (
+    register_pattern("lc", "exact_wording_stating", r"\b(?:stating|state|must state)\s+exactly\s+(.+)$", re.IGNORECASE),
+    register_pattern("lc", "exact_wording", r"\bexact\s+wording\s*[:\-]?\s+(.+)$", re.IGNORECASE),
+    register_pattern("lc", "exact_wording_with_the", r"\bwith\s+the\s+wording\s*[:\-]?\s+(.+)$", re.IGNORECASE),
+)
+_ORIGINALS_COUNT_RE = register_pattern("lc", "originals_count", r"(\d+)\s+originals?\b", re.IGNORECASE)
+_COPIES_COUNT_RE = register_pattern("lc", "copies_count", r"(\d+)\s+copies?\b", re.IGNORECASE)
+_NON_ALNUM_RE = register_pattern("lc", "alias_non_alnum", r"[^a-z0-9]")
+_COMPACT_TOKEN_RE = register_pattern("lc", "compact_requirement_token", r"[A-Z0-9/]+")
+
 DOCUMENT_PATTERNS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
     ("proforma_invoice", ("pro forma invoice", "proforma invoice")),
     ("commercial_invoice", ("commercial invoice", "signed commercial invoice", "signed invoice", "invoice", "inv")),
@@ -523,7 +541,7 @@ def _extract_country_from_value(value: Any) -> str:
     text = str(value).strip()
     if not text:
         return ""
-    segments = [segment.strip(" .,-") for segment in re.split(r"[\n,;/]+", text) if segment.strip(" .,-")]
+    segments = [segment.strip(" .,-") for segment in _COUNTRY_SEGMENT_SPLIT_RE.split(text) if segment.strip(" .,-")]
     candidates = list(reversed(segments)) + [text]
     for candidate in candidates:
         normalized = _normalize_country_name(candidate)
@@ -536,7 +554,7 @@ def _normalize_country_name(value: Any) -> str:
     text = str(value or "").strip().lower()
     if not text:
         return ""
-    text = re.sub(r"\s+", " ", re.sub(r"[^a-z0-9\s.]", " ", text)).strip()
+    text = _WHITESPACE_RUN_RE.sub(" ", _COUNTRY_NAME_NOISE_RE.sub(" ", text)).strip()
     return COUNTRY_SYNONYMS.get(text, text)
 
 
@@ -583,7 +601,7 @@ def _coerce_mt700_date_iso(value: Any) -> Optional[str]:
     text = clean_string(value)
     if not text:
         return None
-    digits = re.sub(r"\D", "", text)
+    digits = _NON_DIGIT_RE.sub("", text)
     if len(digits) < 6:
         return None
     yy = digits[:2]
@@ -612,7 +630,12 @@ def _extract_mt700_date_attributes(source: Dict[str, Any]) -> Dict[str, Optional
             return block_value
         if not raw_text:
             return None
-        match = re.search(rf"(?im)^\s*:{re.escape(block_code)}:\s*([^\r\n]+)", raw_text)
+        block_pattern = register_pattern(
+            "lc",
+            f"mt700_block_{block_code}",
+            rf"(?im)^\s*:{re.escape(block_code)}:\s*([^\r\n]+)",
+        )
+        match = block_pattern.search(raw_text)
         if not match:
             return None
         value = clean_string(match.group(1))
@@ -623,7 +646,7 @@ def _extract_mt700_date_attributes(source: Dict[str, Any]) -> Dict[str, Optional
     latest_raw = _block_or_text("44C")
 
     expiry_place = None
-    expiry_match = re.match(r"^\s*\d{6}\s*([A-Za-z][A-Za-z\s\-.]{1,})\s*$", str(expiry_raw or "").strip())
+    expiry_match = _MT700_EXPIRY_PLACE_RE.match(str(expiry_raw or "").strip())
     if expiry_match:
         expiry_place = clean_string(expiry_match.group(1))
         if expiry_place:
@@ -1010,12 +1033,7 @@ def _extract_exact_wording_requirement(line: str) -> Optional[str]:
     text = clean_string(line)
     if not text:
         return None
-    patterns = (
-        re.compile(r"\b(?:stating|state|must state)\s+exactly\s+(.+)$", re.IGNORECASE),
-        re.compile(r"\bexact\s+wording\s*[:\-]?\s+(.+)$", re.IGNORECASE),
-        re.compile(r"\bwith\s+the\s+wording\s*[:\-]?\s+(.+)$", re.IGNORECASE),
-    )
-    for pattern in patterns:
+    for pattern in _EXACT_WORDING_PATTERNS:
         match = pattern.search(text)
         if not match:
             continue
@@ -1028,7 +1046,7 @@ def _extract_exact_wording_requirement(line: str) -> Optional[str]:
 
 def _extract_original_count_requirement(line: str) -> Optional[int]:
     text = str(line or "")
-    explicit = re.search(r"(\d+)\s+originals?\b", text, re.IGNORECASE)
+    explicit = _ORIGINALS_COUNT_RE.search(text)
     if explicit:
         return int(explicit.group(1))
     spelled = {
@@ -1046,7 +1064,7 @@ def _extract_original_count_requirement(line: str) -> Optional[int]:
 
 def _extract_copy_count_requirement(line: str) -> Optional[int]:
     text = str(line or "")
-    match = re.search(r"(\d+)\s+copies?\b", text, re.IGNORECASE)
+    match = _COPIES_COUNT_RE.search(text)
     return int(match.group(1)) if match else None
 
 
@@ -1085,14 +1103,18 @@ def _contains_alias(lowered_line: str, alias: str) -> bool:
     normalized_alias = alias.lower().strip()
     if not normalized_alias:
         return False
-    if re.search(r"[^a-z0-9]", normalized_alias):
+    if _NON_ALNUM_RE.search(normalized_alias):
         return normalized_alias in lowered_line
-    pattern = re.compile(rf"(^|[^a-z0-9]){re.escape(normalized_alias)}([^a-z0-9]|$)")
+    pattern = register_pattern(
+        "lc",
+        f"document_alias_{normalized_alias}",
+        rf"(^|[^a-z0-9]){re.escape(normalized_alias)}([^a-z0-9]|$)",
+    )
     return bool(pattern.search(lowered_line))
 
 
 def _extract_compact_requirement_tokens(line: str) -> List[str]:
-    tokens = re.findall(r"[A-Z0-9/]+", (line or "").upper())
+    tokens = _COMPACT_TOKEN_RE.findall((line or "").upper())
     return [token for token in tokens if token in COMPACT_REQUIREMENT_TOKENS]
 
 
@@ -1207,7 +1229,7 @@ def extract_int(raw: Any) -> Optional[int]:
         return None
     if isinstance(raw, (int, float)):
         return int(raw)
-    match = re.search(r"(\d+)", str(raw))
+    match = _FIRST_INT_RE.search(str(raw))
     return int(match.group(1)) if match else None
 
 
@@ -1,14 +1,12 @@
 from __future__ import annotations
 
-import asyncio
 import base64
-import io
 import json
 import logging
 import os
 from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
 
 from PIL import Image
 
@@ -21,7 +19,13 @@ from app.services.extraction.ai_first_extractor import (
     _unwrap_confidence_scalars_in_place,
     _wrap_ai_result_with_default_confidence,
 )
+from app.services.llm_clients import get_anthropic_client, get_openai_client, llm_slot, request_timeout
 from app.services.llm_provider import LLMProvider
+from app.utils import pdf_workers
+from app.utils.cpu_pool import run_cpu_bound
+
+if TYPE_CHECKING:
+    from app.services.extraction.parsed_document import ParsedDocument
 
 logger = logging.getLogger(__name__)
 
@@ -678,6 +682,7 @@ async def extract_document_multimodal_first(
     content_type: Optional[str],
     extracted_text: str = "",
     subtype_hint: Optional[str] = None,
+    parsed_document: Optional["ParsedDocument"] = None,
 ) -> Optional[Dict[str, Any]]:
     """Vision LLM extraction with tier escalation.
 
@@ -690,6 +695,9 @@ async def extract_document_multimodal_first(
     present, it's sent alongside the page images so the LLM has both
     visual layout AND character-perfect text content. Empty string means
     vision-only.
+
+    `parsed_document` is the upload's shared ParsedDocument; when given, PDF
+    pages are rendered through it so the OCR and vision stages share renders.
     """
     if not file_bytes or not _is_supported_content_type(content_type, filename):
         return None
@@ -701,6 +709,7 @@ async def extract_document_multimodal_first(
             content_type=content_type,
             filename=filename,
             max_pages=max_pages,
+            parsed_document=parsed_document,
         )
     except Exception as exc:
         logger.warning("Multimodal visual preparation failed for %s: %s", filename, exc)
@@ -944,38 +953,57 @@ def _build_multimodal_prompt(
     return header + one_shot + instruction + text_block
 
 
-async def _build_visual_parts(*, file_bytes: bytes, content_type: Optional[str], filename: str, max_pages: int) -> Tuple[List[Dict[str, str]], str]:
+async def _build_visual_parts(
+    *,
+    file_bytes: bytes,
+    content_type: Optional[str],
+    filename: str,
+    max_pages: int,
+    parsed_document: Optional["ParsedDocument"] = None,
+) -> Tuple[List[Dict[str, str]], str]:
     ctype = (content_type or "").lower()
     lower_name = (filename or "").lower()
     if ctype.startswith("image/") or lower_name.endswith((".png", ".jpg", ".jpeg", ".webp")):
         media_type = ctype if ctype.startswith("image/") else _guess_image_media_type(lower_name)
         return ([{"media_type": media_type, "data": base64.b64encode(file_bytes).decode("ascii")}], "image" )
     if ctype == "application/pdf" or lower_name.endswith(".pdf"):
-        return await _render_pdf_to_images(file_bytes, max_pages=max_pages)
+        return await _render_pdf_to_images(file_bytes, max_pages=max_pages, parsed_document=parsed_document)
     return ([], "unsupported")
 
 
-async def _render_pdf_to_images(file_bytes: bytes, *, max_pages: int) -> Tuple[List[Dict[str, str]], str]:
-    def _convert() -> List[Dict[str, str]]:
-        from pdf2image import convert_from_bytes
-
-        # 220 DPI + JPEG quality 90 — enough resolution for the LLM to read
-        # MT700 small print and SWIFT field codes. Was 170 / 82 which lost
-        # detail on dense LC pages.
-        images = convert_from_bytes(file_bytes, dpi=220, first_page=1, last_page=max_pages, fmt="jpeg")
-        result: List[Dict[str, str]] = []
-        for img in images[:max_pages]:
-            buf = io.BytesIO()
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-            img.save(buf, format="JPEG", quality=90, optimize=True)
-            result.append({
-                "media_type": "image/jpeg",
-                "data": base64.b64encode(buf.getvalue()).decode("ascii"),
-            })
-        return result
-
-    images = await asyncio.to_thread(_convert)
+async def _render_pdf_to_images(
+    file_bytes: bytes,
+    *,
+    max_pages: int,
+    parsed_document: Optional["ParsedDocument"] = None,
+) -> Tuple[List[Dict[str, str]], str]:
+    # 220 DPI + JPEG quality 90 — enough resolution for the LLM to read
+    # MT700 small print and SWIFT field codes. Was 170 / 82 which lost
+    # detail on dense LC pages. Rendering runs in the CPU process pool.
+    if parsed_document is not None:
+        pages = await parsed_document.render_pages_async(
+            dpi=220,
+            output_format="JPEG",
+            max_pages=max_pages,
+            quality=90,
+            optimize=True,
+        )
+    else:
+        rendered = await run_cpu_bound(
+            pdf_workers.render_pdf_pages,
+            file_bytes,
+            220,
+            ("JPEG",),
+            max_pages,
+            90,
+            True,
+            task="render_pdf_pages",
+        )
+        pages = rendered["JPEG"]
+    images = [
+        {"media_type": "image/jpeg", "data": base64.b64encode(page).decode("ascii")}
+        for page in pages[:max_pages]
+    ]
     return images, "pdf_pages"
 
 
@@ -1040,9 +1068,6 @@ async def _generate_multimodal(*, provider: str, model: str, prompt: str, system
 
 
 async def _generate_openai_compatible(*, provider: str, model: str, prompt: str, system_prompt: str, image_parts: Sequence[Dict[str, str]]) -> Tuple[str, str]:
-    import httpx
-    import openai
-
     api_key: Optional[str]
     base_url: Optional[str] = None
     if provider == LLMProvider.OPENAI.value:
@@ -1053,36 +1078,35 @@ async def _generate_openai_compatible(*, provider: str, model: str, prompt: str,
     if not api_key:
         raise ValueError(f"{provider} API key not configured")
 
-    timeout = httpx.Timeout(30.0, read=120.0)
-    client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=timeout)
+    timeout = request_timeout("openai", 30.0, read=120.0)
+    client = get_openai_client(provider, api_key, base_url)
     content: List[Dict[str, Any]] = [{"type": "text", "text": prompt}]
     for part in image_parts:
         content.append({
             "type": "image_url",
             "image_url": {"url": f"data:{part['media_type']};base64,{part['data']}"},
         })
-    response = await client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": content},
-        ],
-        max_tokens=int(os.getenv("EXTRACTION_MULTIMODAL_MAX_TOKENS") or "8000"),
-        temperature=0.1,
-        response_format={"type": "json_object"},
-    )
+    async with llm_slot(provider):
+        response = await client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": content},
+            ],
+            max_tokens=int(os.getenv("EXTRACTION_MULTIMODAL_MAX_TOKENS") or "8000"),
+            temperature=0.1,
+            response_format={"type": "json_object"},
+            timeout=timeout,
+        )
     return (response.choices[0].message.content or "", provider)
 
 
 async def _generate_anthropic(*, model: str, prompt: str, system_prompt: str, image_parts: Sequence[Dict[str, str]]) -> Tuple[str, str]:
-    import anthropic
-    import httpx
-
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY not configured")
-    timeout = httpx.Timeout(30.0, read=120.0)
-    client = anthropic.AsyncAnthropic(api_key=api_key, timeout=timeout)
+    timeout = request_timeout("anthropic", 30.0, read=120.0)
+    client = get_anthropic_client(api_key)
     content: List[Dict[str, Any]] = [{"type": "text", "text": prompt}]
     for part in image_parts:
         content.append({
@@ -1093,13 +1117,15 @@ async def _generate_anthropic(*, model: str, prompt: str, system_prompt: str, im
                 "data": part["data"],
             },
         })
-    response = await client.messages.create(
-        model=model,
-        system=system_prompt,
-        messages=[{"role": "user", "content": content}],
-        max_tokens=int(os.getenv("EXTRACTION_MULTIMODAL_MAX_TOKENS") or "8000"),
-        temperature=0.1,
-    )
+    async with llm_slot(LLMProvider.ANTHROPIC.value):
+        response = await client.messages.create(
+            model=model,
+            system=system_prompt,
+            messages=[{"role": "user", "content": content}],
+            max_tokens=int(os.getenv("EXTRACTION_MULTIMODAL_MAX_TOKENS") or "8000"),
+            temperature=0.1,
+            timeout=timeout,
+        )
     chunks: List[str] = []
     for block in response.content or []:
         text = getattr(block, "text", None)
@@ -0,0 +1,451 @@
+"""
+Per-upload parsed document artifact.
+
+A single upload used to be parsed several times per validation: pdfminer and
+PyPDF2 in the OCR runtime (text, then page count), pdfminer again in the launch
+pipeline, and pdf2image once more for the vision LLM. ``ParsedDocument`` is
+built once per upload and passed through OCR, extraction and vision so each
+of those artifacts is computed at most once:
+
+- ``content_hash``: SHA-256 of the raw bytes (cache key for downstream stages)
+- ``page_count``: PyPDF2 page count (0 when the bytes are not a readable PDF)
+- ``native_text`` / ``page_texts``: pdfminer text layer, whole and per page
+- ``pypdf_text`` / ``pypdf_page_texts``: PyPDF2 text layer, computed on demand
+- ``render_pages()``: rasterised page images, rendered lazily and memoised
+  per (dpi, format); ``render_page()`` renders a single page on demand
+
+Every accessor memoises both its result and its failure, so callers keep their
+existing ``try/except`` handling and a parser that failed once is not retried
+by the next stage.
+
+Each artifact has a synchronous accessor and an ``*_async`` twin. The async
+variants run the parser in the CPU process pool (``app.utils.cpu_pool``) and
+fill the same memo, so async callers warm the artifact off the event loop and
+any later synchronous read is a cache hit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.utils import pdf_workers
+
+logger = logging.getLogger(__name__)
+
+# pdfminer separates pages in extract_text() output with a form feed.
+_PDFMINER_PAGE_BREAK = "\x0c"
+
+_RenderKey = Tuple[int, str, Optional[int], int, bool]
+
+
+def _split_pdfminer_pages(text: str) -> List[str]:
+    pages = text.split(_PDFMINER_PAGE_BREAK)
+    if pages and not pages[-1].strip():
+        pages = pages[:-1]
+    return pages
+
+
+def _save_format(output_format: str) -> str:
+    return "JPEG" if str(output_format or "").upper() in {"JPEG", "JPG"} else "PNG"
+
+
+@dataclass
+class ParsedDocument:
+    """Parse-once view over the bytes of one uploaded document."""
+
+    content: bytes
+    filename: str = ""
+    content_type: str = ""
+    content_hash: str = ""
+    _memo: Dict[Any, Tuple[bool, Any]] = field(default_factory=dict, repr=False)
+    _inflight: Dict[Any, "asyncio.Future[Any]"] = field(default_factory=dict, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+
+    def __post_init__(self) -> None:
+        self.content = bytes(self.content or b"")
+        if not self.content_hash:
+            self.content_hash = hashlib.sha256(self.content).hexdigest()
+
+    @classmethod
+    def from_bytes(
+        cls,
+        file_bytes: bytes,
+        *,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> "ParsedDocument":
+        return cls(
+            content=file_bytes,
+            filename=str(filename or ""),
+            content_type=str(content_type or ""),
+        )
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.content)
+
+    @property
+    def is_pdf(self) -> bool:
+        if self.content.startswith(b"%PDF"):
+            return True
+        if self.content_type.lower() == "application/pdf":
+            return True
+        return self.filename.lower().endswith(".pdf")
+
+    # ------------------------------------------------------------------
+    # Memoisation
+    # ------------------------------------------------------------------
+
+    def _unwrap(self, key: Any) -> Any:
+        ok, value = self._memo[key]
+        if ok:
+            return value
+        raise value
+
+    def _memoised(self, key: Any, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key not in self._memo:
+                try:
+                    self._memo[key] = (True, compute())
+                except Exception as exc:  # noqa: BLE001 - re-raised to every caller
+                    self._memo[key] = (False, exc)
+            return self._unwrap(key)
+
+    async def _memoised_async(self, key: Any, task: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Fill ``key`` from the CPU pool; concurrent callers share one task."""
+        from app.utils.cpu_pool import run_cpu_bound
+
+        with self._lock:
+            if key in self._memo:
+                return self._unwrap(key)
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = asyncio.get_running_loop().create_future()
+                self._inflight[key] = pending
+        if not owner:
+            await asyncio.shield(pending)
+            return await self._memoised_async(key, task, func, *args)
+
+        try:
+            value = await run_cpu_bound(func, *args, task=task)
+            with self._lock:
+                self._memo[key] = (True, value)
+        except Exception as exc:  # noqa: BLE001 - memoised like the sync path
+            # Pool timeouts are memoised too: a later synchronous read must not
+            # redo the same oversized parse on the event loop.
+            with self._lock:
+                self._memo[key] = (False, exc)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            if not pending.done():
+                pending.set_result(None)
+        return self._unwrap(key)
+
+    # ------------------------------------------------------------------
+    # Page count / text layers
+    # ------------------------------------------------------------------
+
+    @property
+    def page_count(self) -> int:
+        try:
+            return self._memoised("page_count", lambda: pdf_workers.pdf_page_count(self.content))
+        except Exception:
+            return 0
+
+    async def page_count_async(self) -> int:
+        try:
+            return await self._memoised_async("page_count", "pdf_page_count", pdf_workers.pdf_page_count, self.content)
+        except Exception:
+            return 0
+
+    @property
+    def native_text(self) -> str:
+        """pdfminer text layer. Raises the pdfminer error when parsing fails."""
+        return self._memoised("native_text", lambda: pdf_workers.pdfminer_text(self.content))
+
+    async def native_text_async(self) -> str:
+        return await self._memoised_async("native_text", "pdfminer_text", pdf_workers.pdfminer_text, self.content)
+
+    @property
+    def page_texts(self) -> List[str]:
+        """pdfminer text split per page (index 0 is page 1)."""
+        return _split_pdfminer_pages(self.native_text)
+
+    @property
+    def pypdf_page_texts(self) -> List[str]:
+        """PyPDF2 text per page; pages that fail to extract yield ``""``."""
+        return self._memoised("pypdf_page_texts", lambda: pdf_workers.pypdf_page_texts(self.content))
+
+    async def pypdf_page_texts_async(self) -> List[str]:
+        return await self._memoised_async(
+            "pypdf_page_texts",
+            "pypdf_text",
+            pdf_workers.pypdf_page_texts,
+            self.content,
+        )
+
+    @property
+    def pypdf_text(self) -> str:
+        return "\n".join(self.pypdf_page_texts)
+
+    async def pypdf_text_async(self) -> str:
+        return "\n".join(await self.pypdf_page_texts_async())
+
+    @staticmethod
+    def _join_pypdf_pages(pages: List[str], pypdf_page_limit: Optional[int]) -> str:
+        if pypdf_page_limit is not None:
+            pages = pages[:pypdf_page_limit]
+        return "\n".join(chunk for chunk in pages if chunk.strip()).strip()
+
+    def best_native_text(self, *, pypdf_page_limit: Optional[int] = 20) -> str:
+        """pdfminer text, falling back to PyPDF2 when pdfminer cannot parse.
+
+        Returns ``""`` when neither text layer is available (scans, encrypted
+        or non-PDF input).
+        """
+        try:
+            return self.native_text.strip()
+        except Exception:
+            pass
+        try:
+            return self._join_pypdf_pages(self.pypdf_page_texts, pypdf_page_limit)
+        except Exception:
+            return ""
+
+    async def best_native_text_async(self, *, pypdf_page_limit: Optional[int] = 20) -> str:
+        try:
+            return (await self.native_text_async()).strip()
+        except Exception:
+            pass
+        try:
+            return self._join_pypdf_pages(await self.pypdf_page_texts_async(), pypdf_page_limit)
+        except Exception:
+            return ""
+
+    # ------------------------------------------------------------------
+    # Page images
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _render_key(dpi: int, output_format: str, max_pages: Optional[int], quality: int, optimize: bool) -> _RenderKey:
+        return (int(dpi), _save_format(output_format), max_pages, int(quality), bool(optimize))
+
+    def _store_renders(
+        self,
+        encoded: Dict[str, List[bytes]],
+        *,
+        dpi: int,
+        max_pages: Optional[int],
+        quality: int,
+        optimize: bool,
+    ) -> None:
+        with self._lock:
+            for fmt, pages in encoded.items():
+                key = ("render", self._render_key(dpi, fmt, max_pages, quality, optimize))
+                self._memo.setdefault(key, (True, list(pages)))
+
+    def _store_render_failure(
+        self,
+        exc: Exception,
+        formats: Sequence[str],
+        *,
+        dpi: int,
+        max_pages: Optional[int],
+        quality: int,
+        optimize: bool,
+    ) -> None:
+        with self._lock:
+            for fmt in formats:
+                key = ("render", self._render_key(dpi, fmt, max_pages, quality, optimize))
+                self._memo.setdefault(key, (False, exc))
+
+    def render_page_formats(
+        self,
+        *,
+        dpi: int,
+        formats: Sequence[str] = ("PNG",),
+        max_pages: Optional[int] = None,
+        quality: int = 90,
+        optimize: bool = False,
+    ) -> Dict[str, List[bytes]]:
+        """Encoded page images per format; missing formats share one rasterisation."""
+        wanted = [_save_format(fmt) for fmt in formats]
+        with self._lock:
+            missing = [
+                fmt for fmt in wanted
+                if ("render", self._render_key(dpi, fmt, max_pages, quality, optimize)) not in self._memo
+            ]
+            if missing:
+                try:
+                    encoded = pdf_workers.render_pdf_pages(self.content, dpi, tuple(missing), max_pages, quality, optimize)
+                except Exception as exc:  # noqa: BLE001 - memoised, re-raised below
+                    self._store_render_failure(exc, missing, dpi=dpi, max_pages=max_pages, quality=quality, optimize=optimize)
+                else:
+                    self._store_renders(encoded, dpi=dpi, max_pages=max_pages, quality=quality, optimize=optimize)
+            return {
+                fmt: list(self._unwrap(("render", self._render_key(dpi, fmt, max_pages, quality, optimize))))
+                for fmt in wanted
+            }
+
+    async def render_page_formats_async(
+        self,
+        *,
+        dpi: int,
+        formats: Sequence[str] = ("PNG",),
+        max_pages: Optional[int] = None,
+        quality: int = 90,
+        optimize: bool = False,
+    ) -> Dict[str, List[bytes]]:
+        from app.utils.cpu_pool import run_cpu_bound
+
+        wanted = [_save_format(fmt) for fmt in formats]
+        with self._lock:
+            missing = [
+                fmt for fmt in wanted
+                if ("render", self._render_key(dpi, fmt, max_pages, quality, optimize)) not in self._memo
+            ]
+        if missing:
+            try:
+                encoded = await run_cpu_bound(
+                    pdf_workers.render_pdf_pages,
+                    self.content,
+                    dpi,
+                    tuple(missing),
+                    max_pages,
+                    quality,
+                    optimize,
+                    task="render_pdf_pages",
+                )
+            except Exception as exc:  # noqa: BLE001 - memoised, re-raised below
+                self._store_render_failure(exc, missing, dpi=dpi, max_pages=max_pages, quality=quality, optimize=optimize)
+                encoded = {}
+            else:
+                self._store_renders(encoded, dpi=dpi, max_pages=max_pages, quality=quality, optimize=optimize)
+            logger.debug(
+                "parsed_document.render file=%s dpi=%s formats=%s pages=%s",
+                self.filename,
+                dpi,
+                ",".join(missing),
+                len(next(iter(encoded.values()), [])),
+            )
+        with self._lock:
+            return {
+                fmt: list(self._unwrap(("render", self._render_key(dpi, fmt, max_pages, quality, optimize))))
+                for fmt in wanted
+            }
+
+    def render_pages(
+        self,
+        *,
+        dpi: int,
+        output_format: str = "PNG",
+        max_pages: Optional[int] = None,
+        quality: int = 90,
+        optimize: bool = False,
+    ) -> List[bytes]:
+        """Return encoded page images, rendering them on first use."""
+        fmt = _save_format(output_format)
+        return self.render_page_formats(
+            dpi=dpi, formats=(fmt,), max_pages=max_pages, quality=quality, optimize=optimize
+        )[fmt]
+
+    async def render_pages_async(
+        self,
+        *,
+        dpi: int,
+        output_format: str = "PNG",
+        max_pages: Optional[int] = None,
+        quality: int = 90,
+        optimize: bool = False,
+    ) -> List[bytes]:
+        fmt = _save_format(output_format)
+        rendered = await self.render_page_formats_async(
+            dpi=dpi, formats=(fmt,), max_pages=max_pages, quality=quality, optimize=optimize
+        )
+        return rendered[fmt]
+
+    def _rendered_page(self, dpi: int, output_format: str, page_index: int) -> Optional[bytes]:
+        """Page ``page_index`` (1-based) from an already memoised full render, if any."""
+        with self._lock:
+            entry = self._memo.get(("render", self._render_key(dpi, output_format, None, 90, False)))
+        if entry is None or not entry[0]:
+            return None
+        pages = entry[1]
+        return pages[page_index - 1] if 0 < page_index <= len(pages) else None
+
+    def render_page(self, *, dpi: int, page_index: int, output_format: str = "PNG") -> bytes:
+        """One encoded page image (1-based ``page_index``), rendered on first use."""
+        fmt = _save_format(output_format)
+        rendered = self._rendered_page(dpi, fmt, page_index)
+        if rendered is not None:
+            return rendered
+        return self._memoised(
+            ("page", int(dpi), fmt, int(page_index)),
+            lambda: pdf_workers.render_pdf_page(self.content, dpi, page_index, fmt),
+        )
+
+    async def render_page_async(self, *, dpi: int, page_index: int, output_format: str = "PNG") -> bytes:
+        fmt = _save_format(output_format)
+        rendered = self._rendered_page(dpi, fmt, page_index)
+        if rendered is not None:
+            return rendered
+        return await self._memoised_async(
+            ("page", int(dpi), fmt, int(page_index)),
+            "render_pdf_page",
+            pdf_workers.render_pdf_page,
+            self.content,
+            dpi,
+            page_index,
+            fmt,
+        )
+
+    def render_tiff(self, *, dpi: int) -> Tuple[bytes, int]:
+        """All pages as one multi-page TIFF plus the rendered page count."""
+        return self._memoised(("tiff", int(dpi)), lambda: pdf_workers.render_pdf_tiff(self.content, dpi))
+
+    async def render_tiff_async(self, *, dpi: int) -> Tuple[bytes, int]:
+        return await self._memoised_async(("tiff", int(dpi)), "render_pdf_tiff", pdf_workers.render_pdf_tiff, self.content, dpi)
+
+    def normalized_image(self, *, dpi: int, output_format: str) -> bytes:
+        """Image upload re-encoded (EXIF transpose, RGB) in ``output_format``."""
+        fmt = _save_format(output_format)
+        return self._memoised(
+            ("image", int(dpi), fmt),
+            lambda: pdf_workers.normalize_image_bytes(self.content, dpi, fmt),
+        )
+
+    async def normalized_image_async(self, *, dpi: int, output_format: str) -> bytes:
+        fmt = _save_format(output_format)
+        return await self._memoised_async(
+            ("image", int(dpi), fmt),
+            "normalize_image",
+            pdf_workers.normalize_image_bytes,
+            self.content,
+            dpi,
+            fmt,
+        )
+
+
+def ensure_parsed_document(
+    parsed_document: Optional[ParsedDocument],
+    file_bytes: Optional[bytes],
+    *,
+    filename: Optional[str] = None,
+    content_type: Optional[str] = None,
+) -> Optional[ParsedDocument]:
+    """Return ``parsed_document`` when it matches ``file_bytes``, else build one."""
+    if parsed_document is not None and (file_bytes is None or parsed_document.content is file_bytes or parsed_document.content == file_bytes):
+        return parsed_document
+    if not file_bytes:
+        return None
+    return ParsedDocument.from_bytes(file_bytes, filename=filename, content_type=content_type)
+
+
+__all__ = ["ParsedDocument", "ensure_parsed_document"]
@@ -24,11 +24,32 @@ import yaml
 from app.reference_data.ports import get_port_registry
 from app.reference_data.currencies import get_currency_registry
 from app.reference_data.countries import get_country_registry
+from app.utils.regex_registry import register_pattern
 
 logger = logging.getLogger(__name__)
 
 _LOCALE_PROFILES_DIR = Path(__file__).resolve().parents[2] / "config" / "extraction_profiles" / "locale"
 
+# Stage 2 field validation patterns.
+_LC_NUMBER_RE = register_pattern("field_validator", "lc_number", r'^[A-Z0-9/-]{5,35}$', re.I)
+_LC_NUMBER_UNUSUAL_CHAR_RE = register_pattern("field_validator", "lc_number_unusual_char", r'[^A-Z0-9/-]', re.I)
+_AMOUNT_NOISE_RE = register_pattern("field_validator", "amount_noise", r'[^\d.]')
+_DATE_LABEL_PREFIX_RE = register_pattern("field_validator", "date_label_prefix", r"^[A-Z ]{2,40}[:#-]*\s*")
+_DATE_YYMMDD_PLACE_RE = register_pattern("field_validator", "date_yymmdd_place", r"(\d{6})([A-Z]{3,})$")
+_DATE_TRAILING_WORD_RE = register_pattern("field_validator", "date_trailing_word", r"\s+[A-Z]{3,}$")
+_DATE_YYMMDD_RE = register_pattern("field_validator", "date_yymmdd", r"\d{6}")
+_SWIFT_CODE_RE = register_pattern("field_validator", "swift_code", r'^[A-Z]{4}[A-Z]{2}[A-Z0-9]{2}([A-Z0-9]{3})?$')
+_DIGITS_ONLY_RE = register_pattern("field_validator", "digits_only", r'^[0-9]+$')
+_HS_CODE_RE = register_pattern("field_validator", "hs_code", r'\b\d{4,6}\.\d{2}\b')
+_NON_DIGIT_RE = register_pattern("field_validator", "non_digit", r"[^0-9]")
+_WEIGHT_RE = register_pattern(
+    "field_validator",
+    "weight",
+    r"([0-9][0-9,\.]*)\s*(KG|KGS|LB|LBS|MT|TON|TONS|TONNE|TONNES)?",
+    re.I,
+)
+_TAX_ID_RE = register_pattern("field_validator", "tax_id", r"^[0-9\-\s]{6,24}$")
+
 
 def _load_locale_profile(locale: str) -> Dict[str, Any]:
     requested = (locale or "").strip().lower() or "global_default"
@@ -159,12 +180,12 @@ class FieldValidator:
             return 0.5, issues
         
         # Check for common patterns
-        if re.match(r'^[A-Z0-9/-]{5,35}$', value, re.I):
+        if _LC_NUMBER_RE.match(value):
             field.normalized_value = value.upper()
             return 1.0, []
         
         # Has unusual characters
-        if re.search(r'[^A-Z0-9/-]', value, re.I):
+        if _LC_NUMBER_UNUSUAL_CHAR_RE.search(value):
             issues.append("LC number contains unusual characters")
             return 0.6, issues
         
@@ -180,7 +201,7 @@ class FieldValidator:
             numeric = float(value)
         else:
             # Remove currency symbols, commas, spaces
-            cleaned = re.sub(r'[^\d.]', '', str(value))
+            cleaned = _AMOUNT_NOISE_RE.sub('', str(value))
             try:
                 numeric = float(cleaned)
             except ValueError:
@@ -224,11 +245,11 @@ class FieldValidator:
         value = str(field.raw_value).strip()
         issues = []
         compact = value.upper().strip()
-        compact = re.sub(r"^[A-Z ]{2,40}[:#-]*\s*", "", compact)
-        compact = re.sub(r"(\d{6})([A-Z]{3,})$", r"\1", compact)
-        compact = re.sub(r"\s+[A-Z]{3,}$", "", compact)
+        compact = _DATE_LABEL_PREFIX_RE.sub("", compact)
+        compact = _DATE_YYMMDD_PLACE_RE.sub(r"\1", compact)
+        compact = _DATE_TRAILING_WORD_RE.sub("", compact)
 
-        if re.fullmatch(r"\d{6}", compact):
+        if _DATE_YYMMDD_RE.fullmatch(compact):
             yy, mm, dd = int(compact[:2]), int(compact[2:4]), int(compact[4:6])
             year = 2000 + yy if yy <= 69 else 1900 + yy
             try:
@@ -320,7 +341,7 @@ class FieldValidator:
             return 0.3, issues
         
         # Format: AAAABBCC or AAAABBCCDDD
-        if not re.match(r'^[A-Z]{4}[A-Z]{2}[A-Z0-9]{2}([A-Z0-9]{3})?$', value):
+        if not _SWIFT_CODE_RE.match(value):
             issues.append("Invalid SWIFT code format")
             return 0.4, issues
         
@@ -341,7 +362,7 @@ class FieldValidator:
             return 0.6, issues
         
         # Check for suspicious patterns
-        if re.match(r'^[0-9]+$', value):
+        if _DIGITS_ONLY_RE.match(value):
             issues.append("Party name appears to be only numbers")
             return 0.1, issues
         
@@ -358,7 +379,7 @@ class FieldValidator:
             return 0.3, issues
         
         # Check for HS code (good sign)
-        if re.search(r'\b\d{4,6}\.\d{2}\b', value):
+        if _HS_CODE_RE.search(value):
             field.normalized_value = value
             return 1.0, []
         
@@ -371,7 +392,7 @@ class FieldValidator:
         issues: List[str] = []
         
         try:
-            qty = int(re.sub(r"[^0-9]", "", str(value)))
+            qty = int(_NON_DIGIT_RE.sub("", str(value)))
         except ValueError:
             issues.append("Cannot parse quantity")
             return 0.0, issues
@@ -391,7 +412,7 @@ class FieldValidator:
         if not value:
             return 0.0, ["Empty weight"]
         
-        match = re.search(r"([0-9][0-9,\.]*)\s*(KG|KGS|LB|LBS|MT|TON|TONS|TONNE|TONNES)?", value, re.I)
+        match = _WEIGHT_RE.search(value)
         if not match:
             issues.append("Cannot parse weight")
             return 0.0, issues
@@ -423,7 +444,7 @@ class FieldValidator:
             return 0.0, ["Empty tax ID"]
 
         # Allow digits with optional hyphens/spaces
-        if not re.match(r"^[0-9\-\s]{6,24}$", value):
+        if not _TAX_ID_RE.match(value):
             issues.append("Tax ID contains invalid characters")
             return 0.3, issues
 
@@ -431,7 +452,7 @@ class FieldValidator:
         min_digits = int((tax_profile or {}).get("min_digits", 6))
         max_digits = int((tax_profile or {}).get("max_digits", 20))
 
-        digits = re.sub(r"[^0-9]", "", value)
+        digits = _NON_DIGIT_RE.sub("", value)
         if len(digits) < min_digits:
             issues.append(f"Tax ID too short for locale (min {min_digits} digits)")
             return 0.4, issues
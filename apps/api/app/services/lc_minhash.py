@@ -0,0 +1,111 @@
+"""
+MinHash / LSH fingerprints for LC duplicate detection.
+
+Each fingerprint is turned into a set of shingles: character trigrams of the
+LC number (so a one-character typo still shares most of them), word tokens
+and trigrams of the party and bank names, exact tokens for amount, currency,
+dates and ports, and word bigrams of the goods text. The MinHash signature
+estimates the Jaccard similarity of two shingle sets, and its bands are
+stored as lookup keys (``lc_fingerprint_bands``), so candidates are the
+fingerprints that share at least one band instead of a scan over history.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import random
+from typing import Any, Dict, List, Optional, Sequence
+
+# 32 bands of 4 rows: pairs with Jaccard ~0.5 collide in at least one band
+# with probability ~0.88, pairs under ~0.2 rarely do.
+NUM_PERMUTATIONS = 128
+BAND_ROWS = 4
+NUM_BANDS = NUM_PERMUTATIONS // BAND_ROWS
+# Bump when shingling or hashing changes; band keys of older versions never collide.
+SIGNATURE_VERSION = 1
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+_rng = random.Random(0x1C0FFEE)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_TRIGRAM_FIELDS = ("lc_number", "client_name", "beneficiary_name", "issuing_bank")
+_EXACT_FIELDS = (
+    "amount",
+    "currency",
+    "expiry_date",
+    "shipment_date",
+    "port_of_loading",
+    "port_of_discharge",
+)
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _compact(value: str) -> str:
+    return "".join(char for char in value.lower() if char.isalnum())
+
+
+def shingles(fingerprint_data: Dict[str, Any]) -> set[str]:
+    """Shingle set of a fingerprint's normalised fields and goods text."""
+    fields = fingerprint_data.get("fields") or {}
+    result: set[str] = set()
+
+    for field in _TRIGRAM_FIELDS:
+        value = str(fields.get(field) or "")
+        if not value:
+            continue
+        compact = _compact(value)
+        padded = f"^{compact}$"
+        result.update(f"{field}:{padded[i:i + 3]}" for i in range(max(1, len(padded) - 2)))
+        if field != "lc_number":
+            result.update(f"{field}:w:{word}" for word in value.lower().split())
+
+    for field in _EXACT_FIELDS:
+        value = str(fields.get(field) or "")
+        if value:
+            result.add(f"{field}:{_compact(value)}")
+
+    goods_words = str(fingerprint_data.get("goods_text") or "").lower().split()
+    result.update(f"goods:{left} {right}" for left, right in zip(goods_words, goods_words[1:]))
+    if len(goods_words) == 1:
+        result.add(f"goods:{goods_words[0]}")
+
+    return result
+
+
+def minhash_signature(shingle_set: set[str]) -> Optional[List[int]]:
+    """MinHash signature of a shingle set (None when there is nothing to hash)."""
+    if not shingle_set:
+        return None
+    hashes = [_hash64(shingle) for shingle in shingle_set]
+    return [
+        min((a * value + b) % _MERSENNE_PRIME for value in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def band_keys(signature: Optional[Sequence[int]]) -> List[str]:
+    """One LSH key per band: ``"<version>:<band>:<hash of the band's rows>"``."""
+    if not signature:
+        return []
+    keys = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * BAND_ROWS:(band + 1) * BAND_ROWS]
+        digest = hashlib.blake2b(
+            ",".join(str(value) for value in rows).encode("ascii"), digest_size=8
+        ).hexdigest()
+        keys.append(f"{SIGNATURE_VERSION}:{band}:{digest}")
+    return keys
+
+
+def estimated_jaccard(left: Optional[Sequence[int]], right: Optional[Sequence[int]]) -> float:
+    """Share of equal signature rows (an estimate of shingle-set Jaccard)."""
+    if not left or not right or len(left) != len(right):
+        return 0.0
+    return sum(1 for a, b in zip(left, right) if a == b) / len(left)
@@ -0,0 +1,234 @@
+"""
+Shared, pooled SDK clients for LLM providers.
+
+Building an ``openai.AsyncOpenAI`` / ``anthropic.AsyncAnthropic`` per call
+creates a new ``httpx`` connection pool each time, so every extraction paid
+for DNS + TCP + TLS and the pool was thrown away afterwards. Instead:
+
+- one SDK client per (provider, API key, base URL) and event loop, backed
+  by a long-lived ``DefaultAsyncHttpxClient`` of that SDK (keep-alive,
+  TCP keepalive socket options) with HTTP/2 when the ``h2`` package is
+  available (``LLM_HTTP2_ENABLED``);
+- per-call timeouts are passed on the request (``request_timeout``), so
+  callers with different budgets share one pool;
+- ``llm_slot(provider)`` bounds concurrent requests per provider
+  (``LLM_PROVIDER_MAX_CONCURRENCY``) and feeds the ``llm_inflight_requests``
+  / ``llm_waiting_requests`` gauges.
+
+Clients are created in the app lifespan (``warm_llm_clients``) or on first
+use, and closed by ``close_llm_clients`` at shutdown. httpx clients are
+bound to the loop that opened their connections, hence the per-loop
+registry.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import logging
+import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from types import ModuleType
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from app.config import settings
+from app.metrics.llm_metrics import (
+    llm_clients_created_total,
+    llm_inflight_requests,
+    llm_slot_wait_seconds,
+    llm_waiting_requests,
+)
+
+logger = logging.getLogger(__name__)
+
+_ClientKey = Tuple[str, str, Optional[str]]
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_ClientKey, Any]]" = weakref.WeakKeyDictionary()
+_http_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_ClientKey, Any]]" = weakref.WeakKeyDictionary()
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = weakref.WeakKeyDictionary()
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _http2_enabled() -> bool:
+    return bool(getattr(settings, "LLM_HTTP2_ENABLED", True)) and importlib.util.find_spec("h2") is not None
+
+
+def _max_concurrency() -> int:
+    return max(1, int(getattr(settings, "LLM_PROVIDER_MAX_CONCURRENCY", 8) or 8))
+
+
+def _sdk_http_module(sdk_name: str) -> Tuple[Any, ModuleType]:
+    """The SDK's default async HTTP client class and the httpx flavour it is built on.
+
+    SDK releases pin different httpx distributions (``httpx`` / ``httpx2``);
+    limits and timeouts must come from the same one.
+    """
+    client_cls = importlib.import_module(sdk_name).DefaultAsyncHttpxClient
+    base = next(cls for cls in client_cls.__mro__ if cls.__name__ == "AsyncClient")
+    return client_cls, importlib.import_module(base.__module__.split(".")[0])
+
+
+def request_timeout(sdk_name: str, timeout: float, read: float) -> Any:
+    """Per-request timeout object for the ``openai`` / ``anthropic`` SDK."""
+    _, http_module = _sdk_http_module(sdk_name)
+    return http_module.Timeout(timeout, read=read)
+
+
+def _build_http_client(sdk_name: str) -> Any:
+    client_cls, http_module = _sdk_http_module(sdk_name)
+    max_connections = max(1, int(getattr(settings, "LLM_HTTP_MAX_CONNECTIONS", 20) or 20))
+    return client_cls(
+        http2=_http2_enabled(),
+        limits=http_module.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max(1, int(getattr(settings, "LLM_HTTP_MAX_KEEPALIVE", 10) or 10)),
+            keepalive_expiry=float(getattr(settings, "LLM_HTTP_KEEPALIVE_EXPIRY_SEC", 60) or 60),
+        ),
+        # Per-request timeouts override this default.
+        timeout=http_module.Timeout(30.0, read=120.0),
+    )
+
+
+def _loop_registry(registry: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Any, Any]]") -> Dict[Any, Any]:
+    loop = asyncio.get_running_loop()
+    entries = registry.get(loop)
+    if entries is None:
+        entries = {}
+        registry[loop] = entries
+    return entries
+
+
+def _get_client(key: _ClientKey, sdk_name: str, factory) -> Any:
+    clients = _loop_registry(_clients)
+    client = clients.get(key)
+    if client is None:
+        http_client = _build_http_client(sdk_name)
+        _loop_registry(_http_clients)[key] = http_client
+        client = factory(http_client)
+        clients[key] = client
+        llm_clients_created_total.labels(provider=key[0]).inc()
+        logger.info("llm_clients.created provider=%s http2=%s", key[0], _http2_enabled())
+    return client
+
+
+def get_openai_client(provider: str, api_key: str, base_url: Optional[str] = None) -> Any:
+    """Shared ``openai.AsyncOpenAI`` for OpenAI or an OpenAI-compatible provider (OpenRouter)."""
+    import openai
+
+    return _get_client(
+        (provider, api_key, base_url),
+        "openai",
+        lambda http_client: openai.AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client),
+    )
+
+
+def get_anthropic_client(api_key: str) -> Any:
+    """Shared ``anthropic.AsyncAnthropic``."""
+    import anthropic
+
+    return _get_client(
+        ("anthropic", api_key, None),
+        "anthropic",
+        lambda http_client: anthropic.AsyncAnthropic(api_key=api_key, http_client=http_client),
+    )
+
+
+def _bump(provider: str, key: str, delta: int) -> None:
+    with _stats_lock:
+        provider_stats = _stats.setdefault(provider, {"inflight": 0, "waiting": 0, "completed": 0})
+        provider_stats[key] = provider_stats.get(key, 0) + delta
+
+
+@asynccontextmanager
+async def llm_slot(provider: str) -> AsyncIterator[None]:
+    """Hold one of the provider's concurrency slots for the duration of a request."""
+    semaphores = _loop_registry(_semaphores)
+    semaphore = semaphores.get(provider)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_max_concurrency())
+        semaphores[provider] = semaphore
+
+    wait_started = time.perf_counter()
+    llm_waiting_requests.labels(provider=provider).inc()
+    _bump(provider, "waiting", 1)
+    try:
+        await semaphore.acquire()
+    finally:
+        llm_waiting_requests.labels(provider=provider).dec()
+        _bump(provider, "waiting", -1)
+    llm_slot_wait_seconds.labels(provider=provider).observe(time.perf_counter() - wait_started)
+
+    llm_inflight_requests.labels(provider=provider).inc()
+    _bump(provider, "inflight", 1)
+    try:
+        yield
+    finally:
+        semaphore.release()
+        llm_inflight_requests.labels(provider=provider).dec()
+        _bump(provider, "inflight", -1)
+        _bump(provider, "completed", 1)
+
+
+def warm_llm_clients() -> None:
+    """Create clients for every configured provider (called from the app lifespan)."""
+    openrouter_key = os.getenv("OPENROUTER_API_KEY")
+    if openrouter_key:
+        try:
+            get_openai_client(
+                "openrouter",
+                openrouter_key,
+                os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1"),
+            )
+        except ImportError:
+            pass
+    openai_key = os.getenv("OPENAI_API_KEY")
+    if openai_key:
+        try:
+            get_openai_client("openai", openai_key)
+        except ImportError:
+            pass
+    anthropic_key = os.getenv("ANTHROPIC_API_KEY")
+    if anthropic_key:
+        try:
+            get_anthropic_client(anthropic_key)
+        except ImportError:
+            pass
+
+
+async def close_llm_clients() -> None:
+    """Close the pooled connections of the running loop's clients (app shutdown)."""
+    loop = asyncio.get_running_loop()
+    http_clients = _http_clients.pop(loop, {}) or {}
+    _clients.pop(loop, None)
+    for http_client in http_clients.values():
+        try:
+            await http_client.aclose()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("llm_clients.close_failed: %s", exc)
+
+
+def llm_client_stats() -> Dict[str, Any]:
+    """Per-provider in-flight/waiting counts for diagnostics endpoints."""
+    with _stats_lock:
+        providers = {name: dict(values) for name, values in _stats.items()}
+    return {
+        "http2": _http2_enabled(),
+        "max_concurrency_per_provider": _max_concurrency(),
+        "providers": providers,
+    }
+
+
+__all__ = [
+    "close_llm_clients",
+    "get_anthropic_client",
+    "get_openai_client",
+    "llm_client_stats",
+    "llm_slot",
+    "request_timeout",
+    "warm_llm_clients",
+]
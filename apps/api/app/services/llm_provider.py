@@ -13,6 +13,8 @@ from abc import ABC, abstractmethod
 from enum import Enum
 from dataclasses import dataclass, field
 
+from app.services.llm_clients import get_anthropic_client, get_openai_client, llm_slot, request_timeout
+
 logger = logging.getLogger(__name__)
 
 
@@ -85,16 +87,9 @@ class OpenRouterProvider(LLMProviderInterface):
     ) -> Tuple[str, int, int]:
         """Generate using OpenRouter API."""
         try:
-            import openai
-
-            # Configure timeout (20s total, 60s read timeout)
-            import httpx
-            timeout = httpx.Timeout(20.0, read=60.0)
-            client = openai.AsyncOpenAI(
-                api_key=self.api_key,
-                base_url=self.base_url,
-                timeout=timeout,
-            )
+            # Per-request timeout (20s total, 60s read) on the shared pooled client
+            timeout = request_timeout("openai", 20.0, read=60.0)
+            client = get_openai_client(LLMProvider.OPENROUTER.value, self.api_key, self.base_url)
 
             messages = []
             if system_prompt:
@@ -107,13 +102,15 @@ class OpenRouterProvider(LLMProviderInterface):
             kwargs.pop("layer", None)
             model_name = self._normalize_model(model_override or self.model)
 
-            response = await client.chat.completions.create(
-                model=model_name,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                **kwargs,
-            )
+            async with llm_slot(LLMProvider.OPENROUTER.value):
+                response = await client.chat.completions.create(
+                    model=model_name,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    timeout=timeout,
+                    **kwargs,
+                )
 
             output_text = response.choices[0].message.content or ""
             tokens_in = response.usage.prompt_tokens
@@ -155,15 +152,12 @@ class OpenAIProvider(LLMProviderInterface):
     ) -> Tuple[str, int, int]:
         """Generate using OpenAI API."""
         try:
-            import openai
-            
             if not self.api_key:
                 raise ValueError("OpenAI API key not configured")
             
-            # Configure timeout for OpenAI client (20s total, 60s read timeout)
-            import httpx
-            timeout = httpx.Timeout(20.0, read=60.0)
-            client = openai.AsyncOpenAI(api_key=self.api_key, timeout=timeout)
+            # Per-request timeout (20s total, 60s read) on the shared pooled client
+            timeout = request_timeout("openai", 20.0, read=60.0)
+            client = get_openai_client(LLMProvider.OPENAI.value, self.api_key)
             
             messages = []
             if system_prompt:
@@ -173,13 +167,15 @@ class OpenAIProvider(LLMProviderInterface):
             model_override = kwargs.pop("model_override", None)
             model_name = model_override or self.model
 
-            response = await client.chat.completions.create(
-                model=model_name,
-                messages=messages,
-                max_tokens=max_tokens,
-                temperature=temperature,
-                **kwargs
-            )
+            async with llm_slot(LLMProvider.OPENAI.value):
+                response = await client.chat.completions.create(
+                    model=model_name,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    timeout=timeout,
+                    **kwargs
+                )
             
             output_text = response.choices[0].message.content or ""
             tokens_in = response.usage.prompt_tokens
@@ -222,28 +218,27 @@ class AnthropicProvider(LLMProviderInterface):
     ) -> Tuple[str, int, int]:
         """Generate using Anthropic API."""
         try:
-            import anthropic
-            
             if not self.api_key:
                 raise ValueError("Anthropic API key not configured")
             
-            # Configure timeout for Anthropic client (20s total, 60s read timeout)
-            import httpx
-            timeout = httpx.Timeout(20.0, read=60.0)
-            client = anthropic.AsyncAnthropic(api_key=self.api_key, timeout=timeout)
+            # Per-request timeout (20s total, 60s read) on the shared pooled client
+            timeout = request_timeout("anthropic", 20.0, read=60.0)
+            client = get_anthropic_client(self.api_key)
             
             # Anthropic uses system parameter separately
             model_override = kwargs.pop("model_override", None)
             model_name = model_override or self.model
 
-            response = await client.messages.create(
-                model=model_name,
-                system=system_prompt or "",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature,
-                **kwargs
-            )
+            async with llm_slot(LLMProvider.ANTHROPIC.value):
+                response = await client.messages.create(
+                    model=model_name,
+                    system=system_prompt or "",
+                    messages=[{"role": "user", "content": prompt}],
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    timeout=timeout,
+                    **kwargs
+                )
             
             output_text = response.content[0].text if response.content else ""
             
@@ -313,12 +308,13 @@ class GeminiProvider(LLMProviderInterface):
                 temperature=temperature,
             )
             
-            # Generate response
-            response = await asyncio.to_thread(
-                model.generate_content,
-                prompt,
-                generation_config=generation_config,
-            )
+            # Generate response (the Gemini SDK is sync; still bounded per provider)
+            async with llm_slot(LLMProvider.GEMINI.value):
+                response = await asyncio.to_thread(
+                    model.generate_content,
+                    prompt,
+                    generation_config=generation_config,
+                )
             
             output_text = response.text if response.text else ""
             
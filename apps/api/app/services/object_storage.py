@@ -0,0 +1,388 @@
+"""
+Non-blocking object storage for generated and uploaded documents.
+
+boto3 is synchronous; calling ``put_object`` or ``Body.read()`` from a
+coroutine stalls the event loop for the whole transfer. Every blocking call
+here runs on a dedicated thread pool of ``DOCUMENT_STORAGE_MAX_CONCURRENCY``
+workers. That caps concurrent transfers per process without tying up the
+default executor used by ``asyncio.to_thread`` and sync endpoints.
+
+- ``S3ObjectStorage`` uses the shared client from ``app.utils.s3_client``.
+  Bodies of at least ``DOCUMENT_STORAGE_MULTIPART_THRESHOLD_MB`` (and file
+  objects of any size) go through ``upload_fileobj``, which streams them as
+  a multipart upload instead of holding one request body in memory.
+- ``LocalObjectStorage`` keeps objects under ``DOCUMENT_STORAGE_LOCAL_ROOT``
+  with a JSON metadata sidecar, for tests and local development.
+
+Both support ranged reads (``byte_range=(start, end)``, inclusive like an
+HTTP Range) and chunked streaming. Missing objects raise FileNotFoundError.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+Body = Union[bytes, BinaryIO]
+ByteRange = Tuple[int, Optional[int]]
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+_executor_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _storage_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = max(1, int(getattr(settings, "DOCUMENT_STORAGE_MAX_CONCURRENCY", 8) or 1))
+                _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="object-storage")
+    return _executor
+
+
+async def _run(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_storage_executor(), partial(func, *args, **kwargs))
+
+
+def _range_header(byte_range: Optional[ByteRange]) -> Optional[str]:
+    if byte_range is None:
+        return None
+    start, end = byte_range
+    if start < 0 or (end is not None and end < start):
+        raise ValueError(f"Invalid byte range: {byte_range}")
+    return f"bytes={start}-{'' if end is None else end}"
+
+
+class ObjectStorage(ABC):
+    """Async object store used by :class:`DocumentStorageService`."""
+
+    @abstractmethod
+    async def put(
+        self,
+        key: str,
+        body: Body,
+        *,
+        content_type: str,
+        content_disposition: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Store ``body`` (bytes or a readable binary file object) under ``key``."""
+
+    @abstractmethod
+    async def get(self, key: str, *, byte_range: Optional[ByteRange] = None) -> Tuple[bytes, Dict[str, str]]:
+        """Return ``(data, metadata)``, optionally for a byte range only."""
+
+    @abstractmethod
+    def stream(
+        self,
+        key: str,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        byte_range: Optional[ByteRange] = None,
+    ) -> AsyncIterator[bytes]:
+        """Yield the object (or a byte range of it) in chunks."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Delete ``key``; deleting a missing key is not an error."""
+
+    @abstractmethod
+    async def list(self, prefix: str) -> List[Dict[str, Any]]:
+        """``{"key", "size", "last_modified"}`` for every key under ``prefix``."""
+
+    @abstractmethod
+    async def presigned_url(
+        self,
+        key: str,
+        *,
+        expires_in: int = 3600,
+        response_content_disposition: Optional[str] = None,
+    ) -> str:
+        """A time-limited download URL for ``key``."""
+
+
+class S3ObjectStorage(ObjectStorage):
+    """S3 (or S3-compatible) bucket behind the shared boto3 client."""
+
+    def __init__(self, bucket: str, client_factory: Optional[Callable[[], Any]] = None):
+        self.bucket = bucket
+        self._client_factory = client_factory
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            if self._client_factory is not None:
+                self._client = self._client_factory()
+            else:
+                from app.utils.s3_client import get_s3_client
+                self._client = get_s3_client()
+        return self._client
+
+    @staticmethod
+    def _multipart_threshold() -> int:
+        return max(5, int(getattr(settings, "DOCUMENT_STORAGE_MULTIPART_THRESHOLD_MB", 8) or 8)) * 1024 * 1024
+
+    @staticmethod
+    def _not_found(exc: Exception) -> bool:
+        code = str(getattr(exc, "response", {}).get("Error", {}).get("Code", ""))
+        return code in ("NoSuchKey", "404", "NotFound")
+
+    def _put_sync(self, key: str, body: Body, extra_args: Dict[str, Any]) -> None:
+        threshold = self._multipart_threshold()
+        if isinstance(body, (bytes, bytearray)) and len(body) < threshold:
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=bytes(body), **extra_args)
+            return
+        from boto3.s3.transfer import TransferConfig
+
+        fileobj = BytesIO(body) if isinstance(body, (bytes, bytearray)) else body
+        transfer = TransferConfig(multipart_threshold=threshold, multipart_chunksize=threshold, max_concurrency=4)
+        self.client.upload_fileobj(fileobj, self.bucket, key, ExtraArgs=extra_args, Config=transfer)
+
+    async def put(
+        self,
+        key: str,
+        body: Body,
+        *,
+        content_type: str,
+        content_disposition: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> None:
+        extra_args: Dict[str, Any] = {"ContentType": content_type, "Metadata": dict(metadata or {})}
+        if content_disposition:
+            extra_args["ContentDisposition"] = content_disposition
+        await _run(self._put_sync, key, body, extra_args)
+
+    def _get_object(self, key: str, byte_range: Optional[ByteRange]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"Bucket": self.bucket, "Key": key}
+        header = _range_header(byte_range)
+        if header:
+            params["Range"] = header
+        try:
+            return self.client.get_object(**params)
+        except Exception as exc:
+            if self._not_found(exc):
+                raise FileNotFoundError(f"Object not found: {key}") from exc
+            raise
+
+    def _get_sync(self, key: str, byte_range: Optional[ByteRange]) -> Tuple[bytes, Dict[str, str]]:
+        response = self._get_object(key, byte_range)
+        body = response["Body"]
+        try:
+            return body.read(), response.get("Metadata", {})
+        finally:
+            body.close()
+
+    async def get(self, key: str, *, byte_range: Optional[ByteRange] = None) -> Tuple[bytes, Dict[str, str]]:
+        return await _run(self._get_sync, key, byte_range)
+
+    async def stream(
+        self,
+        key: str,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        byte_range: Optional[ByteRange] = None,
+    ) -> AsyncIterator[bytes]:
+        response = await _run(self._get_object, key, byte_range)
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await _run(body.read, chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+
+    async def delete(self, key: str) -> None:
+        await _run(self.client.delete_object, Bucket=self.bucket, Key=key)
+
+    def _list_sync(self, prefix: str) -> List[Dict[str, Any]]:
+        objects: List[Dict[str, Any]] = []
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                objects.append({"key": obj["Key"], "size": obj["Size"], "last_modified": obj["LastModified"]})
+        return objects
+
+    async def list(self, prefix: str) -> List[Dict[str, Any]]:
+        return await _run(self._list_sync, prefix)
+
+    async def presigned_url(
+        self,
+        key: str,
+        *,
+        expires_in: int = 3600,
+        response_content_disposition: Optional[str] = None,
+    ) -> str:
+        params: Dict[str, Any] = {"Bucket": self.bucket, "Key": key}
+        if response_content_disposition:
+            params["ResponseContentDisposition"] = response_content_disposition
+        # Signing is local CPU work; no need for the transfer pool.
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=expires_in)
+
+
+class LocalObjectStorage(ObjectStorage):
+    """Objects as files under ``root``; metadata in ``<file>.meta.json``."""
+
+    _META_SUFFIX = ".meta.json"
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root).resolve()
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key.lstrip("/")).resolve()
+        if self.root not in path.parents:
+            raise ValueError(f"Object key escapes the storage root: {key}")
+        return path
+
+    def _meta_path(self, path: Path) -> Path:
+        return path.with_name(path.name + self._META_SUFFIX)
+
+    def _put_sync(self, key: str, body: Body, meta: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial_path = path.with_name(path.name + ".part")
+        with open(partial_path, "wb") as handle:
+            if isinstance(body, (bytes, bytearray)):
+                handle.write(body)
+            else:
+                while True:
+                    chunk = body.read(DEFAULT_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    handle.write(chunk)
+        os.replace(partial_path, path)
+        self._meta_path(path).write_text(json.dumps(meta), encoding="utf-8")
+
+    async def put(
+        self,
+        key: str,
+        body: Body,
+        *,
+        content_type: str,
+        content_disposition: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+    ) -> None:
+        meta = {
+            "content_type": content_type,
+            "content_disposition": content_disposition,
+            "metadata": dict(metadata or {}),
+        }
+        await _run(self._put_sync, key, body, meta)
+
+    def _open(self, key: str) -> Tuple[BinaryIO, Path]:
+        path = self._path(key)
+        try:
+            return open(path, "rb"), path
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Object not found: {key}") from None
+
+    def _get_sync(self, key: str, byte_range: Optional[ByteRange]) -> Tuple[bytes, Dict[str, str]]:
+        _range_header(byte_range)  # validates
+        handle, path = self._open(key)
+        with handle:
+            if byte_range is None:
+                data = handle.read()
+            else:
+                start, end = byte_range
+                handle.seek(start)
+                data = handle.read() if end is None else handle.read(end - start + 1)
+        meta_path = self._meta_path(path)
+        metadata = json.loads(meta_path.read_text(encoding="utf-8")).get("metadata", {}) if meta_path.exists() else {}
+        return data, metadata
+
+    async def get(self, key: str, *, byte_range: Optional[ByteRange] = None) -> Tuple[bytes, Dict[str, str]]:
+        return await _run(self._get_sync, key, byte_range)
+
+    async def stream(
+        self,
+        key: str,
+        *,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        byte_range: Optional[ByteRange] = None,
+    ) -> AsyncIterator[bytes]:
+        _range_header(byte_range)
+        handle, _ = await _run(self._open, key)
+        try:
+            start, end = byte_range if byte_range is not None else (0, None)
+            await _run(handle.seek, start)
+            remaining = None if end is None else end - start + 1
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await _run(handle.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            handle.close()
+
+    def _delete_sync(self, key: str) -> None:
+        path = self._path(key)
+        for candidate in (path, self._meta_path(path)):
+            candidate.unlink(missing_ok=True)
+
+    async def delete(self, key: str) -> None:
+        await _run(self._delete_sync, key)
+
+    def _list_sync(self, prefix: str) -> List[Dict[str, Any]]:
+        objects: List[Dict[str, Any]] = []
+        if not self.root.exists():
+            return objects
+        for path in self.root.rglob("*"):
+            if not path.is_file() or path.name.endswith((self._META_SUFFIX, ".part")):
+                continue
+            key = path.relative_to(self.root).as_posix()
+            if key.startswith(prefix):
+                stat = path.stat()
+                objects.append(
+                    {
+                        "key": key,
+                        "size": stat.st_size,
+                        "last_modified": datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+                    }
+                )
+        return objects
+
+    async def list(self, prefix: str) -> List[Dict[str, Any]]:
+        return await _run(self._list_sync, prefix)
+
+    async def presigned_url(
+        self,
+        key: str,
+        *,
+        expires_in: int = 3600,
+        response_content_disposition: Optional[str] = None,
+    ) -> str:
+        return self._path(key).as_uri()
+
+
+def build_object_storage(bucket: str, client_factory: Optional[Callable[[], Any]] = None) -> ObjectStorage:
+    """The configured backend: ``DOCUMENT_STORAGE_BACKEND`` is "s3" or "local"."""
+    backend = str(getattr(settings, "DOCUMENT_STORAGE_BACKEND", "s3") or "s3").lower()
+    if backend == "local":
+        root = getattr(settings, "DOCUMENT_STORAGE_LOCAL_ROOT", "/tmp/lcopilot_documents")
+        return LocalObjectStorage(Path(root) / bucket)
+    if backend == "s3":
+        return S3ObjectStorage(bucket, client_factory)
+    raise ValueError(f"Unsupported DOCUMENT_STORAGE_BACKEND: {backend}")
@@ -517,12 +517,20 @@ async def collect_ocr_health_snapshot(*, refresh_checks: bool = True) -> Dict[st
                 stage="health_check",
             )
 
+    try:
+        from app.utils.cpu_pool import cpu_pool_stats
+
+        cpu_pool = cpu_pool_stats()
+    except Exception:
+        cpu_pool = None
+
     return {
         "timestamp": _utcnow_iso(),
         "effective_provider_order": list(effective_provider_order),
         "feature_flags": build_ocr_feature_flags(),
         "providers": registry.ordered_states(effective_provider_order),
         "recent_errors": registry.recent_errors(max_errors=max(1, int(getattr(settings, "OCR_DIAGNOSTICS_MAX_ERRORS", 10) or 10))),
+        "cpu_pool": cpu_pool,
     }
 
 
@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import uuid
+import weakref
 from datetime import datetime, timezone
 from typing import Any, Mapping, Optional
 
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.integrations.proofline.base import AdapterResult, ProoflineAdapter
-from app.models import TradeCase, TradeCaseCheckRun
+from app.models import ProoflineFinding, TradeCase, TradeCaseCheckRun
 from app.services.proofline.applicability import ModuleApplicability
 from app.services.proofline.findings import upsert_normalized_finding
 
@@ -25,6 +28,14 @@ TERMINAL_STATES = {
     "pending_review",
 }
 
+# Adapter outcomes that depend only on the module input and adapter version.
+# unable_to_assess is a transient failure and is always retried.
+REUSABLE_STATES = {"clear", "issue_found", "evidence_incomplete", "pending_review"}
+
+_adapter_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
 
 def canonical_input_hash(context: Mapping[str, Any]) -> str:
     payload = json.dumps(
@@ -37,6 +48,58 @@ def canonical_input_hash(context: Mapping[str, Any]) -> str:
     return hashlib.sha256(payload).hexdigest()
 
 
+def module_input_hash(context: Mapping[str, Any], adapter: Optional[ProoflineAdapter]) -> str:
+    """Hash only the context keys the adapter reads (all of them if undeclared)."""
+    keys = getattr(adapter, "input_keys", None)
+    if not keys:
+        return canonical_input_hash(context)
+    return canonical_input_hash({key: context.get(key) for key in keys})
+
+
+def adapter_limit(module: str, adapter: Optional[ProoflineAdapter]) -> asyncio.Semaphore:
+    """Process-wide cap on concurrent calls into one source module."""
+    limits = _adapter_limits.setdefault(asyncio.get_running_loop(), {})
+    limit = limits.get(module)
+    if limit is None:
+        size = getattr(adapter, "max_concurrency", None) or getattr(
+            settings, "PROOFLINE_ADAPTER_MAX_CONCURRENCY", 4
+        )
+        limit = limits[module] = asyncio.Semaphore(max(1, int(size)))
+    return limit
+
+
+def reusable_check_run(
+    db: Session,
+    *,
+    trade_case: TradeCase,
+    module: str,
+    input_hash: str,
+    adapter: Optional[ProoflineAdapter],
+) -> Optional[TradeCaseCheckRun]:
+    """The module's latest terminal run, if it used this input and adapter version."""
+    version = getattr(adapter, "version", None)
+    if adapter is None or not version:
+        return None
+    latest = (
+        db.query(TradeCaseCheckRun)
+        .filter(
+            TradeCaseCheckRun.trade_case_id == trade_case.id,
+            TradeCaseCheckRun.module == module,
+            TradeCaseCheckRun.state.in_(TERMINAL_STATES),
+        )
+        .order_by(TradeCaseCheckRun.completed_at.desc())
+        .first()
+    )
+    if (
+        latest is None
+        or latest.state not in REUSABLE_STATES
+        or latest.input_hash != input_hash
+        or latest.module_version != version
+    ):
+        return None
+    return latest
+
+
 async def run_check(
     db: Session,
     *,
@@ -61,6 +124,18 @@ async def run_check(
         return existing
 
     timestamp = datetime.now(timezone.utc)
+    input_hash = module_input_hash(context, adapter)
+    prior = (
+        reusable_check_run(
+            db,
+            trade_case=trade_case,
+            module=applicability.module,
+            input_hash=input_hash,
+            adapter=adapter,
+        )
+        if applicability.applicable
+        else None
+    )
     check_run = TradeCaseCheckRun(
         id=uuid.uuid4(),
         company_id=trade_case.company_id,
@@ -72,7 +147,7 @@ async def run_check(
         required=applicability.required,
         applicability_reason=applicability.reason,
         idempotency_key=idempotency_key,
-        input_hash=canonical_input_hash(context),
+        input_hash=input_hash,
         attempt_count=0,
         result_summary={},
         created_at=timestamp,
@@ -95,12 +170,34 @@ async def run_check(
         }
         return check_run
 
+    if prior is not None:
+        check_run.state = prior.state
+        check_run.source_record_type = prior.source_record_type
+        check_run.source_record_id = prior.source_record_id
+        check_run.result_summary = {
+            **dict(prior.result_summary or {}),
+            "reused_from_check_run_id": str(prior.id),
+        }
+        check_run.completed_at = timestamp
+        # The prior run's findings (and any analyst status on them) carry over.
+        for finding in (
+            db.query(ProoflineFinding)
+            .filter(
+                ProoflineFinding.trade_case_id == trade_case.id,
+                ProoflineFinding.check_run_id == prior.id,
+            )
+            .all()
+        ):
+            finding.check_run_id = check_run.id
+        return check_run
+
     check_run.state = "running"
     check_run.started_at = timestamp
     check_run.attempt_count = 1
     db.flush()
     try:
-        result = await adapter.run(context)
+        async with adapter_limit(applicability.module, adapter):
+            result = await adapter.run(context)
         if result.state not in TERMINAL_STATES - {"not_applicable"}:
             raise ValueError("Adapter returned an unsupported state")
         check_run.state = result.state
@@ -145,4 +242,11 @@ async def run_check(
     return check_run
 
 
-__all__ = ["AdapterResult", "canonical_input_hash", "run_check"]
+__all__ = [
+    "AdapterResult",
+    "adapter_limit",
+    "canonical_input_hash",
+    "module_input_hash",
+    "reusable_check_run",
+    "run_check",
+]
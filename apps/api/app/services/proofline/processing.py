@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 from datetime import date
@@ -24,9 +25,14 @@ from app.models import (
     TradeCaseStatus,
     ValidationSession,
 )
-from app.services.proofline.applicability import applicability_for
+from app.services.proofline.applicability import ModuleApplicability, applicability_for
 from app.services.proofline.decisions import record_decision
-from app.services.proofline.orchestrator import canonical_input_hash, run_check
+from app.services.proofline.orchestrator import (
+    canonical_input_hash,
+    module_input_hash,
+    reusable_check_run,
+    run_check,
+)
 from app.services.proofline.state import transition_case
 from app.services.proofline.notifications import notify_customer
 
@@ -52,6 +58,12 @@ DOCUMENT_ALIASES = {
     "credit_insurance": "payment_risk_coverage",
 }
 
+# Modules that read another module's output from the context run after it;
+# everything else in a case runs concurrently.
+MODULE_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "buyer_requirements": ("ein",),
+}
+
 RESERVED_TRANSACTION_DETAIL_KEYS = {
     "trade_case_id", "company_id", "parties", "documents", "document_records",
     "documents_presence", "source_lcopilot_result", "ein_verification_results",
@@ -305,13 +317,80 @@ def load_case_context(db: Session, trade_case: TradeCase) -> dict[str, Any]:
     )
 
 
+def _module_waves(applicabilities: list[ModuleApplicability]) -> list[list[ModuleApplicability]]:
+    """Group modules so each wave only depends on modules in earlier waves."""
+    present = {item.module for item in applicabilities}
+    pending = list(applicabilities)
+    done: set[str] = set()
+    waves: list[list[ModuleApplicability]] = []
+    while pending:
+        ready = [
+            item for item in pending
+            if all(dep in done or dep not in present for dep in MODULE_DEPENDENCIES.get(item.module, ()))
+        ] or pending
+        waves.append(ready)
+        done.update(item.module for item in ready)
+        pending = [item for item in pending if item not in ready]
+    return waves
+
+
+def _supersede_stale_findings(
+    db: Session,
+    trade_case: TradeCase,
+    applicability: ModuleApplicability,
+    *,
+    adapter: Any,
+    check_key: str,
+    module_input: str,
+) -> None:
+    """Resolve a module's open automated findings before it re-runs on new input."""
+    existing_check = (
+        db.query(TradeCaseCheckRun)
+        .filter(
+            TradeCaseCheckRun.trade_case_id == trade_case.id,
+            TradeCaseCheckRun.module == applicability.module,
+            TradeCaseCheckRun.idempotency_key == check_key,
+        )
+        .first()
+    )
+    if existing_check is not None:
+        return
+    if applicability.applicable and reusable_check_run(
+        db,
+        trade_case=trade_case,
+        module=applicability.module,
+        input_hash=module_input,
+        adapter=adapter,
+    ) is not None:
+        # Unchanged input: run_check carries the previous result forward.
+        return
+    prior_findings = (
+        db.query(ProoflineFinding)
+        .filter(
+            ProoflineFinding.trade_case_id == trade_case.id,
+            ProoflineFinding.source_module == applicability.module,
+            ProoflineFinding.is_automated.is_(True),
+            ProoflineFinding.status.in_(("open", "acknowledged", "customer_action_required", "unable_to_resolve")),
+        )
+        .all()
+    )
+    for finding in prior_findings:
+        finding.status = "resolved"
+        finding.reviewer_decision = "superseded_by_correction_round"
+
+
 async def process_trade_case(
     db: Session,
     trade_case: TradeCase,
     *,
     adapters: Optional[Mapping[str, Any]] = None,
 ) -> TradeCase:
-    """Run applicable modules idempotently and hand the case to an analyst."""
+    """Run applicable modules idempotently and hand the case to an analyst.
+
+    Independent modules run concurrently (each adapter under its own limit);
+    a module whose input and adapter version are unchanged since its last
+    terminal run reuses that result instead of calling the adapter again.
+    """
     from app.integrations.proofline.registry import build_adapter_registry
 
     if trade_case.status in {
@@ -340,51 +419,48 @@ async def process_trade_case(
     validate_submission_context(context)
     registry = dict(adapters or build_adapter_registry())
     snapshot_hash = canonical_input_hash(context)
-    current_checks: list[TradeCaseCheckRun] = []
-    for applicability in applicability_for(trade_case.payment_arrangement, context=context):
-        module_input_hash = canonical_input_hash(context)
-        check_key = f"{trade_case.correction_rounds_used}:{module_input_hash[:24]}:{applicability.module}"
-        existing_check = (
-            db.query(TradeCaseCheckRun)
-            .filter(
-                TradeCaseCheckRun.trade_case_id == trade_case.id,
-                TradeCaseCheckRun.module == applicability.module,
-                TradeCaseCheckRun.idempotency_key == check_key,
+    applicable_modules = applicability_for(trade_case.payment_arrangement, context=context)
+    completed: dict[str, TradeCaseCheckRun] = {}
+    for wave in _module_waves(applicable_modules):
+        runs = []
+        for applicability in wave:
+            adapter = registry.get(applicability.module)
+            module_input = module_input_hash(context, adapter)
+            check_key = f"{trade_case.correction_rounds_used}:{module_input[:24]}:{applicability.module}"
+            _supersede_stale_findings(
+                db,
+                trade_case,
+                applicability,
+                adapter=adapter,
+                check_key=check_key,
+                module_input=module_input,
             )
-            .first()
-        )
-        if existing_check is None:
-            prior_findings = (
-                db.query(ProoflineFinding)
-                .filter(
-                    ProoflineFinding.trade_case_id == trade_case.id,
-                    ProoflineFinding.source_module == applicability.module,
-                    ProoflineFinding.is_automated.is_(True),
-                    ProoflineFinding.status.in_(("open", "acknowledged", "customer_action_required", "unable_to_resolve")),
+            runs.append(
+                run_check(
+                    db,
+                    trade_case=trade_case,
+                    applicability=applicability,
+                    context=context,
+                    adapter=adapter,
+                    idempotency_key=check_key,
                 )
-                .all()
             )
-            for finding in prior_findings:
-                finding.status = "resolved"
-                finding.reviewer_decision = "superseded_by_correction_round"
-        check_run = await run_check(
-            db,
-            trade_case=trade_case,
-            applicability=applicability,
-            context=context,
-            adapter=registry.get(applicability.module),
-            idempotency_key=check_key,
-        )
-        current_checks.append(check_run)
+        outcomes = await asyncio.gather(*runs, return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                raise outcome
+        for applicability, check_run in zip(wave, outcomes):
+            completed[applicability.module] = check_run
         db.flush()
-        if applicability.module == "ein":
-            summary = check_run.result_summary or {}
+        if any(item.module == "ein" for item in wave):
+            summary = completed["ein"].result_summary or {}
             metadata = summary.get("metadata") if isinstance(summary, dict) else None
             if isinstance(metadata, dict):
                 verified = metadata.get("verification_results")
                 if isinstance(verified, list):
                     context = {**context, "ein_verification_results": verified}
 
+    current_checks = [completed[item.module] for item in applicable_modules]
     checks = current_checks
     findings = (
         db.query(ProoflineFinding)
@@ -7,7 +7,9 @@ Handles condition evaluation, field path resolution, and operator logic.
 
 import logging
 import re
-from typing import Dict, List, Any, Optional
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Any, Optional, Pattern, Sequence, Tuple, Union
 from datetime import datetime, timedelta
 from decimal import Decimal
 
@@ -23,6 +25,32 @@ _LOCATION_RULE_PATH_MARKERS = (
     "airport_of_destination",
     "destination_port",
 )
+_COMPUTED_DAYS_PATTERN = re.compile(
+    r"^(?P<field>[A-Za-z0-9_.]+)\s*(?P<sign>[+-])\s*(?P<days>\d+)\s*(?P<kind>banking_days|calendar_days|days)$",
+    re.IGNORECASE,
+)
+_COMPUTED_ARITHMETIC_PATTERN = re.compile(
+    r"^(?P<field>[A-Za-z0-9_.]+)\s*(?P<operator>[*/+-])\s*(?P<number>\d+(?:\.\d+)?)$",
+    re.IGNORECASE,
+)
+_OPERATOR_ALIASES = {
+    "present": "exists",
+    "not_empty": "is_not_empty",
+    "not_equal": "not_equals",
+    "greater_than_or_equals": "greater_than_or_equal",
+    "less_than_or_equals": "less_than_or_equal",
+    "gt": "greater_than",
+    "gte": "greater_than_or_equal",
+    "lte": "less_than_or_equal",
+    "on_or_before": "less_than_or_equal",
+    "on_or_after": "greater_than_or_equal",
+}
+_NARRATIVE_CONDITION_TYPES = {"document_content", "date_validity", "definition", "conditional_logic", "rule_priority"}
+
+
+@lru_cache(maxsize=8192)
+def _split_field_path(field_path: str) -> Tuple[str, ...]:
+    return tuple(field_path.split("."))
 
 
 def _normalize_lc_type_list(value: Any) -> List[str]:
@@ -78,6 +106,104 @@ class NonEvaluableConditionError(Exception):
         super().__init__(f"Condition type '{condition_type}' is not deterministically evaluable")
 
 
+@dataclass(frozen=True)
+class CompiledCondition:
+    """A condition normalised once: aliases resolved, path split, regex compiled."""
+
+    raw: Dict[str, Any]
+    valid: bool
+    skip: bool = False
+    field: Optional[str] = None
+    field_parts: Tuple[str, ...] = ()
+    operator: Optional[str] = None
+    value: Any = None
+    value_ref: Optional[str] = None
+    computed_field: Optional[str] = None
+    day_type: Optional[str] = None
+    case_insensitive: bool = False
+    is_location: bool = False
+    regex: Optional[Pattern[str]] = None
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Evaluator-ready view of a rule dict; built once per ruleset version."""
+
+    rule: Dict[str, Any]
+    rule_id: str
+    lc_types: Tuple[str, ...]
+    applies_if: Tuple[CompiledCondition, ...]
+    conditions: Tuple[CompiledCondition, ...]
+    trigger_mode: bool
+    has_semantic_check: bool
+
+
+def compile_condition(condition: Dict[str, Any]) -> CompiledCondition:
+    """Normalise a condition dict into a :class:`CompiledCondition`."""
+    if not isinstance(condition, dict):
+        return CompiledCondition(raw={"payload": condition}, valid=False)
+    normalized = RuleEvaluator._normalize_condition(condition)
+    if not normalized:
+        return CompiledCondition(raw=condition, valid=False)
+    if normalized.get("skip"):
+        return CompiledCondition(raw=condition, valid=True, skip=True)
+
+    field_path = normalized["field"]
+    operator = normalized["operator"]
+    value = normalized.get("value")
+    case_insensitive = bool(normalized.get("case_insensitive", False))
+    regex: Optional[Pattern[str]] = None
+    if (
+        operator == "matches"
+        and isinstance(value, str)
+        and not normalized.get("value_ref")
+        and not normalized.get("computed_field")
+    ):
+        try:
+            regex = re.compile(value, re.IGNORECASE if case_insensitive else 0)
+        except re.error:
+            regex = None
+    return CompiledCondition(
+        raw=condition,
+        valid=True,
+        field=field_path,
+        field_parts=_split_field_path(field_path) if isinstance(field_path, str) else (),
+        operator=operator,
+        value=value,
+        value_ref=normalized.get("value_ref"),
+        computed_field=normalized.get("computed_field"),
+        day_type=normalized.get("day_type"),
+        case_insensitive=case_insensitive,
+        is_location=RuleEvaluator._is_location_field(field_path),
+        regex=regex,
+    )
+
+
+def compile_rule(rule: Dict[str, Any]) -> CompiledRule:
+    """Pre-normalise a rule dict's LC types, preconditions and conditions."""
+    metadata = rule.get("metadata") or {}
+    conditions = rule.get("conditions", []) or []
+    return CompiledRule(
+        rule=rule,
+        rule_id=rule.get("rule_id", "unknown"),
+        lc_types=tuple(
+            _normalize_lc_type_list(
+                rule.get("lc_types")
+                or rule.get("lc_type")
+                or metadata.get("lc_types")
+                or metadata.get("lc_type")
+            )
+        ),
+        applies_if=tuple(compile_condition(cond) for cond in rule.get("applies_if", []) or []),
+        conditions=tuple(compile_condition(cond) for cond in conditions),
+        trigger_mode=RuleEvaluator._is_discrepancy_trigger_rule(rule),
+        has_semantic_check=any(
+            isinstance(cond, dict) and str(cond.get("operator") or "").lower() == "semantic_check"
+            for cond in conditions
+        ),
+    )
+
+
 class RuleEvaluator:
     """
     Evaluates rules against document context.
@@ -120,11 +246,7 @@ class RuleEvaluator:
         if direct_value is not None:
             return direct_value
 
-        match = re.match(
-            r"^(?P<field>[A-Za-z0-9_.]+)\s*(?P<sign>[+-])\s*(?P<days>\d+)\s*(?P<kind>banking_days|calendar_days|days)$",
-            expr,
-            re.IGNORECASE,
-        )
+        match = _COMPUTED_DAYS_PATTERN.match(expr)
         if match:
             base_value = self.resolve_field_path(context, match.group("field"))
             base_date = self._coerce_datetime(base_value)
@@ -150,11 +272,7 @@ class RuleEvaluator:
 
             return self.add_calendar_days(base_date, days)
 
-        arithmetic_match = re.match(
-            r"^(?P<field>[A-Za-z0-9_.]+)\s*(?P<operator>[*/+-])\s*(?P<number>\d+(?:\.\d+)?)$",
-            expr,
-            re.IGNORECASE,
-        )
+        arithmetic_match = _COMPUTED_ARITHMETIC_PATTERN.match(expr)
         if not arithmetic_match:
             return None
 
@@ -221,11 +339,13 @@ class RuleEvaluator:
         primary = re.sub(r"\s+", " ", primary)
         return primary
 
-    def _is_location_field(self, field_path: Optional[str]) -> bool:
+    @staticmethod
+    def _is_location_field(field_path: Optional[str]) -> bool:
         text = str(field_path or "").strip().lower()
         return any(marker in text for marker in _LOCATION_RULE_PATH_MARKERS)
 
-    def _is_discrepancy_trigger_rule(self, rule: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _is_discrepancy_trigger_rule(rule: Dict[str, Any]) -> bool:
         consequence = str(rule.get("consequence_class") or "").strip().lower()
         if any(token in consequence for token in ("discrepancy", "violation", "mismatch", "missing")):
             return True
@@ -252,9 +372,13 @@ class RuleEvaluator:
         - "invoice.amount" -> context["invoice"]["amount"]
         - "lc_number" -> context["lc_number"]
         """
-        parts = field_path.split(".")
+        return self.resolve_field_parts(context, _split_field_path(field_path))
+
+    @staticmethod
+    def resolve_field_parts(context: Dict[str, Any], parts: Sequence[str]) -> Any:
+        """Resolve a field path that was split ahead of time."""
         value = context
-        
+
         for part in parts:
             if isinstance(value, dict):
                 value = value.get(part)
@@ -305,6 +429,8 @@ class RuleEvaluator:
         day_type: Optional[str] = None,
         field_path: Optional[str] = None,
         case_insensitive: bool = False,
+        pattern: Optional[Pattern[str]] = None,
+        is_location: Optional[bool] = None,
     ) -> bool:
         """
         Evaluate a single operator condition.
@@ -317,6 +443,8 @@ class RuleEvaluator:
             context: Full document context for resolving references
             day_type: "banking" or "calendar" for time operators
             field_path: Field path being evaluated (for error messages)
+            pattern: Precompiled regex for ``matches`` (from a compiled rule)
+            is_location: Precomputed ``_is_location_field(field_path)``
         """
         # Resolve value_ref if present
         if value_ref:
@@ -352,7 +480,9 @@ class RuleEvaluator:
 
         field_cmp = field_value
         compare_cmp = compare_value
-        if self._is_location_field(field_path):
+        if is_location is None:
+            is_location = self._is_location_field(field_path)
+        if is_location:
             field_cmp = self._normalize_location_for_compare(field_cmp)
             if isinstance(compare_cmp, list):
                 compare_cmp = [self._normalize_location_for_compare(item) for item in compare_cmp]
@@ -394,10 +524,11 @@ class RuleEvaluator:
         
         elif operator == "matches":
             if isinstance(field_value, str) and isinstance(compare_value, str):
+                if pattern is not None:
+                    return bool(pattern.match(field_value))
                 try:
-                    pattern = compare_value
                     flags = re.IGNORECASE if case_insensitive else 0
-                    return bool(re.match(pattern, field_value, flags))
+                    return bool(re.match(compare_value, field_value, flags))
                 except re.error:
                     logger.warning(f"Invalid regex pattern: {compare_value}")
                     return False
@@ -628,49 +759,62 @@ class RuleEvaluator:
             condition: Condition dict with field, operator, value/value_ref, etc.
             context: Document context for field resolution
         """
-        normalized = self._normalize_condition(condition)
-        if not normalized:
+        return self.evaluate_compiled_condition(
+            compile_condition(condition),
+            context,
+            rule_id=rule_id,
+            condition_index=condition_index,
+            condition_type=condition_type,
+        )
+
+    def evaluate_compiled_condition(
+        self,
+        compiled: CompiledCondition,
+        context: Dict[str, Any],
+        *,
+        rule_id: Optional[str] = None,
+        condition_index: Optional[int] = None,
+        condition_type: str = "condition"
+    ) -> bool:
+        """Evaluate a condition that was normalised by :func:`compile_condition`."""
+        if not compiled.valid:
             logger.warning(
                 "Invalid condition (rule=%s, idx=%s, type=%s, payload=%s): missing field or operator",
                 rule_id or "unknown",
                 condition_index,
                 condition_type,
-                condition,
+                compiled.raw,
             )
-            raise NonEvaluableConditionError(condition.get("type"))
+            raise NonEvaluableConditionError(compiled.raw.get("type"))
+
+        if compiled.skip:
+            raise NonEvaluableConditionError(compiled.raw.get("type"))
 
-        if normalized.get("skip"):
-            raise NonEvaluableConditionError(condition.get("type"))
-        
-        field_path = normalized["field"]
-        operator = normalized["operator"]
-        value = normalized.get("value")
-        value_ref = normalized.get("value_ref")
-        day_type = normalized.get("day_type")
-        computed_field = normalized.get("computed_field")
-        
         # Resolve field value
-        field_value = self.resolve_field_path(context, field_path)
-        
+        field_value = self.resolve_field_parts(context, compiled.field_parts)
+
         # Evaluate operator
-        compare_value = value
-        compare_value_ref = value_ref
-        if computed_field:
-            compare_value = self._resolve_computed_field(context, computed_field)
+        compare_value = compiled.value
+        compare_value_ref = compiled.value_ref
+        if compiled.computed_field:
+            compare_value = self._resolve_computed_field(context, compiled.computed_field)
             compare_value_ref = None
 
         return self.evaluate_operator(
-            operator=operator,
+            operator=compiled.operator,
             field_value=field_value,
             condition_value=compare_value,
             value_ref=compare_value_ref,
             context=context,
-            day_type=day_type,
-            field_path=field_path,
-            case_insensitive=normalized.get("case_insensitive", False)
+            day_type=compiled.day_type,
+            field_path=compiled.field,
+            case_insensitive=compiled.case_insensitive,
+            pattern=compiled.regex,
+            is_location=compiled.is_location,
         )
     
-    def _normalize_condition(self, condition: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    @staticmethod
+    def _normalize_condition(condition: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Normalize various condition schemas into the core evaluator schema.
         """
@@ -683,19 +827,6 @@ class RuleEvaluator:
         day_type = cond.get("day_type")
         computed_field = cond.get("computed_field")
         case_insensitive = bool(cond.get("case_insensitive"))
-
-        operator_aliases = {
-            "present": "exists",
-            "not_empty": "is_not_empty",
-            "not_equal": "not_equals",
-            "greater_than_or_equals": "greater_than_or_equal",
-            "less_than_or_equals": "less_than_or_equal",
-            "gt": "greater_than",
-            "gte": "greater_than_or_equal",
-            "lte": "less_than_or_equal",
-            "on_or_before": "less_than_or_equal",
-            "on_or_after": "greater_than_or_equal",
-        }
         
         def is_field_path(candidate: Any) -> bool:
             return isinstance(candidate, str) and "." in candidate and " " not in candidate
@@ -785,7 +916,7 @@ class RuleEvaluator:
             if computed_field is None:
                 computed_field = cond.get("computed_field")
 
-        elif cond_type in {"document_content", "date_validity", "definition", "conditional_logic", "rule_priority"}:
+        elif cond_type in _NARRATIVE_CONDITION_TYPES:
             return {"skip": True}
         
         elif cond_type == "date_order":
@@ -830,7 +961,7 @@ class RuleEvaluator:
                 value = cond.get("days")
 
         if operator:
-            operator = operator_aliases.get(str(operator).strip().lower(), operator)
+            operator = _OPERATOR_ALIASES.get(str(operator).strip().lower(), operator)
 
         if field_path and operator:
             return {
@@ -860,14 +991,18 @@ class RuleEvaluator:
                 "message": "..."
             }
         """
-        rule_id = rule.get("rule_id", "unknown")
+        return self.evaluate_compiled_rule(compile_rule(rule), context)
+
+    def evaluate_compiled_rule(
+        self,
+        compiled: CompiledRule,
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Evaluate a :class:`CompiledRule`; same result shape as ``evaluate_rule``."""
+        rule = compiled.rule
+        rule_id = compiled.rule_id
         lc_type_context = _resolve_workflow_lc_type(context)
-        allowed_types = _normalize_lc_type_list(
-            rule.get("lc_types")
-            or rule.get("lc_type")
-            or (rule.get("metadata") or {}).get("lc_types")
-            or (rule.get("metadata") or {}).get("lc_type")
-        )
+        allowed_types = compiled.lc_types
         if allowed_types:
             if "any" in allowed_types or "*" in allowed_types:
                 pass
@@ -890,10 +1025,10 @@ class RuleEvaluator:
                 }
         
         # Check applies_if preconditions
-        applies_if = rule.get("applies_if", [])
+        applies_if = compiled.applies_if
         if applies_if:
             for index, precondition in enumerate(applies_if):
-                if not self.evaluate_condition(
+                if not self.evaluate_compiled_condition(
                     precondition,
                     context,
                     rule_id=rule_id,
@@ -911,7 +1046,7 @@ class RuleEvaluator:
         
         # Evaluate all conditions (all must pass)
         conditions = rule.get("conditions", [])
-        if not conditions:
+        if not compiled.conditions:
             logger.warning(f"Rule {rule_id} has no conditions")
             return {
                 "rule_id": rule_id,
@@ -922,17 +1057,18 @@ class RuleEvaluator:
         
         violations = []
         all_passed = True
-        trigger_mode = self._is_discrepancy_trigger_rule(rule)
+        trigger_mode = compiled.trigger_mode
         all_trigger_conditions_met = True
 
         missing_fields: List[str] = []
         non_evaluable_conditions: List[str] = []
         evaluated_conditions = 0
 
-        for index, condition in enumerate(conditions):
+        for index, compiled_condition in enumerate(compiled.conditions):
+            condition = compiled_condition.raw
             try:
-                passed = self.evaluate_condition(
-                    condition,
+                passed = self.evaluate_compiled_condition(
+                    compiled_condition,
                     context,
                     rule_id=rule_id,
                     condition_index=index,
@@ -1028,14 +1164,15 @@ class RuleEvaluator:
     
     async def evaluate_rules(
         self,
-        rules: List[Dict[str, Any]],
+        rules: Sequence[Union[Dict[str, Any], CompiledRule]],
         input_context: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
         Evaluate multiple rules against input context.
         
         Args:
-            rules: List of rule objects
+            rules: Rule dicts, or ``CompiledRule`` entries from a compiled
+                ruleset (these skip per-request normalisation)
             input_context: Document context (LC, invoice, BL data)
         
         Returns:
@@ -1052,16 +1189,20 @@ class RuleEvaluator:
         violations = []
         
         for rule in rules:
+            rule_id = rule.rule_id if isinstance(rule, CompiledRule) else rule.get("rule_id", "unknown")
             try:
-                result = self.evaluate_rule(rule, input_context)
+                if isinstance(rule, CompiledRule):
+                    result = self.evaluate_compiled_rule(rule, input_context)
+                else:
+                    result = self.evaluate_rule(rule, input_context)
                 outcomes.append(result)
                 
                 if not result.get("passed", False) and not result.get("not_applicable", False):
                     violations.append(result)
             except Exception as e:
-                logger.error(f"Error evaluating rule {rule.get('rule_id', 'unknown')}: {e}")
+                logger.error(f"Error evaluating rule {rule_id}: {e}")
                 outcomes.append({
-                    "rule_id": rule.get("rule_id", "unknown"),
+                    "rule_id": rule_id,
                     "passed": False,
                     "violations": [{"error": str(e)}],
                     "message": f"Evaluation error: {e}"
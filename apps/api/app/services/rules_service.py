@@ -5,18 +5,23 @@ Provides a unified interface for fetching and evaluating rulesets.
 Uses the normalized `rules` table (RuleRecord) as the source of truth.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
 from sqlalchemy import and_, desc, nullslast
 from sqlalchemy.orm import Session
 
+from app.cache import ruleset_cache
 from app.config import settings
 from app.database import SessionLocal
 from app.models.rule_record import RuleRecord
 from app.models.ruleset import Ruleset, RulesetStatus
 
+if TYPE_CHECKING:
+    from app.services.compiled_ruleset import CompiledRuleset
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,6 +54,26 @@ class RulesService:
         Returns None if no active ruleset found for the domain/jurisdiction.
         """
         raise NotImplementedError
+
+    async def get_compiled_ruleset(
+        self,
+        domain: str,
+        jurisdiction: str = "global",
+        document_type: Optional[str] = None,
+    ) -> Optional["CompiledRuleset"]:
+        """
+        Returns the active ruleset compiled into an indexed rule plan.
+
+        The default implementation compiles whatever ``get_active_ruleset``
+        returns, reusing the plan while the same rules list is served.
+        Returns None if no active ruleset found.
+        """
+        from app.services.compiled_ruleset import get_or_compile
+
+        ruleset_data = await self.get_active_ruleset(domain, jurisdiction, document_type=document_type)
+        if ruleset_data is None:
+            return None
+        return get_or_compile(ruleset_data, domain)
     
     async def evaluate_rules(
         self, rules: List[Dict], input_context: Dict[str, Any]
@@ -74,12 +99,25 @@ class DBRulesAdapter(RulesService):
     
     This is the production adapter - rules are stored in Postgres and loaded
     via SQLAlchemy queries, not from JSON files.
+
+    Cache layers: in-process TTL cache -> shared Redis payload
+    (``app.cache.ruleset_cache``) -> Postgres. The blocking ORM queries run in
+    a worker thread on the engine's connection pool, concurrent cold loads
+    of the same key share one fetch, and ``invalidate`` notifies all workers
+    over Redis pub/sub.
     """
     
     def __init__(self, cache_ttl_minutes: int = 10):
         self.cache_ttl_minutes = cache_ttl_minutes
         self._cache: Dict[str, Dict[str, Any]] = {}
         self._cache_timestamps: Dict[str, datetime] = {}
+        # Compiled rule plans per cache key; reused across TTL refreshes
+        # while the ruleset version key is unchanged.
+        self._compiled_cache: Dict[str, "CompiledRuleset"] = {}
+        # Bumped on every invalidation; a load that started before an
+        # invalidation does not populate the local cache.
+        self._generation = 0
+        self._inflight: Dict[str, "asyncio.Task[Optional[Dict[str, Any]]]"] = {}
     
     def _get_cache_key(self, domain: str, jurisdiction: str, document_type: Optional[str]) -> str:
         """Generate cache key for domain/jurisdiction/document_type combination."""
@@ -104,17 +142,28 @@ class DBRulesAdapter(RulesService):
         """
         Clear cache entries.
         
-        If domain/jurisdiction provided, clears only that entry.
+        If domain/jurisdiction provided, clears only that entry (every
+        document_type variant when document_type is omitted).
         Otherwise clears all cache.
+
+        Local to this process; use ``invalidate`` to reach all workers.
         """
+        self._generation += 1
         if domain and jurisdiction:
-            cache_key = self._get_cache_key(domain, jurisdiction, document_type)
-            self._cache.pop(cache_key, None)
-            self._cache_timestamps.pop(cache_key, None)
-            logger.info(f"Cleared cache for {cache_key}")
+            if document_type:
+                cache_keys = [self._get_cache_key(domain, jurisdiction, document_type)]
+            else:
+                prefix = self._get_cache_key(domain, jurisdiction, None)[:-1]
+                cache_keys = [key for key in list(self._cache) + list(self._compiled_cache) if key.startswith(prefix)]
+            for cache_key in cache_keys:
+                self._cache.pop(cache_key, None)
+                self._cache_timestamps.pop(cache_key, None)
+                self._compiled_cache.pop(cache_key, None)
+            logger.info(f"Cleared cache for {domain}:{jurisdiction}:{document_type or '*'}")
         else:
             self._cache.clear()
             self._cache_timestamps.clear()
+            self._compiled_cache.clear()
             logger.info("Cleared all ruleset cache")
     
     async def get_active_ruleset(
@@ -134,7 +183,58 @@ class DBRulesAdapter(RulesService):
         if self._is_cache_valid(cache_key):
             logger.debug(f"Cache hit for {cache_key}")
             return self._cache[cache_key]
-        
+
+        # Singleflight: concurrent cold loads of one key share a fetch.
+        loop = asyncio.get_running_loop()
+        task = self._inflight.get(cache_key)
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = loop.create_task(self._load_ruleset(domain, jurisdiction, document_type, cache_key))
+            self._inflight[cache_key] = task
+
+            def _forget(done: "asyncio.Task[Optional[Dict[str, Any]]]", key: str = cache_key) -> None:
+                if self._inflight.get(key) is done:
+                    self._inflight.pop(key, None)
+
+            task.add_done_callback(_forget)
+        return await asyncio.shield(task)
+
+    async def _load_ruleset(
+        self,
+        domain: str,
+        jurisdiction: str,
+        document_type: Optional[str],
+        cache_key: str,
+    ) -> Optional[Dict[str, Any]]:
+        generation = self._generation
+
+        async def _from_db() -> Optional[Dict[str, Any]]:
+            return await asyncio.to_thread(self._fetch_ruleset_from_db, domain, jurisdiction, document_type)
+
+        result, shared_hit = await ruleset_cache.load(domain, jurisdiction, document_type, _from_db)
+        if result is None:
+            return None
+
+        if generation == self._generation:
+            self._cache[cache_key] = result
+            self._cache_timestamps[cache_key] = datetime.now()
+        logger.info(
+            "Cached DB ruleset",
+            extra={
+                "cache_key": cache_key,
+                "rule_count": len(result.get("rules") or []),
+                "source": "redis" if shared_hit else "db",
+            },
+        )
+        return result
+
+    def _fetch_ruleset_from_db(
+        self,
+        domain: str,
+        jurisdiction: str,
+        document_type: Optional[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Blocking ORM fetch; called from a worker thread."""
+        cache_key = self._get_cache_key(domain, jurisdiction, document_type)
         db = SessionLocal()
         try:
             # 1) Find the active ruleset for domain/jurisdiction
@@ -227,17 +327,6 @@ class DBRulesAdapter(RulesService):
                 "rulebook_version": ruleset.rulebook_version,
             }
             
-            # Cache the result
-            self._cache[cache_key] = result
-            self._cache_timestamps[cache_key] = datetime.now()
-            logger.info(
-                "Cached DB ruleset",
-                extra={
-                    "cache_key": cache_key,
-                    "rule_count": len(rules_payload),
-                },
-            )
-            
             return result
             
         except Exception as e:
@@ -254,6 +343,52 @@ class DBRulesAdapter(RulesService):
             raise
         finally:
             db.close()
+
+    async def invalidate(
+        self,
+        domain: Optional[str] = None,
+        jurisdiction: Optional[str] = None,
+    ) -> None:
+        """
+        Drop cached rulesets here and in every other worker.
+
+        Clears the local cache, retires the shared Redis entries and
+        publishes an invalidation that ``run_ruleset_invalidation_listener``
+        applies in the other processes.
+        """
+        self.clear_cache(domain=domain, jurisdiction=jurisdiction)
+        await ruleset_cache.invalidate(domain, jurisdiction)
+
+    async def get_compiled_ruleset(
+        self,
+        domain: str,
+        jurisdiction: str = "global",
+        document_type: Optional[str] = None,
+    ) -> Optional["CompiledRuleset"]:
+        """
+        Fetch the active ruleset as a compiled rule plan.
+
+        The plan is rebuilt only when the ruleset id, version or a rule
+        checksum changes, not on every TTL refresh of the raw ruleset.
+        """
+        from app.services.compiled_ruleset import compile_ruleset, ruleset_version_key
+
+        ruleset_data = await self.get_active_ruleset(domain, jurisdiction, document_type=document_type)
+        cache_key = self._get_cache_key(domain, jurisdiction, document_type)
+        if ruleset_data is None:
+            self._compiled_cache.pop(cache_key, None)
+            return None
+
+        compiled = self._compiled_cache.get(cache_key)
+        if compiled is not None and (
+            compiled.ruleset_data is ruleset_data
+            or compiled.version_key == ruleset_version_key(ruleset_data)
+        ):
+            return compiled
+
+        compiled = compile_ruleset(ruleset_data, domain)
+        self._compiled_cache[cache_key] = compiled
+        return compiled
     
     async def evaluate_rules(
         self, rules: List[Dict], input_context: Dict[str, Any]
@@ -700,6 +835,30 @@ def get_rules_service() -> RulesService:
     return _rules_service
 
 
+async def invalidate_rules_cache(domain: Optional[str] = None, jurisdiction: Optional[str] = None) -> None:
+    """Invalidate cached rulesets across workers (after publish/rollback/edits)."""
+    rules_service = get_rules_service()
+    invalidate = getattr(rules_service, "invalidate", None)
+    if callable(invalidate):
+        await invalidate(domain=domain, jurisdiction=jurisdiction)
+        return
+    clear_cache = getattr(rules_service, "clear_cache", None)
+    if callable(clear_cache):
+        clear_cache(domain=domain, jurisdiction=jurisdiction)
+
+
+def _apply_remote_invalidation(domain: Optional[str], jurisdiction: Optional[str]) -> None:
+    clear_cache = getattr(get_rules_service(), "clear_cache", None)
+    if callable(clear_cache):
+        clear_cache(domain=domain, jurisdiction=jurisdiction)
+        logger.info("Applied ruleset invalidation from another worker: %s:%s", domain or "*", jurisdiction or "*")
+
+
+async def run_ruleset_invalidation_listener() -> None:
+    """Background task: apply other workers' ruleset invalidations to this process."""
+    await ruleset_cache.listen_for_invalidations(_apply_remote_invalidation)
+
+
 # =============================================================================
 # CONVENIENCE FUNCTIONS FOR RULE DESCRIPTION LOOKUP
 # =============================================================================
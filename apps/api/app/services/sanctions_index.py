@@ -0,0 +1,516 @@
+"""
+Prebuilt screening index for sanctions lists.
+
+``calculate_match_score`` is pure Python (Jaro-Winkler, token-set ratio),
+so scoring every entity of every list for every party does not scale to
+the real OFAC/EU/UN/UK lists. The index selects candidates through
+blocking keys and only those are fully scored:
+
+- ``e:`` exact normalised name or alias;
+- ``t:`` every name token. Per-row token counts make the token-set
+  containment cases (query tokens ⊆ name tokens or the reverse, which
+  score 100) exact, and a shared distinctive token is what
+  ``_has_meaningful_entity_overlap`` needs for any 70-85 fuzzy score;
+- ``p:`` 5-character prefix of distinctive tokens (the "near-shared stem"
+  case of the same rule);
+- ``f:`` Soundex of distinctive tokens, for misspelt names;
+- ``g:`` character trigrams of the name, skipping trigrams too frequent to
+  be selective. A row is a candidate when it shares at least half of the
+  smaller trigram set, which always holds for substring matches.
+
+Candidates are then checked against a cheap upper bound of
+``calculate_match_score`` (character-multiset bound for Jaro-Winkler,
+length bounds for the token-set ratios); only rows whose bound reaches the
+threshold are scored. Exact/alias rows are always scored.
+
+Selection is exact for exact/alias, substring and token-containment
+matches and for every 70-85 fuzzy score; Jaro-Winkler / token-set scores
+of 85+ without any shared token, stem, phonetic key or selective trigram
+are not enumerated. Below ``LOSSLESS_MIN_THRESHOLD`` (where the overlap cap
+no longer filters weak fuzzy scores) the index scores every row instead.
+
+Indexes are persisted per list content under ``SANCTIONS_INDEX_DIR``
+(``meta.json`` plus a flat ``uint32`` posting file) and the posting file is
+memory-mapped on load, so workers share the pages and startup only parses
+the key map.
+"""
+
+from __future__ import annotations
+
+import array
+import hashlib
+import json
+import logging
+import math
+import mmap
+import os
+import shutil
+import sys
+import threading
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config import settings
+from app.services.sanctions_screening import (
+    GENERIC_ENTITY_TOKENS,
+    LEGAL_SUFFIXES,
+    TRANSLITERATION,
+    WORD_REPLACEMENTS,
+    calculate_match_score,
+    normalize_name,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump when key derivation or the file layout changes.
+INDEX_FORMAT_VERSION = 1
+LOSSLESS_MIN_THRESHOLD = 70.0
+
+_STEM_LENGTH = 5
+_MIN_GRAM_OVERLAP = 0.5
+_MIN_FREQUENT_GRAM_DF = 64
+_FREQUENT_GRAM_RATIO = 0.02
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("BFPV", "1"),
+    **dict.fromkeys("CGJKQSXZ", "2"),
+    **dict.fromkeys("DT", "3"),
+    "L": "4",
+    **dict.fromkeys("MN", "5"),
+    "R": "6",
+}
+
+
+def soundex(token: str) -> str:
+    """American Soundex code of an uppercase ASCII token ("" for non-alphabetic input)."""
+    letters = [char for char in token if "A" <= char <= "Z"]
+    if not letters:
+        return ""
+    code = letters[0]
+    previous = _SOUNDEX_CODES.get(letters[0], "")
+    for char in letters[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in "HW":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _joined_token_set_length(tokens: Sequence[str]) -> int:
+    """Length of the unique tokens joined by spaces (``token_set_ratio``'s strings)."""
+    return sum(len(token) for token in tokens) + max(0, len(tokens) - 1)
+
+
+def _common_prefix(left: str, right: str, limit: int = 4) -> int:
+    prefix = 0
+    for a, b in zip(left[:limit], right[:limit]):
+        if a != b:
+            break
+        prefix += 1
+    return prefix
+
+
+def _distinctive(tokens: Iterable[str]) -> List[str]:
+    return [token for token in tokens if token not in GENERIC_ENTITY_TOKENS and not token.isdigit()]
+
+
+def list_fingerprint(entities: Sequence[Dict[str, Any]]) -> str:
+    """Content hash of a list plus the normalisation tables the keys depend on."""
+    digest = hashlib.sha256()
+    digest.update(f"v{INDEX_FORMAT_VERSION}".encode())
+    digest.update(
+        json.dumps(
+            [LEGAL_SUFFIXES, WORD_REPLACEMENTS, TRANSLITERATION, sorted(GENERIC_ENTITY_TOKENS)],
+            ensure_ascii=False,
+        ).encode("utf-8")
+    )
+    digest.update(json.dumps(list(entities), sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class SanctionsIndex:
+    """Blocking-key index over one sanctions list."""
+
+    def __init__(
+        self,
+        entities: List[Dict[str, Any]],
+        name_norms: List[str],
+        alias_norms: List[List[str]],
+        token_counts: List[int],
+        gram_counts: List[int],
+        frequent_grams: set[str],
+        keys: Dict[str, Tuple[int, int]],
+        postings: memoryview,
+        backing: Any = None,
+    ) -> None:
+        self.entities = entities
+        self.name_norms = name_norms
+        self.alias_norms = alias_norms
+        self._token_counts = token_counts
+        self._gram_counts = gram_counts
+        self._frequent_grams = frequent_grams
+        self._keys = keys
+        self._postings = postings
+        # Keeps the mmap (or array) alive for as long as the memoryview is used.
+        self._backing = backing
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    # ------------------------------------------------------------------
+    # Build / persist
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, entities: Sequence[Dict[str, Any]]) -> "SanctionsIndex":
+        entities = list(entities)
+        name_norms = [normalize_name(entity.get("name") or "") for entity in entities]
+        alias_norms = [[normalize_name(alias) for alias in entity.get("aliases") or []] for entity in entities]
+
+        postings: Dict[str, List[int]] = {}
+
+        def _add(key: str, row: int) -> None:
+            rows = postings.setdefault(key, [])
+            if not rows or rows[-1] != row:
+                rows.append(row)
+
+        row_grams: List[set[str]] = []
+        gram_df: Dict[str, int] = {}
+        token_counts: List[int] = []
+        for row, name_norm in enumerate(name_norms):
+            for exact in dict.fromkeys([name_norm, *alias_norms[row]]):
+                if exact:
+                    _add(f"e:{exact}", row)
+            tokens = sorted(set(name_norm.split()))
+            token_counts.append(len(tokens))
+            for token in tokens:
+                _add(f"t:{token}", row)
+            for token in _distinctive(tokens):
+                if len(token) >= _STEM_LENGTH:
+                    _add(f"p:{token[:_STEM_LENGTH]}", row)
+                code = soundex(token)
+                if code:
+                    _add(f"f:{code}", row)
+            grams = _trigrams(name_norm)
+            row_grams.append(grams)
+            for gram in grams:
+                gram_df[gram] = gram_df.get(gram, 0) + 1
+
+        frequent_cap = max(_MIN_FREQUENT_GRAM_DF, int(len(entities) * _FREQUENT_GRAM_RATIO))
+        frequent_grams = {gram for gram, df in gram_df.items() if df > frequent_cap}
+        gram_counts: List[int] = []
+        for row, grams in enumerate(row_grams):
+            selective = sorted(grams - frequent_grams)
+            gram_counts.append(len(selective))
+            for gram in selective:
+                _add(f"g:{gram}", row)
+
+        flat = array.array("I")
+        keys: Dict[str, Tuple[int, int]] = {}
+        for key, rows in postings.items():
+            keys[key] = (len(flat), len(rows))
+            flat.extend(rows)
+
+        return cls(
+            entities,
+            name_norms,
+            alias_norms,
+            token_counts,
+            gram_counts,
+            frequent_grams,
+            keys,
+            memoryview(flat),
+            backing=flat,
+        )
+
+    def save(self, directory: Path) -> None:
+        """Write the index into ``directory`` (which must not exist yet)."""
+        directory.mkdir(parents=True)
+        with open(directory / "postings.bin", "wb") as handle:
+            handle.write(self._postings.tobytes())
+        meta = {
+            "format": INDEX_FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "entities": self.entities,
+            "name_norms": self.name_norms,
+            "alias_norms": self.alias_norms,
+            "token_counts": self._token_counts,
+            "gram_counts": self._gram_counts,
+            "frequent_grams": sorted(self._frequent_grams),
+            "keys": self._keys,
+        }
+        with open(directory / "meta.json", "w", encoding="utf-8") as handle:
+            json.dump(meta, handle, ensure_ascii=False, separators=(",", ":"), default=str)
+
+    @classmethod
+    def load(cls, directory: Path) -> Optional["SanctionsIndex"]:
+        """Open a saved index with its postings memory-mapped; None if unusable."""
+        try:
+            with open(directory / "meta.json", "r", encoding="utf-8") as handle:
+                meta = json.load(handle)
+            if meta.get("format") != INDEX_FORMAT_VERSION or meta.get("byteorder") != sys.byteorder:
+                return None
+            with open(directory / "postings.bin", "rb") as handle:
+                if os.fstat(handle.fileno()).st_size:
+                    backing: Any = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    backing = array.array("I")
+            postings = memoryview(backing).cast("B").cast("I")
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Sanctions index at %s unreadable: %s", directory, exc)
+            return None
+        return cls(
+            meta["entities"],
+            meta["name_norms"],
+            meta["alias_norms"],
+            meta["token_counts"],
+            meta["gram_counts"],
+            set(meta["frequent_grams"]),
+            {key: (int(span[0]), int(span[1])) for key, span in meta["keys"].items()},
+            postings,
+            backing=backing,
+        )
+
+    # ------------------------------------------------------------------
+    # Query
+    # ------------------------------------------------------------------
+
+    def _rows(self, key: str) -> Sequence[int]:
+        span = self._keys.get(key)
+        if span is None:
+            return ()
+        offset, length = span
+        return self._postings[offset:offset + length]
+
+    def candidates(self, query_norm: str) -> List[int]:
+        """Rows that can reach ``LOSSLESS_MIN_THRESHOLD`` for ``query_norm``, in list order."""
+        exact, rows, _ = self._select(query_norm)
+        return sorted(exact | rows)
+
+    def _select(
+        self,
+        query_norm: str,
+        rows_for: Optional[Callable[[str], Sequence[int]]] = None,
+    ) -> Tuple[set[int], set[int], Dict[int, Tuple[int, int]]]:
+        """``(exact_rows, candidate_rows, {row: (shared tokens, shared token chars)})``."""
+        if not query_norm:
+            return set(), set(), {}
+        rows_for = rows_for or self._rows
+        exact = set(rows_for(f"e:{query_norm}"))
+        rows: set[int] = set()
+
+        tokens = sorted(set(query_norm.split()))
+        shared_tokens: Dict[int, Tuple[int, int]] = {}
+        for token in tokens:
+            for row in rows_for(f"t:{token}"):
+                count, chars = shared_tokens.get(row, (0, 0))
+                shared_tokens[row] = (count + 1, chars + len(token))
+        token_counts = self._token_counts
+        for row, (shared, _) in shared_tokens.items():
+            if shared == len(tokens) or shared == token_counts[row]:
+                rows.add(row)
+
+        for token in _distinctive(tokens):
+            rows.update(rows_for(f"t:{token}"))
+            if len(token) >= _STEM_LENGTH:
+                rows.update(rows_for(f"p:{token[:_STEM_LENGTH]}"))
+            code = soundex(token)
+            if code:
+                rows.update(rows_for(f"f:{code}"))
+
+        selective = [gram for gram in _trigrams(query_norm) if gram not in self._frequent_grams]
+        shared_grams: Dict[int, int] = {}
+        for gram in selective:
+            for row in rows_for(f"g:{gram}"):
+                shared_grams[row] = shared_grams.get(row, 0) + 1
+        gram_counts = self._gram_counts
+        for row, shared in shared_grams.items():
+            if shared >= max(1, math.ceil(_MIN_GRAM_OVERLAP * min(len(selective), gram_counts[row]))):
+                rows.add(row)
+
+        return exact, rows, shared_tokens
+
+    def _score_upper_bound(
+        self,
+        query_norm: str,
+        query_chars: Counter,
+        query_set_length: int,
+        row: int,
+        shared: Optional[Tuple[int, int]],
+        target_chars: Optional[Counter] = None,
+    ) -> float:
+        """Upper bound of ``calculate_match_score`` for a row that is not an exact/alias hit."""
+        target_norm = self.name_norms[row]
+        if not target_norm:
+            return 0.0
+        if target_chars is None:
+            target_chars = Counter(target_norm)
+        overlap = sum((query_chars & target_chars).values())
+        query_len, target_len = len(query_norm), len(target_norm)
+        # Jaro: matches <= shared characters, transpositions >= 0. This also
+        # bounds the substring score (85 * length ratio).
+        matches = min(overlap, query_len, target_len)
+        jaro = (matches / query_len + matches / target_len + (1.0 if matches else 0.0)) / 3
+        bound = jaro + _common_prefix(query_norm, target_norm) * 0.1 * (1 - jaro)
+
+        if shared:
+            # token_set_ratio: SequenceMatcher ratio <= 2*min(len)/(sum of lengths);
+            # the shared tokens are a common prefix of the combined strings.
+            count, chars = shared
+            intersection = chars + count - 1
+            target_set_length = _joined_token_set_length(sorted(set(target_norm.split())))
+            ratio_query = 2 * intersection / (intersection + query_set_length)
+            ratio_target = 2 * intersection / (intersection + target_set_length)
+            ratio_both = 2 * min(overlap, query_set_length, target_set_length) / (query_set_length + target_set_length)
+            bound = max(bound, ratio_query, ratio_target, ratio_both)
+        return bound * 100
+
+    def search(self, query: str, threshold: float) -> List[Tuple[int, float, str, str]]:
+        """``(row, score, match_type, match_method)`` for rows scoring at least ``threshold``.
+
+        ``query`` is normalised the same way ``calculate_match_score`` does.
+        """
+        return self._search_normalized(normalize_name(query), threshold)
+
+    def search_many(
+        self, queries: Sequence[str], threshold: float
+    ) -> List[List[Tuple[int, float, str, str]]]:
+        """``search`` for many queries in one pass, results in query order.
+
+        Queries that normalise to the same name are scored once, and posting
+        lists and per-row character counts are decoded once for the batch, so
+        keys shared between names (common tokens, trigrams) cost one lookup.
+        """
+        postings: Dict[str, Sequence[int]] = {}
+        char_counts: Dict[int, Counter] = {}
+
+        def rows_for(key: str) -> Sequence[int]:
+            rows = postings.get(key)
+            if rows is None:
+                rows = postings[key] = tuple(self._rows(key))
+            return rows
+
+        def target_chars(row: int) -> Counter:
+            counts = char_counts.get(row)
+            if counts is None:
+                counts = char_counts[row] = Counter(self.name_norms[row])
+            return counts
+
+        by_norm: Dict[str, List[Tuple[int, float, str, str]]] = {}
+        results = []
+        for query in queries:
+            query_norm = normalize_name(query)
+            hits = by_norm.get(query_norm)
+            if hits is None:
+                hits = by_norm[query_norm] = self._search_normalized(
+                    query_norm, threshold, rows_for, target_chars
+                )
+            results.append(hits)
+        return results
+
+    def _search_normalized(
+        self,
+        query_norm: str,
+        threshold: float,
+        rows_for: Optional[Callable[[str], Sequence[int]]] = None,
+        target_chars: Optional[Callable[[int], Counter]] = None,
+    ) -> List[Tuple[int, float, str, str]]:
+        if not query_norm:
+            return []
+        if threshold < LOSSLESS_MIN_THRESHOLD:
+            rows: Iterable[int] = range(len(self.entities))
+        else:
+            exact, candidates, shared_tokens = self._select(query_norm, rows_for)
+            query_chars = Counter(query_norm)
+            query_set_length = _joined_token_set_length(sorted(set(query_norm.split())))
+            rows = sorted(
+                exact
+                | {
+                    row
+                    for row in candidates - exact
+                    if self._score_upper_bound(
+                        query_norm,
+                        query_chars,
+                        query_set_length,
+                        row,
+                        shared_tokens.get(row),
+                        target_chars(row) if target_chars else None,
+                    ) >= threshold
+                }
+            )
+        hits = []
+        for row in rows:
+            score, match_type, match_method = calculate_match_score(
+                query_norm,
+                self.name_norms[row],
+                self.alias_norms[row],
+                normalized=True,
+            )
+            if score >= threshold:
+                hits.append((row, score, match_type, match_method))
+        return hits
+
+_registry: Dict[str, SanctionsIndex] = {}
+_registry_lock = threading.Lock()
+
+
+def _index_root() -> Path:
+    return Path(getattr(settings, "SANCTIONS_INDEX_DIR", "/tmp/lcopilot_sanctions_index"))
+
+
+def _persist(index: SanctionsIndex, directory: Path) -> Optional[SanctionsIndex]:
+    """Save atomically (build in a temp dir, then rename) and reopen memory-mapped."""
+    staging = directory.with_name(f"{directory.name}.tmp-{uuid.uuid4().hex}")
+    try:
+        index.save(staging)
+        os.replace(staging, directory)
+    except OSError as exc:
+        shutil.rmtree(staging, ignore_errors=True)
+        if not directory.exists():
+            logger.warning("Sanctions index not persisted to %s: %s", directory, exc)
+            return None
+        # Another worker published the same index first.
+    return SanctionsIndex.load(directory)
+
+
+def load_or_build_index(entities: Sequence[Dict[str, Any]]) -> SanctionsIndex:
+    """Index for a list: process registry, then disk, then a fresh build."""
+    fingerprint = list_fingerprint(entities)
+    with _registry_lock:
+        index = _registry.get(fingerprint)
+        if index is not None:
+            return index
+        directory = _index_root() / fingerprint[:32]
+        index = SanctionsIndex.load(directory) if directory.exists() else None
+        if index is None:
+            built = SanctionsIndex.build(entities)
+            index = _persist(built, directory) or built
+            logger.info("Built sanctions index: entities=%d keys=%d", len(built), len(built._keys))
+        _registry[fingerprint] = index
+        return index
+
+
+def clear_index_registry() -> None:
+    """Drop in-process indexes (tests, or after list updates)."""
+    with _registry_lock:
+        _registry.clear()
+
+
+__all__ = [
+    "INDEX_FORMAT_VERSION",
+    "LOSSLESS_MIN_THRESHOLD",
+    "SanctionsIndex",
+    "clear_index_registry",
+    "list_fingerprint",
+    "load_or_build_index",
+    "soundex",
+]
@@ -182,56 +182,66 @@ async def screen_lc_parties(
     issues = []
     has_match = False
     
+    inputs = []
     for party in parties:
-        try:
-            # Determine screening type
-            screening_type = "vessel" if party.get("is_vessel") else "party"
+        # Determine screening type
+        screening_type = "vessel" if party.get("is_vessel") else "party"
+        
+        # Build screening input
+        additional_data = {}
+        if party.get("is_vessel"):
+            additional_data = {
+                "imo": party.get("imo"),
+                "mmsi": party.get("mmsi"),
+                "flag_state": party.get("country"),
+            }
+        
+        inputs.append(ScreeningInput(
+            query=party["name"],
+            screening_type=screening_type,
+            country=party.get("country"),
+            lists=lists or [],
+            additional_data=additional_data,
+        ))
+    
+    # Run screening: one batch pass over the list indexes for every party
+    try:
+        results = await service.screen_batch(inputs)
+    except Exception as e:
+        logger.error(f"Batch sanctions screening failed, screening parties one by one: {e}")
+        results = []
+        for party, input_data in zip(parties, inputs):
+            try:
+                results.append(await service.screen(input_data))
+            except Exception as party_error:
+                logger.error(f"Error screening party {party['name']}: {party_error}")
+                results.append(None)
+    
+    for party, result in zip(parties, results):
+        if result is None:
+            continue
+        
+        # Check result
+        if result.status in ("match", "potential_match"):
+            if result.status == "match":
+                has_match = True
             
-            # Build screening input
-            additional_data = {}
-            if party.get("is_vessel"):
-                additional_data = {
-                    "imo": party.get("imo"),
-                    "mmsi": party.get("mmsi"),
-                    "flag_state": party.get("country"),
-                }
+            # Build issue for display
+            severity = "critical" if result.status == "match" else "major"
+            match_info = result.matches[0] if result.matches else None
             
-            input_data = ScreeningInput(
-                query=party["name"],
-                screening_type=screening_type,
-                country=party.get("country"),
-                lists=lists or [],
-                additional_data=additional_data,
+            issue = _build_sanctions_issue(
+                party=party,
+                result=result,
+                match_info=match_info,
+                severity=severity,
             )
+            issues.append(issue)
             
-            # Run screening
-            result = await service.screen(input_data)
-            
-            # Check result
-            if result.status in ("match", "potential_match"):
-                if result.status == "match":
-                    has_match = True
-                
-                # Build issue for display
-                severity = "critical" if result.status == "match" else "major"
-                match_info = result.matches[0] if result.matches else None
-                
-                issue = _build_sanctions_issue(
-                    party=party,
-                    result=result,
-                    match_info=match_info,
-                    severity=severity,
-                )
-                issues.append(issue)
-                
-                logger.warning(
-                    f"Sanctions {result.status} found for {party['type']}: {party['name']} "
-                    f"(score={result.highest_score:.2f}, lists={result.lists_screened})"
-                )
-        
-        except Exception as e:
-            logger.error(f"Error screening party {party['name']}: {e}")
-            continue
+            logger.warning(
+                f"Sanctions {result.status} found for {party['type']}: {party['name']} "
+                f"(score={result.highest_score:.2f}, lists={result.lists_screened})"
+            )
     
     logger.info(
         f"Screened {len(parties)} parties: {len(issues)} sanctions issues found, "
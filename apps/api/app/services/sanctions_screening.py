@@ -9,6 +9,7 @@ import re
 import uuid
 import logging
 import asyncio
+import threading
 from datetime import datetime
 from typing import Optional, List, Dict, Any, Tuple
 from pydantic import BaseModel
@@ -44,6 +45,7 @@ class PartyMatch(BaseModel):
     source_id: Optional[str] = None
     listed_date: Optional[str] = None
     remarks: Optional[str] = None
+    also_listed_on: List[str] = []  # Other lists carrying the same entity (batch screening)
 
 
 class ScreeningInput(BaseModel):
@@ -362,17 +364,25 @@ def _has_meaningful_entity_overlap(query_norm: str, target_norm: str) -> bool:
     return False
 
 
-def calculate_match_score(query: str, target: str, aliases: List[str] = None) -> Tuple[float, str, str]:
+def calculate_match_score(
+    query: str,
+    target: str,
+    aliases: List[str] = None,
+    normalized: bool = False,
+) -> Tuple[float, str, str]:
     """
     Calculate comprehensive match score.
     
+    ``normalized=True`` means query, target and aliases already went through
+    ``normalize_name`` (the screening index stores them that way).
+    
     Returns: (score, match_type, match_method)
     """
     if not query or not target:
         return (0.0, "none", "none")
     
-    query_norm = normalize_name(query)
-    target_norm = normalize_name(target)
+    query_norm = query if normalized else normalize_name(query)
+    target_norm = target if normalized else normalize_name(target)
     
     # Exact match
     if query_norm == target_norm:
@@ -381,7 +391,7 @@ def calculate_match_score(query: str, target: str, aliases: List[str] = None) ->
     # Check aliases
     if aliases:
         for alias in aliases:
-            alias_norm = normalize_name(alias)
+            alias_norm = alias if normalized else normalize_name(alias)
             if query_norm == alias_norm:
                 return (98.0, "alias", "exact_alias")
     
@@ -389,7 +399,14 @@ def calculate_match_score(query: str, target: str, aliases: List[str] = None) ->
     if query_norm in target_norm or target_norm in query_norm:
         ratio = min(len(query_norm), len(target_norm)) / max(len(query_norm), len(target_norm))
         return (85.0 * ratio, "fuzzy", "substring")
-    
+
+    # One token set containing the other scores 100 on token set ratio,
+    # which Jaro-Winkler of two different strings cannot beat.
+    query_tokens = set(query_norm.split())
+    target_tokens = set(target_norm.split())
+    if query_tokens <= target_tokens or target_tokens <= query_tokens:
+        return (100.0, "fuzzy", "token_set")
+
     # Jaro-Winkler
     jw_score = jaro_winkler_similarity(query_norm, target_norm) * 100
     
@@ -553,6 +570,9 @@ class SanctionsScreeningService:
             "UK_OFSI": {"name": "UK OFSI", "jurisdiction": "UK"},
             "BIS_EL": {"name": "BIS Entity List", "jurisdiction": "US"},
         }
+        # list_code -> (entity list the index was built from, index)
+        self._indexes: Dict[str, Tuple[List[Dict], Any]] = {}
+        self._indexes_lock = threading.Lock()
     
     def _get_entities_for_list(self, list_code: str) -> List[Dict]:
         """Get sample entities for a list (in production, from DB)."""
@@ -565,6 +585,29 @@ class SanctionsScreeningService:
         else:
             return []
     
+    def _list_index(self, list_code: str):
+        """Screening index for a list, rebuilt only when the list object changes."""
+        entities = self._get_entities_for_list(list_code)
+        if not entities:
+            return None
+        cached = self._indexes.get(list_code)
+        if cached is not None and cached[0] is entities:
+            return cached[1]
+        from app.services.sanctions_index import load_or_build_index
+
+        with self._indexes_lock:
+            cached = self._indexes.get(list_code)
+            if cached is not None and cached[0] is entities:
+                return cached[1]
+            index = load_or_build_index(entities)
+            self._indexes[list_code] = (entities, index)
+            return index
+
+    def warm_indexes(self) -> None:
+        """Load (memory-map) or build every list's index; called at startup."""
+        for list_code in self.available_lists:
+            self._list_index(list_code)
+
     def _screen_against_list(
         self, 
         query: str, 
@@ -572,36 +615,45 @@ class SanctionsScreeningService:
         list_code: str,
         threshold: float = 70.0
     ) -> List[PartyMatch]:
-        """Screen a query against a specific list."""
+        """Screen a query against a specific list (candidates come from the list index)."""
         matches = []
-        entities = self._get_entities_for_list(list_code)
+        index = self._list_index(list_code)
+        if index is None:
+            return matches
         list_info = self.available_lists.get(list_code, {})
         
-        for entity in entities:
-            score, match_type, match_method = calculate_match_score(
-                query_normalized,
-                entity["name"],
-                entity.get("aliases", [])
-            )
-            
+        for row, score, match_type, match_method in index.search(query_normalized, threshold):
             if score >= threshold:
-                matches.append(PartyMatch(
-                    list_code=list_code,
-                    list_name=list_info.get("name", list_code),
-                    matched_name=entity["name"],
-                    matched_type=entity.get("type", "entity"),
-                    match_type=match_type,
-                    match_score=round(score, 1),
-                    match_method=match_method,
-                    programs=entity.get("programs", []),
-                    country=entity.get("country"),
-                    source_id=entity.get("source_id"),
-                    listed_date=entity.get("listed_date"),
-                    remarks=entity.get("remarks"),
+                matches.append(self._list_match(
+                    list_code, list_info, index.entities[row], score, match_type, match_method
                 ))
         
         return matches
     
+    @staticmethod
+    def _list_match(
+        list_code: str,
+        list_info: Dict[str, Any],
+        entity: Dict[str, Any],
+        score: float,
+        match_type: str,
+        match_method: str,
+    ) -> PartyMatch:
+        return PartyMatch(
+            list_code=list_code,
+            list_name=list_info.get("name", list_code),
+            matched_name=entity["name"],
+            matched_type=entity.get("type", "entity"),
+            match_type=match_type,
+            match_score=round(score, 1),
+            match_method=match_method,
+            programs=entity.get("programs", []),
+            country=entity.get("country"),
+            source_id=entity.get("source_id"),
+            listed_date=entity.get("listed_date"),
+            remarks=entity.get("remarks"),
+        )
+    
     def _check_country_sanctions(self, country_code: str) -> List[PartyMatch]:
         """Check if country is under comprehensive sanctions."""
         matches = []
@@ -649,6 +701,20 @@ class SanctionsScreeningService:
             )
             all_matches.extend(matches)
         
+        return self._party_result(
+            name, name_normalized, all_matches, lists, country, start_time
+        )
+    
+    def _party_result(
+        self,
+        name: str,
+        name_normalized: str,
+        all_matches: List[PartyMatch],
+        lists: List[str],
+        country: Optional[str],
+        start_time: datetime,
+    ) -> ComprehensiveScreeningResult:
+        """Add country sanctions to list matches and grade the party result."""
         # Check country if provided
         if country:
             country_matches = self._check_country_sanctions(country)
@@ -897,6 +963,65 @@ class SanctionsScreeningService:
             processing_time_ms=processing_time,
         )
     
+    async def screen_batch(
+        self,
+        inputs: List[ScreeningInput],
+        threshold: float = 70.0,
+    ) -> List[ComprehensiveScreeningResult]:
+        """
+        Screen many inputs (e.g. every party and vessel of an LC set) at once.
+        
+        Party names are normalised once and scored per list in a single
+        ``search_many`` pass over the list index; the same entity matched on
+        several lists is reported once, with the other lists in
+        ``also_listed_on``. Vessels and goods go through their own screens,
+        concurrently. Results are returned in input order.
+        """
+        start_time = datetime.utcnow()
+        results: List[Optional[ComprehensiveScreeningResult]] = [None] * len(inputs)
+        
+        party_positions: Dict[Tuple[str, ...], List[int]] = {}
+        other_positions: List[int] = []
+        for position, item in enumerate(inputs):
+            if item.screening_type in ("vessel", "goods"):
+                other_positions.append(position)
+            else:
+                lists_key = tuple(item.lists or self.available_lists.keys())
+                party_positions.setdefault(lists_key, []).append(position)
+        
+        for lists_key, positions in party_positions.items():
+            queries = [inputs[position].query for position in positions]
+            per_query: List[List[PartyMatch]] = [[] for _ in positions]
+            for list_code in lists_key:
+                index = self._list_index(list_code)
+                if index is None:
+                    continue
+                list_info = self.available_lists.get(list_code, {})
+                for slot, hits in enumerate(index.search_many(queries, threshold)):
+                    per_query[slot].extend(
+                        self._list_match(list_code, list_info, index.entities[row], score, match_type, method)
+                        for row, score, match_type, method in hits
+                    )
+            for slot, position in enumerate(positions):
+                item = inputs[position]
+                results[position] = self._party_result(
+                    item.query,
+                    normalize_name(item.query),
+                    _dedupe_across_lists(per_query[slot]),
+                    list(lists_key),
+                    item.country,
+                    start_time,
+                )
+        
+        if other_positions:
+            screened = await asyncio.gather(
+                *(self.screen(inputs[position]) for position in other_positions)
+            )
+            for position, result in zip(other_positions, screened):
+                results[position] = result
+        
+        return results
+    
     async def screen(self, input: ScreeningInput) -> ComprehensiveScreeningResult:
         """
         Main screening entry point. Routes to appropriate screening method.
@@ -937,6 +1062,19 @@ class SanctionsScreeningService:
         return self.available_lists
 
 
+def _dedupe_across_lists(matches: List[PartyMatch]) -> List[PartyMatch]:
+    """Keep the best match per listed entity; record the other lists it is on."""
+    best: Dict[Tuple[str, str], PartyMatch] = {}
+    for match in sorted(matches, key=lambda m: m.match_score, reverse=True):
+        key = (normalize_name(match.matched_name), match.matched_type)
+        kept = best.get(key)
+        if kept is None:
+            best[key] = match
+        elif match.list_code != kept.list_code and match.list_code not in kept.also_listed_on:
+            kept.also_listed_on = [*kept.also_listed_on, match.list_code]
+    return list(best.values())
+
+
 # Singleton
 _screening_service: Optional[SanctionsScreeningService] = None
 
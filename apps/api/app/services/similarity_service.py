@@ -12,12 +12,14 @@ from difflib import SequenceMatcher
 
 from app.models.duplicate_detection import (
     LCFingerprint,
+    LCFingerprintBand,
     LCSimilarity,
     LCMergeHistory,
     DetectionMethod,
     MergeType,
 )
 from app.models import ValidationSession, SessionStatus
+from app.services import lc_minhash
 
 
 class SimilarityService:
@@ -37,6 +39,9 @@ class SimilarityService:
         'port_of_discharge',
     ]
     
+    # Candidate fingerprints pulled from the LSH bands per requested result
+    LSH_CANDIDATES_PER_RESULT = 20
+    
     # Thresholds for similarity detection
     HIGH_SIMILARITY_THRESHOLD = 0.85  # Very likely duplicate
     MEDIUM_SIMILARITY_THRESHOLD = 0.70  # Possible duplicate
@@ -76,6 +81,15 @@ class SimilarityService:
         
         return metadata
     
+    def extract_goods_text(self, extracted_data: Dict[str, Any]) -> str:
+        """Normalized goods description (shingled into the MinHash signature)"""
+        lc_data = extracted_data.get('lc') if isinstance(extracted_data.get('lc'), dict) else {}
+        for source in (extracted_data.get('bank_metadata') or {}, extracted_data, lc_data):
+            value = source.get('goods_description') or source.get('goods')
+            if isinstance(value, str) and value.strip():
+                return self.normalize_field_value(value)
+        return ""
+    
     def generate_fingerprint(self, session: ValidationSession) -> Tuple[str, Dict[str, Any]]:
         """Generate a content hash and fingerprint data for a validation session"""
         if not session.extracted_data:
@@ -94,8 +108,29 @@ class SimilarityService:
         fingerprint_json = json.dumps(fingerprint_data, sort_keys=True)
         content_hash = hashlib.sha256(fingerprint_json.encode()).hexdigest()
         
+        # Goods text only feeds the MinHash signature, not the content hash
+        goods_text = self.extract_goods_text(session.extracted_data)
+        if goods_text:
+            fingerprint_data['goods_text'] = goods_text
+        
         return content_hash, fingerprint_data
     
+    def index_fingerprint(self, fingerprint: LCFingerprint) -> None:
+        """Refresh a fingerprint's MinHash signature and LSH band rows (caller commits)"""
+        signature = lc_minhash.minhash_signature(
+            lc_minhash.shingles(fingerprint.fingerprint_data or {})
+        )
+        fingerprint.minhash_signature = signature or []  # [] = indexed, nothing to shingle
+        if fingerprint.id is None:
+            self.db.flush()
+        self.db.query(LCFingerprintBand).filter(
+            LCFingerprintBand.fingerprint_id == fingerprint.id
+        ).delete(synchronize_session=False)
+        self.db.add_all(
+            LCFingerprintBand(fingerprint_id=fingerprint.id, band_key=key)
+            for key in lc_minhash.band_keys(signature)
+        )
+    
     def create_or_update_fingerprint(
         self,
         session: ValidationSession,
@@ -122,6 +157,7 @@ class SimilarityService:
             existing.client_name = client_name
             if company_id:
                 existing.company_id = company_id
+            self.index_fingerprint(existing)
             self.db.commit()
             self.db.refresh(existing)
             return existing
@@ -136,10 +172,25 @@ class SimilarityService:
                 fingerprint_data=fingerprint_data,
             )
             self.db.add(fingerprint)
+            self.index_fingerprint(fingerprint)
             self.db.commit()
             self.db.refresh(fingerprint)
             return fingerprint
     
+    def backfill_minhash(self, batch_size: int = 500) -> int:
+        """Index fingerprints created before MinHash signatures existed; returns count"""
+        indexed = 0
+        while True:
+            batch = self.db.query(LCFingerprint).filter(
+                LCFingerprint.minhash_signature.is_(None)
+            ).limit(batch_size).all()
+            if not batch:
+                return indexed
+            for fingerprint in batch:
+                self.index_fingerprint(fingerprint)
+            self.db.commit()
+            indexed += len(batch)
+    
     def compute_similarity(
         self,
         fingerprint1: LCFingerprint,
@@ -234,8 +285,26 @@ class SimilarityService:
         if not fingerprint:
             return []
         
-        # Find similar fingerprints (same content hash or similar LC number/client)
-        candidates_query = self.db.query(LCFingerprint).filter(
+        if fingerprint.minhash_signature is None:
+            # Fingerprint predates MinHash indexing: index it now
+            self.index_fingerprint(fingerprint)
+            self.db.commit()
+        
+        # Near duplicates: fingerprints sharing LSH bands, most shared bands first
+        band_keys = lc_minhash.band_keys(fingerprint.minhash_signature)
+        candidate_ids = set()
+        if band_keys:
+            shared_bands = func.count(LCFingerprintBand.band_key)
+            band_rows = self.db.query(LCFingerprintBand.fingerprint_id).filter(
+                LCFingerprintBand.band_key.in_(band_keys),
+                LCFingerprintBand.fingerprint_id != fingerprint.id,
+            ).group_by(LCFingerprintBand.fingerprint_id).order_by(
+                shared_bands.desc()
+            ).limit(limit * self.LSH_CANDIDATES_PER_RESULT).all()
+            candidate_ids.update(row[0] for row in band_rows)
+        
+        # Exact matches (also covers fingerprints not indexed yet)
+        exact_rows = self.db.query(LCFingerprint.id).filter(
             and_(
                 LCFingerprint.id != fingerprint.id,
                 LCFingerprint.validation_session_id != session_id,
@@ -247,51 +316,70 @@ class SimilarityService:
                     ),
                 ),
             )
-        )
+        ).order_by(LCFingerprint.created_at.desc()).limit(limit * 2).all()
+        candidate_ids.update(row[0] for row in exact_rows)
+        
+        if not candidate_ids:
+            return []
+        
+        candidate_fingerprints = self.db.query(LCFingerprint).filter(
+            LCFingerprint.id.in_(candidate_ids),
+            LCFingerprint.validation_session_id != session_id,
+        ).all()
         
-        # If company_id is set, prefer same company
-        if fingerprint.company_id:
-            candidates_query = candidates_query.order_by(
-                func.nullif(LCFingerprint.company_id == fingerprint.company_id, False).desc(),
-                LCFingerprint.created_at.desc()
+        # Rank by estimated similarity, preferring the same company, then recency
+        def _rank(candidate_fp: LCFingerprint):
+            exact = candidate_fp.content_hash == fingerprint.content_hash
+            estimate = lc_minhash.estimated_jaccard(
+                fingerprint.minhash_signature, candidate_fp.minhash_signature
             )
-        else:
-            candidates_query = candidates_query.order_by(LCFingerprint.created_at.desc())
+            same_company = bool(fingerprint.company_id) and candidate_fp.company_id == fingerprint.company_id
+            created = candidate_fp.created_at.timestamp() if candidate_fp.created_at else 0.0
+            return (exact, estimate, same_company, created)
         
-        candidate_fingerprints = candidates_query.limit(limit * 2).all()  # Get more for filtering
+        candidate_fingerprints.sort(key=_rank, reverse=True)
+        candidate_fingerprints = candidate_fingerprints[:limit * 2]  # Get more for filtering
         
         # Compute similarity scores and filter by threshold
-        candidates = []
+        scored = []
         for candidate_fp in candidate_fingerprints:
             similarity = self.compute_similarity(fingerprint, candidate_fp)
-            
             if similarity['similarity_score'] >= threshold:
-                # Get validation session details
-                session = self.db.query(ValidationSession).filter(
-                    ValidationSession.id == candidate_fp.validation_session_id
-                ).first()
-                
-                # Filter by org_id if provided (phase 1: metadata-based filtering)
-                if session and org_id:
-                    from sqlalchemy.dialects.postgresql import JSONB
-                    from sqlalchemy import cast
-                    session_org_id = cast(session.extracted_data, JSONB)[
-                        'bank_metadata'
-                    ]['org_id'].astext if session.extracted_data else None
-                    if session_org_id != org_id:
-                        continue  # Skip this candidate
-                
-                if session:
-                    candidates.append({
-                        'session_id': candidate_fp.validation_session_id,
-                        'lc_number': candidate_fp.lc_number,
-                        'client_name': candidate_fp.client_name,
-                        'similarity_score': similarity['similarity_score'],
-                        'content_similarity': similarity['content_similarity'],
-                        'metadata_similarity': similarity['metadata_similarity'],
-                        'field_matches': similarity['field_matches'],
-                        'completed_at': session.processing_completed_at,
-                    })
+                scored.append((candidate_fp, similarity))
+        
+        if not scored:
+            return []
+        
+        # Load the candidate sessions in one query
+        sessions = {
+            session.id: session
+            for session in self.db.query(ValidationSession).filter(
+                ValidationSession.id.in_([candidate_fp.validation_session_id for candidate_fp, _ in scored])
+            ).all()
+        }
+        
+        candidates = []
+        for candidate_fp, similarity in scored:
+            session = sessions.get(candidate_fp.validation_session_id)
+            if not session:
+                continue
+            
+            # Filter by org_id if provided (phase 1: metadata-based filtering)
+            if org_id:
+                bank_metadata = session.bank_metadata
+                if str(bank_metadata.get('org_id') or '') != str(org_id):
+                    continue  # Skip this candidate
+            
+            candidates.append({
+                'session_id': candidate_fp.validation_session_id,
+                'lc_number': candidate_fp.lc_number,
+                'client_name': candidate_fp.client_name,
+                'similarity_score': similarity['similarity_score'],
+                'content_similarity': similarity['content_similarity'],
+                'metadata_similarity': similarity['metadata_similarity'],
+                'field_matches': similarity['field_matches'],
+                'completed_at': session.processing_completed_at,
+            })
         
         # Sort by similarity score descending
         candidates.sort(key=lambda x: x['similarity_score'], reverse=True)
@@ -42,7 +42,10 @@ import asyncio
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from app.config import settings
 
@@ -57,6 +60,7 @@ logger = logging.getLogger(__name__)
 async def validate_document_with_pipeline(
     document_data: Dict[str, Any],
     document_type: str,
+    timings_out: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     """Run the three-pass validation pipeline and return the merged findings.
 
@@ -65,6 +69,11 @@ async def validate_document_with_pipeline(
     layer raised it (``_source_layer``), whether the Opus veto modified it
     (``_vetoed``), and any veto reason (``_veto_reason``).
 
+    Passes A and B do not depend on each other, so the deterministic rules
+    run while the AI tiers are in flight; wall time is max(A, B) + C.
+    ``timings_out`` (optional) receives per-pass durations in milliseconds
+    plus the critical path of the run.
+
     When tiered AI is disabled, this function delegates straight to the
     legacy ``validate_document_async`` and returns its output as-is.
     """
@@ -77,11 +86,16 @@ async def validate_document_with_pipeline(
         # Legacy path: deterministic-only.
         return await validate_document_async(document_data, document_type)
 
-    # Pass A — tiered AI validation (failure isolated)
-    ai_findings: List[Dict[str, Any]] = []
-    if tiered_enabled:
+    timings: Dict[str, Any] = timings_out if timings_out is not None else {}
+    started = time.perf_counter()
+
+    async def _pass_a() -> List[Dict[str, Any]]:
+        # Pass A — tiered AI validation (failure isolated)
+        if not tiered_enabled:
+            return []
+        pass_started = time.perf_counter()
         try:
-            ai_findings = await asyncio.wait_for(
+            return await asyncio.wait_for(
                 _run_tiered_ai_validation_pass(document_data, document_type),
                 timeout=float(getattr(settings, "VALIDATION_AI_PASS_TIMEOUT_SECONDS", 60)),
             )
@@ -98,23 +112,39 @@ async def validate_document_with_pipeline(
                 exc,
                 exc_info=True,
             )
+        finally:
+            timings["ai_pass_ms"] = _elapsed_ms(pass_started)
+        return []
 
-    # Pass B — deterministic rules (existing pipeline)
-    deterministic_findings: List[Dict[str, Any]] = []
-    try:
-        deterministic_findings = await validate_document_async(document_data, document_type)
-        for finding in deterministic_findings:
-            finding.setdefault("_source_layer", "deterministic")
-    except Exception as exc:  # noqa: BLE001
-        logger.error(
-            "Deterministic rules pass failed for document_type=%s: %s",
-            document_type,
-            exc,
-            exc_info=True,
-        )
+    async def _pass_b() -> List[Dict[str, Any]]:
+        # Pass B — deterministic rules (existing pipeline)
+        pass_started = time.perf_counter()
+        try:
+            findings = await validate_document_async(document_data, document_type)
+            for finding in findings:
+                finding.setdefault("_source_layer", "deterministic")
+            return findings
+        except Exception as exc:  # noqa: BLE001
+            logger.error(
+                "Deterministic rules pass failed for document_type=%s: %s",
+                document_type,
+                exc,
+                exc_info=True,
+            )
+        finally:
+            timings["deterministic_pass_ms"] = _elapsed_ms(pass_started)
+        return []
+
+    ai_findings, deterministic_findings = await asyncio.gather(_pass_a(), _pass_b())
+    timings["critical_path_pass"] = (
+        "ai" if timings.get("ai_pass_ms", 0) > timings["deterministic_pass_ms"] else "deterministic"
+    )
+
+    final_findings = [*ai_findings, *deterministic_findings]
 
     # Pass C — Opus veto (failure isolated)
     if veto_enabled and (ai_findings or deterministic_findings):
+        pass_started = time.perf_counter()
         try:
             final_findings = await asyncio.wait_for(
                 _run_opus_veto_pass(
@@ -125,7 +155,6 @@ async def validate_document_with_pipeline(
                 ),
                 timeout=float(getattr(settings, "VALIDATION_VETO_TIMEOUT_SECONDS", 90)),
             )
-            return final_findings
         except asyncio.TimeoutError:
             logger.warning(
                 "Opus veto pass timed out after %ss for document_type=%s",
@@ -139,9 +168,17 @@ async def validate_document_with_pipeline(
                 exc,
                 exc_info=True,
             )
+        finally:
+            timings["veto_pass_ms"] = _elapsed_ms(pass_started)
+
+    # Veto disabled or failed — final_findings is AI + deterministic combined.
+    timings["total_ms"] = _elapsed_ms(started)
+    logger.info("Validation pipeline timings for document_type=%s: %s", document_type, timings)
+    return final_findings
+
 
-    # Veto disabled or failed — return AI + deterministic findings combined.
-    return [*ai_findings, *deterministic_findings]
+def _elapsed_ms(started: float) -> int:
+    return int(round((time.perf_counter() - started) * 1000))
 
 
 # ---------------------------------------------------------------------------
@@ -344,6 +381,95 @@ def _format_doc_section(label: str, payload: Optional[Dict[str, Any]], char_budg
     return f"### {pretty_label}\n```json\n{body}\n```"
 
 
+# Tiers, in escalation order, and the tiers whose successor may be started
+# speculatively while they are still in flight.
+_AI_TIERS: Tuple[str, ...] = ("L1", "L2", "L3")
+_SPECULATIVE_TIERS: frozenset = frozenset({"L1"})
+
+# Recent call latencies kept per tier for the speculative budget.
+_TIER_LATENCY_WINDOW = 200
+
+
+class _TierLatencyTracker:
+    """Rolling window of AI tier call latencies (seconds)."""
+
+    def __init__(self, window: int = _TIER_LATENCY_WINDOW) -> None:
+        self._window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tier: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(tier, deque(maxlen=self._window)).append(seconds)
+
+    def percentile(self, tier: str, pct: float, min_samples: int) -> Optional[float]:
+        """Nearest-rank percentile, or None until ``min_samples`` calls were seen."""
+        with self._lock:
+            samples = sorted(self._samples.get(tier) or ())
+        if not samples or len(samples) < max(1, min_samples):
+            return None
+        rank = max(1, min(len(samples), int(-(-len(samples) * pct // 100))))
+        return samples[rank - 1]
+
+
+_tier_latency = _TierLatencyTracker()
+
+
+def _speculative_budget(tier: str) -> Optional[float]:
+    """Seconds to wait on ``tier`` before starting the next tier alongside it."""
+    if tier not in _SPECULATIVE_TIERS:
+        return None
+    if not bool(getattr(settings, "VALIDATION_AI_SPECULATIVE_ESCALATION_ENABLED", False)):
+        return None
+    return _tier_latency.percentile(
+        tier,
+        float(getattr(settings, "VALIDATION_AI_SPECULATIVE_PERCENTILE", 90)),
+        int(getattr(settings, "VALIDATION_AI_SPECULATIVE_MIN_SAMPLES", 20)),
+    )
+
+
+async def _call_ai_tier(tier: str, prompt: str) -> Optional[Dict[str, Any]]:
+    """Run one tier and return its parsed JSON object, or None to escalate."""
+    from app.services.llm_provider import LLMProviderFactory
+
+    started = time.perf_counter()
+    try:
+        result_tuple = await LLMProviderFactory.generate_with_fallback(
+            prompt=prompt,
+            system_prompt=_AI_VALIDATION_SYSTEM_PROMPT,
+            router_layer=tier,
+            temperature=0.1,
+            max_tokens=2000,
+        )
+        # generate_with_fallback returns (output_text, tokens_in, tokens_out, provider_used)
+        response_text = result_tuple[0] if isinstance(result_tuple, tuple) else str(result_tuple)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("AI validation tier=%s failed: %s", tier, exc)
+        return None
+    _tier_latency.record(tier, time.perf_counter() - started)
+
+    if not response_text:
+        logger.info("AI validation tier=%s returned empty — escalating", tier)
+        return None
+
+    parsed = _safe_parse_json(response_text)
+    if not parsed:
+        logger.info("AI validation tier=%s JSON parse failed — escalating", tier)
+        return None
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _is_strong_enough(parsed: Optional[Dict[str, Any]]) -> bool:
+    if not parsed:
+        return False
+    overall = parsed.get("overall_confidence")
+    return (
+        isinstance(overall, (int, float))
+        and float(overall) >= 0.7
+        and not bool(parsed.get("requested_escalation"))
+    )
+
+
 async def _run_tiered_ai_validation_pass(
     document_data: Dict[str, Any],
     document_type: str,
@@ -355,10 +481,15 @@ async def _run_tiered_ai_validation_pass(
     L1 first, escalate to L2 only if the result is empty / low confidence /
     explicit-escalation-requested, then L3 as the last resort.
 
+    With VALIDATION_AI_SPECULATIVE_ESCALATION_ENABLED, L2 is started
+    alongside L1 once L1 has run past its recent latency percentile. A
+    strong answer from either call wins and the other is cancelled; a weak
+    one is resolved in tier order exactly as in the serial path.
+
     Returns a list of finding dicts, each tagged with ``_source_layer``.
     """
     try:
-        from app.services.llm_provider import LLMProviderFactory
+        from app.services.llm_provider import LLMProviderFactory  # noqa: F401
     except ImportError:
         logger.warning("LLMProviderFactory not available — skipping tiered AI validation")
         return []
@@ -368,57 +499,68 @@ async def _run_tiered_ai_validation_pass(
     findings: List[Dict[str, Any]] = []
     last_overall_confidence: Optional[float] = None
     last_layer_used: Optional[str] = None
+    calls: Dict[str, "asyncio.Future[Optional[Dict[str, Any]]]"] = {}
 
-    for tier in ("L1", "L2", "L3"):
-        try:
-            result_tuple = await LLMProviderFactory.generate_with_fallback(
-                prompt=prompt,
-                system_prompt=_AI_VALIDATION_SYSTEM_PROMPT,
-                router_layer=tier,
-                temperature=0.1,
-                max_tokens=2000,
-            )
-            # generate_with_fallback returns (output_text, tokens_in, tokens_out, provider_used)
-            response_text = result_tuple[0] if isinstance(result_tuple, tuple) else str(result_tuple)
-        except Exception as exc:  # noqa: BLE001
-            logger.warning("AI validation tier=%s failed: %s", tier, exc)
-            continue
-
-        if not response_text:
-            logger.info("AI validation tier=%s returned empty — escalating", tier)
-            continue
-
-        parsed = _safe_parse_json(response_text)
-        if not parsed:
-            logger.info("AI validation tier=%s JSON parse failed — escalating", tier)
-            continue
-
-        raw_findings = parsed.get("findings") if isinstance(parsed, dict) else None
-        overall = parsed.get("overall_confidence") if isinstance(parsed, dict) else None
-        requested_escalation = bool(parsed.get("requested_escalation")) if isinstance(parsed, dict) else False
+    def _findings_of(parsed: Dict[str, Any], tier: str) -> List[Dict[str, Any]]:
+        raw_findings = parsed.get("findings")
+        if not isinstance(raw_findings, list):
+            return findings
+        return [_normalize_ai_finding(f, tier) for f in raw_findings if isinstance(f, dict)]
 
-        if isinstance(raw_findings, list):
-            findings = [_normalize_ai_finding(f, tier) for f in raw_findings if isinstance(f, dict)]
-        last_overall_confidence = overall if isinstance(overall, (int, float)) else last_overall_confidence
-        last_layer_used = tier
+    try:
+        for position, tier in enumerate(_AI_TIERS):
+            call = calls.get(tier)
+            if call is None:
+                call = calls[tier] = asyncio.ensure_future(_call_ai_tier(tier, prompt))
+            next_tier = _AI_TIERS[position + 1] if position + 1 < len(_AI_TIERS) else None
+
+            budget = _speculative_budget(tier) if next_tier and next_tier not in calls else None
+            if budget is not None:
+                done, _ = await asyncio.wait({call}, timeout=budget)
+                if not done:
+                    logger.info(
+                        "AI validation tier=%s past its %.2fs budget — starting %s speculatively",
+                        tier, budget, next_tier,
+                    )
+                    calls[next_tier] = asyncio.ensure_future(_call_ai_tier(next_tier, prompt))
+
+            speculative = calls.get(next_tier) if next_tier else None
+            if speculative is not None and not call.done():
+                await asyncio.wait({call, speculative}, return_when=asyncio.FIRST_COMPLETED)
+                if not call.done() and _is_strong_enough(speculative.result()):
+                    parsed = speculative.result()
+                    findings = _findings_of(parsed, next_tier)
+                    logger.info(
+                        "AI validation tier=%s accepted ahead of %s (confidence=%s, findings=%d)",
+                        next_tier, tier, parsed.get("overall_confidence"), len(findings),
+                    )
+                    return findings
+
+            parsed = await call
+            if parsed is None:
+                continue
+
+            overall = parsed.get("overall_confidence")
+            findings = _findings_of(parsed, tier)
+            last_overall_confidence = overall if isinstance(overall, (int, float)) else last_overall_confidence
+            last_layer_used = tier
+
+            if _is_strong_enough(parsed):
+                logger.info(
+                    "AI validation tier=%s accepted (confidence=%s, findings=%d)",
+                    tier, overall, len(findings),
+                )
+                return findings
 
-        # Decide whether to escalate
-        is_strong_enough = (
-            isinstance(overall, (int, float))
-            and float(overall) >= 0.7
-            and not requested_escalation
-        )
-        if is_strong_enough:
             logger.info(
-                "AI validation tier=%s accepted (confidence=%s, findings=%d)",
-                tier, overall, len(findings),
+                "AI validation tier=%s weak (confidence=%s, requested_escalation=%s) — escalating",
+                tier, overall, bool(parsed.get("requested_escalation")),
             )
-            return findings
-
-        logger.info(
-            "AI validation tier=%s weak (confidence=%s, requested_escalation=%s) — escalating",
-            tier, overall, requested_escalation,
-        )
+    finally:
+        # Losing calls (and everything in flight when the pass times out).
+        for call in calls.values():
+            if not call.done():
+                call.cancel()
 
     # All three tiers ran — return whatever the last layer produced.
     if findings:
@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple, Union
 import asyncio
 import os
 import re
@@ -10,7 +10,8 @@ from uuid import UUID
 from app.config import settings
 from app.core.lc_types import LCType
 from app.services.semantic_compare import run_semantic_comparison
-from app.services.rule_evaluator import RuleEvaluator
+from app.services.rule_evaluator import RuleEvaluator, compile_rule
+from app.services.compiled_ruleset import CompiledRuleset, get_or_compile
 
 logger = logging.getLogger(__name__)
 
@@ -568,13 +569,52 @@ def filter_rules_by_lc_context(
     return activate_rules_for_lc(lc_context, rules_with_meta, document_data)
 
 
+class RuleActivationTraits(NamedTuple):
+    """Request-independent activation facts about a rule (see ``activate_rules_for_lc``)."""
+
+    informational: bool
+    target_documents: FrozenSet[str]
+    import_only: bool
+    export_only: bool
+    ports: bool
+    goods: bool
+    third_party: bool
+    negotiability: bool
+    hs_code: bool
+    signed_invoice: bool
+    insurance: bool
+    requires_notice: bool
+
+
+def build_rule_activation_traits(rule: Dict[str, Any], domain_lower: str) -> RuleActivationTraits:
+    tags = _normalize_tags(rule)
+    return RuleActivationTraits(
+        informational=_is_informational_rule(rule, domain_lower),
+        target_documents=frozenset(_rule_targets_documents(rule)),
+        import_only="import" in tags and "export" not in tags,
+        export_only="export" in tags and "import" not in tags,
+        ports=_rule_targets_ports(rule),
+        goods=_rule_targets_goods(rule),
+        third_party=_rule_targets_third_party(rule),
+        negotiability=_rule_targets_negotiability(rule),
+        hs_code=_rule_targets_hs_code(rule),
+        signed_invoice=_rule_targets_signed_invoice(rule),
+        insurance=_rule_targets_insurance(rule),
+        requires_notice=_rule_requires_notice_context(rule),
+    )
+
+
 def activate_rules_for_lc(
     lc_fields: Dict[str, Any],
-    rule_definitions: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    rule_definitions: List[Tuple[Any, Dict[str, Any]]],
     doc_set: Dict[str, Any],
-) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+) -> List[Tuple[Any, Dict[str, Any]]]:
     """
     Rule activation layer. Returns only the rules relevant to this LC package.
+
+    Entries are rule dicts or ``RulePlanEntry`` objects from a compiled
+    ruleset, whose activation traits were computed once at compile time;
+    the returned entries have the same type as the input.
     """
     if not rule_definitions:
         return []
@@ -588,6 +628,7 @@ def activate_rules_for_lc(
     ports_ready = _has_complete_ports(lc_context)
     lc_type = _resolve_workflow_lc_type(lc_context, doc_set)
     doc_ready_map = _build_document_ready_map(lc_context, doc_set)
+    notice_ready = _has_notice_context(doc_set)
 
     drop_stats = {
         "informational": 0,
@@ -603,45 +644,50 @@ def activate_rules_for_lc(
         "notice": 0,
     }
 
-    active: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
-    for rule, meta in rule_definitions:
-        if not isinstance(rule, dict):
-            continue
-        domain_lower = ((meta or {}).get("domain") or "").lower()
-        if _is_informational_rule(rule, domain_lower):
+    active: List[Tuple[Any, Dict[str, Any]]] = []
+    for entry, meta in rule_definitions:
+        if isinstance(entry, dict):
+            traits = build_rule_activation_traits(entry, ((meta or {}).get("domain") or "").lower())
+        else:
+            traits = getattr(entry, "activation", None)
+            if not isinstance(traits, RuleActivationTraits):
+                continue
+        if traits.informational:
             drop_stats["informational"] += 1
             continue
-        if not _rule_matches_doc_requirements(rule, doc_requirements, doc_ready_map):
+        if not _targets_match_doc_requirements(traits.target_documents, doc_requirements, doc_ready_map):
             drop_stats["doc_requirement"] += 1
             continue
-        if not _rule_matches_lc_direction(rule, lc_type):
+        if (lc_type == LCType.EXPORT.value and traits.import_only) or (
+            lc_type == LCType.IMPORT.value and traits.export_only
+        ):
             drop_stats["direction"] += 1
             continue
-        if not ports_ready and _rule_targets_ports(rule):
+        if not ports_ready and traits.ports:
             drop_stats["ports"] += 1
             continue
-        if not goods_ready and _rule_targets_goods(rule):
+        if not goods_ready and traits.goods:
             drop_stats["goods"] += 1
             continue
-        if toggles["third_party_allowed"] and _rule_targets_third_party(rule):
+        if toggles["third_party_allowed"] and traits.third_party:
             drop_stats["third_party"] += 1
             continue
-        if toggles["non_negotiable_allowed"] and _rule_targets_negotiability(rule):
+        if toggles["non_negotiable_allowed"] and traits.negotiability:
             drop_stats["negotiability"] += 1
             continue
-        if not toggles["hs_code_required"] and _rule_targets_hs_code(rule):
+        if not toggles["hs_code_required"] and traits.hs_code:
             drop_stats["hs_code"] += 1
             continue
-        if not toggles["signed_invoice_required"] and _rule_targets_signed_invoice(rule):
+        if not toggles["signed_invoice_required"] and traits.signed_invoice:
             drop_stats["signed_invoice"] += 1
             continue
-        if not toggles["insurance_required"] and _rule_targets_insurance(rule):
+        if not toggles["insurance_required"] and traits.insurance:
             drop_stats["insurance"] += 1
             continue
-        if _rule_requires_notice_context(rule) and not _has_notice_context(doc_set):
+        if traits.requires_notice and not notice_ready:
             drop_stats["notice"] += 1
             continue
-        active.append((rule, meta))
+        active.append((entry, meta))
 
     logger.info(
         "Rule activation summary: total=%s active=%s drops=%s lc_type=%s toggles=%s goods_ready=%s ports_ready=%s doc_ready=%s",
@@ -1223,7 +1269,14 @@ def _rule_matches_doc_requirements(
     requirements: Dict[str, bool],
     doc_ready_map: Dict[str, bool],
 ) -> bool:
-    targets = _rule_targets_documents(rule)
+    return _targets_match_doc_requirements(_rule_targets_documents(rule), requirements, doc_ready_map)
+
+
+def _targets_match_doc_requirements(
+    targets: Union[Set[str], FrozenSet[str]],
+    requirements: Dict[str, bool],
+    doc_ready_map: Dict[str, bool],
+) -> bool:
     if not targets:
         return True
     for target in targets:
@@ -2034,6 +2087,9 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
     from app.services.rules_service import get_rules_service
 
     rules_service = get_rules_service()
+    # Rules services that do not implement compiled plans (e.g. the RulHub
+    # adapter) are compiled here with an identity-keyed memo.
+    load_compiled_ruleset = getattr(rules_service, "get_compiled_ruleset", None)
 
     requested_domain = document_data.get("domain")
     jurisdiction = document_data.get("jurisdiction", "global")
@@ -2062,13 +2118,13 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
         if crossdoc_domain not in domain_sequence:
             domain_sequence.append(crossdoc_domain)
 
-    aggregated_rules: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+    compiled_rulesets: List[Tuple[CompiledRuleset, Dict[str, Any]]] = []
     base_metadata: Optional[Dict[str, Any]] = None
 
     for idx, domain_key in enumerate(domain_sequence):
         resolved_jurisdiction = jurisdiction or "global"
         candidate_jurisdictions = _ruleset_lookup_jurisdictions(domain_key, jurisdiction)
-        ruleset_data = None
+        compiled_ruleset: Optional[CompiledRuleset] = None
         try:
             for lookup_idx, lookup_jurisdiction in enumerate(candidate_jurisdictions):
                 logger.info(
@@ -2083,12 +2139,22 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
                         "lookup_index": lookup_idx,
                     },
                 )
-                ruleset_data = await rules_service.get_active_ruleset(
-                    domain_key,
-                    lookup_jurisdiction,
-                    document_type=None,
-                )
-                if ruleset_data is not None:
+                if callable(load_compiled_ruleset):
+                    compiled_ruleset = await load_compiled_ruleset(
+                        domain_key,
+                        lookup_jurisdiction,
+                        document_type=None,
+                    )
+                else:
+                    ruleset_data = await rules_service.get_active_ruleset(
+                        domain_key,
+                        lookup_jurisdiction,
+                        document_type=None,
+                    )
+                    compiled_ruleset = (
+                        get_or_compile(ruleset_data, domain_key) if ruleset_data is not None else None
+                    )
+                if compiled_ruleset is not None:
                     resolved_jurisdiction = lookup_jurisdiction
                     if lookup_jurisdiction != (jurisdiction or "global"):
                         logger.info(
@@ -2103,7 +2169,7 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
                     break
             
             # Handle None return (no active ruleset found)
-            if ruleset_data is None:
+            if compiled_ruleset is None:
                 logger.warning(
                     f"No active ruleset found for domain={domain_key}, jurisdiction={jurisdiction}",
                     extra={
@@ -2129,7 +2195,7 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
                     "jurisdiction": resolved_jurisdiction,
                     "requested_jurisdiction": jurisdiction,
                     "document_type": document_type,
-                    "rule_count": len(ruleset_data.get("rules", [])),
+                    "rule_count": len(compiled_ruleset),
                 },
             )
         except ValueError as e:
@@ -2166,35 +2232,29 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
             "domain": domain_key,
             "requested_jurisdiction": jurisdiction,
             "ruleset_jurisdiction": resolved_jurisdiction,
-            "ruleset_version": ruleset_data.get("ruleset_version"),
-            "rulebook_version": ruleset_data.get("rulebook_version"),
+            "ruleset_version": compiled_ruleset.ruleset_version,
+            "rulebook_version": compiled_ruleset.rulebook_version,
         }
         if idx == 0:
             base_metadata = meta
 
-        for rule in ruleset_data.get("rules", []) or []:
-            aggregated_rules.append((rule, meta))
+        compiled_rulesets.append((compiled_ruleset, meta))
 
-    if not aggregated_rules:
+    total_rule_count = sum(len(compiled_ruleset) for compiled_ruleset, _ in compiled_rulesets)
+    if not total_rule_count:
         logger.warning(
             f"No rules retrieved for document_type={document_type}, domains={domain_sequence}, jurisdiction={jurisdiction}"
         )
         return []
 
-    filtered_rules_with_meta = []
-    for rule, meta in aggregated_rules:
-        rule_document_type = rule.get("document_type")
-        if rule_document_type in (None, "", document_type, "lc"):
-            filtered_rules_with_meta.append((rule, meta))
-            continue
-
-        # Staged/live lc_ops packs carry document-specific runtime rows
-        # (for example insurance letter rules) that still need LC-package
-        # activation, even when the primary request doc type is invoice.
-        rule_domain = str(rule.get("domain") or "").strip().lower()
-        if rule_domain == "lc_ops":
-            filtered_rules_with_meta.append((rule, meta))
-    doc_scope_count = len(filtered_rules_with_meta)
+    # Document-type scope comes from the compiled index. It includes rules
+    # with no document type, "lc" rules and staged/live lc_ops packs, which
+    # carry document-specific runtime rows (for example insurance letter
+    # rules) that still need LC-package activation, even when the primary
+    # request doc type is invoice.
+    doc_scope_count = sum(
+        len(compiled_ruleset.select(document_type)) for compiled_ruleset, _ in compiled_rulesets
+    )
     lc_context = document_data.get("lc") or {}
     requirements_graph = _resolve_requirements_graph(lc_context, document_data)
     if isinstance(requirements_graph, dict):
@@ -2202,9 +2262,9 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
         lc_context = document_data.get("lc") or lc_context
     lc_type_context = _resolve_workflow_lc_type(lc_context, document_data)
     filtered_rules_with_meta = [
-        (rule, meta)
-        for rule, meta in filtered_rules_with_meta
-        if _rule_matches_lc_type(rule, (meta or {}).get("domain"), lc_type_context)
+        (entry, meta)
+        for compiled_ruleset, meta in compiled_rulesets
+        for entry in compiled_ruleset.select(document_type, lc_type_context)
     ]
     activated_rules_with_meta = activate_rules_for_lc(
         lc_context,
@@ -2212,14 +2272,14 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
         document_data,
     )
     sample_rules = [
-        (rule.get("rule_id") or rule.get("code") or rule.get("title"))
-        for rule, _ in activated_rules_with_meta[:5]
+        (entry.rule.get("rule_id") or entry.rule.get("code") or entry.rule.get("title"))
+        for entry, _ in activated_rules_with_meta[:5]
     ]
     logger.info(
         "DB rule selection summary",
         extra={
             "domains": domain_sequence,
-            "total_rules": len(aggregated_rules),
+            "total_rules": total_rule_count,
             "doc_scope_rules": doc_scope_count,
             "activated_rules": len(activated_rules_with_meta),
             "sample_rule_ids": sample_rules,
@@ -2235,8 +2295,8 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
     evaluator = RuleEvaluator()
     filtered_rules_with_meta = activated_rules_with_meta
     rule_envelopes = [
-        {"rule": rule, "meta": meta}
-        for rule, meta in filtered_rules_with_meta
+        {"rule": entry.rule, "meta": meta}
+        for entry, meta in filtered_rules_with_meta
     ]
     icc_specific_families: set[tuple[str, str]] = set()
     icc_rule_pattern = re.compile(r"^(?P<prefix>[A-Z0-9]+)-(?P<article>[A-Z]*\d+)(?P<suffix>[A-Z][A-Z0-9]*)?$")
@@ -2260,10 +2320,15 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
         document_data,
         evaluator,
     )
+    # Rules without semantic checks come back unchanged and keep their
+    # compiled form; rewritten ones are recompiled for this request.
+    evaluation_rules = []
     for idx, rule in enumerate(prepared_rules):
         rule_envelopes[idx]["rule"] = rule
+        entry = filtered_rules_with_meta[idx][0]
+        evaluation_rules.append(entry.compiled if rule is entry.rule else compile_rule(rule))
 
-    evaluation_result = await evaluator.evaluate_rules(prepared_rules, document_data)
+    evaluation_result = await evaluator.evaluate_rules(evaluation_rules, document_data)
 
     results: List[Dict[str, Any]] = []
     outcomes = evaluation_result.get("outcomes", [])
@@ -2275,7 +2340,9 @@ async def validate_document_async(document_data: Dict[str, Any], document_type:
             continue
 
         envelope = rule_envelopes[idx] if idx < len(rule_envelopes) else {"rule": {}, "meta": base_metadata}
-        rule_def = envelope.get("rule", {}) or {}
+        # Compiled rulesets share rule dicts across requests; copy before
+        # their values end up in (possibly mutated) result payloads.
+        rule_def = copy.deepcopy(envelope.get("rule", {}) or {})
         meta = envelope.get("meta") or base_metadata or {}
         rule_id = outcome.get("rule_id", rule_def.get("rule_id", "unknown"))
         match = icc_rule_pattern.match(str(rule_id or "").strip().upper())
@@ -2354,6 +2421,12 @@ async def _inject_semantic_conditions(
     updated_rules: List[Dict[str, Any]] = []
 
     for rule in rules:
+        if not any(
+            isinstance(condition, dict) and (condition.get("operator") or "").lower() == "semantic_check"
+            for condition in rule.get("conditions") or []
+        ):
+            updated_rules.append(rule)
+            continue
         working_rule = copy.deepcopy(rule)
         rule_id = working_rule.get("rule_id") or working_rule.get("rule") or "rule"
         conditions = working_rule.get("conditions") or []
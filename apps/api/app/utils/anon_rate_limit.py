@@ -1,12 +1,13 @@
 """Redis-backed per-IP, per-scope abuse limiter for public, no-auth endpoints.
 
-The generic ``RateLimiterMiddleware`` is an in-memory, per-process, per-IP
+The generic ``RateLimiterMiddleware`` is a per-tenant/per-IP
 *request-count* limiter over a short rolling window — it CANNOT express
 "1 request per IP per 24 hours, scoped to one path". The public LC checker
 (``POST /api/check``) needs exactly that: an un-rate-limited public endpoint
 that runs Sonnet/Opus on every hit is unbounded free model spend, so the limit
 has to be a long-window, path-scoped, shared (cross-process) counter — hence
-Redis.
+Redis. The window is the shared engine's (:mod:`app.utils.rate_limiter`)
+``anon_run:<scope>`` policy, used in its Redis-only mode.
 
 Usage::
 
@@ -35,11 +36,12 @@ from typing import Optional
 
 from fastapi import Request
 
+from app.utils.rate_limiter import RateLimitPolicy, get_rate_limiter, rate_limit_policy
 from app.utils.redis_cache import get_redis
 
 logger = logging.getLogger(__name__)
 
-_KEY_PREFIX = "anon_run"
+_POLICY_PREFIX = "anon_run"
 
 
 def client_ip(request: Request) -> str:
@@ -61,8 +63,8 @@ def client_ip(request: Request) -> str:
     return host or "unknown"
 
 
-def _key(scope: str, ip: str) -> str:
-    return f"{_KEY_PREFIX}:{scope}:{ip}"
+def _policy(scope: str, window_seconds: int, limit: int) -> RateLimitPolicy:
+    return rate_limit_policy(f"{_POLICY_PREFIX}:{scope}", limit, window_seconds)
 
 
 async def reserve_anon_run(
@@ -75,8 +77,8 @@ async def reserve_anon_run(
     """Reserve one anonymous run for ``(client IP, scope)``.
 
     Returns ``None`` when the run is allowed (and reserved). Returns an ``int``
-    — seconds remaining until the window resets — when the IP has already used
-    its allowance.
+    — seconds until the oldest run in the window ages out — when the IP has
+    already used its allowance.
 
     Raises whatever ``get_redis()`` raises when Redis is configured but
     unreachable (caller should treat that as 503).
@@ -86,22 +88,10 @@ async def reserve_anon_run(
         # Not configured at all — local/stub dev only. Fail open.
         return None
 
-    ip = client_ip(request)
-    key = _key(scope, ip)
-
-    count = await redis.incr(key)
-    if count == 1:
-        # First request in this window — arm the TTL.
-        await redis.expire(key, window_seconds)
-        return None
-    if count > limit:
-        ttl = await redis.ttl(key)
-        if not isinstance(ttl, int) or ttl <= 0:
-            # Key exists without a TTL (shouldn't happen) — repair it.
-            await redis.expire(key, window_seconds)
-            ttl = window_seconds
-        return ttl
-    return None
+    decision = await get_rate_limiter().hit(
+        _policy(scope, window_seconds, limit), client_ip(request), client=redis
+    )
+    return None if decision.allowed else decision.retry_after
 
 
 async def release_anon_run(*, request: Request, scope: str) -> None:
@@ -115,30 +105,28 @@ async def release_anon_run(*, request: Request, scope: str) -> None:
         redis = await get_redis()
         if redis is None:
             return
-        ip = client_ip(request)
-        await redis.decr(_key(scope, ip))
+        # Refunds only touch the key, so the window/limit are irrelevant here.
+        await get_rate_limiter().refund(_policy(scope, 1, 1), client_ip(request), client=redis)
     except Exception:  # noqa: BLE001 — refund is purely best-effort
         logger.debug("anon_rate_limit: refund failed for scope=%s", scope, exc_info=True)
 
 
-async def peek_anon_run(*, request: Request, scope: str, limit: int = 1) -> Optional[int]:
+async def peek_anon_run(
+    *,
+    request: Request,
+    scope: str,
+    limit: int = 1,
+    window_seconds: int = 24 * 60 * 60,
+) -> Optional[int]:
     """Non-consuming check: returns seconds-until-reset if the IP is over its
     allowance, else ``None``. Used by GET-style "can I run?" probes."""
     try:
         redis = await get_redis()
         if redis is None:
             return None
-        ip = client_ip(request)
-        raw = await redis.get(_key(scope, ip))
-        if raw is None:
-            return None
-        try:
-            count = int(raw)
-        except (TypeError, ValueError):
-            return None
-        if count < limit:
-            return None
-        ttl = await redis.ttl(_key(scope, ip))
-        return ttl if isinstance(ttl, int) and ttl > 0 else 1
+        decision = await get_rate_limiter().peek(
+            _policy(scope, window_seconds, limit), client_ip(request), client=redis
+        )
+        return None if decision.allowed else decision.retry_after
     except Exception:  # noqa: BLE001
         return None
@@ -0,0 +1,232 @@
+"""
+Bounded process pool for CPU-bound document work.
+
+PDF text extraction (pdfminer / PyPDF2), page rasterisation and image
+normalisation are pure CPU and hold the GIL, so running them on the event
+loop — or in the default thread pool — stalls every other request on the
+worker. ``run_cpu_bound`` ships them to a shared ``ProcessPoolExecutor`` and
+the event loop only awaits the result.
+
+- Size limit: at most ``CPU_POOL_MAX_WORKERS + CPU_POOL_MAX_QUEUE`` tasks are
+  admitted at once; further callers wait (``cpu_pool_waiting_tasks``).
+- Per-task timeout: ``CPU_POOL_TASK_TIMEOUT_SEC`` unless overridden. A task
+  that has not started is cancelled; a running worker cannot be interrupted,
+  so it finishes in the background and its result is discarded.
+- A broken pool (worker crash / OOM kill) is rebuilt on the next call.
+- ``CPU_POOL_ENABLED=false`` or an environment without working process
+  support (e.g. AWS Lambda) falls back to ``asyncio.to_thread``.
+
+Functions passed to ``run_cpu_bound`` must be picklable module-level
+callables; see ``app.utils.pdf_workers``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.config import settings
+from app.metrics.cpu_pool_metrics import (
+    cpu_pool_inflight,
+    cpu_pool_task_seconds,
+    cpu_pool_tasks_total,
+    cpu_pool_wait_seconds,
+    cpu_pool_waiting,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CPUTaskTimeoutError(asyncio.TimeoutError):
+    """A CPU pool task exceeded its timeout."""
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_disabled_reason: Optional[str] = None
+_executor_lock = threading.Lock()
+# One admission semaphore per event loop; asyncio primitives are loop-bound.
+_admission: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+_stats_lock = threading.Lock()
+_stats: Dict[str, int] = {"waiting": 0, "inflight": 0, "completed": 0, "failed": 0, "timeouts": 0}
+
+
+def _pool_enabled() -> bool:
+    return bool(getattr(settings, "CPU_POOL_ENABLED", True))
+
+
+def _max_workers() -> int:
+    return max(1, int(getattr(settings, "CPU_POOL_MAX_WORKERS", 2) or 2))
+
+
+def _admission_limit() -> int:
+    return _max_workers() + max(0, int(getattr(settings, "CPU_POOL_MAX_QUEUE", 16) or 0))
+
+
+def _default_timeout() -> Optional[float]:
+    value = float(getattr(settings, "CPU_POOL_TASK_TIMEOUT_SEC", 90) or 0)
+    return value if value > 0 else None
+
+
+def get_cpu_executor() -> Optional[ProcessPoolExecutor]:
+    """Return the shared process pool, creating it on first use.
+
+    Returns ``None`` when the pool is disabled or cannot be created; callers
+    then run work in a thread instead.
+    """
+    global _executor, _executor_disabled_reason
+    if not _pool_enabled() or _executor_disabled_reason:
+        return None
+    if _executor is not None:
+        return _executor
+    with _executor_lock:
+        if _executor is None and not _executor_disabled_reason:
+            start_method = str(getattr(settings, "CPU_POOL_START_METHOD", "forkserver") or "forkserver")
+            try:
+                if start_method not in multiprocessing.get_all_start_methods():
+                    start_method = "spawn"
+                _executor = ProcessPoolExecutor(
+                    max_workers=_max_workers(),
+                    mp_context=multiprocessing.get_context(start_method),
+                )
+                logger.info(
+                    "cpu_pool.started workers=%s start_method=%s admission_limit=%s",
+                    _max_workers(),
+                    start_method,
+                    _admission_limit(),
+                )
+            except Exception as exc:  # noqa: BLE001 - e.g. no /dev/shm on Lambda
+                _executor_disabled_reason = str(exc)
+                logger.warning("cpu_pool.unavailable falling back to threads: %s", exc)
+                return None
+    return _executor
+
+
+def _reset_broken_executor(broken: ProcessPoolExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            _executor = None
+    try:
+        broken.shutdown(wait=False, cancel_futures=True)
+    except Exception:
+        pass
+
+
+def shutdown_cpu_pool(wait: bool = True) -> None:
+    """Shut the pool down (application shutdown / tests)."""
+    global _executor, _executor_disabled_reason
+    with _executor_lock:
+        executor, _executor = _executor, None
+        _executor_disabled_reason = None
+    if executor is not None:
+        executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _admission_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    semaphore = _admission.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(_admission_limit())
+        _admission[loop] = semaphore
+    return semaphore
+
+
+def _bump(key: str, delta: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] = _stats.get(key, 0) + delta
+
+
+async def run_cpu_bound(
+    func: Callable[..., T],
+    *args: Any,
+    task: str,
+    timeout: Optional[float] = None,
+) -> T:
+    """Run ``func(*args)`` off the event loop, in the process pool when available."""
+    effective_timeout = _default_timeout() if timeout is None else timeout
+    semaphore = _admission_semaphore()
+
+    wait_started = time.perf_counter()
+    cpu_pool_waiting.labels(task=task).inc()
+    _bump("waiting")
+    try:
+        await semaphore.acquire()
+    finally:
+        cpu_pool_waiting.labels(task=task).dec()
+        _bump("waiting", -1)
+    cpu_pool_wait_seconds.labels(task=task).observe(time.perf_counter() - wait_started)
+
+    started = time.perf_counter()
+    cpu_pool_inflight.labels(task=task).inc()
+    _bump("inflight")
+    outcome = "error"
+    try:
+        executor = get_cpu_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            if executor is None:
+                future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+            else:
+                future = loop.run_in_executor(executor, func, *args)
+            result = await asyncio.wait_for(future, timeout=effective_timeout)
+        except BrokenProcessPool:
+            logger.warning("cpu_pool.broken task=%s rebuilding pool", task)
+            if executor is not None:
+                _reset_broken_executor(executor)
+            retry_executor = get_cpu_executor()
+            if retry_executor is None:
+                retry = asyncio.ensure_future(asyncio.to_thread(func, *args))
+            else:
+                retry = loop.run_in_executor(retry_executor, func, *args)
+            result = await asyncio.wait_for(retry, timeout=effective_timeout)
+        outcome = "success"
+        _bump("completed")
+        return result
+    except asyncio.TimeoutError as exc:
+        outcome = "timeout"
+        _bump("timeouts")
+        logger.warning("cpu_pool.timeout task=%s timeout=%ss", task, effective_timeout)
+        raise CPUTaskTimeoutError(f"cpu_pool_timeout:{task}") from exc
+    except Exception:
+        _bump("failed")
+        raise
+    finally:
+        semaphore.release()
+        cpu_pool_inflight.labels(task=task).dec()
+        _bump("inflight", -1)
+        cpu_pool_tasks_total.labels(task=task, outcome=outcome).inc()
+        cpu_pool_task_seconds.labels(task=task).observe(time.perf_counter() - started)
+
+
+def cpu_pool_stats() -> Dict[str, Any]:
+    """Point-in-time pool statistics for health/diagnostics endpoints."""
+    with _stats_lock:
+        snapshot: Dict[str, Any] = dict(_stats)
+    snapshot.update(
+        {
+            "enabled": _pool_enabled(),
+            "mode": "process" if _executor is not None else ("thread" if _executor_disabled_reason or not _pool_enabled() else "idle"),
+            "max_workers": _max_workers(),
+            "admission_limit": _admission_limit(),
+            "disabled_reason": _executor_disabled_reason,
+        }
+    )
+    return snapshot
+
+
+__all__ = [
+    "CPUTaskTimeoutError",
+    "cpu_pool_stats",
+    "get_cpu_executor",
+    "run_cpu_bound",
+    "shutdown_cpu_pool",
+]
@@ -0,0 +1,159 @@
+"""
+Pure, picklable PDF/image workers for the CPU process pool.
+
+Every function here takes raw bytes plus plain arguments and returns bytes,
+strings or lists of them, so it can run either inline or inside a
+``ProcessPoolExecutor`` worker (see ``app.utils.cpu_pool``). Heavy imports are
+kept inside the functions so spawned workers only load what they use.
+"""
+
+from __future__ import annotations
+
+from io import BytesIO
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def _save_format(output_format: str) -> str:
+    fmt = str(output_format or "").upper()
+    if fmt in {"JPEG", "JPG"}:
+        return "JPEG"
+    if fmt in {"TIFF", "TIF"}:
+        return "TIFF"
+    return "PNG"
+
+
+def _encode_image(image: Any, *, save_format: str, dpi: int, quality: int = 90, optimize: bool = False) -> bytes:
+    buffer = BytesIO()
+    save_kwargs: Dict[str, Any] = {"format": save_format, "dpi": (dpi, dpi)}
+    if save_format == "JPEG":
+        save_kwargs["quality"] = quality
+        if optimize:
+            save_kwargs["optimize"] = True
+    image.save(buffer, **save_kwargs)
+    return buffer.getvalue()
+
+
+def pdfminer_text(content: bytes) -> str:
+    """pdfminer text layer; pages are separated by form feeds."""
+    from pdfminer.high_level import extract_text  # type: ignore
+
+    return extract_text(BytesIO(content)) or ""
+
+
+def pypdf_page_texts(content: bytes) -> List[str]:
+    """PyPDF2 text per page; pages that fail to extract yield ``""``."""
+    from PyPDF2 import PdfReader  # type: ignore[reportMissingImports]
+
+    pieces: List[str] = []
+    for page in PdfReader(BytesIO(content)).pages:
+        try:
+            pieces.append(page.extract_text() or "")
+        except Exception:
+            pieces.append("")
+    return pieces
+
+
+def pdf_page_count(content: bytes) -> int:
+    """PyPDF2 page count. Raises when the bytes are not a readable PDF."""
+    from PyPDF2 import PdfReader  # type: ignore[reportMissingImports]
+
+    return len(PdfReader(BytesIO(content)).pages)
+
+
+def _rasterise_pdf(
+    content: bytes,
+    *,
+    dpi: int,
+    max_pages: Optional[int] = None,
+    first_page: int = 1,
+) -> List[Any]:
+    from pdf2image import convert_from_bytes  # type: ignore
+    from PIL import ImageOps  # type: ignore
+
+    convert_kwargs: Dict[str, Any] = {"dpi": dpi, "fmt": "png", "thread_count": 1}
+    if max_pages is not None or first_page > 1:
+        convert_kwargs["first_page"] = first_page
+    if max_pages is not None:
+        convert_kwargs["last_page"] = first_page + max_pages - 1
+    rasters: List[Any] = []
+    for image in convert_from_bytes(content, **convert_kwargs):
+        normalized = ImageOps.exif_transpose(image)
+        if normalized.mode != "RGB":
+            normalized = normalized.convert("RGB")
+        rasters.append(normalized)
+    if max_pages is not None:
+        rasters = rasters[:max_pages]
+    return rasters
+
+
+def render_pdf_pages(
+    content: bytes,
+    dpi: int,
+    formats: Sequence[str] = ("PNG",),
+    max_pages: Optional[int] = None,
+    quality: int = 90,
+    optimize: bool = False,
+) -> Dict[str, List[bytes]]:
+    """Rasterise PDF pages once and encode them in every requested format."""
+    rasters = _rasterise_pdf(content, dpi=dpi, max_pages=max_pages)
+    encoded: Dict[str, List[bytes]] = {}
+    for output_format in formats:
+        save_format = _save_format(output_format)
+        encoded[save_format] = [
+            _encode_image(raster, save_format=save_format, dpi=dpi, quality=quality, optimize=optimize)
+            for raster in rasters
+        ]
+    return encoded
+
+
+def render_pdf_page(
+    content: bytes,
+    dpi: int,
+    page_number: int,
+    output_format: str = "PNG",
+    quality: int = 90,
+    optimize: bool = False,
+) -> bytes:
+    """Rasterise and encode a single (1-based) PDF page."""
+    rasters = _rasterise_pdf(content, dpi=dpi, max_pages=1, first_page=max(1, int(page_number)))
+    if not rasters:
+        raise ValueError(f"pdf_page_out_of_range:{page_number}")
+    return _encode_image(rasters[0], save_format=_save_format(output_format), dpi=dpi, quality=quality, optimize=optimize)
+
+
+def render_pdf_tiff(content: bytes, dpi: int) -> Tuple[bytes, int]:
+    """Render every PDF page into one deflate-compressed multi-page TIFF."""
+    rasters = _rasterise_pdf(content, dpi=dpi)
+    if not rasters:
+        raise ValueError("pdf_render_empty")
+    buffer = BytesIO()
+    rasters[0].save(
+        buffer,
+        format="TIFF",
+        save_all=True,
+        append_images=rasters[1:],
+        compression="tiff_deflate",
+        dpi=(dpi, dpi),
+    )
+    return buffer.getvalue(), len(rasters)
+
+
+def normalize_image_bytes(content: bytes, dpi: int, output_format: str) -> bytes:
+    """EXIF-transpose an image, convert to RGB and re-encode it."""
+    from PIL import Image, ImageOps  # type: ignore
+
+    normalized = ImageOps.exif_transpose(Image.open(BytesIO(content)))
+    if normalized.mode != "RGB":
+        normalized = normalized.convert("RGB")
+    return _encode_image(normalized, save_format=_save_format(output_format), dpi=dpi)
+
+
+__all__ = [
+    "normalize_image_bytes",
+    "pdf_page_count",
+    "pdfminer_text",
+    "pypdf_page_texts",
+    "render_pdf_page",
+    "render_pdf_pages",
+    "render_pdf_tiff",
+]
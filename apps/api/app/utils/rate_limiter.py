@@ -0,0 +1,353 @@
+"""
+Shared sliding-window rate limiter.
+
+One engine backs ``RateLimiterMiddleware``, ``bank_rate_limit``, the
+anonymous-run limiter (``app.utils.anon_rate_limit``) and the AI quota
+tracker:
+
+- A policy is a name plus ``limit`` hits per ``window_seconds``.
+  ``rate_limit_policy`` applies ``RATE_LIMIT_OVERRIDES``, so every limiter
+  is tuned from one setting.
+- The deployment-wide window lives in one Redis sorted set per key. A Lua
+  script trims it, records the hit and returns the decision atomically, so
+  instances never race between read and write and nothing is locked across
+  the network. Scores come from the Redis clock, not the instances'.
+- When Redis reports a key far under its limit, the instance may admit
+  ``RATE_LIMIT_LOCAL_FASTPATH_FRACTION`` of that headroom without asking
+  again for ``RATE_LIMIT_LOCAL_SYNC_MS``. Those hits are added to the
+  sorted set with the key's next Redis call. With N instances the worst
+  case overshoot is N * fraction of the headroom, so keep the fraction at
+  or below 1/N where limits must be exact (tiny limits never get a budget).
+- In-process state is spread over ``RATE_LIMIT_LOCAL_SHARDS`` locks. The
+  same state keeps a local sliding window which decides alone when Redis is
+  unconfigured, or failing (retried after a short backoff).
+
+``hit_local`` is the synchronous, process-wide window for callers that cannot
+await.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from redis.exceptions import NoScriptError
+
+from app.config import settings
+from app.metrics.rate_limit_metrics import rate_limit_decisions_total, rate_limit_redis_errors_total
+from app.utils.redis_cache import get_redis
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "ratelimit"
+_REDIS_RETRY_BACKOFF_SEC = 5.0
+_SWEEP_EVERY = 1024  # operations per shard between idle-key sweeps
+
+# KEYS[1] window key; ARGV: window_ms, limit, pending hits, consume (0/1), token.
+# Returns {allowed, count after this call, ms until a slot frees (0 if allowed)}.
+_SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local pending = tonumber(ARGV[3])
+local consume = tonumber(ARGV[4])
+local token = ARGV[5]
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+for i = 1, pending do
+  redis.call('ZADD', key, now, token .. ':' .. i)
+end
+local count = redis.call('ZCARD', key)
+local allowed = 0
+if count < limit then
+  allowed = 1
+  if consume == 1 then
+    redis.call('ZADD', key, now, token)
+    count = count + 1
+  end
+end
+local retry = 0
+if allowed == 0 then
+  local blocking = redis.call('ZRANGE', key, count - limit, count - limit, 'WITHSCORES')
+  retry = tonumber(blocking[2]) + window - now
+end
+if count > 0 then
+  redis.call('PEXPIRE', key, window)
+end
+return {allowed, count, retry}
+"""
+_SLIDING_WINDOW_SHA = hashlib.sha1(_SLIDING_WINDOW_SCRIPT.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    name: str
+    limit: int
+    window_seconds: int
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    remaining: int
+    retry_after: int = 0  # whole seconds until a slot frees; 0 when allowed
+    token: Optional[str] = None  # Redis member of this hit, for ``refund``
+
+
+def rate_limit_policy(name: str, limit: int, window_seconds: int) -> RateLimitPolicy:
+    """Build a policy, letting ``RATE_LIMIT_OVERRIDES[name]`` ("limit/window") win."""
+    override = (getattr(settings, "RATE_LIMIT_OVERRIDES", None) or {}).get(name)
+    if override:
+        raw_limit, _, raw_window = str(override).partition("/")
+        try:
+            limit, window_seconds = int(raw_limit), int(raw_window) if raw_window else window_seconds
+        except ValueError:
+            logger.warning("Ignoring malformed RATE_LIMIT_OVERRIDES[%s]=%r", name, override)
+    return RateLimitPolicy(name=name, limit=max(1, int(limit)), window_seconds=max(1, int(window_seconds)))
+
+
+class _KeyState:
+    __slots__ = ("hits", "headroom", "budget", "budget_until", "pending", "idle_after")
+
+    def __init__(self) -> None:
+        self.hits: Deque[float] = deque()  # this process's admitted hits (monotonic)
+        self.headroom = 0
+        self.budget = 0
+        self.budget_until = 0.0
+        self.pending = 0  # fast-path hits not yet written to Redis
+        self.idle_after = 0.0
+
+
+class _Shard:
+    __slots__ = ("lock", "states", "ops")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.states: Dict[Tuple[str, str], _KeyState] = {}
+        self.ops = 0
+
+
+class RateLimiter:
+    """Redis sliding windows with a sharded in-process fast path and fallback."""
+
+    def __init__(
+        self,
+        *,
+        shards: Optional[int] = None,
+        fastpath_fraction: Optional[float] = None,
+        sync_ms: Optional[int] = None,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> None:
+        shard_count = int(shards or getattr(settings, "RATE_LIMIT_LOCAL_SHARDS", 64) or 64)
+        self._shards: List[_Shard] = [_Shard() for _ in range(max(1, shard_count))]
+        if fastpath_fraction is None:
+            fastpath_fraction = getattr(settings, "RATE_LIMIT_LOCAL_FASTPATH_FRACTION", 0.1)
+        self.fastpath_fraction = min(1.0, max(0.0, float(fastpath_fraction or 0.0)))
+        if sync_ms is None:
+            sync_ms = getattr(settings, "RATE_LIMIT_LOCAL_SYNC_MS", 250)
+        self.sync_seconds = max(0, int(sync_ms or 0)) / 1000.0
+        self._redis_getter = redis_getter or get_redis
+        self._redis_retry_at = 0.0
+
+    # -- public API -----------------------------------------------------
+
+    async def hit(self, policy: RateLimitPolicy, key: str, *, client: Any = None) -> RateLimitDecision:
+        """Count one hit against ``key`` and say whether it is allowed.
+
+        Without ``client`` the shared Redis is used when available and the
+        local window otherwise. With ``client`` Redis is required: its errors
+        propagate instead of falling back.
+        """
+        now = time.monotonic()
+        shard = self._shard(policy, key)
+        with shard.lock:
+            state = self._state(shard, policy, key, now)
+            if state.budget > 0 and now < state.budget_until:
+                state.budget -= 1
+                state.headroom = max(0, state.headroom - 1)
+                state.pending += 1
+                state.hits.append(now)
+                return self._record(policy, "fastpath", RateLimitDecision(True, state.headroom))
+            pending, state.pending = state.pending, 0
+
+        redis = client if client is not None else await self._shared_redis()
+        if redis is not None:
+            try:
+                allowed, count, retry_ms, token = await self._run_script(
+                    redis, policy, key, pending=pending, consume=True
+                )
+            except Exception as exc:
+                if client is not None:
+                    raise
+                # Pending fast-path hits are already in the local window.
+                self._redis_failed(exc)
+            else:
+                headroom = max(0, policy.limit - count)
+                with shard.lock:
+                    if allowed:
+                        state.hits.append(now)
+                    state.headroom = headroom
+                    state.budget = int(headroom * self.fastpath_fraction)
+                    state.budget_until = now + self.sync_seconds
+                decision = RateLimitDecision(
+                    allowed=allowed,
+                    remaining=headroom,
+                    retry_after=0 if allowed else max(1, math.ceil(retry_ms / 1000.0)),
+                    token=token if allowed else None,
+                )
+                return self._record(policy, "redis", decision)
+
+        return self.hit_local(policy, key)
+
+    def hit_local(self, policy: RateLimitPolicy, key: str) -> RateLimitDecision:
+        """Count one hit in this process's window only (never touches Redis)."""
+        now = time.monotonic()
+        shard = self._shard(policy, key)
+        with shard.lock:
+            state = self._state(shard, policy, key, now)
+            if len(state.hits) >= policy.limit:
+                oldest = state.hits[len(state.hits) - policy.limit]
+                retry_after = max(1, math.ceil(policy.window_seconds - (now - oldest)))
+                decision = RateLimitDecision(False, 0, retry_after)
+            else:
+                state.hits.append(now)
+                decision = RateLimitDecision(True, policy.limit - len(state.hits))
+        return self._record(policy, "local", decision)
+
+    async def peek(self, policy: RateLimitPolicy, key: str, *, client: Any = None) -> RateLimitDecision:
+        """Like ``hit`` but never consumes a slot."""
+        now = time.monotonic()
+        shard = self._shard(policy, key)
+        with shard.lock:
+            state = self._state(shard, policy, key, now)
+            pending, state.pending = state.pending, 0
+
+        redis = client if client is not None else await self._shared_redis()
+        if redis is not None:
+            try:
+                allowed, count, retry_ms, _ = await self._run_script(
+                    redis, policy, key, pending=pending, consume=False
+                )
+            except Exception as exc:
+                if client is not None:
+                    raise
+                self._redis_failed(exc)
+            else:
+                retry_after = 0 if allowed else max(1, math.ceil(retry_ms / 1000.0))
+                return RateLimitDecision(allowed, max(0, policy.limit - count), retry_after)
+
+        with shard.lock:
+            used = len(state.hits)
+            if used < policy.limit:
+                return RateLimitDecision(True, policy.limit - used)
+            oldest = state.hits[used - policy.limit]
+            return RateLimitDecision(False, 0, max(1, math.ceil(policy.window_seconds - (now - oldest))))
+
+    async def refund(
+        self, policy: RateLimitPolicy, key: str, token: Optional[str] = None, *, client: Any = None
+    ) -> None:
+        """Give back one hit (``token`` if known, else the newest)."""
+        shard = self._shard(policy, key)
+        with shard.lock:
+            state = shard.states.get((policy.name, key))
+            if state is not None and state.hits:
+                state.hits.pop()
+            if state is not None and state.pending and token is None:
+                state.pending -= 1  # a fast-path hit that Redis never saw
+                return
+
+        redis = client if client is not None else await self._shared_redis()
+        if redis is None:
+            return
+        redis_key = self._redis_key(policy, key)
+        try:
+            if token:
+                await redis.zrem(redis_key, token)
+            else:
+                await redis.zpopmax(redis_key)
+        except Exception as exc:
+            if client is not None:
+                raise
+            self._redis_failed(exc)
+
+    # -- internals ------------------------------------------------------
+
+    @staticmethod
+    def _redis_key(policy: RateLimitPolicy, key: str) -> str:
+        return f"{_KEY_PREFIX}:{policy.name}:{key}"
+
+    async def _run_script(
+        self, redis: Any, policy: RateLimitPolicy, key: str, *, pending: int, consume: bool
+    ) -> Tuple[bool, int, int, str]:
+        token = uuid.uuid4().hex
+        args = (policy.window_seconds * 1000, policy.limit, pending, 1 if consume else 0, token)
+        redis_key = self._redis_key(policy, key)
+        try:
+            result = await redis.evalsha(_SLIDING_WINDOW_SHA, 1, redis_key, *args)
+        except NoScriptError:
+            result = await redis.eval(_SLIDING_WINDOW_SCRIPT, 1, redis_key, *args)
+        allowed, count, retry_ms = (int(value) for value in result)
+        return bool(allowed), count, retry_ms, token
+
+    async def _shared_redis(self) -> Any:
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        try:
+            return await self._redis_getter()
+        except Exception as exc:
+            self._redis_failed(exc)
+            return None
+
+    def _redis_failed(self, exc: Exception) -> None:
+        if time.monotonic() >= self._redis_retry_at:
+            logger.warning("Rate limiter using in-process windows; Redis failed: %s", exc)
+        self._redis_retry_at = time.monotonic() + _REDIS_RETRY_BACKOFF_SEC
+        rate_limit_redis_errors_total.inc()
+
+    def _shard(self, policy: RateLimitPolicy, key: str) -> _Shard:
+        return self._shards[hash((policy.name, key)) % len(self._shards)]
+
+    @staticmethod
+    def _state(shard: _Shard, policy: RateLimitPolicy, key: str, now: float) -> _KeyState:
+        """Look up (or create) and trim a key's state; caller holds ``shard.lock``."""
+        shard.ops += 1
+        if shard.ops >= _SWEEP_EVERY:
+            shard.ops = 0
+            idle = [name for name, state in shard.states.items() if state.idle_after < now]
+            for name in idle:
+                del shard.states[name]
+        state = shard.states.get((policy.name, key))
+        if state is None:
+            state = shard.states[(policy.name, key)] = _KeyState()
+        cutoff = now - policy.window_seconds
+        while state.hits and state.hits[0] <= cutoff:
+            state.hits.popleft()
+        state.idle_after = now + policy.window_seconds
+        return state
+
+    @staticmethod
+    def _record(policy: RateLimitPolicy, source: str, decision: RateLimitDecision) -> RateLimitDecision:
+        outcome = "allowed" if decision.allowed else "limited"
+        rate_limit_decisions_total.labels(policy=policy.name, outcome=outcome, source=source).inc()
+        return decision
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
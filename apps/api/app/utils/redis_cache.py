@@ -17,6 +17,7 @@ logger = logging.getLogger(__name__)
 
 
 _redis_client: Optional[Redis] = None
+_redis_binary_client: Optional[Redis] = None
 
 
 def _env_bool(value: Optional[str], default: bool = False) -> bool:
@@ -93,3 +94,34 @@ async def get_redis() -> Optional[Redis]:
     return _redis_client
 
 
+async def get_redis_binary() -> Optional[Redis]:
+    """Return a shared Redis client that does not decode responses.
+
+    Used for compressed/binary cache values; shares configuration with
+    :func:`get_redis`.
+    """
+
+    global _redis_binary_client
+
+    if _redis_binary_client is not None:
+        return _redis_binary_client
+
+    options = _build_redis_options()
+    if not options:
+        return None
+
+    try:
+        if "url" in options:
+            client = Redis.from_url(options["url"], decode_responses=False)
+        else:
+            client = Redis(**{**options, "decode_responses": False})
+
+        await client.ping()
+    except RedisError as exc:
+        logger.warning("Failed to connect to Redis: %s", exc)
+        if settings.USE_STUBS:
+            return None
+        raise RuntimeError("Unable to connect to Redis") from exc
+
+    _redis_binary_client = client
+    return _redis_binary_client
@@ -10,39 +10,81 @@ env var away:
   path-style addressing and SigV4. ``AWS_ACCESS_KEY_ID`` /
   ``AWS_SECRET_ACCESS_KEY`` hold the store's S3 access keys regardless of
   vendor — boto3 reads those names natively.
+
+Clients are shared: building one costs tens of milliseconds and each owns a
+connection pool, so a client is created once per (endpoint, region,
+credentials, config) and reused by every caller and thread — botocore
+clients are thread-safe. ``S3_MAX_POOL_CONNECTIONS`` (default 32) sizes
+each pool for concurrent transfers.
 """
 
 import os
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
 
 import boto3
 from botocore.config import Config
 
+_MAX_CACHED_CLIENTS = 16
+
+_clients_lock = threading.Lock()
+# key -> (config, client); the config is held so its id() cannot be reused.
+_clients: "OrderedDict[Tuple[Any, ...], Tuple[Optional[Config], Any]]" = OrderedDict()
+
+
+def _max_pool_connections() -> int:
+    return max(1, int(os.getenv("S3_MAX_POOL_CONNECTIONS", "32") or 32))
+
 
 def get_s3_client(region_name: Optional[str] = None, config: Optional[Config] = None):
-    """Build an S3 client honoring the S3_ENDPOINT_URL override.
+    """Return the shared S3 client honoring the S3_ENDPOINT_URL override.
 
     Args:
         region_name: optional region override; defaults to boto3's normal
             resolution (AWS_REGION / AWS_DEFAULT_REGION env).
         config: optional botocore Config; merged with the S3-compatible
             settings (which take precedence) when an endpoint is set.
+            Pass a module-level Config so calls share one client.
     """
+    endpoint_url = os.getenv("S3_ENDPOINT_URL") or None
+    access_key = os.getenv("AWS_ACCESS_KEY_ID")
+    secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+    key = (endpoint_url, region_name, access_key, secret_key, id(config) if config is not None else None)
+
+    with _clients_lock:
+        cached = _clients.get(key)
+        if cached is not None:
+            _clients.move_to_end(key)
+            return cached[1]
+
+        client = _build_client(endpoint_url, region_name, access_key, secret_key, config)
+        _clients[key] = (config, client)
+        while len(_clients) > _MAX_CACHED_CLIENTS:
+            _clients.popitem(last=False)
+        return client
+
+
+def _build_client(
+    endpoint_url: Optional[str],
+    region_name: Optional[str],
+    access_key: Optional[str],
+    secret_key: Optional[str],
+    config: Optional[Config],
+):
     kwargs = {}
 
-    endpoint_url = os.getenv("S3_ENDPOINT_URL") or None
+    pool = Config(max_pool_connections=_max_pool_connections())
+    config = pool.merge(config) if config is not None else pool
     if endpoint_url:
         kwargs["endpoint_url"] = endpoint_url
         compat = Config(signature_version="s3v4", s3={"addressing_style": "path"})
-        config = config.merge(compat) if config is not None else compat
+        config = config.merge(compat)
 
-    if config is not None:
-        kwargs["config"] = config
+    kwargs["config"] = config
     if region_name:
         kwargs["region_name"] = region_name
 
-    access_key = os.getenv("AWS_ACCESS_KEY_ID")
-    secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
     if access_key and secret_key:
         kwargs["aws_access_key_id"] = access_key
         kwargs["aws_secret_access_key"] = secret_key
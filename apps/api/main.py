@@ -5,6 +5,7 @@ This is an example of how to integrate the performance monitoring
 middleware with a FastAPI application.
 """
 
+import asyncio
 import os
 import time
 from contextlib import asynccontextmanager
@@ -190,6 +191,28 @@ async def lifespan(app: FastAPI):
         logger.info("Background job scheduler started")
     except Exception as e:
         logger.warning(f"Failed to start scheduler: {e}")
+
+    # Long-lived pooled HTTP clients for LLM providers
+    try:
+        from app.services.llm_clients import warm_llm_clients
+        warm_llm_clients()
+    except Exception as e:
+        logger.warning(f"Failed to create LLM clients: {e}")
+
+    # Memory-map (or build) the local sanctions screening indexes
+    try:
+        from app.services.sanctions_screening import get_screening_service
+        await asyncio.to_thread(get_screening_service().warm_indexes)
+    except Exception as e:
+        logger.warning(f"Failed to load sanctions screening indexes: {e}")
+
+    # Apply ruleset invalidations published by other workers (rules admin)
+    ruleset_listener = None
+    try:
+        from app.services.rules_service import run_ruleset_invalidation_listener
+        ruleset_listener = asyncio.create_task(run_ruleset_invalidation_listener())
+    except Exception as e:
+        logger.warning(f"Failed to start ruleset invalidation listener: {e}")
     
     yield
 
@@ -204,6 +227,31 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Error stopping scheduler: {e}")
 
+    if ruleset_listener is not None:
+        ruleset_listener.cancel()
+
+    # Close pooled LLM connections
+    try:
+        from app.services.llm_clients import close_llm_clients
+        await close_llm_clients()
+    except Exception as e:
+        logger.warning(f"Error closing LLM clients: {e}")
+
+    # Write (or spill) buffered request audit events
+    try:
+        from app.services.audit_writer import close_audit_writer
+        await close_audit_writer()
+    except Exception as e:
+        logger.warning(f"Error flushing audit log writer: {e}")
+
+    # Stop the CPU process pool (PDF parsing / rendering workers)
+    try:
+        from app.utils.cpu_pool import shutdown_cpu_pool
+        shutdown_cpu_pool(wait=False)
+        logger.info("CPU process pool stopped")
+    except Exception as e:
+        logger.warning(f"Error stopping CPU process pool: {e}")
+
 
 # Create database tables only when explicitly allowed
 _auto_create_flag = os.getenv("ENABLE_SQLALCHEMY_CREATE_ALL", "").lower() in {"1", "true", "yes"}
@@ -0,0 +1,74 @@
+"""
+Rebuild ``analytics_daily_rollups`` from ``validation_sessions``.
+
+The API keeps rollups current after each commit; run this after bulk imports,
+direct SQL edits, or to repair buckets whose refresh failed.
+
+Usage:
+    python scripts/backfill_analytics_rollups.py --since 2025-01-01 --apply
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, func, select  # noqa: E402
+
+from app.models import ValidationSession  # noqa: E402
+from app.models.analytics_rollup import backfill_rollups  # noqa: E402
+
+
+def month_chunks(start: date, end: date) -> Iterator[Tuple[date, date]]:
+    cursor = start
+    while cursor <= end:
+        next_month = (cursor.replace(day=1) + timedelta(days=32)).replace(day=1)
+        yield cursor, min(end, next_month - timedelta(days=1))
+        cursor = next_month
+
+
+def backfill(since: Optional[date], until: Optional[date], apply: bool = False) -> None:
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL environment variable is required")
+
+    engine = create_engine(database_url)
+    with engine.connect() as conn:
+        first, last = conn.execute(
+            select(func.min(func.date(ValidationSession.created_at)), func.max(func.date(ValidationSession.created_at)))
+        ).one()
+    if first is None:
+        print("No validation sessions found; nothing to backfill.")
+        return
+
+    start = max(since, first) if since else first
+    end = min(until, last) if until else last
+    chunks = list(month_chunks(start, end))
+
+    if not apply:
+        print(f"Dry run - would rebuild {len(chunks)} monthly chunk(s) from {start} to {end}.")
+        print("Re-run with --apply to execute.")
+        return
+
+    for chunk_start, chunk_end in chunks:
+        # One transaction per month keeps locks and WAL bursts short.
+        with engine.begin() as conn:
+            rows = backfill_rollups(conn, chunk_start, chunk_end)
+        print(f"{chunk_start} .. {chunk_end}: {rows} rollup rows")
+    print("Analytics rollup backfill complete.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily analytics rollups from validation sessions.")
+    parser.add_argument("--since", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--until", type=date.fromisoformat, help="Last day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--apply", action="store_true", help="Write rollups instead of printing the plan")
+    args = parser.parse_args()
+    backfill(args.since, args.until, apply=args.apply)
+
+
+if __name__ == "__main__":
+    main()
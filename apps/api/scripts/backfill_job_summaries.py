@@ -0,0 +1,69 @@
+"""
+Fill the job list summary columns of ``validation_sessions``.
+
+New and re-validated sessions are summarised when they are written. Older
+sessions are only summarised here; until then ``GET /api/jobs`` lists them
+with empty summary fields. Run it once, by hand, after the migration that
+adds the columns (see LAUNCH-NOTES.md); it is safe to re-run or interrupt.
+
+Usage:
+    python scripts/backfill_job_summaries.py --batch-size 200 --apply
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, func  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.models import ValidationSession  # noqa: E402
+from app.models.job_summary import refresh_job_summary  # noqa: E402
+
+
+def backfill(batch_size: int, apply: bool = False) -> None:
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL environment variable is required")
+
+    Session = sessionmaker(bind=create_engine(database_url))
+    pending = ValidationSession.summary_updated_at.is_(None)
+    with Session() as db:
+        total = db.query(func.count(ValidationSession.id)).filter(pending).scalar() or 0
+    if not apply:
+        print(f"Dry run - {total} session(s) have no job summary yet.")
+        print("Re-run with --apply to fill them in.")
+        return
+
+    done = 0
+    last_id = None
+    while True:
+        # One short transaction per batch, walking the primary key.
+        with Session() as db:
+            query = db.query(ValidationSession).filter(pending)
+            if last_id is not None:
+                query = query.filter(ValidationSession.id > last_id)
+            batch = query.order_by(ValidationSession.id).limit(batch_size).all()
+            if not batch:
+                break
+            for validation_session in batch:
+                refresh_job_summary(db, validation_session)
+            last_id = batch[-1].id
+            db.commit()
+        done += len(batch)
+        print(f"{done}/{total} sessions summarised")
+    print("Job summary backfill complete.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fill job list summary columns on validation sessions.")
+    parser.add_argument("--batch-size", type=int, default=200, help="Sessions per transaction")
+    parser.add_argument("--apply", action="store_true", help="Write summaries instead of counting them")
+    args = parser.parse_args()
+    backfill(max(1, args.batch_size), apply=args.apply)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Move large ``validation_results`` / ``extracted_data`` payloads to result_blobs.
+
+Sessions written since the result_blobs migration are offloaded when they
+are flushed (app/models/result_blob.py). This moves the older inline
+payloads of at least RESULT_BLOB_MIN_BYTES, can prune blobs no session
+points at any more, and can inline every payload again before a downgrade.
+
+Usage:
+    python scripts/offload_result_blobs.py --batch-size 100 --apply
+    python scripts/offload_result_blobs.py --prune --apply
+    python scripts/offload_result_blobs.py --inline --apply
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.models import ValidationSession  # noqa: E402
+from app.models.result_blob import blob_pointer, offload_result_payload  # noqa: E402
+
+_STORED = ("stored_validation_results", "stored_extracted_data")
+_PAYLOADS = ("validation_results", "extracted_data")
+
+# Blobs younger than a day may belong to a transaction still in flight.
+_PRUNE_SQL = text(
+    """
+    DELETE FROM result_blobs b
+     WHERE b.created_at < now() - interval '1 day'
+       AND NOT EXISTS (
+           SELECT 1 FROM validation_sessions s
+            WHERE s.validation_results::jsonb -> '_blob' ->> 'sha256' = b.sha256
+               OR s.extracted_data::jsonb -> '_blob' ->> 'sha256' = b.sha256
+       )
+    """
+)
+
+
+def _walk(Session, batch_size: int):
+    last_id = None
+    while True:
+        # One short transaction per batch, walking the primary key.
+        with Session() as db:
+            query = db.query(ValidationSession)
+            if last_id is not None:
+                query = query.filter(ValidationSession.id > last_id)
+            batch = query.order_by(ValidationSession.id).limit(batch_size).all()
+            if not batch:
+                return
+            yield db, batch
+            last_id = batch[-1].id
+            db.commit()
+
+
+def offload(Session, batch_size: int) -> int:
+    min_bytes = int(settings.RESULT_BLOB_MIN_BYTES)
+    if min_bytes <= 0:
+        raise SystemExit("RESULT_BLOB_MIN_BYTES is 0; payloads are kept inline")
+    moved = 0
+    for db, batch in _walk(Session, batch_size):
+        for validation_session in batch:
+            for attribute in _STORED:
+                moved += offload_result_payload(db, validation_session, attribute, min_bytes)
+        print(f"{moved} payload(s) moved so far")
+    return moved
+
+
+def inline(Session, batch_size: int) -> int:
+    settings.RESULT_BLOB_MIN_BYTES = 0  # keep the flush hook from offloading them again
+    restored = 0
+    for db, batch in _walk(Session, batch_size):
+        for validation_session in batch:
+            for stored, payload in zip(_STORED, _PAYLOADS):
+                if blob_pointer(getattr(validation_session, stored)) is not None:
+                    setattr(validation_session, payload, getattr(validation_session, payload))
+                    restored += 1
+        print(f"{restored} payload(s) inlined so far")
+    return restored
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move large validation session payloads to result_blobs.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Sessions per transaction")
+    parser.add_argument("--prune", action="store_true", help="Delete blobs no session points at")
+    parser.add_argument("--inline", action="store_true", help="Move every payload back inline (before a downgrade)")
+    parser.add_argument("--apply", action="store_true", help="Write changes instead of only describing them")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise SystemExit("DATABASE_URL environment variable is required")
+    engine = create_engine(database_url)
+
+    action = "prune unreferenced blobs" if args.prune else "inline offloaded payloads" if args.inline else "offload large payloads"
+    if not args.apply:
+        print(f"Dry run - would {action}. Re-run with --apply.")
+        return
+
+    if args.prune:
+        with engine.begin() as conn:
+            print(f"{conn.execute(_PRUNE_SQL).rowcount} unreferenced blob(s) deleted")
+        return
+    Session = sessionmaker(bind=engine)
+    batch_size = max(1, args.batch_size)
+    count = inline(Session, batch_size) if args.inline else offload(Session, batch_size)
+    print(f"Done: {count} payload(s).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Daily analytics rollups: commit hooks, backfill, and service reads."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Discrepancy, Document, UserRole, ValidationSession
+from app.models.agency import Supplier
+from app.models.analytics_rollup import AnalyticsDailyRollup, backfill_rollups
+from app.models.base import Base
+from app.models.bulk_jobs import BulkItem, BulkJob
+from app.models.services import ServicesClient
+from app.services.analytics_service import AnalyticsService
+
+
+@compiles(UUID, "sqlite")
+def _uuid_as_char(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    tables = [
+        # Foreign-key targets of validation_sessions.
+        BulkJob.__table__,
+        BulkItem.__table__,
+        Supplier.__table__,
+        ServicesClient.__table__,
+        ValidationSession.__table__,
+        # Counted into the job summary columns on every session flush.
+        Document.__table__,
+        Discrepancy.__table__,
+        AnalyticsDailyRollup.__table__,
+    ]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _rollups(engine):
+    table = AnalyticsDailyRollup.__table__
+    with engine.connect() as conn:
+        rows = conn.execute(select(table.c.day, table.c.status, table.c.jobs, table.c.discrepancy_count))
+        return sorted((str(day)[:10], status, jobs, discrepancies) for day, status, jobs, discrepancies in rows)
+
+
+def _session(user_id, created_at, status="created"):
+    return ValidationSession(
+        user_id=user_id,
+        status=status,
+        workflow_type="exporter_presentation",
+        created_at=created_at,
+    )
+
+
+def _discrepancy(session_id):
+    return Discrepancy(
+        validation_session_id=session_id,
+        discrepancy_type="ucp600",
+        severity="major",
+        rule_name="UCP600.18.c",
+        description="Late presentation",
+    )
+
+
+def test_commit_hooks_recompute_touched_buckets(db):
+    engine = db.get_bind()
+    user_id = uuid.uuid4()
+    first = _session(user_id, datetime(2026, 10, 1, 9))
+    second = _session(user_id, datetime(2026, 10, 1, 15))
+    db.add_all([first, second])
+    db.commit()
+    assert _rollups(engine) == [("2026-10-01", "created", 2, 0)]
+
+    first.status = "completed"
+    db.add_all([_discrepancy(first.id), _discrepancy(first.id)])
+    db.commit()
+    assert _rollups(engine) == [
+        ("2026-10-01", "completed", 1, 2),
+        ("2026-10-01", "created", 1, 0),
+    ]
+
+    second.status = "failed"
+    db.flush()
+    db.rollback()
+    assert _rollups(engine) == [
+        ("2026-10-01", "completed", 1, 2),
+        ("2026-10-01", "created", 1, 0),
+    ]
+
+
+def test_backfill_matches_incremental_rollups(db):
+    engine = db.get_bind()
+    user_id = uuid.uuid4()
+    sessions = [
+        _session(user_id, datetime(2026, 9, 30, 23), "completed"),
+        _session(user_id, datetime(2026, 10, 1, 1), "failed"),
+        _session(uuid.uuid4(), datetime(2026, 10, 1, 2)),
+    ]
+    db.add_all(sessions)
+    db.commit()
+    db.add(_discrepancy(sessions[1].id))
+    db.commit()
+    incremental = _rollups(engine)
+
+    with engine.begin() as conn:
+        conn.execute(AnalyticsDailyRollup.__table__.delete())
+        backfill_rollups(conn, date(2026, 9, 1), date(2026, 10, 31))
+
+    assert _rollups(engine) == incremental
+    assert ("2026-10-01", "failed", 1, 1) in incremental
+
+
+def test_trend_and_summary_read_rollups_in_one_query(db):
+    engine = db.get_bind()
+    user = SimpleNamespace(id=uuid.uuid4(), role=UserRole.EXPORTER)
+    db.add_all(
+        [
+            AnalyticsDailyRollup(day=date(2026, 10, 1), user_id=user.id, status="completed",
+                                 jobs=3, processing_jobs=2, processing_seconds=240.0, discrepancy_count=4),
+            AnalyticsDailyRollup(day=date(2026, 10, 1), user_id=user.id, status="failed",
+                                 jobs=1, processing_jobs=1, processing_seconds=600.0, discrepancy_count=2),
+            AnalyticsDailyRollup(day=date(2026, 10, 3), user_id=user.id, status="created",
+                                 jobs=2, processing_jobs=0, processing_seconds=0.0, discrepancy_count=0),
+            AnalyticsDailyRollup(day=date(2026, 10, 1), user_id=uuid.uuid4(), status="completed",
+                                 jobs=9, processing_jobs=9, processing_seconds=90.0, discrepancy_count=0),
+        ]
+    )
+    db.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    service = AnalyticsService(db)
+    trend = service.get_trend_stats(
+        user, "custom", datetime(2026, 10, 1), datetime(2026, 10, 3, 23, 59)
+    )
+
+    assert len(statements) == 1
+    assert [point.jobs_submitted for point in trend.timeline] == [4, 0, 2]
+    first_day = trend.timeline[0]
+    assert (first_day.jobs_completed, first_day.jobs_rejected, first_day.discrepancy_count) == (3, 1, 6)
+    assert first_day.avg_processing_time == 2.0  # completed jobs only: 240s / 2
+
+    summary = service.get_summary_stats(
+        user, "custom", datetime(2026, 10, 1), datetime(2026, 10, 3, 23, 59)
+    )
+    assert (summary.total_jobs, summary.success_count, summary.rejection_count, summary.pending_count) == (6, 3, 1, 2)
+    assert summary.avg_processing_time_minutes == pytest.approx(4.67, abs=0.01)  # 840s / 3
@@ -0,0 +1,168 @@
+"""Buffered audit log writer: batching, user resolution, spill and replay.
+
+SQLite-in-memory like test_discrepancy_workflow.py, with Postgres UUID and
+JSONB columns rendered as CHAR(32) and JSON.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models as legacy_models  # noqa: F401  (side effects)
+from app.models import AuditLog, User
+from app.models.base import Base
+from app.services.audit_service import AuditService
+from app.services.audit_writer import SUBJECT_KEY, AuditLogWriter
+
+
+@compiles(UUID, "sqlite")
+def _uuid_as_char(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine(
+        "sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine, tables=[User.__table__, AuditLog.__table__])
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+
+
+@pytest.fixture()
+def session_factory(engine):
+    return sessionmaker(bind=engine)
+
+
+def _event(path="/api/jobs", subject=None):
+    values = AuditService.audit_log_values(
+        action="get_request",
+        correlation_id=str(uuid.uuid4()),
+        endpoint=path,
+        http_method="GET",
+        status_code=200,
+        request_data={"path": path, "headers": {"authorization": "Bearer abc"}},
+    )
+    values[SUBJECT_KEY] = subject
+    return values
+
+
+def _audit_rows(engine):
+    with engine.connect() as conn:
+        return conn.execute(
+            select(AuditLog.__table__.c.endpoint, AuditLog.__table__.c.user_email)
+            .order_by(AuditLog.__table__.c.timestamp)
+        ).all()
+
+
+def test_flush_bulk_inserts_and_resolves_users(engine, session_factory, tmp_path):
+    with session_factory() as db:
+        db.add(User(email="ops@example.com", hashed_password="x", full_name="Ops", role="exporter", is_active=True))
+        db.commit()
+
+    writer = AuditLogWriter(session_factory, batch_size=10, spill_path=str(tmp_path / "spill.jsonl"))
+    for index in range(25):
+        writer.submit(_event(f"/api/jobs/{index}", subject="ops@example.com" if index == 0 else "ghost@example.com"))
+
+    inserts = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *rest: inserts.append(statement)
+                 if statement.startswith("INSERT INTO audit_logs") else None)
+    assert writer.flush() == 25
+
+    emails = dict(_audit_rows(engine))
+    assert len(emails) == 25
+    assert emails.pop("/api/jobs/0") == "ops@example.com"
+    assert set(emails.values()) == {None}
+    assert len(inserts) <= 3  # one executemany per batch of 10
+    assert writer.stats()["written"] == 25
+
+
+def test_db_outage_spills_then_replays(engine, session_factory, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    failing = {"on": True}
+
+    def flaky_factory():
+        if failing["on"]:
+            raise RuntimeError("database unavailable")
+        return session_factory()
+
+    writer = AuditLogWriter(flaky_factory, batch_size=5, spill_path=str(spill))
+    for index in range(7):
+        writer.submit(_event(f"/api/outage/{index}"))
+    assert writer.flush() == 0
+    assert spill.exists() and len(spill.read_text().splitlines()) == 7
+    assert _audit_rows(engine) == []
+
+    failing["on"] = False
+    writer._db_retry_at = 0.0
+    writer.submit(_event("/api/after"))
+    assert writer.flush() == 1
+
+    assert len(_audit_rows(engine)) == 8
+    assert not spill.exists() and not os.path.exists(str(spill) + ".replay")
+    assert writer.stats()["replayed"] == 7
+
+
+def test_full_buffer_spills_instead_of_blocking(session_factory, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    writer = AuditLogWriter(session_factory, max_events=3, spill_path=str(spill))
+    for index in range(5):
+        writer.submit(_event(f"/api/burst/{index}"))
+
+    stats = writer.stats()
+    assert (stats["buffered"], stats["spilled"]) == (3, 2)
+    assert len(spill.read_text().splitlines()) == 2
+
+
+def test_background_flusher_writes_without_explicit_flush(engine, session_factory, tmp_path):
+    writer = AuditLogWriter(session_factory, flush_interval=0.01, spill_path=str(tmp_path / "spill.jsonl"))
+
+    async def scenario():
+        writer.submit(_event("/api/background"))
+        writer.ensure_started()
+        for _ in range(100):
+            if writer.stats()["written"]:
+                break
+            await asyncio.sleep(0.01)
+        await writer.close()
+
+    asyncio.run(scenario())
+    assert _audit_rows(engine) == [("/api/background", None)]
+
+
+def test_replay_quarantines_torn_and_rejected_lines(engine, session_factory, tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    writer = AuditLogWriter(session_factory, batch_size=10, spill_path=str(spill))
+    writer._spill([{**_event(f"/api/spilled/{index}"), "id": uuid.uuid4()} for index in range(2)])
+    duplicate = {**_event("/api/spilled/duplicate"), "id": uuid.uuid4()}
+    writer._spill([duplicate, dict(duplicate)])  # same id: the batch insert fails on the primary key
+    with open(spill, "a", encoding="utf-8") as handle:
+        handle.write('{"id": "a1f1c0de-torn-write", "endpoint": "/api/to')  # crash mid-write
+
+    assert writer.flush() == 0
+
+    endpoints = sorted(endpoint for endpoint, _ in _audit_rows(engine))
+    assert endpoints == ["/api/spilled/0", "/api/spilled/1", "/api/spilled/duplicate"]
+    assert not spill.exists() and not os.path.exists(str(spill) + ".replay")
+    corrupt = (tmp_path / "spill.jsonl.corrupt").read_text().splitlines()
+    assert len(corrupt) == 2 and corrupt[0].startswith('{"id": "a1f1c0de-torn-write"')
+    assert writer._db_retry_at == 0.0
+    stats = writer.stats()
+    assert (stats["replayed"], stats["quarantined"]) == (3, 2)
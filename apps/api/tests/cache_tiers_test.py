@@ -0,0 +1,50 @@
+"""Shared memory LRU and Redis accessor behind the app.cache modules."""
+
+from __future__ import annotations
+
+import asyncio
+
+from app.cache import _tiers
+from app.cache._tiers import CacheCounters, ExpiringLRU, RedisTier
+
+
+def test_lru_evicts_least_recent_by_entries_and_bytes_and_expires(monkeypatch):
+    counters = CacheCounters("evictions")
+    limits = {"entries": 3, "bytes": 10}
+    lru = ExpiringLRU(lambda: limits["entries"], max_bytes=lambda: limits["bytes"], on_evict=lambda: counters.bump("evictions"))
+
+    lru.put("a", b"aaaa", 60)
+    lru.put("b", b"bbbb", 60)
+    assert lru.get("a") == b"aaaa"  # "b" is now least recent
+    lru.put("c", b"cc", 60)
+    lru.put("d", b"dd", 60)  # 12 bytes and 4 entries: "b" goes
+    assert lru.get("b") is None
+    assert (len(lru), lru.size_bytes) == (3, 8)
+    lru.put("too-big", b"x" * 11, 60)
+    assert lru.get("too-big") is None
+    assert counters.snapshot() == {"evictions": 1}
+
+    now = _tiers.time.time()
+    monkeypatch.setattr(_tiers.time, "time", lambda: now + 61)
+    assert lru.get("a") is None and lru.size_bytes == 4
+
+    limits["entries"] = 0
+    lru.put("e", b"e", 60)
+    assert lru.get("e") is None
+
+
+def test_redis_tier_stops_retrying_once_unavailable(monkeypatch):
+    calls = []
+
+    async def get_redis_binary():
+        calls.append(1)
+        return None
+
+    import app.utils.redis_cache as redis_cache
+
+    monkeypatch.setattr(redis_cache, "get_redis_binary", get_redis_binary)
+    tier = RedisTier("Test cache")
+
+    assert asyncio.run(tier.client()) is None
+    assert asyncio.run(tier.client()) is None
+    assert calls == [1] and tier.available is False
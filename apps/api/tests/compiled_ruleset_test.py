@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+root_str = str(ROOT)
+if root_str not in sys.path:
+    sys.path.insert(0, root_str)
+
+os.environ["DEBUG"] = "false"
+
+from app.services import compiled_ruleset as compiled_module  # noqa: E402
+from app.services import rules_service as rules_service_module  # noqa: E402
+from app.services.rule_evaluator import RuleEvaluator, compile_rule  # noqa: E402
+
+
+def _ruleset(rules: list[dict[str, object]], version: str = "1.0.0") -> dict[str, object]:
+    return {
+        "ruleset": {"id": "rs-1", "published_at": "2026-01-01T00:00:00"},
+        "rules": rules,
+        "ruleset_version": version,
+        "rulebook_version": "UCP600:2007",
+    }
+
+
+_RULES = [
+    {
+        "rule_id": "UCP600-14C",
+        "document_type": None,
+        "checksum": "a",
+        "conditions": [
+            {"type": "equality_match", "left_path": "invoice.currency", "right_path": "lc.currency"},
+            {"field": "invoice.number", "operator": "matches", "value": "^inv-\\d+$", "case_insensitive": True},
+        ],
+    },
+    {
+        "rule_id": "INV-ONLY",
+        "document_type": "commercial_invoice",
+        "checksum": "b",
+        "conditions": [{"field": "invoice.amount", "operator": "gte", "value": 100}],
+    },
+    {
+        "rule_id": "BL-ONLY",
+        "document_type": "bill_of_lading",
+        "checksum": "c",
+        "conditions": [{"field": "bl.port_of_loading", "operator": "exists"}],
+    },
+    {
+        "rule_id": "IMPORT-ONLY",
+        "document_type": "lc",
+        "lc_types": ["import"],
+        "checksum": "d",
+        "conditions": [{"field": "lc.number", "operator": "exists"}],
+    },
+    {
+        "rule_id": "LC-OPS-INSURANCE",
+        "document_type": "insurance_certificate",
+        "domain": "lc_ops",
+        "checksum": "e",
+        "applies_if": [{"field": "lc.insurance_required", "operator": "equals", "value": True}],
+        "conditions": [{"field": "insurance.originals", "operator": "gte", "value": 2}],
+    },
+]
+
+
+@pytest.mark.parametrize(
+    "context",
+    [
+        {"lc": {"currency": "USD", "number": "LC1"}, "invoice": {"currency": "USD", "number": "INV-42", "amount": 150}},
+        {"lc": {"currency": "USD"}, "invoice": {"currency": "EUR", "number": "X-1", "amount": 50}},
+        {"lc": {"insurance_required": True}, "insurance": {"originals": 1}},
+        {},
+    ],
+)
+@pytest.mark.asyncio
+async def test_compiled_rules_evaluate_like_rule_dicts(context: dict[str, object]) -> None:
+    evaluator = RuleEvaluator()
+
+    from_dicts = await evaluator.evaluate_rules(_RULES, context)
+    from_compiled = await evaluator.evaluate_rules([compile_rule(rule) for rule in _RULES], context)
+
+    assert from_compiled == from_dicts
+
+
+def test_select_indexes_rules_by_document_type_and_lc_type() -> None:
+    compiled = compiled_module.compile_ruleset(_ruleset(_RULES), "icc.ucp600")
+
+    invoice_rules = [entry.compiled.rule_id for entry in compiled.select("commercial_invoice")]
+    assert invoice_rules == ["UCP600-14C", "INV-ONLY", "IMPORT-ONLY", "LC-OPS-INSURANCE"]
+
+    export_rules = [entry.compiled.rule_id for entry in compiled.select("commercial_invoice", "export")]
+    assert export_rules == ["UCP600-14C", "INV-ONLY", "LC-OPS-INSURANCE"]
+    assert compiled.select("commercial_invoice", "export") is compiled.select("commercial_invoice", "export")
+
+
+@pytest.mark.asyncio
+async def test_db_adapter_recompiles_only_when_the_version_key_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    adapter = rules_service_module.DBRulesAdapter()
+    served = {"ruleset": _ruleset([dict(rule) for rule in _RULES])}
+
+    async def _fake_get_active_ruleset(domain, jurisdiction="global", document_type=None):
+        return served["ruleset"]
+
+    monkeypatch.setattr(adapter, "get_active_ruleset", _fake_get_active_ruleset)
+
+    first = await adapter.get_compiled_ruleset("icc.ucp600", "global")
+    # A TTL refresh returns an equal payload as a new object: the plan is kept.
+    served["ruleset"] = _ruleset([dict(rule) for rule in _RULES])
+    assert await adapter.get_compiled_ruleset("icc.ucp600", "global") is first
+
+    changed_rules = [dict(rule) for rule in _RULES]
+    changed_rules[1]["checksum"] = "b2"
+    served["ruleset"] = _ruleset(changed_rules)
+    second = await adapter.get_compiled_ruleset("icc.ucp600", "global")
+    assert second is not first
+
+    adapter.clear_cache()
+    assert await adapter.get_compiled_ruleset("icc.ucp600", "global") is not second
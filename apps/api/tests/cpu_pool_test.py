@@ -0,0 +1,53 @@
+"""run_cpu_bound offloads CPU work to the process pool with bounded time."""
+
+from __future__ import annotations
+
+import time
+from io import BytesIO
+
+import pytest
+
+from app.config import settings
+from app.utils import cpu_pool, pdf_workers
+
+
+def _one_page_pdf() -> bytes:
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    pdf.drawString(72, 720, "BILL OF LADING BL-7")
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fresh_pool():
+    cpu_pool.shutdown_cpu_pool()
+    yield
+    cpu_pool.shutdown_cpu_pool()
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_bound_uses_process_pool(monkeypatch: pytest.MonkeyPatch, fresh_pool) -> None:
+    monkeypatch.setattr(settings, "CPU_POOL_ENABLED", True)
+    monkeypatch.setattr(settings, "CPU_POOL_MAX_WORKERS", 1)
+
+    text = await cpu_pool.run_cpu_bound(pdf_workers.pdfminer_text, _one_page_pdf(), task="pdfminer_text")
+
+    assert "BL-7" in text
+    stats = cpu_pool.cpu_pool_stats()
+    assert stats["mode"] in {"process", "thread"}
+    assert stats["inflight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_run_cpu_bound_thread_fallback_times_out(monkeypatch: pytest.MonkeyPatch, fresh_pool) -> None:
+    monkeypatch.setattr(settings, "CPU_POOL_ENABLED", False)
+
+    with pytest.raises(cpu_pool.CPUTaskTimeoutError):
+        await cpu_pool.run_cpu_bound(time.sleep, 0.5, task="sleep", timeout=0.05)
+
+    assert cpu_pool.cpu_pool_stats()["mode"] == "thread"
+    assert await cpu_pool.run_cpu_bound(sum, [1, 2, 3], task="sum") == 6
@@ -0,0 +1,59 @@
+"""Per-document label index behind DocumentFieldExtractor's regex fallback."""
+
+from __future__ import annotations
+
+import re
+
+from app.rules import extractors
+from app.rules.extractors import DocumentFieldExtractor, _LabelIndex
+from app.rules.models import DocumentType
+
+
+LINES = [
+    "COMMERCIAL INVOICE",
+    "Invoice No:",
+    "INV-2024-001",
+    "invoice",
+    "# 77",
+    "Ship to: ACME Ltd",
+    "CONSIGNEE：",
+    "Straße 5, Grüße GmbH",
+    "",
+    "G.W./N.W. 1200 / 1000 KGS",
+    "BIN 000123",
+]
+
+
+def test_index_positions_match_a_case_insensitive_per_line_search():
+    index = _LabelIndex(LINES)
+    patterns = [p for aliases in DocumentFieldExtractor.FIELD_LABEL_ALIASES.values() for p in aliases]
+    # Patterns the upper-cased document scan cannot take fall back to per-line search.
+    patterns += [r"^\s*$", r"gmbh", r"(?i)acme", r"NET(?=\s*WT)", r"INVOICE$", r"STRASSE"]
+
+    for pattern in patterns:
+        expected = [i for i, line in enumerate(LINES) if re.search(pattern, line, re.IGNORECASE)]
+        assert index.positions(pattern) == expected, pattern
+
+    # "INVOICE\s*#" matches "invoice\n# 77" across lines, but neither line on its own.
+    assert index.positions(r"INVOICE\s*#") == []
+
+
+def test_label_index_is_built_once_per_document(monkeypatch):
+    built = []
+
+    class CountingIndex(_LabelIndex):
+        def __init__(self, lines):
+            built.append(len(lines))
+            super().__init__(lines)
+
+    monkeypatch.setattr(extractors, "_LabelIndex", CountingIndex)
+    text = "\n".join(LINES + ["TOTAL AMOUNT: 1,250.00 USD", "L/C NO. LC-9981"])
+
+    fields = {f.field_name: f for f in DocumentFieldExtractor().extract_fields(text, DocumentType.COMMERCIAL_INVOICE)}
+
+    assert built == [len(LINES) + 2]
+    assert fields["invoice_number"].value == "INV-2024-001"
+    assert fields["consignee"].value == "ACME Ltd"
+    assert fields["lc_number"].value == "LC-9981"
+    assert fields["exporter_bin"].value == "000123"
+    assert fields["exporter_tin"].reason == "missing_in_source"
@@ -0,0 +1,98 @@
+"""DocumentStorageService over the non-blocking object storage backends."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.config import settings
+from app.services.document_storage import DocumentStorageService
+from app.services.object_storage import LocalObjectStorage, S3ObjectStorage
+from app.utils import s3_client
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+def test_local_backend_round_trip_with_ranges_and_streams(tmp_path):
+    storage = DocumentStorageService(backend=LocalObjectStorage(tmp_path))
+    pdf = bytes(range(256)) * 40
+
+    async def scenario():
+        stored = await storage.upload_document(io.BytesIO(pdf), "co-1", "set-1", "invoice", "invoice.pdf")
+        whole, metadata = await storage.get_document(stored["s3_key"])
+        part, _ = await storage.get_document(stored["s3_key"], byte_range=(10, 19))
+        streamed = await _collect(storage.stream_document(stored["s3_key"], chunk_size=1000, byte_range=(100, None)))
+        versions = await storage.list_versions("co-1", "set-1")
+        assert await storage.delete_document(stored["s3_key"])
+        with pytest.raises(FileNotFoundError):
+            await storage.get_document(stored["s3_key"])
+        return stored, whole, metadata, part, streamed, versions
+
+    stored, whole, metadata, part, streamed, versions = asyncio.run(scenario())
+    assert whole == pdf and stored["file_size"] == len(pdf)
+    assert metadata["checksum"] == stored["checksum"] and metadata["document-type"] == "invoice"
+    assert part == pdf[10:20]
+    assert streamed == pdf[100:]
+    assert [(v["s3_key"], v["document_type"]) for v in versions] == [(stored["s3_key"], "invoice")]
+
+
+class _FakeS3:
+    def __init__(self) -> None:
+        self.calls: List[Any] = []
+        self.objects: Dict[str, bytes] = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.calls.append(("put_object", Key))
+        self.objects[Key] = Body
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        self.calls.append(("upload_fileobj", key))
+        self.objects[key] = fileobj.read()
+
+    def get_object(self, Bucket, Key, Range=None):
+        self.calls.append(("get_object", Range))
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+        data = self.objects[Key]
+        if Range:
+            start, _, end = Range[len("bytes="):].partition("-")
+            data = data[int(start): int(end) + 1 if end else None]
+        return {"Body": io.BytesIO(data), "Metadata": {}}
+
+
+def test_s3_backend_multiparts_large_bodies_and_sends_ranges(monkeypatch):
+    monkeypatch.setattr(settings, "DOCUMENT_STORAGE_MULTIPART_THRESHOLD_MB", 5, raising=False)
+    fake = _FakeS3()
+    backend = S3ObjectStorage("bucket", client_factory=lambda: fake)
+    large = b"x" * (5 * 1024 * 1024)
+
+    async def scenario():
+        await backend.put("small", b"abc", content_type="application/pdf")
+        await backend.put("large", large, content_type="application/pdf")
+        part, _ = await backend.get("large", byte_range=(0, 9))
+        with pytest.raises(FileNotFoundError):
+            await backend.get("missing")
+        return part
+
+    assert asyncio.run(scenario()) == b"x" * 10
+    assert fake.calls[:2] == [("put_object", "small"), ("upload_fileobj", "large")]
+    assert ("get_object", "bytes=0-9") in fake.calls
+
+
+def test_s3_clients_are_shared(monkeypatch):
+    built = []
+    monkeypatch.setattr(s3_client, "_clients", type(s3_client._clients)())
+    monkeypatch.setattr(s3_client.boto3, "client", lambda *args, **kwargs: built.append(kwargs) or SimpleNamespace())
+    monkeypatch.delenv("S3_ENDPOINT_URL", raising=False)
+
+    assert s3_client.get_s3_client() is s3_client.get_s3_client()
+    assert s3_client.get_s3_client(region_name="eu-west-1") is not s3_client.get_s3_client()
+    assert len(built) == 2
+    assert built[0]["config"].max_pool_connections == 32
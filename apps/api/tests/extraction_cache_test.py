@@ -0,0 +1,95 @@
+"""AI extraction result cache: content-addressed reuse and prompt-version invalidation."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+root_str = str(ROOT)
+if root_str not in sys.path:
+    sys.path.insert(0, root_str)
+
+os.environ["DEBUG"] = "false"
+
+from app.cache import extraction_cache  # noqa: E402
+from app.services.extraction import ai_first_extractor as ai_first_module  # noqa: E402
+
+
+INVOICE_TEXT = "COMMERCIAL INVOICE\nInvoice No: INV-7731\nAmount: USD 48,250.00\n"
+
+
+@pytest.fixture(autouse=True)
+def _memory_only(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def _no_redis():
+        return None
+
+    monkeypatch.setattr(extraction_cache, "_get_redis", _no_redis)
+    extraction_cache._memory_cache.clear()
+
+
+def _extractor_with_model(monkeypatch: pytest.MonkeyPatch, calls: List[str]) -> ai_first_module.InvoiceAIFirstExtractor:
+    extractor = ai_first_module.InvoiceAIFirstExtractor()
+
+    async def _call_invoice_model(raw_text: str):
+        calls.append(raw_text)
+        await asyncio.sleep(0.01)
+        result: Dict[str, Any] = {"invoice_number": {"value": "INV-7731", "confidence": 0.9}}
+        return result, "openrouter"
+
+    monkeypatch.setattr(extractor, "_call_invoice_model", _call_invoice_model)
+    return extractor
+
+
+@pytest.mark.asyncio
+async def test_unchanged_text_is_extracted_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[str] = []
+    extractor = _extractor_with_model(monkeypatch, calls)
+
+    first, concurrent = await asyncio.gather(
+        extractor._run_invoice_ai_extraction(INVOICE_TEXT),
+        extractor._run_invoice_ai_extraction(INVOICE_TEXT),
+    )
+    first[0]["invoice_number"]["value"] = "mutated by caller"
+    # OCR re-wrapping does not change the content hash.
+    recheck = await extractor._run_invoice_ai_extraction(INVOICE_TEXT.replace("\n", "  \n "))
+
+    assert len(calls) == 1
+    assert concurrent[0]["invoice_number"]["value"] == "INV-7731"
+    assert recheck == ({"invoice_number": {"value": "INV-7731", "confidence": 0.9}}, "openrouter")
+
+    monkeypatch.setenv("EXTRACTION_PRIMARY_MODEL", "another/model")
+    await extractor._run_invoice_ai_extraction(INVOICE_TEXT)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_prompt_version_invalidation_and_failures(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[str] = []
+    extractor = _extractor_with_model(monkeypatch, calls)
+    await extractor._run_invoice_ai_extraction(INVOICE_TEXT)
+
+    version = extraction_cache.prompt_version(
+        ai_first_module.INVOICE_EXTRACTION_PROMPT,
+        ai_first_module.INVOICE_EXTRACTION_SYSTEM_PROMPT,
+    )
+    assert await extraction_cache.invalidate_prompt_version("0-unrelated") == 0
+    assert await extraction_cache.invalidate_prompt_version(version) == 1
+    await extractor._run_invoice_ai_extraction(INVOICE_TEXT)
+    assert len(calls) == 2
+
+    async def _failing_model(raw_text: str):
+        calls.append(raw_text)
+        return None, "parse_error"
+
+    bl_extractor = ai_first_module.BLAIFirstExtractor()
+    monkeypatch.setattr(bl_extractor, "_call_bl_model", _failing_model)
+    assert await bl_extractor._run_bl_ai_extraction(INVOICE_TEXT) == (None, "parse_error")
+    assert await bl_extractor._run_bl_ai_extraction(INVOICE_TEXT) == (None, "parse_error")
+    assert len(calls) == 4
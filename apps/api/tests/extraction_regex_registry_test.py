@@ -0,0 +1,92 @@
+"""Shared precompiled-regex registry and the inline-regex lint for the extraction modules."""
+
+from __future__ import annotations
+
+import ast
+import re
+from pathlib import Path
+
+import pytest
+
+from app.config import settings
+from app.utils import regex_registry
+from app.utils.regex_registry import get_stats, register_pattern, reset_stats
+
+
+EXTRACTION_DIR = Path(__file__).resolve().parents[1] / "app" / "services" / "extraction"
+
+_LINTED_MODULES = (
+    "ai_first_extractor.py",
+    "two_stage_extractor.py",
+    "launch_pipeline.py",
+    "lc_taxonomy.py",
+    "iso20022_lc_extractor.py",
+)
+_RE_FUNCTIONS = {"search", "match", "fullmatch", "findall", "finditer", "sub", "subn", "split", "compile"}
+# Functions other tests exec on their own with only ``re`` in scope.
+_ALLOWED = {("launch_pipeline.py", "detect_lc_format")}
+
+
+def _inline_regex_calls(module: str):
+    tree = ast.parse((EXTRACTION_DIR / module).read_text(encoding="utf-8"))
+    found = []
+
+    def visit(node, function):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            function = node.name
+        if (
+            function
+            and (module, function) not in _ALLOWED
+            and isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and isinstance(node.func.value, ast.Name)
+            and node.func.value.id in {"re", "_re"}
+            and node.func.attr in _RE_FUNCTIONS
+            and node.args
+            and isinstance(node.args[0], ast.Constant)
+            and isinstance(node.args[0].value, str)
+        ):
+            found.append(f"{module}:{node.lineno} {function}() re.{node.func.attr}")
+        for child in ast.iter_child_nodes(node):
+            visit(child, function)
+
+    visit(tree, None)
+    return found
+
+
+@pytest.mark.parametrize("module", _LINTED_MODULES)
+def test_extraction_modules_do_not_compile_literal_patterns_per_call(module):
+    assert _inline_regex_calls(module) == [], "register the pattern at module level with register_pattern()"
+
+
+def test_registration_is_idempotent_and_rejects_a_conflicting_expression():
+    first = register_pattern("test", "lc_ref", r"LC[-\s]?(\d+)", re.I)
+
+    assert register_pattern("test", "lc_ref", r"LC[-\s]?(\d+)", re.I) is first
+    assert first in regex_registry.registered_patterns("test")
+    with pytest.raises(ValueError):
+        register_pattern("test", "lc_ref", r"LC(\d+)", re.I)
+
+
+def test_stats_count_calls_hits_and_time_only_when_enabled(monkeypatch):
+    pattern = register_pattern("test", "amount", r"USD\s*([\d,.]+)")
+    monkeypatch.setattr(settings, "DEBUG", False, raising=False)
+    monkeypatch.setattr(settings, "EXTRACTION_PATTERN_STATS_ENABLED", False, raising=False)
+    reset_stats()
+
+    assert pattern.search("TOTAL USD 1,250.00").group(1) == "1,250.00"
+    assert get_stats() == []
+
+    monkeypatch.setattr(settings, "EXTRACTION_PATTERN_STATS_ENABLED", True, raising=False)
+    try:
+        pattern.search("TOTAL USD 1,250.00")
+        pattern.search("no amount here")
+        assert [m.group(1) for m in pattern.finditer("USD 1 and USD 2")] == ["1", "2"]
+        assert pattern.sub("", "USD 5 due") == " due"
+
+        (row,) = [r for r in get_stats() if (r["family"], r["name"]) == ("test", "amount")]
+        assert (row["calls"], row["hits"]) == (4, 3)
+        assert row["pattern"] == r"USD\s*([\d,.]+)"
+        assert row["total_ms"] >= 0 and row["mean_us"] >= 0
+    finally:
+        reset_stats()
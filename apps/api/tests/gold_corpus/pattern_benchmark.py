@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Gold Corpus Regex Benchmark
+
+Runs the deterministic extraction paths (AI-first regex fallbacks,
+DocumentFieldExtractor, two-stage validators, MT700 timeline and LC
+classification) over the text layer of every corpus document, and prints the
+per-pattern cost collected by ``app.utils.regex_registry``.
+
+Usage:
+    python -m tests.gold_corpus.pattern_benchmark
+    python -m tests.gold_corpus.pattern_benchmark --set set_001_standard
+    python -m tests.gold_corpus.pattern_benchmark --repeat 20 --top 40
+    python -m tests.gold_corpus.pattern_benchmark --json pattern_stats.json
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# Add app to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from app.config import settings
+from app.rules.extractors import DocumentFieldExtractor
+from app.rules.models import DocumentType
+from app.services.extraction import ai_first_extractor as ai_first
+from app.services.extraction.launch_pipeline import _extract_mt700_timeline_fields, detect_lc_format
+from app.services.extraction.lc_taxonomy import build_lc_classification
+from app.services.extraction.parsed_document import ParsedDocument
+from app.services.extraction.two_stage_extractor import TwoStageExtractor
+from app.utils.regex_registry import get_stats, reset_stats
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Paths
+CORPUS_DIR = Path(__file__).parent
+DOCUMENTS_DIR = CORPUS_DIR / "documents"
+
+# Corpus file stem -> (document type, AI-first extractor, regex fallback method)
+DOCUMENT_KINDS: Dict[str, Tuple[DocumentType, type, str]] = {
+    "Invoice": (DocumentType.COMMERCIAL_INVOICE, ai_first.InvoiceAIFirstExtractor, "_invoice_regex_fallback"),
+    "Bill_of_Lading": (DocumentType.BILL_OF_LADING, ai_first.BLAIFirstExtractor, "_bl_regex_fallback"),
+    "Packing_List": (DocumentType.PACKING_LIST, ai_first.PackingListAIFirstExtractor, "_packing_list_regex_fallback"),
+    "Certificate_of_Origin": (
+        DocumentType.CERTIFICATE_OF_ORIGIN,
+        ai_first.CertificateOfOriginAIFirstExtractor,
+        "_coo_regex_fallback",
+    ),
+    "Insurance_Certificate": (
+        DocumentType.INSURANCE_CERTIFICATE,
+        ai_first.InsuranceCertificateAIFirstExtractor,
+        "_insurance_regex_fallback",
+    ),
+    "Inspection_Certificate": (
+        DocumentType.INSPECTION_CERTIFICATE,
+        ai_first.InspectionCertificateAIFirstExtractor,
+        "_inspection_regex_fallback",
+    ),
+}
+
+
+def load_corpus_texts(set_name: str = None) -> List[Tuple[str, str]]:
+    """(stem, text) for every corpus PDF with a text layer."""
+    set_dirs = [DOCUMENTS_DIR / set_name] if set_name else sorted(DOCUMENTS_DIR.glob("set_*"))
+    texts = []
+    for set_dir in set_dirs:
+        for pdf_path in sorted(set_dir.glob("*.pdf")):
+            text = ParsedDocument.from_bytes(pdf_path.read_bytes(), filename=pdf_path.name).best_native_text()
+            if text:
+                texts.append((pdf_path.stem, text))
+            else:
+                logger.warning(f"No text layer in {pdf_path}")
+    return texts
+
+
+def build_runs(texts: List[Tuple[str, str]]) -> List[Callable[[], object]]:
+    """One callable per document covering its deterministic extraction paths."""
+    field_extractor = DocumentFieldExtractor()
+    two_stage = TwoStageExtractor()
+    runs: List[Callable[[], object]] = []
+
+    for stem, text in texts:
+        if stem == "LC":
+            def run_lc(text=text):
+                timeline = _extract_mt700_timeline_fields(text)
+                build_lc_classification({"raw_text": text, "format": detect_lc_format(text), **timeline})
+                field_extractor.extract_fields(text, DocumentType.LETTER_OF_CREDIT)
+            runs.append(run_lc)
+            continue
+        if stem not in DOCUMENT_KINDS:
+            continue
+        doc_type, extractor_cls, fallback_name = DOCUMENT_KINDS[stem]
+        fallback = getattr(extractor_cls(), fallback_name)
+
+        def run_document(text=text, doc_type=doc_type, fallback=fallback):
+            extracted = fallback(text)
+            two_stage.process(
+                {name: {"value": value, "confidence": 0.5} for name, value in extracted.items() if value},
+                doc_type.value,
+            )
+            field_extractor.extract_fields(text, doc_type)
+        runs.append(run_document)
+    return runs
+
+
+def print_stats(rows: List[Dict[str, object]], top: int) -> None:
+    print("\n" + "=" * 100)
+    print("EXTRACTION REGEX COST")
+    print("=" * 100)
+    print(f"{'family':<16} {'name':<40} {'calls':>8} {'hits':>8} {'total ms':>10} {'mean us':>9}")
+    for row in rows[:top]:
+        print(
+            f"{row['family']:<16} {str(row['name'])[:40]:<40} {row['calls']:>8} {row['hits']:>8} "
+            f"{row['total_ms']:>10.3f} {row['mean_us']:>9.2f}"
+        )
+    print("=" * 100)
+    print(f"Patterns: {len(rows)}  Total: {sum(row['total_ms'] for row in rows):.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extraction regexes over the gold corpus")
+    parser.add_argument("--set", "-s", help="Run specific test set")
+    parser.add_argument("--repeat", "-r", type=int, default=5, help="Passes over the corpus")
+    parser.add_argument("--top", "-t", type=int, default=30, help="Patterns to print")
+    parser.add_argument("--json", "-j", help="Also write all rows to this JSON file")
+
+    args = parser.parse_args()
+
+    texts = load_corpus_texts(args.set)
+    if not texts:
+        logger.error("No corpus documents with a text layer found")
+        sys.exit(1)
+    runs = build_runs(texts)
+
+    settings.EXTRACTION_PATTERN_STATS_ENABLED = True
+    reset_stats()
+    start = time.perf_counter()
+    for _ in range(max(1, args.repeat)):
+        for run in runs:
+            run()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    rows = get_stats()
+    print_stats(rows, args.top)
+    print(f"Documents: {len(texts)}  Passes: {max(1, args.repeat)}  Wall: {elapsed_ms:.0f}ms")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+        logger.info(f"Stats saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
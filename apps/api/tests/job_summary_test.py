@@ -0,0 +1,150 @@
+"""Job list summary columns and keyset pagination of GET /api/jobs."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.models import Discrepancy, Document, ValidationSession
+from app.models.agency import Supplier
+from app.models.analytics_rollup import AnalyticsDailyRollup
+from app.models.base import Base
+from app.models.bulk_jobs import BulkItem, BulkJob
+from app.models.services import ServicesClient
+from app.routers.jobs_public import list_user_jobs
+
+
+@compiles(UUID, "sqlite")
+def _uuid_as_char(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    tables = [
+        BulkJob.__table__,
+        BulkItem.__table__,
+        Supplier.__table__,
+        ServicesClient.__table__,
+        ValidationSession.__table__,
+        Document.__table__,
+        Discrepancy.__table__,
+        # Written by the rollup commit hooks on every session commit.
+        AnalyticsDailyRollup.__table__,
+    ]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _results(lc_number="LC-1", issues=2):
+    return {
+        "structured_result": {
+            "version": "structured_result_v1",
+            "documents_structured": [{"status": "success"}, {"status": "error"}, {"status": "odd"}],
+            "issues": [{"title": f"Issue {n}", "severity": "major", "documents": ["Invoice"]} for n in range(issues)],
+            "bank_verdict": {"verdict": "caution"},
+        },
+        "lc_number": lc_number,
+        "extracted_data": {"invoice": {"buyer": {"name": "Acme Imports"}, "invoice_amount": {"value": 1200, "currency": "USD"}}},
+    }
+
+
+def _discrepancy(session_id):
+    return Discrepancy(
+        validation_session_id=session_id,
+        discrepancy_type="ucp600",
+        severity="major",
+        rule_name="UCP600.18.c",
+        description="Late presentation",
+    )
+
+
+def test_summary_written_with_results_and_recounted_from_rows(db):
+    job = ValidationSession(user_id=uuid.uuid4(), status="processing", workflow_type="exporter_presentation")
+    db.add(job)
+    db.commit()
+    assert job.summary_updated_at is not None and job.summary_document_count == 0
+
+    job.validation_results = _results()
+    job.status = "completed"
+    db.add(_discrepancy(job.id))
+    db.commit()
+
+    assert (job.summary_lc_number, job.summary_supplier_name) == ("LC-1", "Acme Imports")
+    assert (job.summary_invoice_amount, job.summary_invoice_currency) == ("1200", "USD")
+    assert job.summary_document_status == {"success": 1, "warning": 1, "error": 1}
+    assert job.summary_top_issue["title"] == "Issue 0"
+    assert job.summary_verdict == "CAUTION"
+    assert job.summary_document_count == 3  # no Document rows: from the result
+    assert job.summary_discrepancy_count == 1  # from the Discrepancy row
+
+    db.add(_discrepancy(job.id))
+    db.commit()
+    assert job.summary_discrepancy_count == 2
+
+
+def test_list_pages_by_cursor_without_loading_blobs(db):
+    engine = db.get_bind()
+    user = SimpleNamespace(id=uuid.uuid4())
+    start = datetime(2026, 10, 1, 9)
+    for index in range(5):
+        db.add(
+            ValidationSession(
+                user_id=user.id,
+                status="completed",
+                workflow_type="exporter_presentation",
+                created_at=start + timedelta(hours=index),
+                validation_results=_results(f"LC-{index}"),
+            )
+        )
+    db.add(ValidationSession(user_id=uuid.uuid4(), status="completed", workflow_type="exporter_presentation"))
+    db.commit()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    first = list_user_jobs(limit=2, status_filter=None, cursor=None, current_user=user, db=db)
+    second = list_user_jobs(limit=2, status_filter=None, cursor=first["nextCursor"], current_user=user, db=db)
+    third = list_user_jobs(limit=2, status_filter=None, cursor=second["nextCursor"], current_user=user, db=db)
+
+    pages = [[job["lcNumber"] for job in page["jobs"]] for page in (first, second, third)]
+    assert pages == [["LC-4", "LC-3"], ["LC-2", "LC-1"], ["LC-0"]]
+    assert third["nextCursor"] is None
+    assert first["jobs"][0]["verdict"] == "CAUTION"
+    assert len(statements) == 3
+    assert not any("validation_results" in statement or "extracted_data" in statement for statement in statements)
+
+    with pytest.raises(HTTPException):
+        list_user_jobs(limit=2, status_filter=None, cursor="not-a-cursor", current_user=user, db=db)
+
+
+def test_list_serves_legacy_rows_without_summarising_them(db):
+    engine = db.get_bind()
+    user = SimpleNamespace(id=uuid.uuid4())
+    job = ValidationSession(user_id=user.id, status="completed", workflow_type="exporter_presentation",
+                            validation_results=_results("LC-OLD"))
+    db.add(job)
+    db.commit()
+    with engine.begin() as conn:
+        conn.execute(ValidationSession.__table__.update().values(summary_updated_at=None, summary_lc_number=None))
+    db.expire_all()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    listed = list_user_jobs(limit=10, status_filter=None, cursor=None, current_user=user, db=db)
+    assert listed["jobs"][0]["lcNumber"] is None
+    assert len(statements) == 1 and statements[0].lstrip().upper().startswith("SELECT")
+    assert "validation_results" not in statements[0]
@@ -0,0 +1,79 @@
+"""MinHash/LSH fingerprints used for LC duplicate candidate lookup."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+root_str = str(ROOT)
+if root_str not in sys.path:
+    sys.path.insert(0, root_str)
+
+from app.services import lc_minhash  # noqa: E402
+
+
+def _fingerprint(lc_number: str, **fields) -> dict:
+    base = {
+        "lc_number": lc_number,
+        "client_name": "dhaka knitwear ltd",
+        "beneficiary_name": "dhaka knitwear ltd",
+        "issuing_bank": "standard chartered bank",
+        "amount": "125000.00",
+        "currency": "usd",
+        "expiry_date": "2026-03-31",
+        "port_of_loading": "chittagong",
+        "port_of_discharge": "hamburg",
+    }
+    base.update(fields)
+    return {
+        "lc_number": lc_number,
+        "client_name": base["client_name"],
+        "fields": base,
+        "goods_text": "100% cotton knitted t-shirts as per proforma invoice no 42",
+    }
+
+
+def _signature(data: dict):
+    return lc_minhash.minhash_signature(lc_minhash.shingles(data))
+
+
+def test_signature_is_deterministic() -> None:
+    data = _fingerprint("EXP2026001")
+    assert _signature(data) == _signature(data)
+    assert len(_signature(data)) == lc_minhash.NUM_PERMUTATIONS
+    assert len(lc_minhash.band_keys(_signature(data))) == lc_minhash.NUM_BANDS
+
+
+def test_lc_number_typo_shares_bands() -> None:
+    original = _signature(_fingerprint("EXP2026001"))
+    typo = _signature(_fingerprint("EXP2O26001"))
+
+    assert set(lc_minhash.band_keys(original)) & set(lc_minhash.band_keys(typo))
+    assert lc_minhash.estimated_jaccard(original, typo) > 0.7
+
+
+def test_unrelated_lc_does_not_share_bands() -> None:
+    original = _signature(_fingerprint("EXP2026001"))
+    other = _signature(
+        {
+            "fields": {
+                "lc_number": "IMP77810",
+                "client_name": "nordic timber ab",
+                "issuing_bank": "danske bank",
+                "amount": "9800",
+                "currency": "eur",
+            },
+            "goods_text": "kiln dried spruce planks",
+        }
+    )
+
+    assert not set(lc_minhash.band_keys(original)) & set(lc_minhash.band_keys(other))
+    assert lc_minhash.estimated_jaccard(original, other) < 0.2
+
+
+def test_empty_fingerprint_has_no_signature() -> None:
+    assert _signature({"fields": {}}) is None
+    assert lc_minhash.band_keys(None) == []
+    assert lc_minhash.estimated_jaccard(None, [1, 2]) == 0.0
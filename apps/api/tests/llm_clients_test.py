@@ -0,0 +1,58 @@
+"""Pooled LLM clients: reuse per provider/key and per-provider concurrency slots."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+root_str = str(ROOT)
+if root_str not in sys.path:
+    sys.path.insert(0, root_str)
+
+os.environ["DEBUG"] = "false"
+
+from app.config import settings  # noqa: E402
+from app.services import llm_clients  # noqa: E402
+
+
+@pytest.mark.asyncio
+async def test_clients_are_reused_per_provider_and_key() -> None:
+    first = llm_clients.get_openai_client("openrouter", "key-a", "https://openrouter.ai/api/v1")
+    again = llm_clients.get_openai_client("openrouter", "key-a", "https://openrouter.ai/api/v1")
+    other_key = llm_clients.get_openai_client("openrouter", "key-b", "https://openrouter.ai/api/v1")
+    anthropic_client = llm_clients.get_anthropic_client("key-a")
+
+    assert first is again
+    assert other_key is not first
+    assert llm_clients.get_anthropic_client("key-a") is anthropic_client
+
+    await llm_clients.close_llm_clients()
+    assert llm_clients.get_openai_client("openrouter", "key-a", "https://openrouter.ai/api/v1") is not first
+    await llm_clients.close_llm_clients()
+
+
+@pytest.mark.asyncio
+async def test_llm_slot_bounds_concurrency_per_provider(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LLM_PROVIDER_MAX_CONCURRENCY", 2)
+    state = {"active": 0, "peak": 0}
+
+    async def _call(provider: str) -> None:
+        async with llm_clients.llm_slot(provider):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+
+    await asyncio.gather(*(_call("slot-test") for _ in range(6)))
+
+    assert state["peak"] == 2
+    stats = llm_clients.llm_client_stats()["providers"]["slot-test"]
+    assert stats["inflight"] == 0
+    assert stats["waiting"] == 0
+    assert stats["completed"] == 6
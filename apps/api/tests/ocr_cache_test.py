@@ -0,0 +1,158 @@
+"""Tiered OCR cache: bounded LRU, compressed Redis values and singleflight."""
+
+from __future__ import annotations
+
+import asyncio
+import fnmatch
+from typing import Any, Dict, Optional
+
+import pytest
+
+from app.cache import ocr_cache
+from app.config import settings
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.values.get(key)
+
+    async def set(self, key: str, value: Any, nx: bool = False, ex: Optional[int] = None) -> bool:
+        if nx and key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    async def setex(self, key: str, ttl: int, value: Any) -> None:
+        self.values[key] = value
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str) -> int:
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+    async def scan_iter(self, match: str, count: int = 10):
+        for key in list(self.values):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def keys(self, pattern: str):  # pragma: no cover - must not be used
+        raise AssertionError("KEYS blocks Redis; use SCAN")
+
+
+@pytest.fixture
+def memory_only(monkeypatch: pytest.MonkeyPatch):
+    async def _no_redis():
+        return None
+
+    monkeypatch.setattr(ocr_cache, "_get_redis", _no_redis)
+    ocr_cache._memory_cache.clear()
+    yield
+    ocr_cache._memory_cache.clear()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch):
+    redis = _FakeRedis()
+
+    async def _redis():
+        return redis
+
+    monkeypatch.setattr(ocr_cache, "_get_redis", _redis)
+    ocr_cache._memory_cache.clear()
+    yield redis
+    ocr_cache._memory_cache.clear()
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_is_lru_bounded_by_bytes(monkeypatch: pytest.MonkeyPatch, memory_only) -> None:
+    page = {"full_text": "x" * 64}
+    entry_bytes = len(ocr_cache._encode(page))
+    monkeypatch.setattr(settings, "OCR_CACHE_MEMORY_MAX_BYTES", entry_bytes * 2)
+
+    await ocr_cache.set("page-1", page)
+    await ocr_cache.set("page-2", page)
+    assert await ocr_cache.get("page-1") == page  # page-1 becomes most recent
+    await ocr_cache.set("page-3", page)
+
+    assert await ocr_cache.get("page-2") is None
+    assert await ocr_cache.get("page-1") == page
+    assert await ocr_cache.get("page-3") == page
+    stats = await ocr_cache.get_stats()
+    assert stats["memory_entries"] == 2
+    assert stats["memory_bytes"] == entry_bytes * 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_computation(memory_only) -> None:
+    calls = {"count": 0}
+
+    async def _compute() -> Dict[str, Any]:
+        calls["count"] += 1
+        await asyncio.sleep(0.01)
+        return {"full_text": "BILL OF LADING"}
+
+    key = ocr_cache.build_page_key("aws_textract", b"page-bytes", "image/png")
+    results = await asyncio.gather(*(ocr_cache.get_or_compute(key, _compute) for _ in range(5)))
+
+    assert calls["count"] == 1
+    assert [payload for payload, _ in results] == [{"full_text": "BILL OF LADING"}] * 5
+    assert sum(1 for _, hit in results if not hit) == 1
+    assert (await ocr_cache.get_or_compute(key, _compute))[1] is True
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_uncacheable_results_are_recomputed(memory_only) -> None:
+    calls = {"count": 0}
+
+    async def _compute() -> Dict[str, Any]:
+        calls["count"] += 1
+        return {"full_text": "", "error": "throttled"}
+
+    key = ocr_cache.build_page_key("aws_textract", b"blank-page", "image/png")
+    usable = lambda payload: not payload.get("error")  # noqa: E731
+    await ocr_cache.get_or_compute(key, _compute, should_cache=usable)
+    await ocr_cache.get_or_compute(key, _compute, should_cache=usable)
+
+    assert calls["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_values_are_compressed_and_stats_use_scan(fake_redis: _FakeRedis) -> None:
+    payload = {"full_text": "INVOICE " * 200}
+    await ocr_cache.set("doc-hash", payload)
+
+    stored = fake_redis.values[f"{ocr_cache.OCR_CACHE_PREFIX}doc-hash"]
+    assert stored[:1] == b"\x01"
+    assert len(stored) < len(payload["full_text"])
+
+    await ocr_cache.clear_memory_cache()
+    assert await ocr_cache.get("doc-hash") == payload
+    stats = await ocr_cache.get_stats()
+    assert stats["redis_entries"] == 1
+    assert stats["memory_entries"] == 1  # promoted from Redis
+
+
+@pytest.mark.asyncio
+async def test_waits_for_value_while_another_process_holds_the_lock(fake_redis: _FakeRedis) -> None:
+    key = ocr_cache.build_page_key("aws_textract", b"shared-page", "image/png")
+    fake_redis.values[f"{ocr_cache.OCR_CACHE_LOCK_PREFIX}{key}"] = "other-process"
+
+    async def _other_process_finishes() -> None:
+        await asyncio.sleep(0.05)
+        fake_redis.values[f"{ocr_cache.OCR_CACHE_PREFIX}{key}"] = ocr_cache._encode({"full_text": "FROM PEER"})
+        del fake_redis.values[f"{ocr_cache.OCR_CACHE_LOCK_PREFIX}{key}"]
+
+    async def _compute() -> Dict[str, Any]:
+        raise AssertionError("provider must not be called while a peer holds the lock")
+
+    peer = asyncio.create_task(_other_process_finishes())
+    payload, hit = await ocr_cache.get_or_compute(key, _compute)
+    await peer
+
+    assert payload == {"full_text": "FROM PEER"}
+    assert hit is True
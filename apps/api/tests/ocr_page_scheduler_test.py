@@ -0,0 +1,179 @@
+"""Per-page OCR scheduling: pages run concurrently, JPEG is rendered only on fallback."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+from app.config import settings
+from app.routers.validation import ocr_runtime
+from app.services.extraction.parsed_document import ParsedDocument
+
+
+class _PagedDocument(ParsedDocument):
+    """ParsedDocument whose pages render without pdf2image."""
+
+    def __post_init__(self) -> None:
+        super().__post_init__()
+        self.rendered: List[tuple] = []
+
+    @property
+    def page_count(self) -> int:
+        return 4
+
+    async def page_count_async(self) -> int:
+        return 4
+
+    async def render_page_async(self, *, dpi: int, page_index: int, output_format: str = "PNG") -> bytes:
+        self.rendered.append((page_index, output_format))
+        return f"{output_format}-page-{page_index}".encode()
+
+
+class _SlowAdapter:
+    provider_name = "aws_textract"
+
+    def __init__(self) -> None:
+        self.calls: List[bytes] = []
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def process_file_bytes(self, content: bytes, filename: str, content_type: str, document_id: Any) -> Any:
+        self.calls.append(content)
+        await asyncio.sleep(0.2)
+        page = content.decode().rsplit("-", 1)[-1]
+        if content.startswith(b"PNG") and page == "2":
+            return SimpleNamespace(full_text="", error="Unsupported document format", overall_confidence=None, elements=[], metadata={}, processing_time_ms=0, provider="aws_textract")
+        return SimpleNamespace(full_text=f"text of page {page}", error=None, overall_confidence=0.9, elements=[], metadata={}, processing_time_ms=0, provider="aws_textract")
+
+
+@pytest.fixture
+def textract_only(monkeypatch: pytest.MonkeyPatch):
+    adapter = _SlowAdapter()
+    factory = SimpleNamespace(configured_providers=["textract"], get_all_adapters=lambda: [adapter])
+    import app.ocr.factory as ocr_factory
+
+    monkeypatch.setattr(ocr_factory, "get_ocr_factory", lambda: factory)
+    monkeypatch.setattr(settings, "OCR_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "OCR_PROVIDER_MAX_CONCURRENCY", 8)
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_pages_run_concurrently_in_page_order(textract_only: _SlowAdapter) -> None:
+    content = b"%PDF-1.4 scanned bill of lading"
+    document = _PagedDocument(content=content, filename="bl.pdf", content_type="application/pdf")
+
+    started = time.perf_counter()
+    result = await ocr_runtime._try_ocr_providers(content, "bl.pdf", "application/pdf", parsed_document=document)
+    elapsed = time.perf_counter() - started
+
+    assert [line for line in result["text"].splitlines() if line] == [f"text of page {n}" for n in range(1, 5)]
+    # Four 0.2s pages plus one 0.2s JPEG retry: concurrent is ~0.4s, sequential ~1.0s.
+    assert elapsed < 0.7
+    attempts: List[Dict[str, Any]] = result["artifacts"]["provider_attempts"]
+    assert [(a["page_index"], a["normalized_mime"]) for a in attempts] == [
+        (1, "image/png"),
+        (2, "image/png"),
+        (2, "image/jpeg"),
+        (3, "image/png"),
+        (4, "image/png"),
+    ]
+    assert [a["attempt_number"] for a in attempts] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_jpeg_rendered_only_for_failed_page(textract_only: _SlowAdapter) -> None:
+    content = b"%PDF-1.4 scanned bill of lading"
+    document = _PagedDocument(content=content, filename="bl.pdf", content_type="application/pdf")
+
+    await ocr_runtime._try_ocr_providers(content, "bl.pdf", "application/pdf", parsed_document=document)
+
+    assert sorted(document.rendered) == [(1, "PNG"), (2, "JPEG"), (2, "PNG"), (3, "PNG"), (4, "PNG")]
+
+
+@pytest.mark.asyncio
+async def test_provider_concurrency_is_bounded(textract_only: _SlowAdapter, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "OCR_PROVIDER_MAX_CONCURRENCY", 1)
+    ocr_runtime._ocr_page_semaphores.clear()
+    content = b"%PDF-1.4 scanned bill of lading"
+    document = _PagedDocument(content=content, filename="bl.pdf", content_type="application/pdf")
+
+    started = time.perf_counter()
+    await ocr_runtime._try_ocr_providers(content, "bl.pdf", "application/pdf", parsed_document=document)
+
+    assert time.perf_counter() - started >= 0.9
+    ocr_runtime._ocr_page_semaphores.clear()
+
+
+class _BrokenPageDocument(_PagedDocument):
+    async def render_page_async(self, *, dpi: int, page_index: int, output_format: str = "PNG") -> bytes:
+        if page_index == 3:
+            raise RuntimeError("corrupt page")
+        return await super().render_page_async(dpi=dpi, page_index=page_index, output_format=output_format)
+
+
+@pytest.mark.asyncio
+async def test_page_render_failure_fails_only_that_page(textract_only: _SlowAdapter) -> None:
+    content = b"%PDF-1.4 scanned bill of lading"
+    document = _BrokenPageDocument(content=content, filename="bl.pdf", content_type="application/pdf")
+
+    result = await ocr_runtime._try_ocr_providers(content, "bl.pdf", "application/pdf", parsed_document=document)
+
+    assert [line for line in result["text"].splitlines() if line] == [f"text of page {n}" for n in (1, 2, 4)]
+    page_3 = [a for a in result["artifacts"]["provider_attempts"] if a["page_index"] == 3]
+    assert page_3 and all("page_render_failed:corrupt page" in str(a.get("error")) for a in page_3)
+
+
+class _TiffDocument(_PagedDocument):
+    async def render_tiff_async(self, *, dpi: int) -> tuple:
+        self.rendered.append(("tiff", dpi))
+        return b"TIFF-all-pages", 4
+
+
+class _DocAIAdapter:
+    provider_name = "google_documentai"
+
+    def __init__(self, reject_pdf: bool) -> None:
+        self.reject_pdf = reject_pdf
+        self.calls: List[str] = []
+
+    async def health_check(self) -> bool:
+        return True
+
+    async def process_file_bytes(self, content: bytes, filename: str, content_type: str, document_id: Any) -> Any:
+        self.calls.append(content_type)
+        if self.reject_pdf and content_type == "application/pdf":
+            return SimpleNamespace(full_text="", error="Unsupported document format", overall_confidence=None, elements=[], metadata={}, processing_time_ms=0, provider="google_documentai")
+        return SimpleNamespace(full_text=f"text from {content_type}", error=None, overall_confidence=0.9, elements=[], metadata={}, processing_time_ms=0, provider="google_documentai")
+
+
+@pytest.mark.parametrize("reject_pdf", [False, True])
+@pytest.mark.asyncio
+async def test_docai_tiff_retry_rendered_only_after_direct_pdf_fails(monkeypatch: pytest.MonkeyPatch, reject_pdf: bool) -> None:
+    adapter = _DocAIAdapter(reject_pdf)
+    factory = SimpleNamespace(configured_providers=["gdocai"], get_all_adapters=lambda: [adapter])
+    import app.ocr.factory as ocr_factory
+
+    monkeypatch.setattr(ocr_factory, "get_ocr_factory", lambda: factory)
+    monkeypatch.setattr(settings, "OCR_CACHE_ENABLED", False)
+    content = b"%PDF-1.4 scanned certificate"
+    document = _TiffDocument(content=content, filename="coo.pdf", content_type="application/pdf")
+
+    await ocr_runtime._warm_provider_runtime_payloads("google_documentai", content, "coo.pdf", "application/pdf", document)
+    assert document.rendered == []
+
+    result = await ocr_runtime._try_ocr_providers(content, "coo.pdf", "application/pdf", parsed_document=document)
+
+    if reject_pdf:
+        assert adapter.calls == ["application/pdf", "image/tiff"]
+        assert document.rendered == [("tiff", settings.OCR_NORMALIZATION_DPI)]
+        assert result["text"].strip() == "text from image/tiff"
+        assert result["artifacts"]["provider_attempts"][-1]["payload_source"] == "runtime_pdf_retry_image"
+    else:
+        assert adapter.calls == ["application/pdf"]
+        assert document.rendered == []
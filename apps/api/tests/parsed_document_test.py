@@ -0,0 +1,128 @@
+"""ParsedDocument parses each upload once and memoises every artifact."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sys
+import types
+from io import BytesIO
+
+import pytest
+
+from app.services.extraction.parsed_document import ParsedDocument, ensure_parsed_document
+
+
+def _two_page_pdf() -> bytes:
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    pdf = canvas.Canvas(buffer)
+    pdf.drawString(72, 720, "COMMERCIAL INVOICE NO INV-001")
+    pdf.showPage()
+    pdf.drawString(72, 720, "PACKING LIST REF PL-002")
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_text_layers_and_page_count_are_parsed_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    import pdfminer.high_level
+
+    payload = _two_page_pdf()
+    parsed = ParsedDocument.from_bytes(payload, filename="invoice.pdf", content_type="application/pdf")
+
+    calls = {"pdfminer": 0}
+    real_extract_text = pdfminer.high_level.extract_text
+
+    def _counting_extract_text(*args, **kwargs):
+        calls["pdfminer"] += 1
+        return real_extract_text(*args, **kwargs)
+
+    monkeypatch.setattr(pdfminer.high_level, "extract_text", _counting_extract_text)
+
+    assert parsed.content_hash == hashlib.sha256(payload).hexdigest()
+    assert parsed.is_pdf
+    assert parsed.page_count == 2
+    assert "INV-001" in parsed.native_text
+    assert "PL-002" in parsed.native_text
+    assert len(parsed.page_texts) == 2
+    assert "INV-001" in parsed.page_texts[0]
+    assert "PL-002" in parsed.page_texts[1]
+    assert parsed.best_native_text() == parsed.native_text.strip()
+    assert calls["pdfminer"] == 1
+
+
+def test_parser_failures_are_memoised_and_reraised() -> None:
+    parsed = ParsedDocument.from_bytes(b"not a pdf at all", filename="scan.pdf")
+
+    with pytest.raises(Exception) as first:
+        parsed.native_text
+    with pytest.raises(Exception) as second:
+        parsed.native_text
+
+    assert first.value is second.value
+    assert parsed.page_count == 0
+    assert parsed.best_native_text() == ""
+
+
+def test_png_and_jpeg_renders_share_one_rasterisation(monkeypatch: pytest.MonkeyPatch) -> None:
+    from PIL import Image
+
+    calls = []
+
+    def _fake_convert_from_bytes(data, **kwargs):
+        calls.append(kwargs)
+        return [Image.new("L", (20, 30), color=255) for _ in range(3)]
+
+    monkeypatch.setitem(sys.modules, "pdf2image", types.SimpleNamespace(convert_from_bytes=_fake_convert_from_bytes))
+    parsed = ParsedDocument.from_bytes(b"%PDF-1.4 stub", filename="bl.pdf")
+
+    rendered = parsed.render_page_formats(dpi=300, formats=("PNG", "JPEG"))
+    png_pages, jpeg_pages = rendered["PNG"], rendered["JPEG"]
+    assert parsed.render_pages(dpi=300, output_format="PNG") == png_pages
+    assert parsed.render_pages(dpi=300, output_format="JPEG") == jpeg_pages
+
+    assert len(png_pages) == 3
+    assert len(jpeg_pages) == 3
+    assert png_pages[0].startswith(b"\x89PNG")
+    assert jpeg_pages[0][:2] == b"\xff\xd8"
+    assert len(calls) == 1
+
+    parsed.render_pages(dpi=220, output_format="JPEG", max_pages=2)
+    assert len(calls) == 2
+    assert calls[-1]["last_page"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_accessors_share_one_task_and_fill_the_sync_memo(monkeypatch: pytest.MonkeyPatch) -> None:
+    from app.config import settings
+    from app.utils import pdf_workers
+
+    monkeypatch.setattr(settings, "CPU_POOL_ENABLED", False)
+    calls = {"pdfminer": 0}
+
+    def _fake_pdfminer_text(content: bytes) -> str:
+        calls["pdfminer"] += 1
+        return "LC NUMBER LC-42\x0cPAGE TWO"
+
+    monkeypatch.setattr(pdf_workers, "pdfminer_text", _fake_pdfminer_text)
+    parsed = ParsedDocument.from_bytes(b"%PDF-1.4 stub", filename="lc.pdf")
+
+    results = await asyncio.gather(*(parsed.native_text_async() for _ in range(4)))
+
+    assert set(results) == {"LC NUMBER LC-42\x0cPAGE TWO"}
+    assert parsed.native_text == results[0]
+    assert parsed.page_texts == ["LC NUMBER LC-42", "PAGE TWO"]
+    assert calls["pdfminer"] == 1
+
+
+def test_ensure_parsed_document_reuses_matching_instance() -> None:
+    parsed = ParsedDocument.from_bytes(b"%PDF-1.4 body")
+
+    assert ensure_parsed_document(parsed, parsed.content) is parsed
+    assert ensure_parsed_document(parsed, None) is parsed
+    rebuilt = ensure_parsed_document(parsed, b"%PDF-1.4 other")
+    assert rebuilt is not parsed
+    assert rebuilt.content == b"%PDF-1.4 other"
+    assert ensure_parsed_document(None, b"") is None
@@ -11,8 +11,10 @@ from app.services.proofline.applicability import ModuleApplicability
 from app.services.proofline.orchestrator import (
     AdapterResult,
     canonical_input_hash,
+    module_input_hash,
     run_check,
 )
+from app.services.proofline.processing import _module_waves
 
 
 class _Query:
@@ -30,9 +32,15 @@ class _Query:
                 ]
         return self
 
+    def order_by(self, *clauses):
+        return self
+
     def first(self):
         return self.rows[0] if self.rows else None
 
+    def all(self):
+        return list(self.rows)
+
 
 class _Db:
     def __init__(self):
@@ -173,3 +181,79 @@ def test_adapter_timeout_fails_closed_without_persisting_sensitive_exception_tex
     assert check.safe_error_message == "The required check timed out. Analyst review is required."
     assert "private transaction" not in check.safe_error_message
 
+
+
+class _ScopedAdapter(_Adapter):
+    input_keys = ("payment_terms",)
+
+
+def test_unchanged_module_input_reuses_the_previous_terminal_result():
+    db = _Db()
+    trade_case = _case()
+    adapter = _ScopedAdapter()
+    context = {"payment_terms": {"due_days": 60}, "documents": {"invoice": {"version": 1}}}
+
+    def run(key, **changes):
+        return asyncio.run(
+            run_check(
+                db,
+                trade_case=trade_case,
+                applicability=_applicability(),
+                context={**context, **changes},
+                adapter=adapter,
+                idempotency_key=key,
+            )
+        )
+
+    first = run("round-0")
+    reused = run("round-1", documents={"invoice": {"version": 2}})
+
+    assert adapter.calls == 1
+    assert reused is not first
+    assert reused.state == first.state == "issue_found"
+    assert reused.input_hash == first.input_hash == module_input_hash(context, adapter)
+    assert reused.result_summary["reused_from_check_run_id"] == str(first.id)
+    assert [finding.check_run_id for finding in db.rows[ProoflineFinding]] == [reused.id]
+
+    rerun = run("round-2", payment_terms={"due_days": 90})
+    assert adapter.calls == 2 and rerun.attempt_count == 1
+
+
+def test_independent_modules_share_a_wave_and_adapter_limits_apply():
+    waves = _module_waves([
+        _applicability("buyer_requirements"),
+        _applicability("sanctions"),
+        _applicability("ein"),
+    ])
+    assert [[item.module for item in wave] for wave in waves] == [["sanctions", "ein"], ["buyer_requirements"]]
+
+    class _SlowAdapter(_Adapter):
+        max_concurrency = 1
+        in_flight = 0
+        peak = 0
+
+        async def run(self, context):
+            type(self).in_flight += 1
+            type(self).peak = max(type(self).peak, type(self).in_flight)
+            await asyncio.sleep(0.01)
+            type(self).in_flight -= 1
+            return await super().run(context)
+
+    db = _Db()
+    adapter = _SlowAdapter()
+
+    async def scenario():
+        await asyncio.gather(*(
+            run_check(
+                db,
+                trade_case=_case(),
+                applicability=_applicability(),
+                context={"case": index},
+                adapter=adapter,
+                idempotency_key=f"limit-{index}",
+            )
+            for index in range(3)
+        ))
+
+    asyncio.run(scenario())
+    assert adapter.calls == 3 and _SlowAdapter.peak == 1
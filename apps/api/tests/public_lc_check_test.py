@@ -4,7 +4,7 @@ Covers two units without spinning up the full app / DB / pipeline:
 
   * ``app.utils.anon_rate_limit`` — the Redis-backed 1/IP/24h limiter that is
     the cost control on a public endpoint that runs Sonnet/Opus. Exercised
-    against a tiny in-memory fake Redis.
+    against a tiny in-memory fake Redis that mirrors the limiter's script.
   * The response-trimming helpers in ``app.routers.public_check`` — that the
     public payload is exactly ``{verdict, verdict_label, verdict_color,
     finding_count, top_findings (<=2, severity-sorted), signup_cta}`` and never
@@ -19,6 +19,7 @@ from __future__ import annotations
 
 import ast
 import asyncio
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -35,6 +36,7 @@ class _FakeAsyncRedis:
     def __init__(self) -> None:
         self.store: Dict[str, int] = {}
         self.ttls: Dict[str, int] = {}
+        self.zsets: Dict[str, Dict[str, int]] = {}
 
     async def incr(self, key: str) -> int:
         self.store[key] = int(self.store.get(key, 0)) + 1
@@ -61,6 +63,36 @@ class _FakeAsyncRedis:
     async def ping(self) -> bool:
         return True
 
+    # Sorted-set window used by app.utils.rate_limiter's Lua script.
+    async def evalsha(self, sha: str, numkeys: int, key: str, *args: Any) -> List[int]:
+        window, limit, pending, consume = (int(value) for value in args[:4])
+        token = args[4]
+        now = int(time.time() * 1000)
+        zset = self.zsets.setdefault(key, {})
+        for member, score in list(zset.items()):
+            if score <= now - window:
+                del zset[member]
+        for index in range(1, pending + 1):
+            zset[f"{token}:{index}"] = now
+        count = len(zset)
+        if count >= limit:
+            blocking = sorted(zset.values())[count - limit]
+            return [0, count, blocking + window - now]
+        if consume:
+            zset[token] = now
+            count += 1
+        return [1, count, 0]
+
+    async def zrem(self, key: str, member: str) -> int:
+        return 1 if self.zsets.get(key, {}).pop(member, None) is not None else 0
+
+    async def zpopmax(self, key: str) -> List[Any]:
+        zset = self.zsets.get(key, {})
+        if not zset:
+            return []
+        member = max(zset, key=zset.get)
+        return [(member, zset.pop(member))]
+
 
 class _FakeRequest:
     def __init__(self, ip: str = "203.0.113.7", headers: Optional[Dict[str, str]] = None) -> None:
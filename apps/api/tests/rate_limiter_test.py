@@ -0,0 +1,138 @@
+"""Shared rate limiter engine: Redis script path, local fast path, fallback.
+
+Redis is a tiny in-memory fake that mirrors the sliding-window Lua script
+and counts how often the limiter reached it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.middleware.bank_rate_limit import bank_rate_limit
+from app.utils.rate_limiter import RateLimiter, RateLimitPolicy, rate_limit_policy
+
+
+class _FakeScriptRedis:
+    def __init__(self) -> None:
+        self.zsets: Dict[str, Dict[str, int]] = {}
+        self.calls = 0
+
+    async def evalsha(self, sha: str, numkeys: int, key: str, *args: Any) -> List[int]:
+        self.calls += 1
+        window, limit, pending, consume = (int(value) for value in args[:4])
+        token = args[4]
+        now = int(time.time() * 1000)
+        zset = self.zsets.setdefault(key, {})
+        for member, score in list(zset.items()):
+            if score <= now - window:
+                del zset[member]
+        for index in range(1, pending + 1):
+            zset[f"{token}:{index}"] = now
+        count = len(zset)
+        if count >= limit:
+            blocking = sorted(zset.values())[count - limit]
+            return [0, count, blocking + window - now]
+        if consume:
+            zset[token] = now
+            count += 1
+        return [1, count, 0]
+
+    async def zrem(self, key: str, member: str) -> int:
+        return 1 if self.zsets.get(key, {}).pop(member, None) is not None else 0
+
+
+def _limiter(redis: Any, **kwargs: Any) -> RateLimiter:
+    async def _get_redis():
+        if isinstance(redis, Exception):
+            raise redis
+        return redis
+
+    kwargs.setdefault("fastpath_fraction", 0.0)
+    return RateLimiter(redis_getter=_get_redis, **kwargs)
+
+
+def test_redis_window_is_shared_between_instances():
+    redis = _FakeScriptRedis()
+    first, second = _limiter(redis), _limiter(redis)
+    policy = RateLimitPolicy("api:authenticated", 3, 60)
+
+    async def scenario():
+        return [await limiter.hit(policy, "tenant:a") for limiter in (first, second, first, second)]
+
+    decisions = asyncio.run(scenario())
+    assert [decision.allowed for decision in decisions] == [True, True, True, False]
+    assert decisions[2].remaining == 0
+    assert 0 < decisions[3].retry_after <= 60
+
+
+def test_fast_path_skips_redis_and_flushes_pending_hits():
+    redis = _FakeScriptRedis()
+    limiter = _limiter(redis, fastpath_fraction=0.5, sync_ms=60_000)
+    policy = RateLimitPolicy("bank:api", 100, 60)
+
+    async def scenario():
+        for _ in range(40):
+            assert (await limiter.hit(policy, "user-1")).allowed
+        await limiter.peek(policy, "user-1")
+
+    asyncio.run(scenario())
+    # 1st call: headroom 99 -> budget 49 local hits; 40 hits never needed a 2nd call.
+    assert redis.calls == 2
+    assert len(redis.zsets["ratelimit:bank:api:user-1"]) == 40
+
+
+def test_redis_failure_falls_back_to_local_window_with_backoff():
+    calls = {"n": 0}
+
+    async def _broken():
+        calls["n"] += 1
+        raise RuntimeError("Unable to connect to Redis")
+
+    limiter = RateLimiter(redis_getter=_broken)
+    policy = RateLimitPolicy("api:anonymous", 2, 60)
+
+    async def scenario():
+        return [await limiter.hit(policy, "ip:198.51.100.1") for _ in range(3)]
+
+    assert [decision.allowed for decision in asyncio.run(scenario())] == [True, True, False]
+    assert calls["n"] == 1  # not retried on every request
+
+
+def test_refund_releases_the_reserved_slot():
+    redis = _FakeScriptRedis()
+    limiter = _limiter(redis)
+    policy = RateLimitPolicy("anon_run:lc_check", 1, 86400)
+
+    async def scenario():
+        reserved = await limiter.hit(policy, "203.0.113.1", client=redis)
+        await limiter.refund(policy, "203.0.113.1", reserved.token, client=redis)
+        return await limiter.hit(policy, "203.0.113.1", client=redis)
+
+    assert asyncio.run(scenario()).allowed
+
+
+def test_overrides_retune_policies_and_bank_decorator(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_OVERRIDES", {"bank:export": "1/30", "ai:user": "junk"}, raising=False)
+    assert rate_limit_policy("bank:export", 10, 60) == RateLimitPolicy("bank:export", 1, 30)
+    assert rate_limit_policy("ai:user", 10, 60) == RateLimitPolicy("ai:user", 10, 60)
+
+    limiter = _limiter(None)
+    monkeypatch.setattr("app.middleware.bank_rate_limit.get_rate_limiter", lambda: limiter)
+
+    @bank_rate_limit(limiter_type="export", limit=10, window_seconds=60)
+    async def export(current_user):
+        return "ok"
+
+    user = SimpleNamespace(id="u-1", role="bank_officer")
+    assert asyncio.run(export(current_user=user)) == "ok"
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(export(current_user=user))
+    assert exc.value.status_code == 429
+    assert 0 < int(exc.value.headers["Retry-After"]) <= 30
@@ -0,0 +1,134 @@
+"""Blob offloading of large ValidationSession payloads."""
+
+from __future__ import annotations
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.models import Discrepancy, Document, ResultBlob, ValidationSession
+from app.models.agency import Supplier
+from app.models.analytics_rollup import AnalyticsDailyRollup
+from app.models.base import Base
+from app.models.bulk_jobs import BulkItem, BulkJob
+from app.models.services import ServicesClient
+
+
+@compiles(UUID, "sqlite")
+def _uuid_as_char(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@pytest.fixture()
+def db(monkeypatch):
+    # Offload anything over 1 KiB so small fixtures exercise the blob path.
+    monkeypatch.setattr(settings, "RESULT_BLOB_MIN_BYTES", 1024, raising=False)
+    engine = create_engine("sqlite:///:memory:")
+    tables = [
+        BulkJob.__table__,
+        BulkItem.__table__,
+        Supplier.__table__,
+        ServicesClient.__table__,
+        ValidationSession.__table__,
+        Document.__table__,
+        Discrepancy.__table__,
+        AnalyticsDailyRollup.__table__,
+        ResultBlob.__table__,
+    ]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _results(lc_number="LC-9"):
+    return {
+        "lc_number": lc_number,
+        "discrepancies": [{"discrepancy_type": "date_mismatch", "description": "x" * 400} for _ in range(5)],
+        "structured_result": {"version": "structured_result_v1", "ocr_text": "lorem ipsum " * 500},
+    }
+
+
+def _session(**kwargs):
+    return ValidationSession(user_id=uuid.uuid4(), status="completed", workflow_type="exporter_presentation", **kwargs)
+
+
+def test_large_payload_is_offloaded_with_index_and_read_back(db):
+    engine = db.get_bind()
+    job = _session(validation_results=_results(), extracted_data={"bank_metadata": {"queue": "ops"}})
+    db.add(job)
+    db.commit()
+
+    with engine.connect() as conn:
+        stored, extracted = conn.execute(
+            select(ValidationSession.__table__.c.validation_results, ValidationSession.__table__.c.extracted_data)
+        ).one()
+        blob = conn.execute(select(ResultBlob.__table__)).one()
+    assert stored["_blob"]["sha256"] == blob.sha256 and stored["_blob"]["codec"] == "gzip"
+    assert stored["lc_number"] == "LC-9"
+    assert stored["discrepancies"] == [{"discrepancy_type": "date_mismatch"}] * 5
+    assert "structured_result" not in stored
+    assert extracted == {"bank_metadata": {"queue": "ops"}}  # small payloads stay inline
+    assert blob.stored_size < blob.raw_size // 10
+    assert job.summary_lc_number == "LC-9"
+
+    db.expunge_all()
+    reloaded = db.get(ValidationSession, job.id)
+    assert reloaded.validation_results == _results()
+    # SQL expressions still address the column itself.
+    assert db.scalar(select(func.count()).where(ValidationSession.validation_results.isnot(None))) == 1
+
+
+def test_identical_payloads_share_one_blob_and_edits_write_a_new_one(db):
+    first, second = _session(validation_results=_results()), _session(validation_results=_results())
+    db.add_all([first, second])
+    db.commit()
+    assert db.scalar(select(func.count()).select_from(ResultBlob)) == 1
+
+    payload = first.validation_results
+    payload["lc_number"] = "LC-10"
+    first.validation_results = payload
+    db.commit()
+    db.expire_all()
+    assert first.validation_results["lc_number"] == "LC-10"
+    assert second.validation_results["lc_number"] == "LC-9"
+    assert db.scalar(select(func.count()).select_from(ResultBlob)) == 2
+
+
+def test_bank_job_list_reads_bank_metadata_without_loading_blobs(db, monkeypatch):
+    engine = db.get_bind()
+    from app.routers import bank
+
+    monkeypatch.setattr(bank, "AuditService", lambda db: SimpleNamespace(log_action=lambda **kwargs: None))
+    monkeypatch.setattr(bank, "create_audit_context", lambda request: {
+        "correlation_id": None, "ip_address": None, "user_agent": None, "endpoint": None, "http_method": None,
+    })
+    user = SimpleNamespace(id=uuid.uuid4())
+    for index in range(4):
+        extracted = {"bank_metadata": {"client_name": f"Client {index}", "lc_number": f"LC-{index}"},
+                     "ocr_text": "lorem ipsum " * 500}
+        db.add(ValidationSession(user_id=user.id, status="completed", workflow_type="exporter_presentation",
+                                 validation_results=_results(f"LC-{index}"), extracted_data=extracted))
+    db.commit()
+    db.expunge_all()
+    assert db.scalar(select(func.count()).select_from(ResultBlob)) == 8
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    listed = bank.list_bank_jobs(
+        q=None, status=None, client_name=None, assignee=None, queue=None, date_from=None, date_to=None,
+        sort_by=None, sort_order="desc", limit=50, offset=0, current_user=user, db=db, request=None,
+    )
+
+    assert sorted(job["client_name"] for job in listed["jobs"]) == [f"Client {n}" for n in range(4)]
+    assert len(statements) == 2  # the count and the page
+    assert not any("result_blobs" in statement for statement in statements)
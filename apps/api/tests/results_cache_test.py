@@ -0,0 +1,160 @@
+"""Pre-rendered, ETag-aware GET /api/results/{job_id}.
+
+The handler runs its queries in worker threads, so the in-memory database
+is shared across threads through a StaticPool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import threading
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+from app.cache import results_cache
+from app.models import Discrepancy, Document, ResultBlob, ValidationSession
+from app.models.agency import Supplier
+from app.models.analytics_rollup import AnalyticsDailyRollup
+from app.models.base import Base
+from app.models.bulk_jobs import BulkItem, BulkJob
+from app.models.services import ServicesClient
+from app.routers.jobs_public import get_job_results
+
+
+@compiles(UUID, "sqlite")
+def _uuid_as_char(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@pytest.fixture(autouse=True)
+def _memory_cache_only(monkeypatch):
+    results_cache._memory_cache.clear()
+    monkeypatch.setattr(results_cache._redis_tier, "available", False)
+
+
+@pytest.fixture()
+def db():
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    tables = [
+        BulkJob.__table__,
+        BulkItem.__table__,
+        Supplier.__table__,
+        ServicesClient.__table__,
+        ValidationSession.__table__,
+        Document.__table__,
+        Discrepancy.__table__,
+        AnalyticsDailyRollup.__table__,
+        ResultBlob.__table__,
+    ]
+    Base.metadata.create_all(engine, tables=tables)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/api/results/x", "headers": raw})
+
+
+def _structured(verdict="pass"):
+    return {"version": "structured_result_v1", "validation_status": verdict, "issues": [], "documents_structured": []}
+
+
+def _get(db, user, job_id, **headers):
+    return asyncio.run(get_job_results(job_id=str(job_id), request=_request(**headers), current_user=user, db=db))
+
+
+def test_results_are_rendered_once_per_version_with_etag_and_gzip(db):
+    engine = db.get_bind()
+    user = SimpleNamespace(id=uuid.uuid4(), role="exporter")
+    job = ValidationSession(user_id=user.id, status="completed", workflow_type="exporter_presentation",
+                            validation_results={"structured_result": _structured()})
+    db.add(job)
+    db.commit()
+    job_id = job.id
+
+    first = _get(db, user, job_id)
+    envelope = json.loads(first.body)
+    assert envelope["jobId"] == str(job_id) and envelope["structured_result"]["validation_status"] == "pass"
+    assert first.headers["cache-control"] == "private, no-cache"
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    zipped = _get(db, user, job_id, accept_encoding="gzip, br")
+    assert len(statements) == 1  # the gate columns; the envelope came from the cache
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(zipped.body) == first.body
+    assert zipped.headers["etag"] == first.headers["etag"][:-1] + '-gzip"'
+    assert _get(db, user, job_id, if_none_match=first.headers["etag"]).status_code == 304
+    revalidated = _get(db, user, job_id, if_none_match=zipped.headers["etag"], accept_encoding="gzip")
+    assert revalidated.status_code == 304 and revalidated.headers["etag"] == zipped.headers["etag"]
+
+    job.validation_results = {"structured_result": _structured("fail")}
+    db.commit()
+    updated = _get(db, user, job_id, if_none_match=first.headers["etag"])
+    assert updated.status_code == 200 and updated.headers["etag"] != first.headers["etag"]
+    assert json.loads(updated.body)["structured_result"]["validation_status"] == "fail"
+
+
+def test_unfinished_and_foreign_jobs_are_answered_from_gate_columns(db):
+    engine = db.get_bind()
+    user = SimpleNamespace(id=uuid.uuid4(), role="exporter")
+    job = ValidationSession(user_id=user.id, status="processing", workflow_type="exporter_presentation")
+    db.add(job)
+    db.commit()
+    job_id = job.id
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with pytest.raises(HTTPException) as not_ready:
+        _get(db, user, job_id)
+    assert not_ready.value.status_code == 409
+    with pytest.raises(HTTPException) as foreign:
+        _get(db, SimpleNamespace(id=uuid.uuid4(), role="exporter"), job_id)
+    assert foreign.value.status_code == 403
+    assert len(statements) == 2
+
+
+def test_database_work_and_rendering_stay_off_the_event_loop(db, monkeypatch):
+    engine = db.get_bind()
+    user = SimpleNamespace(id=uuid.uuid4(), role="exporter")
+    job = ValidationSession(user_id=user.id, status="completed", workflow_type="exporter_presentation",
+                            validation_results={"structured_result": _structured()})
+    db.add(job)
+    db.commit()
+    job_id = job.id
+
+    loop_threads = []
+    query_threads = []
+    event.listen(engine, "before_cursor_execute", lambda *args: query_threads.append(threading.get_ident()))
+    real_render = results_cache.render
+    render_threads = []
+
+    def render(envelope):
+        render_threads.append(threading.get_ident())
+        return real_render(envelope)
+
+    monkeypatch.setattr(results_cache, "render", render)
+
+    async def fetch():
+        loop_threads.append(threading.get_ident())
+        return await get_job_results(job_id=str(job_id), request=_request(), current_user=user, db=db)
+
+    assert asyncio.run(fetch()).status_code == 200
+    assert len(query_threads) == 2 and len(render_threads) == 1
+    assert loop_threads[0] not in query_threads + render_threads
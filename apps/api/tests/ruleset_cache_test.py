@@ -0,0 +1,144 @@
+"""Ruleset loading: off-loop DB fetch, singleflight, shared Redis tier, invalidation."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+root_str = str(ROOT)
+if root_str not in sys.path:
+    sys.path.insert(0, root_str)
+
+os.environ["DEBUG"] = "false"
+
+from app.cache import ruleset_cache  # noqa: E402
+from app.services import rules_service as rules_service_module  # noqa: E402
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.values: Dict[str, Any] = {}
+        self.published: List[tuple[str, str]] = []
+
+    async def mget(self, *keys: str) -> List[Optional[Any]]:
+        return [self.values.get(key) for key in keys]
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.values.get(key)
+
+    async def setex(self, key: str, ttl: int, value: Any) -> None:
+        self.values[key] = value
+
+    async def incr(self, key: str) -> int:
+        self.values[key] = int(self.values.get(key) or 0) + 1
+        return self.values[key]
+
+    async def publish(self, channel: str, message: str) -> int:
+        self.published.append((channel, message))
+        return 1
+
+
+def _payload(version: str) -> Dict[str, Any]:
+    return {
+        "ruleset": {"id": "rs-1"},
+        "rules": [{"rule_id": "UCP600-14", "checksum": version}],
+        "ruleset_version": version,
+        "rulebook_version": "UCP600:2007",
+    }
+
+
+def _adapter_with_db(monkeypatch: pytest.MonkeyPatch, db_state: Dict[str, Any]) -> rules_service_module.DBRulesAdapter:
+    adapter = rules_service_module.DBRulesAdapter()
+
+    def _fetch(domain, jurisdiction, document_type):
+        db_state["calls"] += 1
+        db_state["threads"].add(threading.current_thread().name)
+        return _payload(db_state["version"])
+
+    monkeypatch.setattr(adapter, "_fetch_ruleset_from_db", _fetch)
+    return adapter
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> _FakeRedis:
+    redis = _FakeRedis()
+
+    async def _redis():
+        return redis
+
+    monkeypatch.setattr(ruleset_cache, "_get_redis", _redis)
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_cold_loads_share_one_fetch_off_the_event_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def _no_redis():
+        return None
+
+    monkeypatch.setattr(ruleset_cache, "_get_redis", _no_redis)
+    db_state: Dict[str, Any] = {"calls": 0, "threads": set(), "version": "1"}
+    adapter = _adapter_with_db(monkeypatch, db_state)
+
+    results = await asyncio.gather(*(adapter.get_active_ruleset("icc.ucp600", "global") for _ in range(5)))
+
+    assert db_state["calls"] == 1
+    assert threading.current_thread().name not in db_state["threads"]
+    assert all(result is results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_workers_share_redis_payload_until_invalidated(
+    monkeypatch: pytest.MonkeyPatch,
+    fake_redis: _FakeRedis,
+) -> None:
+    db_state: Dict[str, Any] = {"calls": 0, "threads": set(), "version": "1"}
+    worker_a = _adapter_with_db(monkeypatch, db_state)
+    worker_b = _adapter_with_db(monkeypatch, db_state)
+
+    await worker_a.get_active_ruleset("icc.ucp600", "global")
+    loaded_by_b = await worker_b.get_active_ruleset("icc.ucp600", "global")
+    assert db_state["calls"] == 1
+    assert loaded_by_b["ruleset_version"] == "1"
+
+    db_state["version"] = "2"
+    await worker_a.invalidate("icc.ucp600", "global")
+    assert fake_redis.published and fake_redis.published[0][0] == ruleset_cache.RULESET_INVALIDATION_CHANNEL
+
+    # Worker B receives the pub/sub message and drops its local copy.
+    monkeypatch.setattr(rules_service_module, "get_rules_service", lambda: worker_b)
+    rules_service_module._apply_remote_invalidation("icc.ucp600", "global")
+
+    reloaded = await worker_b.get_active_ruleset("icc.ucp600", "global")
+    assert reloaded["ruleset_version"] == "2"
+    assert db_state["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_load_started_before_invalidation_is_not_cached_locally(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def _no_redis():
+        return None
+
+    monkeypatch.setattr(ruleset_cache, "_get_redis", _no_redis)
+    adapter = rules_service_module.DBRulesAdapter()
+    release = threading.Event()
+
+    def _slow_fetch(domain, jurisdiction, document_type):
+        release.wait(timeout=5)
+        return _payload("stale")
+
+    monkeypatch.setattr(adapter, "_fetch_ruleset_from_db", _slow_fetch)
+    pending = asyncio.create_task(adapter.get_active_ruleset("icc.ucp600", "global"))
+    await asyncio.sleep(0.01)
+    adapter.clear_cache("icc.ucp600", "global")
+    release.set()
+    await pending
+
+    assert adapter._cache == {}
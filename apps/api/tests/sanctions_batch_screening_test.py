@@ -0,0 +1,74 @@
+"""Batch screening: one pass for every party, same grading as per-party screening."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+root_str = str(ROOT)
+if root_str not in sys.path:
+    sys.path.insert(0, root_str)
+
+os.environ["DEBUG"] = "false"
+
+from app.services import sanctions_index  # noqa: E402
+from app.services.sanctions_screening import (  # noqa: E402
+    ScreeningInput,
+    SanctionsScreeningService,
+)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(sanctions_index.settings, "SANCTIONS_INDEX_DIR", str(tmp_path), raising=False)
+    sanctions_index.clear_index_registry()
+    yield SanctionsScreeningService()
+    sanctions_index.clear_index_registry()
+
+
+@pytest.mark.asyncio
+async def test_batch_grades_parties_like_screen_party(service) -> None:
+    names = ["Rosneft Oil Company", "Acme Widgets Ltd", "Gazprombank JSC", "ROSNEFT OIL COMPANY"]
+    results = await service.screen_batch(
+        [ScreeningInput(query=name, screening_type="party") for name in names]
+    )
+
+    assert [result.query for result in results] == names
+    for name, result in zip(names, results):
+        single = await service.screen_party(name)
+        assert result.status == single.status
+        assert result.risk_level == single.risk_level
+        assert result.highest_score == single.highest_score
+        assert {m.matched_name for m in result.matches} == {m.matched_name for m in single.matches}
+    assert results[1].status == "clear"
+
+
+@pytest.mark.asyncio
+async def test_batch_dedupes_entity_across_lists(service) -> None:
+    [result] = await service.screen_batch(
+        [ScreeningInput(query="Islamic Republic of Iran Shipping Lines", screening_type="party", country="IR")]
+    )
+
+    list_hits = [m for m in result.matches if m.list_code != "COUNTRY_SANCTIONS"]
+    assert len(list_hits) == 1
+    assert list_hits[0].list_code == "OFAC_SDN"
+    assert set(list_hits[0].also_listed_on) == {"OFAC_SSI", "EU_CONS"}
+    assert any(m.list_code == "COUNTRY_SANCTIONS" for m in result.matches)
+    assert result.status == "match"
+
+
+def test_search_many_matches_search() -> None:
+    index = sanctions_index.SanctionsIndex.build(
+        [
+            {"name": "ROSNEFT", "aliases": ["ROSNEFT OIL COMPANY"]},
+            {"name": "GAZPROMBANK", "aliases": ["GAZPROM BANK"]},
+            {"name": "VTB BANK", "aliases": []},
+        ]
+    )
+    queries = ["Rosneft", "Gazprom Bank", "VTB Bank PJSC", "rosneft", "Unrelated Trading"]
+    assert index.search_many(queries, 70.0) == [index.search(query, 70.0) for query in queries]
@@ -0,0 +1,97 @@
+"""Sanctions screening index: candidate selection agrees with a full linear scan."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+ROOT = Path(__file__).resolve().parents[1]
+root_str = str(ROOT)
+if root_str not in sys.path:
+    sys.path.insert(0, root_str)
+
+os.environ["DEBUG"] = "false"
+
+from app.services import sanctions_index  # noqa: E402
+from app.services.sanctions_screening import (  # noqa: E402
+    SAMPLE_SDN_ENTITIES,
+    calculate_match_score,
+)
+
+
+ENTITIES = list(SAMPLE_SDN_ENTITIES) + [
+    {"name": "GLOBAL MARITIME TRADING LLC", "aliases": ["GMT LLC"]},
+    {"name": "NORTHERN STAR SHIPPING COMPANY", "aliases": []},
+    {"name": "ABDUL RAHMAN AL HASHIMI", "aliases": ["ABDULRAHMAN HASHEMI"]},
+    {"name": "PETROLEUM EXPORT HOLDINGS", "aliases": ["PEH"]},
+]
+
+QUERIES = [
+    "Rosneft Oil Company",
+    "ROSNEFTT",
+    "Sberbank of Russia PJSC",
+    "Islamic Republic of Iran Shipping Lines",
+    "Iran Shipping",
+    "Global Maritime Trading",
+    "Northern Star Shiping Co",
+    "Abdul Rahman Al-Hashemi",
+    "Acme Widgets Ltd",
+    "Trading Company",
+]
+
+
+def _linear(query: str, threshold: float):
+    hits = []
+    for row, entity in enumerate(ENTITIES):
+        score, match_type, method = calculate_match_score(query, entity["name"], entity.get("aliases", []))
+        if score >= threshold:
+            hits.append((row, score, match_type, method))
+    return hits
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(sanctions_index.settings, "SANCTIONS_INDEX_DIR", str(tmp_path), raising=False)
+    sanctions_index.clear_index_registry()
+    yield tmp_path
+    sanctions_index.clear_index_registry()
+
+
+@pytest.mark.parametrize("threshold", [50.0, 70.0, 85.0])
+def test_index_search_matches_linear_scan(threshold: float) -> None:
+    index = sanctions_index.SanctionsIndex.build(ENTITIES)
+    for query in QUERIES:
+        assert index.search(query, threshold) == _linear(query, threshold), query
+
+
+def test_index_is_persisted_and_memory_mapped(index_dir: Path) -> None:
+    built = sanctions_index.load_or_build_index(ENTITIES)
+    assert sanctions_index.load_or_build_index(ENTITIES) is built
+    assert len(list(index_dir.iterdir())) == 1
+
+    sanctions_index.clear_index_registry()
+    reloaded = sanctions_index.load_or_build_index(ENTITIES)
+    assert reloaded is not built
+    assert type(reloaded._backing).__name__ == "mmap"
+    for query in QUERIES:
+        assert reloaded.search(query, 70.0) == _linear(query, 70.0), query
+
+
+def test_list_change_produces_new_index(index_dir: Path) -> None:
+    first = sanctions_index.load_or_build_index(ENTITIES)
+    changed = ENTITIES + [{"name": "NEW LISTED ENTITY", "aliases": []}]
+    second = sanctions_index.load_or_build_index(changed)
+    assert second is not first
+    assert len(second) == len(first) + 1
+    assert sanctions_index.list_fingerprint(changed) != sanctions_index.list_fingerprint(ENTITIES)
+
+
+def test_soundex() -> None:
+    assert sanctions_index.soundex("ROBERT") == "R163"
+    assert sanctions_index.soundex("RUPERT") == "R163"
+    assert sanctions_index.soundex("ASHCRAFT") == "A261"
+    assert sanctions_index.soundex("123") == ""
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import ast
 import asyncio
+import copy
+import hashlib
 import os
 import sys
+import threading
 import time
 import types
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 
@@ -107,7 +110,22 @@ class DummyUploadFile:
         return None
 
 
-async def _fake_extract_text_from_upload(upload_file: DummyUploadFile, document_type: Optional[str] = None) -> dict[str, Any]:
+class _ParsedDocumentStub:
+    def __init__(self, content: bytes, filename: str = "", content_type: str = "") -> None:
+        self.content = content
+        self.filename = filename
+        self.content_type = content_type
+
+    @classmethod
+    def from_bytes(cls, file_bytes: bytes, *, filename: Optional[str] = None, content_type: Optional[str] = None) -> "_ParsedDocumentStub":
+        return cls(file_bytes, filename or "", content_type or "")
+
+
+async def _fake_extract_text_from_upload(
+    upload_file: DummyUploadFile,
+    document_type: Optional[str] = None,
+    parsed_document: Any = None,
+) -> dict[str, Any]:
     text = {
         "LC_001.pdf": ":20:LC12345\n:46A:INVOICE/WEIGHT LIST\n:47A:SHIPMENT DOCS AS PER LC",
         "Invoice_001.pdf": "COMMERCIAL INVOICE\nINVOICE NO: INV-001\nAMOUNT: USD 1000",
@@ -234,6 +252,7 @@ def test_build_document_context_lc_first_mixed_batch_uses_launch_pipeline_as_sin
         "_canonical_document_tag": lambda value: str(value).strip().lower(),
         "_resolve_document_type": lambda filename, idx, normalized_tags: normalized_tags.get(str(filename).lower(), "supporting_document"),
         "_extract_text_from_upload": _fake_extract_text_from_upload,
+        "ParsedDocument": _ParsedDocumentStub,
         "_empty_extraction_artifacts_v1": lambda raw_text="", ocr_confidence=None: {
             "version": "extraction_artifacts_v1",
             "raw_text": raw_text or "",
@@ -383,7 +402,11 @@ def test_build_document_context_allows_lc_launch_pipeline_when_route_text_is_emp
 
     pipeline = LCOnlyPipeline()
 
-    async def _fake_extract_text_empty_for_lc(upload_file: DummyUploadFile, document_type: Optional[str] = None) -> dict[str, Any]:
+    async def _fake_extract_text_empty_for_lc(
+        upload_file: DummyUploadFile,
+        document_type: Optional[str] = None,
+        parsed_document: Any = None,
+    ) -> dict[str, Any]:
         if upload_file.filename == "LC_Image_001.pdf":
             return {
                 "text": "",
@@ -424,6 +447,7 @@ def test_build_document_context_allows_lc_launch_pipeline_when_route_text_is_emp
         "_canonical_document_tag": lambda value: str(value).strip().lower(),
         "_resolve_document_type": lambda filename, idx, normalized_tags: normalized_tags.get(str(filename).lower(), "supporting_document"),
         "_extract_text_from_upload": _fake_extract_text_empty_for_lc,
+        "ParsedDocument": _ParsedDocumentStub,
         "_empty_extraction_artifacts_v1": lambda raw_text="", ocr_confidence=None: {
             "version": "extraction_artifacts_v1",
             "raw_text": raw_text or "",
@@ -502,3 +526,251 @@ def test_build_document_context_allows_lc_launch_pipeline_when_route_text_is_emp
     assert context["lc"]["documents_required"] == ["COMMERCIAL INVOICE", "PACKING LIST"]
     assert context["documents"][0]["extraction_method"] == "multimodal_ai_first"
     assert context["documents"][0]["extraction_status"] == "success"
+
+
+def test_build_document_context_streams_each_document_from_ocr_to_extraction() -> None:
+    _install_stub_modules()
+
+    ocr_delay = {"Slow_Scan.pdf": 0.5}
+    extraction_delay = {"Slow_Scan.pdf": 0.05, "LC_001.pdf": 0.02}
+    events: list[tuple[str, str]] = []
+
+    class TimedPipeline:
+        def __init__(self) -> None:
+            pass
+
+        async def process_document(self, **kwargs: Any) -> dict[str, Any]:
+            filename = kwargs.get("filename")
+            events.append(("extraction_started", filename))
+            await asyncio.sleep(extraction_delay.get(filename, 0.4))
+            if filename == "LC_001.pdf":
+                return {
+                    "handled": True,
+                    "context_key": "lc",
+                    "context_payload": {"lc_number": "LC12345", "documents_required": ["INVOICE"]},
+                    "doc_info_patch": {"extracted_fields": {"lc_number": "LC12345"}, "extraction_status": "success"},
+                    "has_structured_data": True,
+                    "lc_number": "LC12345",
+                    "validation_doc_type": None,
+                }
+            return {"handled": False}
+
+    async def _timed_extract_text(
+        upload_file: DummyUploadFile,
+        document_type: Optional[str] = None,
+        parsed_document: Any = None,
+    ) -> dict[str, Any]:
+        await asyncio.sleep(ocr_delay.get(upload_file.filename, 0.02))
+        events.append(("ocr_finished", upload_file.filename))
+        text = f"TEXT OF {upload_file.filename}"
+        return {"text": text, "artifacts": {"raw_text": text, "total_time_ms": 1.0}}
+
+    class _WideSettings(_SettingsStub):
+        EXTRACTION_LLM_CONCURRENCY = 8
+
+    namespace: Dict[str, Any] = {
+        "asyncio": asyncio,
+        "os": os,
+        "time": time,
+        "uuid4": uuid4,
+        "Any": Any,
+        "Dict": Dict,
+        "List": List,
+        "Optional": Optional,
+        "settings": _WideSettings(),
+        "logger": _LoggerStub(),
+        "_canonical_document_tag": lambda value: str(value).strip().lower(),
+        "_resolve_document_type": lambda filename, idx, normalized_tags: normalized_tags.get(str(filename).lower(), "supporting_document"),
+        "_extract_text_from_upload": _timed_extract_text,
+        "ParsedDocument": _ParsedDocumentStub,
+        "_empty_extraction_artifacts_v1": lambda raw_text="", ocr_confidence=None: {"raw_text": raw_text or ""},
+        "_infer_required_document_types_from_lc": lambda lc: ["commercial_invoice"] if lc and lc.get("documents_required") else [],
+        "_maybe_promote_document_type_from_content": lambda **kwargs: {
+            "document_type": kwargs.get("current_type"),
+            "promoted": False,
+            "content_classification": None,
+        },
+        "get_launch_extraction_pipeline": lambda: TimedPipeline(),
+        "LaunchExtractionPipeline": TimedPipeline,
+        "_apply_two_stage_validation": lambda payload, *args, **kwargs: (payload, {}),
+        "_context_payload_for_doc_type": lambda context, document_type: context.get(
+            {"letter_of_credit": "lc"}.get(document_type, document_type), {}
+        ),
+        "_apply_direct_token_recovery": lambda *args, **kwargs: None,
+        "_enforce_day1_runtime_policy": lambda *args, **kwargs: None,
+        "_apply_extraction_guard": lambda *args, **kwargs: None,
+        "_finalize_text_backed_extraction_status": lambda *args, **kwargs: None,
+        "_stabilize_document_review_semantics": lambda *args, **kwargs: None,
+        "_resolve_doc_llm_trace": lambda *args, **kwargs: {},
+        "_count_populated_canonical_fields": lambda fields: len(fields or {}),
+        "_build_document_extraction_payload": lambda **kwargs: kwargs,
+        "_log_document_extraction_telemetry": lambda **kwargs: None,
+        "_augment_doc_field_details_with_decisions": lambda docs: None,
+        "_annotate_documents_with_review_metadata": lambda docs: {"documents": len(docs or [])},
+        "_normalize_lc_payload_structures": lambda payload: payload,
+        "build_lc_classification": lambda lc, context=None: {},
+        "_build_minimal_lc_structured_output": lambda lc_data, context: {"lc_number": (lc_data or {}).get("lc_number")},
+        "_extraction_fallback_hotfix_enabled": lambda: False,
+        "_backfill_lc_mt700_sources": lambda lc_data, *args, **kwargs: lc_data,
+        "_repair_lc_mt700_dates": lambda payload: payload,
+        "build_lc_requirements_graph_v1": lambda lc_data: {},
+        "_extract_extraction_resolution_from_context_payload": lambda payload: None,
+    }
+
+    loaded = _load_symbols(VALIDATE_PATH, {"_build_document_context"}, namespace)
+    build_document_context = loaded["_build_document_context"]
+
+    supporting = ["Slow_Scan.pdf"] + [f"Clean_{n}.pdf" for n in range(5)]
+    files = [DummyUploadFile(name, "application/pdf", b"bytes") for name in supporting]
+    files.append(DummyUploadFile("LC_001.pdf", "application/pdf", b"lc-bytes"))
+
+    context = asyncio.run(
+        build_document_context(files, document_tags={"LC_001.pdf": "letter_of_credit"})
+    )
+
+    # Without a global OCR barrier, the clean documents are extracted while the
+    # slow scan is still in OCR.
+    slow_ocr_finished = events.index(("ocr_finished", "Slow_Scan.pdf"))
+    extracted_before = [name for kind, name in events[:slow_ocr_finished] if kind == "extraction_started"]
+    assert extracted_before[0] == "LC_001.pdf"
+    assert set(extracted_before[1:]) == {f"Clean_{n}.pdf" for n in range(5)}
+    docs = context["documents"]
+    assert [doc["filename"] for doc in docs] == ["LC_001.pdf"] + supporting
+    assert context["lc_number"] == "LC12345"
+    slow_timings = docs[1]["timings_ms"]
+    assert slow_timings["ocr_stage"] >= 500
+    assert slow_timings["launch_pipeline"] >= 50
+    assert {"ocr_queue", "lc_gate_wait", "extraction_queue", "pipeline"} <= set(slow_timings)
+
+
+def test_build_document_context_reuses_extraction_store_by_content_hash() -> None:
+    _install_stub_modules()
+    ocr_calls: list[str] = []
+    pipeline = DummyLaunchPipeline()
+
+    class _HashedParsedDocument(_ParsedDocumentStub):
+        def __init__(self, content: bytes, filename: str = "", content_type: str = "") -> None:
+            super().__init__(content, filename, content_type)
+            self.content_hash = hashlib.sha256(content).hexdigest()
+
+    async def _counting_extract_text(
+        upload_file: DummyUploadFile,
+        document_type: Optional[str] = None,
+        parsed_document: Any = None,
+    ) -> dict[str, Any]:
+        ocr_calls.append(upload_file.filename)
+        source_name = {"Shipment2_LC.pdf": "LC_001.pdf", "Shipment2_Invoice.pdf": "Invoice_001.pdf"}
+        renamed = DummyUploadFile(source_name.get(upload_file.filename, upload_file.filename), upload_file.content_type, b"")
+        return await _fake_extract_text_from_upload(renamed, document_type=document_type)
+
+    class _MemoryStore:
+        def __init__(self) -> None:
+            self.records: Dict[tuple, Dict[str, Any]] = {}
+            self.lookup_threads: list[int] = []
+
+        def lookup(self, keys: Any) -> Dict[tuple, Dict[str, Any]]:
+            self.lookup_threads.append(threading.get_ident())
+            return {key: copy.deepcopy(self.records[key]) for key in keys if key in self.records}
+
+        def record(self, sha: str, doc_type: str, *, text: Any, artifacts: Any, launch_result: Any) -> None:
+            self.records[(sha, doc_type)] = copy.deepcopy(
+                {"text": text, "artifacts": artifacts, "launch_result": launch_result}
+            )
+
+    namespace: Dict[str, Any] = {
+        "asyncio": asyncio,
+        "os": os,
+        "time": time,
+        "uuid4": uuid4,
+        "Any": Any,
+        "Dict": Dict,
+        "List": List,
+        "Optional": Optional,
+        "Tuple": Tuple,
+        "settings": _SettingsStub(),
+        "logger": _LoggerStub(),
+        "_canonical_document_tag": lambda value: str(value).strip().lower(),
+        "_resolve_document_type": lambda filename, idx, normalized_tags: normalized_tags.get(str(filename).lower(), "supporting_document"),
+        "_extract_text_from_upload": _counting_extract_text,
+        "ParsedDocument": _HashedParsedDocument,
+        "_empty_extraction_artifacts_v1": lambda raw_text="", ocr_confidence=None: {"raw_text": raw_text or ""},
+        "_infer_required_document_types_from_lc": lambda lc: ["commercial_invoice"] if lc and lc.get("documents_required") else [],
+        "_maybe_promote_document_type_from_content": lambda **kwargs: {
+            "document_type": kwargs.get("current_type"),
+            "promoted": False,
+            "content_classification": None,
+        },
+        "get_launch_extraction_pipeline": lambda: pipeline,
+        "LaunchExtractionPipeline": lambda: pipeline,
+        "_apply_two_stage_validation": lambda payload, *args, **kwargs: (payload, {}),
+        "_context_payload_for_doc_type": lambda context, document_type: context.get(
+            {"letter_of_credit": "lc", "commercial_invoice": "invoice"}.get(document_type, document_type), {}
+        ),
+        "_apply_direct_token_recovery": lambda *args, **kwargs: None,
+        "_enforce_day1_runtime_policy": lambda *args, **kwargs: None,
+        "_apply_extraction_guard": lambda *args, **kwargs: None,
+        "_finalize_text_backed_extraction_status": lambda *args, **kwargs: None,
+        "_stabilize_document_review_semantics": lambda *args, **kwargs: None,
+        "_resolve_doc_llm_trace": lambda *args, **kwargs: {},
+        "_count_populated_canonical_fields": lambda fields: len(fields or {}),
+        "_build_document_extraction_payload": lambda **kwargs: kwargs,
+        "_log_document_extraction_telemetry": lambda **kwargs: None,
+        "_augment_doc_field_details_with_decisions": lambda docs: None,
+        "_annotate_documents_with_review_metadata": lambda docs: {"documents": len(docs or [])},
+        "_normalize_lc_payload_structures": lambda payload: payload,
+        "build_lc_classification": lambda lc, context=None: {},
+        "_build_minimal_lc_structured_output": lambda lc_data, context: {"lc_number": (lc_data or {}).get("lc_number")},
+        "_extraction_fallback_hotfix_enabled": lambda: False,
+        "_backfill_lc_mt700_sources": lambda lc_data, *args, **kwargs: lc_data,
+        "_repair_lc_mt700_dates": lambda payload: payload,
+        "build_lc_requirements_graph_v1": lambda lc_data: {},
+        "_extract_extraction_resolution_from_context_payload": lambda payload: None,
+    }
+
+    loaded = _load_symbols(VALIDATE_PATH, {"_build_document_context"}, namespace)
+    build_document_context = loaded["_build_document_context"]
+    store = _MemoryStore()
+
+    first = asyncio.run(
+        build_document_context(
+            [
+                DummyUploadFile("LC_001.pdf", "application/pdf", b"lc-bytes"),
+                DummyUploadFile("Invoice_001.pdf", "application/pdf", b"invoice-bytes"),
+            ],
+            document_tags={"LC_001.pdf": "letter_of_credit", "Invoice_001.pdf": "commercial_invoice"},
+            extraction_store=store,
+        )
+    )
+    assert len(store.records) == 2
+    assert len(pipeline.calls) == 2
+
+    # Next shipment: the same LC and invoice bytes under new names, plus a new document.
+    ocr_calls.clear()
+    pipeline.calls.clear()
+    second = asyncio.run(
+        build_document_context(
+            [
+                DummyUploadFile("Shipment2_LC.pdf", "application/pdf", b"lc-bytes"),
+                DummyUploadFile("Shipment2_Invoice.pdf", "application/pdf", b"invoice-bytes"),
+                DummyUploadFile("Weight_List_001.pdf", "application/pdf", b"weight-bytes"),
+            ],
+            document_tags={
+                "Shipment2_LC.pdf": "letter_of_credit",
+                "Shipment2_Invoice.pdf": "commercial_invoice",
+                "Weight_List_001.pdf": "weight_list",
+            },
+            extraction_store=store,
+        )
+    )
+
+    assert ocr_calls == ["Weight_List_001.pdf"]
+    assert [call["filename"] for call in pipeline.calls] == ["Weight_List_001.pdf"]
+    assert second["lc_number"] == first["lc_number"] == "LC12345"
+    assert second["lc"]["documents_required"] == first["lc"]["documents_required"]
+    assert second["invoice"]["invoice_number"] == "INV-001"
+    docs = {doc["filename"]: doc for doc in second["documents"]}
+    assert docs["Shipment2_LC.pdf"]["_reused_from_extraction_store"] is True
+    assert docs["Shipment2_Invoice.pdf"]["extracted_fields"] == {"invoice_number": "INV-001", "amount": "USD 1000"}
+    assert "_reused_from_extraction_store" not in docs["Weight_List_001.pdf"]
+    # The store's query runs in a worker thread, not on the event loop.
+    assert len(store.lookup_threads) == 2 and threading.get_ident() not in store.lookup_threads
@@ -0,0 +1,106 @@
+"""Concurrent Pass A / Pass B and speculative L1→L2 escalation."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.config import settings
+from app.services import llm_provider, validator
+from app.services.validation import tiered_validation
+
+
+def _ai_response(confidence: float, title: str) -> tuple:
+    body = {"findings": [{"title": title, "severity": "advisory"}], "overall_confidence": confidence}
+    return json.dumps(body), 0, 0, "fake"
+
+
+def test_ai_and_deterministic_passes_overlap(monkeypatch):
+    monkeypatch.setattr(settings, "VALIDATION_TIERED_AI_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "VALIDATION_OPUS_VETO_ENABLED", False, raising=False)
+    running = set()
+    overlapped = []
+
+    async def ai_pass(document_data, document_type):
+        running.add("ai")
+        await asyncio.sleep(0.05)
+        overlapped.append("deterministic" in running)
+        return [{"rule": "AI-1", "_source_layer": "L1"}]
+
+    async def deterministic_pass(document_data, document_type):
+        running.add("deterministic")
+        await asyncio.sleep(0.05)
+        overlapped.append("ai" in running)
+        return [{"rule": "UCP600-18"}]
+
+    monkeypatch.setattr(tiered_validation, "_run_tiered_ai_validation_pass", ai_pass)
+    monkeypatch.setattr(validator, "validate_document_async", deterministic_pass)
+
+    timings = {}
+    findings = asyncio.run(
+        tiered_validation.validate_document_with_pipeline({}, "invoice", timings_out=timings)
+    )
+
+    assert [f["rule"] for f in findings] == ["AI-1", "UCP600-18"]
+    assert findings[1]["_source_layer"] == "deterministic"
+    assert overlapped == [True, True]
+    assert timings["total_ms"] < timings["ai_pass_ms"] + timings["deterministic_pass_ms"]
+    assert timings["critical_path_pass"] in {"ai", "deterministic"}
+
+
+def test_slow_l1_starts_l2_speculatively_and_loses(monkeypatch):
+    monkeypatch.setattr(settings, "VALIDATION_AI_SPECULATIVE_ESCALATION_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "VALIDATION_AI_SPECULATIVE_MIN_SAMPLES", 3, raising=False)
+    tracker = tiered_validation._TierLatencyTracker()
+    for seconds in (0.01, 0.01, 0.02):
+        tracker.record("L1", seconds)
+    monkeypatch.setattr(tiered_validation, "_tier_latency", tracker)
+    calls = []
+    cancelled = []
+
+    async def generate_with_fallback(*, router_layer, **kwargs):
+        calls.append(router_layer)
+        try:
+            if router_layer == "L1":
+                await asyncio.sleep(5)
+                return _ai_response(0.9, "slow L1")
+            await asyncio.sleep(0.01)
+            return _ai_response(0.9, "fast L2")
+        except asyncio.CancelledError:
+            cancelled.append(router_layer)
+            raise
+
+    monkeypatch.setattr(
+        llm_provider.LLMProviderFactory, "generate_with_fallback", staticmethod(generate_with_fallback)
+    )
+
+    findings = asyncio.run(tiered_validation._run_tiered_ai_validation_pass({}, "invoice"))
+
+    assert calls == ["L1", "L2"]
+    assert cancelled == ["L1"]
+    assert [(f["title"], f["_source_layer"]) for f in findings] == [("fast L2", "L2")]
+
+
+def test_weak_speculative_l2_waits_for_l1_in_tier_order(monkeypatch):
+    monkeypatch.setattr(settings, "VALIDATION_AI_SPECULATIVE_ESCALATION_ENABLED", True, raising=False)
+    monkeypatch.setattr(settings, "VALIDATION_AI_SPECULATIVE_MIN_SAMPLES", 1, raising=False)
+    tracker = tiered_validation._TierLatencyTracker()
+    tracker.record("L1", 0.01)
+    monkeypatch.setattr(tiered_validation, "_tier_latency", tracker)
+    calls = []
+
+    async def generate_with_fallback(*, router_layer, **kwargs):
+        calls.append(router_layer)
+        if router_layer == "L1":
+            await asyncio.sleep(0.1)
+            return _ai_response(0.8, "L1 answer")
+        return _ai_response(0.4, "weak L2")
+
+    monkeypatch.setattr(
+        llm_provider.LLMProviderFactory, "generate_with_fallback", staticmethod(generate_with_fallback)
+    )
+
+    findings = asyncio.run(tiered_validation._run_tiered_ai_validation_pass({}, "invoice"))
+
+    assert calls == ["L1", "L2"]
+    assert [f["title"] for f in findings] == ["L1 answer"]
@@ -0,0 +1,109 @@
+"""Deduplicated tracking-alert sweeps and the provider response cache."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.cache import tracking_cache
+from app.models import User
+from app.models.tracking import TrackedShipment
+from app.routers import tracking
+
+
+class _Query:
+    def __init__(self, rows):
+        self.rows = list(rows)
+
+    def filter(self, *criteria):
+        return self
+
+    def all(self):
+        return list(self.rows)
+
+
+class _Db:
+    def __init__(self, users):
+        self.rows = {User: users, TrackedShipment: []}
+        self.added = []
+
+    def query(self, model):
+        return _Query(self.rows.get(model, []))
+
+    def add_all(self, rows):
+        self.added.extend(rows)
+
+
+def _alert(user, reference, tracking_type="container"):
+    return SimpleNamespace(
+        id=uuid.uuid4(), user_id=user.id, reference=reference, tracking_type=tracking_type,
+        alert_type="arrival", email_address=None, notify_email=True, notify_sms=False,
+        phone_number=None, threshold_hours=None, threshold_days=None,
+        last_triggered=None, trigger_count=0,
+    )
+
+
+def test_sweep_tracks_each_reference_once_and_logs_notifications_in_one_batch(monkeypatch):
+    users = [SimpleNamespace(id=uuid.uuid4(), email=f"user{i}@example.com") for i in range(2)]
+    alerts = [
+        _alert(users[0], "MSCU1234567"),
+        _alert(users[1], "mscu 123 4567"),
+        _alert(users[1], "MSCU1234567"),
+        _alert(users[0], "EVER GIVEN", tracking_type="vessel"),
+        _alert(SimpleNamespace(id=uuid.uuid4()), "MSCU1234567"),  # orphaned user
+    ]
+    eta = (datetime.now(timezone.utc) + timedelta(hours=2)).isoformat()
+    fetched, sent = [], []
+
+    async def track_container(reference):
+        fetched.append(("container", reference))
+        return tracking.generate_mock_container_tracking(reference).model_copy(update={"eta": eta})
+
+    async def track_vessel(reference, search_type="name"):
+        fetched.append(("vessel", reference))
+        return tracking.generate_mock_vessel_tracking(reference).model_copy(update={"eta": eta})
+
+    async def send_arrival(**kwargs):
+        sent.append(kwargs["user_email"])
+        return []
+
+    monkeypatch.setattr(tracking, "_track_container_internal", track_container)
+    monkeypatch.setattr(tracking, "_track_vessel_internal", track_vessel)
+    monkeypatch.setattr(tracking.notification_service, "send_container_arrival_alert", send_arrival)
+    db = _Db(users)
+
+    assert asyncio.run(tracking._process_alert_batch(db, alerts)) == 4
+
+    assert sorted(fetched) == [("container", "MSCU1234567"), ("vessel", "EVER GIVEN")]
+    assert sorted(sent) == sorted(["user0@example.com", "user1@example.com", "user1@example.com", "user0@example.com"])
+    assert [alert.trigger_count for alert in alerts] == [1, 1, 1, 1, 0]
+    # Vessel arrivals are sent but, as before, not logged as notifications.
+    assert [row.alert_id for row in db.added] == [alert.id for alert in alerts[:3]]
+
+
+def test_provider_cache_shares_inflight_calls_and_skips_empty_responses(monkeypatch):
+    tracking_cache._memory_cache.clear()
+    monkeypatch.setattr(tracking_cache._redis_tier, "available", False)
+    calls = []
+
+    async def load():
+        calls.append("searates")
+        await asyncio.sleep(0.01)
+        return {"data": {"status": "in_transit"}}
+
+    async def load_nothing():
+        calls.append("portcast")
+        return None
+
+    async def scenario():
+        first = await asyncio.gather(*(tracking_cache.fetch("searates", "mscu1234567", load) for _ in range(5)))
+        again = await tracking_cache.fetch("searates", "MSCU1234567", load)
+        await tracking_cache.fetch("portcast", "MSCU1234567", load_nothing)
+        await tracking_cache.fetch("portcast", "MSCU1234567", load_nothing)
+        return first, again
+
+    first, again = asyncio.run(scenario())
+    assert calls == ["searates", "portcast", "portcast"]
+    assert all(item == {"data": {"status": "in_transit"}} for item in first) and again == first[0]
@@ -1176,11 +1176,13 @@ export interface ValidationHistoryItem {
     documentName?: string;
     rule?: string;
   } | null;
+  verdict?: string | null;
 }
 
 export interface ValidationHistoryResponse {
   jobs: ValidationHistoryItem[];
   total: number;
+  nextCursor?: string | null;
 }
 
 // Hook for fetching validation history